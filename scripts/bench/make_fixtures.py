@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Regenerate the benchmark fixture corpus in scripts/bench/fixtures/.
+
+Usage:
+  python scripts/bench/make_fixtures.py
+  python scripts/bench/make_fixtures.py --pokemon-json public/data/pokemon_data.json --count 12
+
+The corpus is checked in so timings are comparable between commits; rerun this
+only when a fixture has to change, and expect every benchmark's baseline to
+move with it. It writes:
+
+  sprites/<id>.png      synthetic 96x96 RGBA sprites: black-outlined shapes on a
+                        transparent canvas, with white outlined highlights
+  cards/<id>-1.jpg      synthetic 240x336 cards: a tinted frame around the sprite art
+  pokemon_data.json     the --count Pokemon with the most encounter entries, with
+                        only the fields the encounter scripts read and at most
+                        --max-encounters entries per list
+  map_files.txt         the map file names in location_to_file_map.json
+
+The Bulbapedia HTML sections in html/ are hand-trimmed copies of rendered
+encounter tables and are not generated.
+
+Requires: Pillow
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import write_json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SPRITE_IDS = (1, 4, 7, 25, 133, 150)
+CARD_IDS = (1, 25, 150)
+KEEP_FIELDS = ('id', 'name', 'generation', 'location_area_encounters', 'preevolution_location_area_encounters')
+
+
+def make_sprite(pokemon_id, size=96):
+    rnd = random.Random(pokemon_id)
+    im = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(im)
+    base = tuple(rnd.randint(40, 220) for _ in range(3))
+    # Body, then a few limbs, each with a 2px black outline
+    draw.ellipse((18, 24, 78, 84), fill=base + (255,), outline=(0, 0, 0, 255), width=2)
+    for _ in range(3):
+        x0, y0 = rnd.randint(8, 56), rnd.randint(8, 56)
+        x1, y1 = x0 + rnd.randint(14, 30), y0 + rnd.randint(14, 30)
+        shade = tuple(max(0, min(255, c + rnd.randint(-50, 50))) for c in base)
+        draw.ellipse((x0, y0, x1, y1), fill=shade + (255,), outline=(0, 0, 0, 255), width=2)
+    # Eyes and a belly patch: white regions closed by outline
+    for cx in (38, 58):
+        draw.ellipse((cx - 6, 38, cx + 6, 50), fill=(255, 255, 255, 255), outline=(0, 0, 0, 255), width=2)
+    draw.ellipse((36, 58, 60, 78), fill=(250, 250, 250, 255), outline=(0, 0, 0, 255), width=2)
+    return im
+
+
+def make_card(pokemon_id, sprite, size=(240, 336)):
+    rnd = random.Random(1000 + pokemon_id)
+    tint = tuple(rnd.randint(120, 240) for _ in range(3))
+    card = Image.new('RGB', size, (235, 200, 60))
+    draw = ImageDraw.Draw(card)
+    draw.rounded_rectangle((8, 8, size[0] - 9, size[1] - 9), radius=10, fill=tint)
+    # Art window with a vertical gradient behind the sprite
+    art = (20, 40, size[0] - 20, 190)
+    for y in range(art[1], art[3]):
+        t = (y - art[1]) / (art[3] - art[1])
+        draw.line((art[0], y, art[2], y), fill=tuple(int(c * (1 - t) + 255 * t) for c in tint))
+    big = sprite.resize((140, 140), Image.NEAREST)
+    card.paste(big, ((size[0] - 140) // 2, 45), big)
+    for y in range(205, 310, 18):
+        draw.rectangle((24, y, size[0] - 24, y + 8), fill=tuple(c - 60 for c in tint))
+    return card
+
+
+def trimmed_pokemon(path, count, max_encounters):
+    with open(path, 'r', encoding='utf-8') as fh:
+        data = json.load(fh)
+
+    def weight(p):
+        return sum(len(p.get(k) or []) for k in KEEP_FIELDS[3:] if isinstance(p.get(k), list))
+
+    picked = sorted(data, key=lambda p: (-weight(p), int(p['id'])))[:count]
+    picked.sort(key=lambda p: int(p['id']))
+    out = []
+    for p in picked:
+        entry = {k: p[k] for k in KEEP_FIELDS if k in p}
+        for k in KEEP_FIELDS[3:]:
+            if isinstance(entry.get(k), list):
+                entry[k] = entry[k][:max_encounters]
+        out.append(entry)
+    return out
+
+
+def main():
+    p = argparse.ArgumentParser(description='Regenerate the benchmark fixture corpus')
+    p.add_argument('--pokemon-json', default=os.path.join(ROOT, 'public', 'data', 'pokemon_data.json'))
+    p.add_argument('--location-map', default=os.path.join(ROOT, 'public', 'data', 'location_to_file_map.json'))
+    p.add_argument('--count', type=int, default=12, help='Pokemon to keep in the trimmed data (default 12)')
+    p.add_argument('--max-encounters', type=int, default=40, help='Entries kept per encounter list (default 40)')
+    p.add_argument('--output-dir', default=FIXTURES)
+    args = p.parse_args()
+
+    sprites_dir = os.path.join(args.output_dir, 'sprites')
+    cards_dir = os.path.join(args.output_dir, 'cards')
+    os.makedirs(sprites_dir, exist_ok=True)
+    os.makedirs(cards_dir, exist_ok=True)
+
+    sprites = {}
+    for pid in SPRITE_IDS:
+        sprites[pid] = make_sprite(pid)
+        sprites[pid].save(os.path.join(sprites_dir, f'{pid}.png'), optimize=True)
+    for pid in CARD_IDS:
+        make_card(pid, sprites[pid]).save(os.path.join(cards_dir, f'{pid}-1.jpg'), quality=85)
+    print(f'Wrote {len(SPRITE_IDS)} sprites and {len(CARD_IDS)} cards')
+
+    write_json(os.path.join(args.output_dir, 'pokemon_data.json'),
+               trimmed_pokemon(args.pokemon_json, args.count, args.max_encounters),
+               indent=None, separators=(',', ':'), ensure_ascii=False)
+
+    with open(args.location_map, 'r', encoding='utf-8') as fh:
+        mapping = json.load(fh)
+    files = sorted({f for f in mapping.values() if isinstance(f, str)})
+    with open(os.path.join(args.output_dir, 'map_files.txt'), 'w', encoding='utf-8') as fh:
+        fh.write('\n'.join(files) + '\n')
+    print(f'Wrote {len(files)} map file names')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
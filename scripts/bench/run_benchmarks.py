@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""Time the pipeline's hot functions on the fixture corpus and track regressions.
+
+Usage:
+  python scripts/bench/run_benchmarks.py
+  python scripts/bench/run_benchmarks.py --filter colour --repeat 10
+
+  # CI-style: compare with the last run of another commit, exit 1 on a >25% slowdown
+  python scripts/bench/run_benchmarks.py --check --threshold 0.25
+
+  # Compare with a specific earlier commit without recording this run
+  python scripts/bench/run_benchmarks.py --baseline 984530a --no-save
+
+Every benchmark runs one function over the checked-in corpus in
+scripts/bench/fixtures/ (see make_fixtures.py): sprites, card images,
+Bulbapedia encounter-table sections and a trimmed pokemon_data.json. Inputs
+are loaded before timing; each repeat calls the function enough times to run
+for at least --min-time seconds, and the best and median time per call are
+reported.
+
+Results are appended to a per-machine history (--history, default
+scripts/bench/results/<host>.json, not checked in) together with the git
+commit, so timings are only ever compared with runs on the same machine.
+The baseline is the latest recorded run of a different commit (or
+--baseline), and a benchmark whose best time grew by more than --threshold
+is reported as a regression.
+
+A benchmark whose module cannot be imported (e.g. scikit-learn for the colour
+blocks, or requests / BeautifulSoup for the encounter scraper) is skipped with
+the reason, and the rest still run.
+"""
+
+import argparse
+import contextlib
+import datetime
+import glob
+import importlib.util
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = os.path.dirname(HERE)
+ROOT = os.path.dirname(SCRIPTS)
+FIXTURES = os.path.join(HERE, 'fixtures')
+
+sys.path.insert(0, SCRIPTS)
+from common.atomic_output import write_json
+
+
+class Skip(Exception):
+    """A benchmark cannot run here (missing dependency or fixture)."""
+
+
+_modules = {}
+_cleanups = contextlib.ExitStack()  # unwound once the current benchmark has been timed
+
+
+def load_script(relpath):
+    """Import a script under scripts/ by path, with its folder importable for sibling imports."""
+    if relpath in _modules:
+        return _modules[relpath]
+    path = os.path.join(SCRIPTS, relpath)
+    folder = os.path.dirname(path)
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+    name = 'bench_' + re.sub(r'\W', '_', os.path.splitext(relpath)[0])
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except ImportError as e:
+        raise Skip(f'{relpath}: {e}')
+    _modules[relpath] = module
+    return module
+
+
+def fixture_files(folder, pattern):
+    files = sorted(glob.glob(os.path.join(FIXTURES, folder, pattern)))
+    if not files:
+        raise Skip(f'no fixtures in {folder}/')
+    return files
+
+
+def temp_dir(prefix):
+    """Scratch folder that is removed after the current benchmark is timed."""
+    return _cleanups.enter_context(tempfile.TemporaryDirectory(prefix=prefix))
+
+
+def load_fixture_pokemon():
+    with open(os.path.join(FIXTURES, 'pokemon_data.json'), 'r', encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks: each prepares its inputs (untimed) and returns the timed callable
+# ---------------------------------------------------------------------------
+
+def bench_most_common_colors():
+    mcb = load_script('image_tools/make_colour_blocks.py')
+    cards = fixture_files('cards', '*.jpg')
+    return lambda: [mcb.get_most_common_colors(path, num_colors=10) for path in cards]
+
+
+def _card_colours(mcb):
+    return [mcb.get_most_common_colors(path, num_colors=10) for path in fixture_files('cards', '*.jpg')]
+
+
+def bench_reduce_clusters():
+    mcb = load_script('image_tools/make_colour_blocks.py')
+    palettes = _card_colours(mcb)
+    return lambda: [mcb.reduce_clusters_to_n(colors, 5) for colors in palettes]
+
+
+def bench_create_color_blocks():
+    mcb = load_script('image_tools/make_colour_blocks.py')
+    palettes = [mcb.reduce_clusters_to_n(colors, 5) for colors in _card_colours(mcb)]
+    out_dir = temp_dir('bench_colour_blocks_')
+    paths = [os.path.join(out_dir, f'{n}.png') for n in range(len(palettes))]
+    return lambda: [mcb.create_color_blocks(colors, path) for colors, path in zip(palettes, paths)]
+
+
+def bench_choose_points():
+    grp = load_script('zoom/generate_random_points.py')
+    sprites = fixture_files('sprites', '*.png')
+
+    def run():
+        random.seed(0)  # same point draws every call
+        return [grp.choose_points_for_image(path, points=10) for path in sprites]
+    return run
+
+
+def bench_outline_image():
+    oi = load_script('image_tools/outline_images.py')
+    from PIL import Image
+    images = []
+    for path in fixture_files('sprites', '*.png'):
+        with Image.open(path) as im:
+            images.append(im.convert('RGBA'))
+    return lambda: [oi.outline_image(im, 3, (0, 0, 0)) for im in images]
+
+
+def bench_reconstruct_region():
+    ewr = load_script('image_tools/extract_white_regions.py')
+    cv2 = ewr.cv2
+    jobs = []
+    for path in fixture_files('sprites', '*.png'):
+        img = ewr.load_image(path)
+        if img.ndim == 2:
+            img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        gray = cv2.cvtColor(img[:, :, :3], cv2.COLOR_BGR2GRAY)
+        outline_mask, _, _ = ewr.compute_outline_mask(gray)
+        comps, _ = ewr.find_white_components(img)
+        jobs.extend((mask, outline_mask) for mask, _, area in comps if area >= 20)
+    if not jobs:
+        raise Skip('no white regions found in the sprite fixtures')
+    return lambda: [ewr.reconstruct_region_until_outline(seed, outline) for seed, outline in jobs]
+
+
+def bench_parse_encounter_table():
+    sle = load_script('pokemon_locations/scrape_location_encounters.py')
+    tables = []
+    for path in fixture_files('html', '*.html'):
+        with open(path, 'r', encoding='utf-8') as fh:
+            soup = sle.BeautifulSoup(fh.read(), 'html.parser')
+        generation = soup.find(class_='mw-headline').get_text(strip=True)
+        location = os.path.splitext(os.path.basename(path))[0].replace('_', ' ').title()
+        tables.extend((table, generation, location) for table in soup.find_all('table', class_='roundy'))
+    return lambda: [sle.parse_encounter_table(*job) for job in tables]
+
+
+def bench_merge_encounters():
+    mde = load_script('pokemon_data_scripts/merge_duplicate_encounters.py')
+    lists = [p.get(key) for p in load_fixture_pokemon() for key in mde.FIELDS]
+    lists = [encs for encs in lists if isinstance(encs, list) and encs]
+
+    def run():
+        mde.clear_parse_caches()  # time cold parses, as a fresh process() run sees
+        return [mde.merge_encounters(encs, require_same_games=same)
+                for encs in lists for same in (True, False)]
+    return run
+
+
+def bench_best_match_for_location():
+    mlm = load_script('image_tools/match_location_maps.py')
+    locations = sorted(mlm.collect_locations_from_json(load_fixture_pokemon()))
+    with open(os.path.join(FIXTURES, 'map_files.txt'), 'r', encoding='utf-8') as fh:
+        candidates = [line.strip() for line in fh if line.strip()]
+    return lambda: [mlm.best_match_for_location(loc, candidates) for loc in locations]
+
+
+BENCHMARKS = [
+    ('colour.get_most_common_colors', bench_most_common_colors),
+    ('colour.reduce_clusters_to_n', bench_reduce_clusters),
+    ('colour.create_color_blocks', bench_create_color_blocks),
+    ('zoom.choose_points_for_image', bench_choose_points),
+    ('image.outline_image', bench_outline_image),
+    ('image.reconstruct_region_until_outline', bench_reconstruct_region),
+    ('encounters.parse_encounter_table', bench_parse_encounter_table),
+    ('encounters.merge_encounters', bench_merge_encounters),
+    ('locations.best_match_for_location', bench_best_match_for_location),
+]
+
+
+# ---------------------------------------------------------------------------
+# Timing and history
+# ---------------------------------------------------------------------------
+
+def measure(fn, repeat, min_time):
+    """(best, median) seconds per call; each repeat makes enough calls to last min_time."""
+    fn()  # warm up imports and lazy tables
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed * 2 >= min_time else 10
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - t0) / number)
+    return min(times), statistics.median(times), number
+
+
+def git_state():
+    """(commit hash, dirty) for the working tree, or ('unknown', False) outside git."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+    return commit, bool(status.strip())
+
+
+def default_history():
+    host = re.sub(r'[^\w.-]', '_', platform.node() or 'local')
+    return os.path.join(HERE, 'results', f'{host}.json')
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return {'version': 1, 'runs': []}
+    with open(path, 'r', encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def find_baseline(runs, commit, wanted=None):
+    for run in reversed(runs):
+        if wanted:
+            if run['commit'].startswith(wanted):
+                return run
+        elif run['commit'] != commit:
+            return run
+    return None
+
+
+def main():
+    p = argparse.ArgumentParser(description='Benchmark the pipeline hot functions on the fixture corpus')
+    p.add_argument('--filter', help='Only run benchmarks whose name contains this text')
+    p.add_argument('--repeat', type=int, default=5, help='Timed repeats per benchmark (default 5)')
+    p.add_argument('--min-time', type=float, default=0.05, help='Minimum seconds per repeat (default 0.05)')
+    p.add_argument('--history', default=None, help='Results history JSON (default scripts/bench/results/<host>.json)')
+    p.add_argument('--baseline', help='Commit (prefix) to compare with (default: latest run of another commit)')
+    p.add_argument('--threshold', type=float, default=0.25,
+                   help='Slowdown of the best time that counts as a regression (default 0.25 = 25%%)')
+    p.add_argument('--check', action='store_true', help='Exit with status 1 if anything regressed')
+    p.add_argument('--no-save', action='store_true', help="Don't record this run in the history")
+    p.add_argument('--keep', type=int, default=200, help='Runs kept in the history (default 200)')
+    p.add_argument('--list', action='store_true', help='List the benchmarks and exit')
+    args = p.parse_args()
+
+    selected = [(name, setup) for name, setup in BENCHMARKS if not args.filter or args.filter in name]
+    if args.list or not selected:
+        for name, _ in BENCHMARKS:
+            print(name)
+        return 0 if args.list else 2
+
+    history_path = args.history or default_history()
+    history = load_history(history_path)
+    commit, dirty = git_state()
+    baseline = find_baseline(history['runs'], commit, args.baseline)
+    if args.baseline and baseline is None:
+        print(f'No recorded run for commit {args.baseline} in {history_path}')
+    base_results = baseline['results'] if baseline else {}
+
+    results, skipped, regressed = {}, {}, []
+    print(f"{'benchmark':<40}{'best':>12}{'median':>12}{'baseline':>12}{'change':>9}")
+    for name, setup in selected:
+        with _cleanups:
+            try:
+                fn = setup()
+            except Skip as e:
+                skipped[name] = str(e)
+                print(f'{name:<40}  skipped: {e}')
+                continue
+            best, median, number = measure(fn, args.repeat, args.min_time)
+        results[name] = {'best': best, 'median': median, 'number': number, 'repeat': args.repeat}
+        line = f'{name:<40}{best * 1000:>10.3f}ms{median * 1000:>10.3f}ms'
+        base = base_results.get(name)
+        if base:
+            ratio = best / base['best']
+            flag = ''
+            if ratio > 1 + args.threshold:
+                flag = '  REGRESSION'
+                regressed.append((name, ratio))
+            elif ratio < 1 / (1 + args.threshold):
+                flag = '  faster'
+            line += f"{base['best'] * 1000:>10.3f}ms{(ratio - 1) * 100:>+8.1f}%{flag}"
+        print(line)
+
+    if baseline:
+        print(f"\nBaseline: {baseline['commit'][:10]}{' (dirty)' if baseline.get('dirty') else ''} "
+              f"recorded {baseline['date']}")
+    if not args.no_save and results:
+        history['runs'].append({
+            'commit': commit,
+            'dirty': dirty,
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'results': results,
+            'skipped': skipped,
+        })
+        history['runs'] = history['runs'][-args.keep:]
+        write_json(history_path, history)
+
+    if regressed:
+        print(f'{len(regressed)} regression(s) over {args.threshold:.0%}: ' +
+              ', '.join(f'{name} x{ratio:.2f}' for name, ratio in regressed))
+    return 1 if args.check and regressed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
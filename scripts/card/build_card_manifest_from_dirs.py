@@ -3,79 +3,34 @@
 Build a card manifest JSON from organized card image directories.
 
 This script scans directories (full_art, normal, shiny, special) and organizes
-filenames by their Pokemon ID (the first part before the dot).
+filenames by their Pokemon ID (the part before the first dash), in natural
+order ('1-2.jpg' before '1-11.jpg'). Unchanged files are not re-read between
+runs (see common/asset_manifests.py); tools/build_manifests.py rebuilds this
+and the other asset manifests in one pass.
 
 Usage:
     python build_card_manifest_from_dirs.py --input-dir ./cards --output-json ./card_manifest.json
 """
 
 import argparse
-import json
 import os
-from pathlib import Path
-from collections import defaultdict
+import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import instrument
+from common.asset_manifests import AssetScan, build_card_manifest, card_folders
+from common.atomic_output import write_json
 
-def get_pokemon_id(filename):
-    """Extract the Pokemon ID from a filename like '1-11.jpg' -> '1'"""
-    return filename.split('-')[0] if '-' in filename else filename
 
-
-def scan_directory(dir_path):
-    """Scan a directory and return filenames grouped by Pokemon ID"""
-    grouped = defaultdict(list)
-    
-    if not os.path.exists(dir_path):
-        return grouped
-    
-    for filename in os.listdir(dir_path):
-        # Skip directories and hidden files
-        if os.path.isdir(os.path.join(dir_path, filename)) or filename.startswith('.'):
-            continue
-        
-        # Get the Pokemon ID (first part before dot)
-        pokemon_id = get_pokemon_id(filename)
-        grouped[pokemon_id].append(filename)
-    
-    # Sort filenames within each Pokemon ID group
-    for pokemon_id in grouped:
-        grouped[pokemon_id].sort()
-    
-    return dict(sorted(grouped.items(), key=lambda x: (0, int(x[0])) if x[0].isdigit() else (1, x[0])))
-
-
-def build_manifest(input_dir):
+def build_manifest(input_dir, state_path=None):
     """Build the complete manifest from all subdirectories"""
-    manifest = {}
-    
-    # Folders to scan (in desired output order)
-    # normal and shiny need to look in the /resized subdirectory
-    folder_names = ['normal', 'full_art', 'shiny', 'special']
-    # folder_names = ['trimmed']
-    
-    for folder_name in folder_names:
-        if folder_name == 'normal':
-            folder_path = os.path.join(input_dir, folder_name, 'resized')
-            folder_data = scan_directory(folder_path)
-        elif folder_name == 'shiny':
-            # Keep regular and full lists separate under each Pokemon ID
-            folder_data = {}
-            for sub in ['regular', 'full']:
-                sub_path = os.path.join(input_dir, folder_name, sub)
-                sub_data = scan_directory(sub_path)
-                for pokemon_id, files in sub_data.items():
-                    if pokemon_id not in folder_data:
-                        folder_data[pokemon_id] = {}
-                    folder_data[pokemon_id][sub] = files
-        else:
-            folder_path = os.path.join(input_dir, folder_name)
-            folder_data = scan_directory(folder_path)
-        
-        if folder_data:
-            manifest[folder_name] = folder_data
-        else:
-            print(f"Warning: No files found in {os.path.join(input_dir, folder_name)}")
-    
+    # normal and shiny are read from their resized / regular+full subfolders
+    scan = AssetScan(input_dir, state_path=state_path)
+    with instrument.span('scan'):
+        scan.scan(card_folders(''))
+    print(f"  {scan.summary()}")
+    manifest = build_card_manifest(scan, '')
+    scan.save()
     return manifest
 
 
@@ -93,8 +48,14 @@ def main():
         required=True,
         help='Output JSON file path'
     )
+    parser.add_argument(
+        '--state',
+        help='Scan state file (default scripts/data/manifest_state/)'
+    )
     
+    instrument.add_arguments(parser)
     args = parser.parse_args()
+    instrument.setup(args)
     
     # Validate input directory
     if not os.path.isdir(args.input_dir):
@@ -104,7 +65,7 @@ def main():
     print(f"Scanning directories in: {args.input_dir}")
     
     # Build manifest
-    manifest = build_manifest(args.input_dir)
+    manifest = build_manifest(args.input_dir, args.state)
     
     if not manifest:
         print("Warning: No data found. Output will be empty.")
@@ -114,14 +75,14 @@ def main():
             total_files = sum(len(files) for files in data.values())
             print(f"  {folder_name}: {len(data)} Pokemon IDs, {total_files} total files")
     
-    # Write output JSON
-    output_path = Path(args.output_json)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    # Write output JSON (skipped when unchanged, so the frontend's cached copy stays valid)
+    with instrument.span('write'):
+        result = write_json(args.output_json, manifest, verbose=False)
     
-    print(f"\nManifest written to: {args.output_json}")
+    if result.changed:
+        print(f"\nManifest written to: {args.output_json}")
+    else:
+        print(f"\nManifest unchanged: {args.output_json}")
     return 0
 
 
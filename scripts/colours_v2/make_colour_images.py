@@ -6,6 +6,10 @@ from scipy.ndimage import binary_dilation
 import random
 import os
 from pathlib import Path
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.image_cache import open_rgba
 
 def extract_dominant_colors(image, n_colors=8):
     """Extract n dominant colors from image using K-means"""
@@ -141,7 +145,7 @@ def create_mosaic(image, colors, cell_size=8, vague_shape=False, shuffle_hexagon
 
 def process_sprite(input_path, output_path, n_colors=8, cell_size=8, vague_shape=False, padding=0, blur=0, shuffle_hexagons=False):
     """Process a single sprite"""
-    image = Image.open(input_path).convert('RGBA')
+    image = open_rgba(input_path)
     
     # Add padding if requested
     if padding > 0:
@@ -5,6 +5,11 @@ from sklearn.cluster import KMeans
 from scipy.spatial import Voronoi
 from scipy.ndimage import distance_transform_edt
 from pathlib import Path
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.image_cache import open_rgba
 
 def extract_dominant_colors(image, n_colors=8):
     """Extract n dominant colors from image using K-means"""
@@ -174,7 +179,7 @@ def create_voronoi_mosaic(image, colors, n_points=50, vague_shape=False, extend=
 
 def process_sprite(input_path, output_path, n_colors=8, n_points=50, vague_shape=False, extend=20):
     """Process a single sprite"""
-    image = Image.open(input_path).convert('RGBA')
+    image = open_rgba(input_path)
     colors = extract_dominant_colors(image, n_colors)
     mosaic = create_voronoi_mosaic(image, colors, n_points, vague_shape, extend)
     mosaic.save(output_path)
@@ -0,0 +1,7 @@
+"""Shared helpers for the data and asset scripts.
+
+Scripts in sibling folders import these by putting `scripts/` on sys.path:
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from common.region_matcher import RegionMatcher
+"""
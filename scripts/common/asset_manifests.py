@@ -0,0 +1,256 @@
+"""Incremental scanning of the assets checkout and the manifests built from it.
+
+The frontend's manifests (card_manifest.json, eyes_manifest.json,
+body_parts_manifest.json, backgrounds_manifest.json) list the image files in
+folders of the assets checkout. AssetScan lists each folder once with
+os.scandir and compares every file's size and mtime with the state saved by
+the previous run, so only new or modified files are hashed, and the run can
+report what was added, changed or removed:
+
+    scan = AssetScan(assets_dir)
+    scan.scan(MANIFESTS['cards'].folders('cards'))
+    manifest = MANIFESTS['cards'].build(scan, 'cards')
+    scan.save()
+
+The state is one JSON file per assets root in scripts/data/manifest_state/:
+{"version", "root", "files": {relative path: [size, mtime_ns, sha256]}}.
+Files outside the folders scanned in a run are kept as they are, so the
+single-manifest builders and build_manifests.py can share it.
+
+Filenames and Pokemon IDs are ordered with natural_key, so '1-2.jpg' comes
+before '1-11.jpg' and '9.png' before '10.png'.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+
+from common import instrument
+from common.atomic_output import file_digest, write_json
+
+
+STATE_VERSION = 1
+DEFAULT_STATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'manifest_state')
+
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.webp')
+CARD_TYPES = ('normal', 'full_art', 'shiny', 'special')
+
+
+def natural_key(name):
+    """Sort key comparing runs of digits as numbers: '1-2.jpg' < '1-11.jpg' < '2-1.jpg'."""
+    parts = re.split(r'(\d+)', name)
+    return [int(p) if i % 2 else p.casefold() for i, p in enumerate(parts)], name
+
+
+def pokemon_id(filename):
+    """Pokemon ID of a card or body part file: '1-11.jpg' -> '1'."""
+    return filename.split('-')[0] if '-' in filename else filename
+
+
+def group_by_pokemon(files):
+    """{pokemon id: [files]} with IDs and files in natural order."""
+    grouped = {}
+    for name in sorted(files, key=natural_key):
+        grouped.setdefault(pokemon_id(name), []).append(name)
+    return dict(sorted(grouped.items(), key=lambda kv: natural_key(kv[0])))
+
+
+def _join(*parts):
+    return '/'.join(p.strip('/') for p in parts if p and p.strip('/') not in ('', '.'))
+
+
+def default_state_path(root):
+    """State file for an assets root: <folder name>-<hash of the absolute path>.json."""
+    root = os.path.abspath(root)
+    tag = hashlib.sha1(root.encode('utf-8')).hexdigest()[:10]
+    return os.path.join(DEFAULT_STATE_DIR, f'{os.path.basename(root) or "root"}-{tag}.json')
+
+
+class AssetScan:
+    """Listings of folders under an assets root, with file changes since the last run."""
+
+    def __init__(self, root, state_path=None):
+        self.root = os.path.abspath(root)
+        self.state_path = state_path or default_state_path(self.root)
+        self.entries = self._load_state()  # relative path -> [size, mtime_ns, sha256]
+        self.dirs = {}  # relative folder -> file names in natural order
+        self.added, self.changed, self.removed = [], [], []
+        self.hashed = 0
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding='utf-8') as fh:
+                state = json.load(fh)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f'Ignoring unreadable scan state {self.state_path}: {e}', file=sys.stderr)
+            return {}
+        if state.get('version') != STATE_VERSION or state.get('root') != self.root:
+            return {}
+        return state.get('files') or {}
+
+    def scan(self, folders):
+        """List (relative folder, recursive) pairs and update the state for the files in them."""
+        folders = [(_join(rel), recursive) for rel, recursive in folders]
+        seen = set()
+        for rel, recursive in folders:
+            self._scan_dir(rel, recursive, seen)
+        for path in list(self.entries):
+            if path not in seen and _in_scope(path, folders):
+                del self.entries[path]
+                self.removed.append(path)
+        return self
+
+    def _scan_dir(self, rel, recursive, seen):
+        try:
+            it = os.scandir(os.path.join(self.root, rel))
+        except (FileNotFoundError, NotADirectoryError):
+            self.dirs.setdefault(rel, [])
+            return
+        names, subdirs = [], []
+        with it:
+            for entry in it:
+                # Skip hidden files and folders
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir():
+                    subdirs.append(entry.name)
+                elif entry.is_file():
+                    path = _join(rel, entry.name)
+                    self._check(path, entry)
+                    seen.add(path)
+                    names.append(entry.name)
+        self.dirs[rel] = sorted(names, key=natural_key)
+        if recursive:
+            for name in sorted(subdirs, key=natural_key):
+                self._scan_dir(_join(rel, name), True, seen)
+
+    def _check(self, path, entry):
+        instrument.count('files_scanned')
+        st = entry.stat()
+        old = self.entries.get(path)
+        if old and old[0] == st.st_size and old[1] == st.st_mtime_ns:
+            return
+        digest = file_digest(entry.path)
+        self.hashed += 1
+        instrument.count('files_hashed')
+        if old is None:
+            self.added.append(path)
+        elif old[2] != digest:
+            self.changed.append(path)
+        self.entries[path] = [st.st_size, st.st_mtime_ns, digest]
+
+    def files(self, rel=''):
+        """File names in a scanned folder (empty if it was missing)."""
+        return self.dirs.get(_join(rel), [])
+
+    def walk(self, rel=''):
+        """(relative folder, files) for a scanned folder and every scanned folder below it."""
+        rel = _join(rel)
+        for folder in sorted(self.dirs, key=natural_key):
+            if folder == rel or not rel or folder.startswith(rel + '/'):
+                yield folder, self.dirs[folder]
+
+    def summary(self):
+        return (f'{sum(map(len, self.dirs.values()))} files in {len(self.dirs)} folders: '
+                f'{len(self.added)} added, {len(self.changed)} changed, '
+                f'{len(self.removed)} removed ({self.hashed} hashed)')
+
+    def save(self):
+        """Write the state file (skipped when nothing changed)."""
+        state = {'version': STATE_VERSION, 'root': self.root, 'files': dict(sorted(self.entries.items()))}
+        return write_json(self.state_path, state, indent=None, diff=False, fsync=False, verbose=False)
+
+
+def _in_scope(path, folders):
+    folder = path.rpartition('/')[0]
+    for rel, recursive in folders:
+        if folder == rel or (recursive and (not rel or folder.startswith(rel + '/'))):
+            return True
+    return False
+
+
+# ---------------------------------------------------------------------------
+# Manifests
+# ---------------------------------------------------------------------------
+
+def card_folders(base):
+    # normal and shiny cards are listed from their resized / regular+full subfolders
+    return [(_join(base, 'normal', 'resized'), False), (_join(base, 'full_art'), False),
+            (_join(base, 'shiny', 'regular'), False), (_join(base, 'shiny', 'full'), False),
+            (_join(base, 'special'), False)]
+
+
+def build_card_manifest(scan, base):
+    """{card type: {pokemon id: [files]}}; shiny IDs map to {'regular': [...], 'full': [...]}."""
+    manifest = {}
+    for card_type in CARD_TYPES:
+        if card_type == 'normal':
+            data = group_by_pokemon(scan.files(_join(base, 'normal', 'resized')))
+        elif card_type == 'shiny':
+            # Keep regular and full lists separate under each Pokemon ID
+            data = {}
+            for sub in ('regular', 'full'):
+                for pid, files in group_by_pokemon(scan.files(_join(base, 'shiny', sub))).items():
+                    data.setdefault(pid, {})[sub] = files
+            data = dict(sorted(data.items(), key=lambda kv: natural_key(kv[0])))
+        else:
+            data = group_by_pokemon(scan.files(_join(base, card_type)))
+        if data:
+            manifest[card_type] = data
+        else:
+            print(f'Warning: No files found in {os.path.join(scan.root, base, card_type)}')
+    return manifest
+
+
+def eyes_folders(base):
+    return [(_join(base), False)]
+
+
+def build_eyes_manifest(scan, base):
+    """Flat list of eye images, in Pokemon ID order."""
+    return [f for f in scan.files(base) if f.lower().endswith(IMAGE_EXTS)]
+
+
+def body_parts_folders(base):
+    return [(_join(base, 'trimmed'), False)]
+
+
+def build_body_parts_manifest(scan, base):
+    """{'trimmed': {pokemon id: [files]}}."""
+    return {'trimmed': group_by_pokemon(scan.files(_join(base, 'trimmed')))}
+
+
+def backgrounds_folders(base):
+    return [(_join(base), True)]
+
+
+def build_backgrounds_manifest(scan, base, exts=IMAGE_EXTS):
+    """{folder relative to base: [images]}; base itself is keyed by its own name."""
+    base = _join(base)
+    exts = tuple(exts)
+    manifest = {}
+    for folder, files in scan.walk(base):
+        key = folder[len(base):].lstrip('/') if base else folder
+        key = key or os.path.basename(base or scan.root)
+        images = [f for f in files if f.lower().endswith(exts)]
+        if images:
+            manifest[key] = images
+    return dict(sorted(manifest.items(), key=lambda kv: natural_key(kv[0])))
+
+
+ManifestSpec = namedtuple('ManifestSpec', 'folder output indent folders build')
+
+# name -> where it lives in the assets checkout, the public/data file it becomes, and how it is built
+MANIFESTS = {
+    'cards': ManifestSpec('cards', 'card_manifest.json', 2, card_folders, build_card_manifest),
+    'eyes': ManifestSpec('eyes/trimmed', 'eyes_manifest.json', 2, eyes_folders, build_eyes_manifest),
+    'body_parts': ManifestSpec('body_parts', 'body_parts_manifest.json', 2,
+                               body_parts_folders, build_body_parts_manifest),
+    'backgrounds': ManifestSpec('results/backgrounds', 'backgrounds_manifest.json', 4,
+                                backgrounds_folders, build_backgrounds_manifest),
+}
@@ -0,0 +1,242 @@
+"""Atomic, change-aware writes for generated data files and manifests.
+
+`write_json` serialises data exactly like `json.dump(data, f, indent=2,
+ensure_ascii=False)`, then compares the bytes with the file on disk:
+
+  - unchanged: nothing is written, so the file's mtime and the frontend's
+    cached copies stay valid and git sees no change;
+  - changed: the bytes go to a temp file in the same directory, which is
+    fsync'd and renamed over the target, so readers never see a half-written
+    file and a crash leaves the old version in place.
+
+It returns a WriteResult and prints a one-line structural summary of what
+changed, for example:
+
+    Wrote public/data/pokemon_data.json: 3 changed (flavor_text_entries x3), 0 added, 0 removed
+    Unchanged: public/data/pokemon_data.json (write skipped)
+
+Lists of objects with an 'id' are compared by id; other lists by position;
+dicts (manifests) by key.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import Counter, namedtuple
+
+from common import instrument
+
+
+WriteResult = namedtuple('WriteResult', 'path changed size diff')
+
+
+def serialize_json(data, indent=2, **kwargs):
+    """Return the UTF-8 bytes json.dump(data, f, indent=indent, ensure_ascii=False) would write."""
+    kwargs.setdefault('ensure_ascii', False)
+    return json.dumps(data, indent=indent, **kwargs).encode('utf-8')
+
+
+def read_bytes(path):
+    """Return the file's bytes, or None when it does not exist."""
+    try:
+        with open(path, 'rb') as fh:
+            return fh.read()
+    except FileNotFoundError:
+        return None
+
+
+def _fsync_dir(path):
+    # Persist the rename itself; not supported on every platform
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def replace_atomic(tmp_path, path, fsync=True):
+    """Rename a fully written temp file over path, keeping path's permissions."""
+    try:
+        os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+    except FileNotFoundError:
+        pass
+    os.replace(tmp_path, path)
+    if fsync:
+        _fsync_dir(os.path.dirname(os.path.abspath(path)))
+
+
+_umask = None
+
+
+def _default_mode():
+    """Mode open() gives a new file: 0o666 less the process umask (read once)."""
+    global _umask
+    if _umask is None:
+        _umask = os.umask(0)
+        os.umask(_umask)
+    return 0o666 & ~_umask
+
+
+def write_bytes_atomic(path, payload, fsync=True):
+    """Write payload to path through a temp file + rename."""
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f'.{os.path.basename(path)}.', suffix='.tmp', dir=parent)
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            if hasattr(os, 'fchmod') and not os.path.exists(path):
+                # mkstemp files are 0600; give a new file the mode open() would
+                # (an existing target's mode is copied by replace_atomic)
+                os.fchmod(fh.fileno(), _default_mode())
+            fh.write(payload)
+            fh.flush()
+            if fsync:
+                os.fsync(fh.fileno())
+        replace_atomic(tmp, path, fsync=fsync)
+        instrument.count('bytes_written', len(payload))
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def files_equal(a, b, chunk_size=1 << 16):
+    """Byte-compare two files (False when either is missing)."""
+    try:
+        if os.path.getsize(a) != os.path.getsize(b):
+            return False
+        with open(a, 'rb') as fa, open(b, 'rb') as fb:
+            while True:
+                ca, cb = fa.read(chunk_size), fb.read(chunk_size)
+                if ca != cb:
+                    return False
+                if not ca:
+                    return True
+    except FileNotFoundError:
+        return False
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """sha256 hex digest of a file's contents."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def commit_temp(tmp_path, path, fsync=True):
+    """Install a finished temp file at path unless the contents are identical.
+
+    Returns True if path was replaced, False if the temp file was discarded.
+    """
+    if files_equal(tmp_path, path):
+        os.unlink(tmp_path)
+        return False
+    if fsync:
+        with open(tmp_path, 'rb') as fh:
+            os.fsync(fh.fileno())
+    replace_atomic(tmp_path, path, fsync=fsync)
+    return True
+
+
+# --------------------------------------------------------------------------
+# Structural diff
+# --------------------------------------------------------------------------
+
+def _keyed(items):
+    """Key a list by 'id' when every element is a dict with a unique id, else by index."""
+    if items and all(isinstance(x, dict) and 'id' in x for x in items):
+        keyed = {str(x['id']): x for x in items}
+        if len(keyed) == len(items):
+            return keyed
+    return {i: x for i, x in enumerate(items)}
+
+
+def diff_json(old, new):
+    """Summarise differences between two decoded JSON documents.
+
+    Returns {'added': n, 'removed': n, 'changed': n, 'fields': Counter,
+    'reordered': bool} where 'fields' counts changed keys inside changed
+    entries (for lists of objects).
+    """
+    diff = {'added': 0, 'removed': 0, 'changed': 0, 'fields': Counter(), 'reordered': False}
+    if isinstance(old, list) and isinstance(new, list):
+        old_map, new_map = _keyed(old), _keyed(new)
+    elif isinstance(old, dict) and isinstance(new, dict):
+        old_map, new_map = old, new
+    else:
+        diff['changed'] = int(old != new)
+        return diff
+
+    diff['added'] = sum(1 for k in new_map if k not in old_map)
+    diff['removed'] = sum(1 for k in old_map if k not in new_map)
+    for k, new_v in new_map.items():
+        if k not in old_map:
+            continue
+        old_v = old_map[k]
+        if old_v == new_v:
+            continue
+        diff['changed'] += 1
+        if isinstance(old_v, dict) and isinstance(new_v, dict):
+            for field in set(old_v) | set(new_v):
+                if old_v.get(field) != new_v.get(field):
+                    diff['fields'][field] += 1
+    # Same entries in a different order still rewrites the file
+    if not any((diff['added'], diff['removed'], diff['changed'])) and old != new:
+        diff['reordered'] = True
+    return diff
+
+
+def format_diff(diff, max_fields=4):
+    text = f"{diff['changed']} changed"
+    if diff['fields']:
+        fields = diff['fields'].most_common()
+        shown = ', '.join(f'{name} x{n}' for name, n in fields[:max_fields])
+        if len(fields) > max_fields:
+            shown += f', +{len(fields) - max_fields} more'
+        text += f' ({shown})'
+    text = f"{text}, {diff['added']} added, {diff['removed']} removed"
+    return text + ', reordered' if diff['reordered'] else text
+
+
+def write_json(path, data, indent=2, fsync=True, diff=True, verbose=True, **dump_kwargs):
+    """Atomically write data as JSON to path, skipping the write when nothing changed.
+
+    Extra keyword arguments go to json.dumps (e.g. separators, sort_keys).
+    """
+    payload = serialize_json(data, indent=indent, **dump_kwargs)
+    old = read_bytes(path)
+    if old == payload:
+        instrument.count('writes_skipped')
+        if verbose:
+            print(f'Unchanged: {path} (write skipped)')
+        return WriteResult(path, False, len(payload), None)
+
+    summary = None
+    if diff and old is not None:
+        try:
+            # Compare decoded forms so tuples etc. in data match their JSON lists
+            summary = diff_json(json.loads(old), json.loads(payload))
+        except ValueError:
+            summary = None
+    write_bytes_atomic(path, payload, fsync=fsync)
+    if verbose:
+        if old is None:
+            detail = 'new file'
+        elif summary is None:
+            detail = 'replaced'
+        elif not (summary['added'] or summary['removed'] or summary['changed'] or summary['reordered']):
+            detail = 'formatting only'
+        else:
+            detail = format_diff(summary)
+        print(f'Wrote {path}: {detail}')
+    return WriteResult(path, True, len(payload), summary)
@@ -0,0 +1,286 @@
+"""Classic-mode feedback: the N x N matrix of getComparison results.
+
+`compare(guess, answer)` is a port of getComparison in
+src/pages/ClassicPage.jsx for the attributes the Classic grid shows. Each
+attribute's result is stored as a small integer code (its index in
+ATTRIBUTES):
+
+    types       miss / partial / match   (JSON.stringify equality, any shared type)
+    habitat     miss / match
+    height      match / up / down        ('down' = guess is bigger than the answer)
+    weight      match / up / down
+    generation  miss / match
+    evolution   match / up / down        (evolution_stage || 1)
+
+`feedback_matrices(pokemon)` builds every attribute's codes for all
+(guess, answer) pairs at once (rows are guesses, columns answers) with NumPy,
+or in pure Python without it. `pack_codes` / `unpack_codes` store a matrix at
+1 or 2 bits per cell, and `feedback_codes` folds the attributes into one
+integer per pair, the feedback pattern a player sees, for the solver
+statistics here and in classic_solver.
+
+The grid only colours the evolution box match/miss (no arrow), so by default
+patterns use the visible evolution feedback; pass visible=False for the full
+getComparison result.
+"""
+
+import base64
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+ATTRIBUTES = {
+    'types': ('miss', 'partial', 'match'),
+    'habitat': ('miss', 'match'),
+    'height': ('match', 'up', 'down'),
+    'weight': ('match', 'up', 'down'),
+    'generation': ('miss', 'match'),
+    'evolution': ('match', 'up', 'down'),
+}
+# Feedback the Classic grid does not distinguish
+HIDDEN_STATES = {'evolution': {'up': 'miss', 'down': 'miss'}}
+
+
+def bits_for(attr):
+    return 1 if len(ATTRIBUTES[attr]) <= 2 else 2
+
+
+def _evo(p):
+    return p.get('evolution_stage') or 1
+
+
+def _ordered(g, a):
+    if g == a:
+        return 'match'
+    return 'down' if g > a else 'up'
+
+
+def compare(guess, answer):
+    """getComparison for the Classic grid's attributes, as state names."""
+    g_types, a_types = guess.get('types'), answer.get('types')
+    if g_types == a_types:
+        types = 'match'
+    elif isinstance(g_types, list) and isinstance(a_types, list) and set(g_types) & set(a_types):
+        types = 'partial'
+    else:
+        types = 'miss'
+    return {
+        'types': types,
+        'habitat': 'match' if guess.get('habitat') == answer.get('habitat') else 'miss',
+        'height': _ordered(guess['height'], answer['height']),
+        'weight': _ordered(guess['weight'], answer['weight']),
+        'generation': 'match' if guess.get('generation') == answer.get('generation') else 'miss',
+        'evolution': _ordered(_evo(guess), _evo(answer)),
+    }
+
+
+def _factorize(values):
+    index = {}
+    return [index.setdefault(v, len(index)) for v in values]
+
+
+def _ordered_codes(values):
+    v = np.asarray(values, dtype=np.float64)
+    g, a = v[:, None], v[None, :]
+    return np.where(g == a, 0, np.where(g > a, 2, 1)).astype(np.uint8)
+
+
+def feedback_matrices(pokemon):
+    """{attribute: N x N codes}, rows = guess, columns = answer.
+
+    uint8 arrays with NumPy, else lists of lists.
+    """
+    if np is None:
+        out = {attr: [] for attr in ATTRIBUTES}
+        for g in pokemon:
+            rows = {attr: [] for attr in ATTRIBUTES}
+            for a in pokemon:
+                for attr, state in compare(g, a).items():
+                    rows[attr].append(ATTRIBUTES[attr].index(state))
+            for attr in ATTRIBUTES:
+                out[attr].append(rows[attr])
+        return out
+
+    def equal(values):
+        f = np.asarray(_factorize(values))
+        return (f[:, None] == f[None, :]).astype(np.uint8)
+
+    type_keys = [tuple(p.get('types') or ()) for p in pokemon]
+    names = sorted({t for key in type_keys for t in key})
+    onehot = np.zeros((len(pokemon), len(names)), dtype=np.uint8)
+    for i, key in enumerate(type_keys):
+        for t in key:
+            onehot[i, names.index(t)] = 1
+    shared = (onehot.astype(np.int32) @ onehot.T.astype(np.int32)) > 0
+    same = equal(type_keys).astype(bool)
+    return {
+        'types': np.where(same, 2, np.where(shared, 1, 0)).astype(np.uint8),
+        'habitat': equal([p.get('habitat') for p in pokemon]),
+        'height': _ordered_codes([p['height'] for p in pokemon]),
+        'weight': _ordered_codes([p['weight'] for p in pokemon]),
+        'generation': equal([p.get('generation') for p in pokemon]),
+        'evolution': _ordered_codes([_evo(p) for p in pokemon]),
+    }
+
+
+def verify_matrices(pokemon, matrices):
+    """(guess index, answer index, attribute) triples where matrices disagree with compare()."""
+    bad = []
+    for i, g in enumerate(pokemon):
+        for j, a in enumerate(pokemon):
+            for attr, state in compare(g, a).items():
+                if int(matrices[attr][i][j]) != ATTRIBUTES[attr].index(state):
+                    bad.append((i, j, attr))
+    return bad
+
+
+# ---------------------------------------------------------------------------
+# Packing
+# ---------------------------------------------------------------------------
+
+def pack_codes(matrix, bits):
+    """Row-major cells at `bits` (1 or 2) per cell, lowest bits first in each byte."""
+    per_byte = 8 // bits
+    if np is None:
+        flat = [c for row in matrix for c in row]
+        out = bytearray((len(flat) + per_byte - 1) // per_byte)
+        for k, c in enumerate(flat):
+            out[k // per_byte] |= c << (k % per_byte * bits)
+        return bytes(out)
+    flat = np.asarray(matrix, dtype=np.uint8).ravel()
+    flat = np.concatenate([flat, np.zeros(-len(flat) % per_byte, dtype=np.uint8)])
+    shifts = (np.arange(per_byte, dtype=np.uint8) * bits)
+    return (flat.reshape(-1, per_byte) << shifts).sum(axis=1, dtype=np.uint8).tobytes()
+
+
+def unpack_codes(data, bits, n):
+    """Inverse of pack_codes for an n x n matrix (uint8 array, or lists without NumPy)."""
+    per_byte = 8 // bits
+    mask = (1 << bits) - 1
+    if np is None:
+        flat = [(data[k // per_byte] >> (k % per_byte * bits)) & mask for k in range(n * n)]
+        return [flat[i * n:(i + 1) * n] for i in range(n)]
+    raw = np.frombuffer(data, dtype=np.uint8)
+    shifts = (np.arange(per_byte, dtype=np.uint8) * bits)
+    cells = (raw[:, None] >> shifts) & mask
+    return cells.ravel()[:n * n].reshape(n, n)
+
+
+def lookup(packed, bits, n, guess_index, answer_index):
+    """One cell of a packed matrix, without unpacking it."""
+    k = guess_index * n + answer_index
+    per_byte = 8 // bits
+    return (packed[k // per_byte] >> (k % per_byte * bits)) & ((1 << bits) - 1)
+
+
+def encode_packed(matrices):
+    """{attribute: {'bits', 'states', 'data' (base64)}} for a JSON file."""
+    return {
+        attr: {
+            'bits': bits_for(attr),
+            'states': list(states),
+            'data': base64.b64encode(pack_codes(matrices[attr], bits_for(attr))).decode('ascii'),
+        }
+        for attr, states in ATTRIBUTES.items()
+    }
+
+
+def decode_packed(packed, n):
+    return {attr: unpack_codes(base64.b64decode(entry['data']), entry['bits'], n)
+            for attr, entry in packed.items()}
+
+
+# ---------------------------------------------------------------------------
+# Patterns and solver statistics
+# ---------------------------------------------------------------------------
+
+def _radices(visible):
+    out = []
+    for attr, states in ATTRIBUTES.items():
+        hidden = HIDDEN_STATES.get(attr, {}) if visible else {}
+        seen = []
+        for s in states:
+            v = hidden.get(s, s)
+            if v not in seen:
+                seen.append(v)
+        # state code -> visible code
+        out.append((attr, [seen.index(hidden.get(s, s)) for s in states], len(seen)))
+    return out
+
+
+def feedback_codes(matrices, visible=True):
+    """One pattern code per (guess, answer): all attributes, plus whether it's the answer.
+
+    Two Pokemon with identical attributes still get different patterns, since
+    guessing the answer ends the game.
+    """
+    radices = _radices(visible)
+    if np is None:
+        n = len(matrices['types'])
+        codes = []
+        for i in range(n):
+            row = []
+            for j in range(n):
+                code = 1 if i == j else 0
+                for attr, remap, size in radices:
+                    code = code * size + remap[matrices[attr][i][j]]
+                row.append(code)
+            codes.append(row)
+        return codes
+    n = matrices['types'].shape[0]
+    codes = np.eye(n, dtype=np.uint16)
+    for attr, remap, size in radices:
+        codes = codes * np.uint16(size) + np.asarray(remap, dtype=np.uint16)[matrices[attr]]
+    return codes
+
+
+def remaining_counts(codes):
+    """R[g][a]: candidates left (answer included) after guessing g when a is the answer."""
+    if np is None:
+        out = []
+        for row in codes:
+            counts = Counter(row)
+            out.append([counts[c] for c in row])
+        return out
+    out = np.empty(codes.shape, dtype=np.int32)
+    for g in range(codes.shape[0]):
+        _, inverse, counts = np.unique(codes[g], return_inverse=True, return_counts=True)
+        out[g] = counts[inverse]
+    return out
+
+
+def solver_stats(pokemon, codes, top=10):
+    """Opening-guess quality and per-answer difficulty from one guess's feedback.
+
+    For a guess, expected remaining = mean over answers of the candidates left;
+    for an answer, the mean / best over all first guesses.
+    """
+    remaining = remaining_counts(codes)
+    n = len(pokemon)
+    if np is not None:
+        expected = remaining.mean(axis=1).tolist()
+        worst = remaining.max(axis=1).tolist()
+        answer_mean = remaining.mean(axis=0).tolist()
+        answer_best = remaining.min(axis=0).tolist()
+    else:
+        expected = [sum(r) / n for r in remaining]
+        worst = [max(r) for r in remaining]
+        cols = list(zip(*remaining))
+        answer_mean = [sum(c) / n for c in cols]
+        answer_best = [min(c) for c in cols]
+    order = sorted(range(n), key=lambda g: (expected[g], worst[g]))
+    return {
+        'best_openers': [
+            {'id': pokemon[g]['id'], 'name': pokemon[g]['name'],
+             'expected_remaining': round(expected[g], 3), 'worst_case': int(worst[g])}
+            for g in order[:top]
+        ],
+        'answers': {
+            str(p['id']): {'mean_remaining': round(answer_mean[j], 3), 'best_remaining': int(answer_best[j])}
+            for j, p in enumerate(pokemon)
+        },
+    }
@@ -0,0 +1,134 @@
+"""Classic-mode solver: entropy-greedy guess tree and per-Pokemon difficulty.
+
+Works on the pattern matrix from classic_feedback.feedback_codes (rows =
+guess, columns = answer). At each node the candidates are partitioned by the
+pattern every possible guess would produce. All guesses are scored in one
+vectorised pass by bincounting (guess, pattern) pairs. The guess with the
+most information (Shannon entropy of the partition) is taken. Ties prefer a
+guess that could itself be the answer, then the smaller expected partition.
+
+    codes = feedback_codes(feedback_matrices(pokemon))
+    solver = ClassicSolver(codes)
+    tree = solver.solve()                   # nested {'guess', 'children'} dict
+    guesses = solver.guess_counts(tree)     # answer index -> guesses needed
+    scores = solver.difficulty()            # mean guesses after a random opener
+
+Requires NumPy.
+"""
+
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class ClassicSolver:
+    def __init__(self, codes):
+        if np is None:
+            raise RuntimeError('classic_solver needs numpy')
+        self.codes = np.ascontiguousarray(codes, dtype=np.int64)
+        self.n = self.codes.shape[0]
+        self.patterns = int(self.codes.max()) + 1
+        # Answer-major copy: gathering candidate rows is contiguous
+        self._by_answer = np.ascontiguousarray(self.codes.T)
+        self._offsets = np.arange(self.n, dtype=np.int64)
+        # c * log2(c) and c * c for every possible partition size
+        sizes = np.arange(self.n + 1, dtype=np.float64)
+        self._clog2c = sizes * np.log2(np.maximum(sizes, 1))
+        self._squares = sizes * sizes
+        self._memo = {}
+
+    def score(self, candidates):
+        """(entropy, expected partition size) of every guess over the candidate indexes."""
+        m = len(candidates)
+        # Relabel the patterns that occur here as 0..k-1 so small nodes stay cheap
+        sub = self._by_answer[candidates]
+        present = np.zeros(self.patterns, dtype=bool)
+        present[sub] = True
+        k = int(present.sum())
+        relabel = np.cumsum(present) - 1
+        flat = relabel[sub] + self._offsets * k
+        counts = np.bincount(flat.ravel(), minlength=self.n * k).reshape(self.n, k)
+        entropy = math.log2(m) - self._clog2c[counts].sum(axis=1) / m
+        expected = self._squares[counts].sum(axis=1) / m
+        return entropy, expected
+
+    def best_guess(self, candidates):
+        if len(candidates) <= 2:
+            return int(candidates[0])
+        entropy, expected = self.score(candidates)
+        is_candidate = np.zeros(self.n, dtype=bool)
+        is_candidate[candidates] = True
+        # Highest entropy, then could win now, then smallest expected partition
+        order = np.lexsort((np.arange(self.n), expected, ~is_candidate, -np.round(entropy, 12)))
+        return int(order[0])
+
+    def solve(self, candidates=None):
+        """Guess tree for the candidates (default all): {'guess', 'children': {pattern: subtree}}."""
+        if candidates is None:
+            candidates = np.arange(self.n)
+        candidates = np.asarray(candidates, dtype=np.int64)
+        key = candidates.tobytes()
+        if key in self._memo:
+            return self._memo[key]
+        guess = self.best_guess(candidates)
+        node = {'guess': guess, 'children': {}}
+        rest = candidates[candidates != guess]
+        if len(rest):
+            pats = self.codes[guess, rest]
+            for pattern in np.unique(pats):
+                node['children'][int(pattern)] = self.solve(rest[pats == pattern])
+        self._memo[key] = node
+        return node
+
+    def guess_counts(self, tree, candidates=None, depth=1, out=None):
+        """{answer index: guesses the tree needs to find it} for the candidates the tree was solved for.
+
+        A node's guess only counts as finding it when it is still a candidate
+        there; best_guess also picks probes that cannot be the answer.
+        """
+        out = {} if out is None else out
+        if candidates is None:
+            candidates = np.arange(self.n)
+        candidates = np.asarray(candidates, dtype=np.int64)
+        guess = tree['guess']
+        if np.any(candidates == guess):
+            out[guess] = depth
+        rest = candidates[candidates != guess]
+        if tree['children']:
+            pats = self.codes[guess, rest]
+            for pattern, child in tree['children'].items():
+                self.guess_counts(child, rest[pats == pattern], depth + 1, out)
+        return out
+
+    def difficulty(self, openers=None):
+        """Per answer: guesses needed on average over first guesses, playing the tree after it.
+
+        openers: how many first guesses to average over, spread evenly across
+        the list (default all; fewer is faster for large N).
+        """
+        total = np.zeros(self.n, dtype=np.float64)
+        everyone = np.arange(self.n, dtype=np.int64)
+        if openers and openers < self.n:
+            chosen = np.unique(np.linspace(0, self.n - 1, openers).astype(np.int64))
+        else:
+            chosen = everyone
+        for opener in chosen:
+            total[opener] += 1
+            rest = everyone[everyone != opener]
+            pats = self.codes[opener, rest]
+            for pattern in np.unique(pats):
+                group = rest[pats == pattern]
+                for answer, guesses in self.guess_counts(self.solve(group), group).items():
+                    total[answer] += 1 + guesses
+        return total / len(chosen)
+
+
+def tree_to_ids(tree, ids):
+    """A solve() tree with Pokemon ids in place of indexes, for writing out."""
+    return {
+        'guess': ids[tree['guess']],
+        'children': {str(p): tree_to_ids(child, ids) for p, child in tree['children'].items()},
+    }
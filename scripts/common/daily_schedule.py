@@ -0,0 +1,492 @@
+"""Daily-answer schedule: a Python port of the frontend's daily selection.
+
+Reproduces, bit for bit, how `src/App.jsx` picks each mode's daily Pokemon:
+
+  - `mulberry32`, the JS PRNG, on uint32 arithmetic (JS keeps the state in a
+    double, but every use goes through ToInt32/ToUint32, so they agree);
+    `floor(rng() * n)` is computed exactly as `(u * n) >> 32`;
+  - `getSeedFromDate`: the YYYYMMDD of the game day. A game day starts at
+    RESET_HOUR_UTC (src/config/resetConfig.js) on the previous UTC day, so
+    schedules here are keyed by that game day, not by a wall-clock time;
+  - per-mode seed offsets (SEED_OFFSETS in App.jsx); the Details mode seed
+    depends on the weekday (silhouette / zoom / features);
+  - `DAILY_OVERRIDES` from `src/config/dailyOverrides.js`;
+  - the 28-day anti-repeat filter of `getRecentPokemonIds`, including its
+    quirk of replaying only the 56 days before each target date from an empty
+    history, so a date's exclusions are computed from that window alone;
+  - the Card mode's card type / file rolls (`getCardAnswerForDate`).
+
+Features days take the regular selection path, as in App.jsx (its
+manifest-based branch checks for a mode named 'eyes', which
+getDetailsModeForDate never returns).
+
+The per-(mode, day) candidate draws, which don't depend on the target date, are
+generated for every seed at once with NumPy (pure Python without it); the
+anti-repeat replay then only does set lookups.
+
+    builder = ScheduleBuilder(pokemon_ids, load_daily_overrides(path), card_manifest)
+    schedule = builder.build(date(2026, 1, 1), days=730)
+    schedule['modes']['classic'][0]     # Pokemon id for 2026-01-01
+"""
+
+import json
+import re
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+MODES = ('classic', 'card', 'pokedex', 'details', 'colours', 'map')
+LOOKBACK_DAYS = 28
+_MASK = 0xFFFFFFFF
+_STEP = 0x6D2B79F5
+
+# App.jsx SEED_OFFSETS: (offset, letter); the letter's char code is added too
+SEED_OFFSETS = {
+    'classic': (6 * 452, 'c'),
+    'card': (9999, None),
+    'pokedex': (7 * 3355, 'p'),
+    'colours': (9 * 5657, 'c'),
+    'map': (13 * 5575, 'g'),
+}
+DETAILS_OFFSETS = {
+    'silhouette': (7 * 1000, 's'),
+    'zoom': (8 * 1000, 'z'),
+    'features': (14 * 1000, 'e'),
+}
+# Python weekday() (Monday=0) -> getDetailsModeForDate
+DETAILS_BY_WEEKDAY = ('silhouette', 'zoom', 'features', 'silhouette', 'zoom', 'features', 'zoom')
+
+CARD_TYPES = ('normal', 'full_art', 'shiny', 'special')
+
+
+# ---------------------------------------------------------------------------
+# PRNG and seeds
+# ---------------------------------------------------------------------------
+
+def _mix(a):
+    """One mulberry32 output (uint32) for the already-advanced state a."""
+    t = (((a ^ (a >> 15)) & _MASK) * (a | 1)) & _MASK
+    t ^= (t + ((((t ^ (t >> 7)) & _MASK) * (t | 61)) & _MASK)) & _MASK
+    return (t ^ (t >> 14)) & _MASK
+
+
+def mulberry32(seed):
+    """The JS mulberry32: returns a function yielding floats in [0, 1)."""
+    state = seed & _MASK
+
+    def rng():
+        nonlocal state
+        state = (state + _STEP) & _MASK
+        return _mix(state) / 4294967296
+    return rng
+
+
+def mulberry32_raw(seed, start, count):
+    """Raw uint32 outputs start .. start+count-1 of mulberry32(seed)."""
+    state = (seed + start * _STEP) & _MASK
+    out = []
+    for _ in range(count):
+        state = (state + _STEP) & _MASK
+        out.append(_mix(state))
+    return out
+
+
+def mulberry32_block(seeds, count):
+    """First `count` raw outputs for each seed, as a (len(seeds), count) uint32 array."""
+    if np is None:
+        return [mulberry32_raw(s, 0, count) for s in seeds]
+    mask = np.uint64(_MASK)
+    state = np.asarray(seeds, dtype=np.int64).astype(np.uint64) & mask
+    out = np.empty((len(state), count), dtype=np.uint32)
+    for k in range(count):
+        state = (state + np.uint64(_STEP)) & mask
+        t = (((state ^ (state >> np.uint64(15))) & mask) * (state | np.uint64(1))) & mask
+        t ^= (t + ((((t ^ (t >> np.uint64(7))) & mask) * (t | np.uint64(61))) & mask)) & mask
+        out[:, k] = (t ^ (t >> np.uint64(14))) & mask
+    return out
+
+
+def scaled_index(raw, n):
+    """Math.floor(raw / 2**32 * n), exactly."""
+    return (raw * n) >> 32
+
+
+def seed_from_date(day):
+    """getSeedFromDate for a game day: YYYYMMDD as an int."""
+    return day.year * 10000 + day.month * 100 + day.day
+
+
+def date_from_seed(seed):
+    return date(seed // 10000, seed // 100 % 100, seed % 100)
+
+
+def details_mode_for_date(day):
+    return DETAILS_BY_WEEKDAY[day.weekday()]
+
+
+def mode_seed(mode, day):
+    """The seed App.jsx uses for mode on game day `day`."""
+    if mode == 'details':
+        offset, letter = DETAILS_OFFSETS[details_mode_for_date(day)]
+    else:
+        offset, letter = SEED_OFFSETS.get(mode, (len(mode) * 1000, mode[0]))
+    return seed_from_date(day) + offset + (ord(letter) if letter else 0)
+
+
+# ---------------------------------------------------------------------------
+# dailyOverrides.js
+# ---------------------------------------------------------------------------
+
+def _strip_js_comments(text):
+    out = []
+    i, n = 0, len(text)
+    while i < n:
+        c = text[i]
+        if c in '"\'':
+            j = i + 1
+            while j < n and text[j] != c:
+                j += 2 if text[j] == '\\' else 1
+            literal = text[i:j + 1]
+            # Single-quoted JS strings -> JSON strings
+            out.append(json.dumps(literal[1:-1]) if c == "'" else literal)
+            i = j + 1
+        elif text.startswith('//', i):
+            i = text.find('\n', i)
+            i = n if i < 0 else i
+        elif text.startswith('/*', i):
+            i = text.find('*/', i + 2)
+            i = n if i < 0 else i + 2
+        else:
+            out.append(c)
+            i += 1
+    return ''.join(out)
+
+
+def parse_js_object(text):
+    """Parse a plain JS object literal (comments, bare keys, trailing commas) as JSON."""
+    text = _strip_js_comments(text)
+    text = re.sub(r'([{,]\s*)([A-Za-z_$][\w$]*)\s*:', r'\1"\2":', text)
+    text = re.sub(r',(\s*[}\]])', r'\1', text)
+    return json.loads(text)
+
+
+def load_daily_overrides(path):
+    """DAILY_OVERRIDES from src/config/dailyOverrides.js, keyed by YYYYMMDD string."""
+    with open(path, 'r', encoding='utf-8') as fh:
+        source = fh.read()
+    match = re.search(r'DAILY_OVERRIDES\s*=\s*', source)
+    if not match:
+        raise ValueError(f'No DAILY_OVERRIDES object in {path}')
+    # The object ends at the brace matching the first one
+    start = source.index('{', match.end())
+    depth = 0
+    body = _strip_js_comments(source[start:])
+    for end, c in enumerate(body):
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                break
+    return parse_js_object(body[:end + 1])
+
+
+def override_id(overrides, day, mode):
+    """getDailyOverride resolved to a Pokemon id (number or {pokemonId}), else None."""
+    value = (overrides.get(str(seed_from_date(day))) or {}).get(mode)
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)) and value:
+        return int(value)
+    if isinstance(value, dict) and value.get('pokemonId'):
+        return int(value['pokemonId'])
+    return None
+
+
+def is_theme_day(overrides, day):
+    return bool((overrides.get(str(seed_from_date(day))) or {}).get('theme'))
+
+
+# ---------------------------------------------------------------------------
+# Schedule
+# ---------------------------------------------------------------------------
+
+class _Draws:
+    """Candidate ids per (mode, day) in rng order, extended on demand."""
+
+    def __init__(self, ids, seeds, count):
+        self.ids = ids
+        self.n = len(ids)
+        self.seeds = seeds
+        raw = mulberry32_block(seeds, count)
+        if np is not None:
+            idx = ((raw.astype(np.uint64) * np.uint64(self.n)) >> np.uint64(32)).astype(np.int64)
+            id_arr = np.asarray(ids, dtype=np.int64)
+            self.rows = id_arr[idx].tolist()
+        else:
+            self.rows = [[ids[scaled_index(u, self.n)] for u in row] for row in raw]
+
+    def row(self, i, need):
+        row = self.rows[i]
+        if need > len(row):
+            more = mulberry32_raw(self.seeds[i], len(row), max(need, 2 * len(row)) - len(row))
+            row.extend(self.ids[scaled_index(u, self.n)] for u in more)
+        return row
+
+
+class ScheduleBuilder:
+    """Replays App.jsx's daily selection for every mode over a range of game days.
+
+    pokemon_ids: ids in pokemon_data.json order (the frontend indexes that list).
+    overrides: parsed DAILY_OVERRIDES. card_manifest: public/data/card_manifest.json
+    (without it Card days have no answer, as in the app).
+    """
+
+    def __init__(self, pokemon_ids, overrides=None, card_manifest=None, lookback=LOOKBACK_DAYS,
+                 draws=32):
+        self.ids = list(pokemon_ids)
+        self.known = set(self.ids)
+        self.n = len(self.ids)
+        self.overrides = overrides or {}
+        self.card_manifest = card_manifest
+        self.lookback = lookback
+        self.draws = draws
+
+    # -- anti-repeat replay --------------------------------------------------
+
+    def _pick(self, row_of, i, excluded):
+        """First candidate not excluded within n attempts, or None."""
+        row = row_of(i, 1)
+        k = 0
+        while k < self.n:
+            if k >= len(row):
+                row = row_of(i, k + 1)
+            if row[k] not in excluded:
+                return row[k]
+            k += 1
+        return None
+
+    def _recent(self, t, mode, row_of, days):
+        """getRecentPokemonIds: ids picked in the lookback days before day index t."""
+        window = 2 * self.lookback
+        picked = {}
+        for back in range(window, 0, -1):
+            p = t - back
+            sel = override_id(self.overrides, days[p], mode)
+            if sel is None:
+                excluded = {picked[q] for q in range(p - self.lookback, p) if q in picked}
+                sel = self._pick(row_of, p, excluded)
+            if sel is not None:
+                picked[p] = sel
+        return {picked[t - b] for b in range(1, self.lookback + 1) if t - b in picked}
+
+    # -- cards ---------------------------------------------------------------
+
+    def _card_list(self, kind, pid):
+        return (self.card_manifest.get(kind) or {}).get(str(pid)) or []
+
+    def _build_card(self, base_seed, pid, local_rng):
+        """buildCardForPokemon: (card type, file) or None."""
+        normal = self._card_list('normal', pid)
+        if not normal:
+            return None
+        type_rng = mulberry32(base_seed + pid * 7777)
+        special_roll, full_art_roll, shiny_roll = type_rng(), type_rng(), type_rng()
+        full_art = self._card_list('full_art', pid)
+        shiny = self._card_list('shiny', pid) or {}
+        shiny_files = list(shiny.get('regular') or []) + list(shiny.get('full') or [])
+        special = self._card_list('special', pid)
+        if special_roll < 0.10 and special:
+            return 'special', special[int(local_rng() * len(special))]
+        if full_art_roll < 0.05 and full_art:
+            return 'full_art', full_art[int(local_rng() * len(full_art))]
+        if shiny_roll < 0.05:
+            if not shiny_files:
+                return None
+            return 'shiny', shiny_files[int(local_rng() * len(shiny_files))]
+        return 'normal', normal[int(local_rng() * len(normal))]
+
+    def _card_override(self, day):
+        value = (self.overrides.get(str(seed_from_date(day))) or {}).get('card')
+        if not isinstance(value, dict) or not value.get('pokemonId'):
+            return None
+        pid = int(value['pokemonId'])
+        if pid not in self.known:
+            return None
+        card_type, card_file = value.get('cardType'), value.get('cardFile')
+        if card_file and not card_type:
+            for kind in CARD_TYPES:
+                files = self._card_list(kind, pid)
+                if isinstance(files, list) and card_file in files:
+                    card_type = kind
+                    break
+        card_type = card_type or 'normal'
+        files = self._card_list(card_type, pid)
+        if not isinstance(files, list) or not files:
+            return None
+        if not card_file or card_file not in files:
+            card_file = files[0]
+        return pid, card_type, card_file
+
+    def _card_for(self, day, excluded):
+        """getCardAnswerForDate: (pokemon id, card type, card file, fell back)."""
+        chosen = self._card_override(day)
+        if chosen:
+            return chosen + (False,)
+        base_seed = seed_from_date(day) + 9999
+        for allow_repeats in (False, True):
+            local_rng = mulberry32(base_seed)
+            for _ in range(200):
+                pid = self.ids[int(local_rng() * self.n)]
+                if allow_repeats or pid not in excluded:
+                    card = self._build_card(base_seed, pid, local_rng)
+                    if card:
+                        return (pid,) + card + (allow_repeats,)
+        return None, None, None, True
+
+    # -- build ---------------------------------------------------------------
+
+    def build(self, start, days):
+        """Schedule for game days start .. start+days-1 (dates)."""
+        window = 2 * self.lookback
+        all_days = [start + timedelta(days=i - window) for i in range(days + window)]
+        schedule = {
+            'start': start.isoformat(),
+            'days': days,
+            'details_mode': ''.join(details_mode_for_date(d)[0] for d in all_days[window:]),
+            'theme': [i for i, d in enumerate(all_days[window:]) if is_theme_day(self.overrides, d)],
+            'modes': {},
+            'overrides': {},
+            'fallbacks': {},
+        }
+        for mode in MODES:
+            draws = _Draws(self.ids, [mode_seed(mode, d) for d in all_days], self.draws)
+            picks, overridden, fallbacks = [], [], []
+            cards = []
+            for t in range(window, window + days):
+                day = all_days[t]
+                i = t - window
+                if mode == 'card':
+                    # Like App.jsx, no card manifest means no Card answer
+                    pid, card_type, card_file, fell_back = None, None, None, False
+                    if self.card_manifest is not None:
+                        if self._card_override(day):
+                            overridden.append(i)
+                        pid, card_type, card_file, fell_back = self._card_for(
+                            day, self._recent(t, mode, draws.row, all_days))
+                    cards.append((card_type, card_file))
+                else:
+                    pid = override_id(self.overrides, day, mode)
+                    fell_back = False
+                    if pid is not None:
+                        overridden.append(i)
+                        if pid not in self.known:
+                            pid = None
+                    else:
+                        pid = self._pick(draws.row, t, self._recent(t, mode, draws.row, all_days))
+                        if pid is None:
+                            # Fallback: first draw, repeats allowed
+                            pid, fell_back = draws.row(t, 1)[0], True
+                if fell_back:
+                    fallbacks.append(i)
+                picks.append(pid)
+            schedule['modes'][mode] = picks
+            schedule['overrides'][mode] = overridden
+            schedule['fallbacks'][mode] = fallbacks
+            if mode == 'card':
+                schedule['card_type'] = [c[0] for c in cards]
+                schedule['card_file'] = [c[1] for c in cards]
+        return schedule
+
+
+# ---------------------------------------------------------------------------
+# Lookup and statistics
+# ---------------------------------------------------------------------------
+
+def answers_for(schedule, day):
+    """{mode: id} (plus 'card_file' / 'card_type') for a date in the schedule."""
+    i = (day - date.fromisoformat(schedule['start'])).days
+    if not 0 <= i < schedule['days']:
+        raise KeyError(f'{day} is outside the schedule')
+    out = {mode: ids[i] for mode, ids in schedule['modes'].items()}
+    if 'card_file' in schedule:
+        out['card_type'] = schedule['card_type'][i]
+        out['card_file'] = schedule['card_file'][i]
+    return out
+
+
+def schedule_stats(schedule, lookback=LOOKBACK_DAYS):
+    """Repeat and collision statistics for a built schedule."""
+    start = date.fromisoformat(schedule['start'])
+    stats = {'modes': {}, 'collisions': []}
+    for mode, ids in schedule['modes'].items():
+        counts = Counter(i for i in ids if i is not None)
+        last_seen = {}
+        gaps = []
+        for i, pid in enumerate(ids):
+            if pid is None:
+                continue
+            if pid in last_seen:
+                gaps.append(i - last_seen[pid])
+            last_seen[pid] = i
+        top = counts.most_common(1)
+        stats['modes'][mode] = {
+            'distinct': len(counts),
+            'most_picked': {'id': top[0][0], 'times': top[0][1]} if top else None,
+            'repeats': len(gaps),
+            'repeats_within_lookback': sum(1 for g in gaps if g <= lookback),
+            'min_repeat_gap': min(gaps) if gaps else None,
+            'overrides': len(schedule['overrides'].get(mode, [])),
+            'fallbacks': len(schedule['fallbacks'].get(mode, [])),
+        }
+    # Same Pokemon answering several modes on one day
+    for i in range(schedule['days']):
+        by_id = defaultdict(list)
+        for mode, ids in schedule['modes'].items():
+            if ids[i] is not None:
+                by_id[ids[i]].append(mode)
+        for pid, modes in sorted(by_id.items()):
+            if len(modes) > 1:
+                stats['collisions'].append({'date': (start + timedelta(days=i)).isoformat(),
+                                            'id': pid, 'modes': modes})
+    return stats
+
+
+def difficulty_balance(schedule, difficulty, mode='classic', hard=75):
+    """How answer difficulty (id -> 0-100 score) spreads over a mode's days.
+
+    Reports the mean, the mean per weekday, the hardest calendar week and the
+    longest run of consecutive days scoring at least `hard`.
+    """
+    start = date.fromisoformat(schedule['start'])
+    scores = [difficulty.get(pid) for pid in schedule['modes'][mode]]
+    rated = [s for s in scores if s is not None]
+    if not rated:
+        return None
+    weekdays = defaultdict(list)
+    weeks = defaultdict(list)
+    run = longest = 0
+    run_end = None
+    for i, score in enumerate(scores):
+        day = start + timedelta(days=i)
+        if score is not None:
+            weekdays[day.strftime('%a')].append(score)
+            weeks[day - timedelta(days=day.weekday())].append(score)
+        run = run + 1 if score is not None and score >= hard else 0
+        if run > longest:
+            longest, run_end = run, day
+    full_weeks = {w: v for w, v in weeks.items() if len(v) == 7} or weeks
+    hardest_week = max(full_weeks, key=lambda w: sum(full_weeks[w]) / len(full_weeks[w]))
+    return {
+        'mean': round(sum(rated) / len(rated), 2),
+        'by_weekday': {d: round(sum(v) / len(v), 2) for d, v in weekdays.items()},
+        'hardest_week': {'from': hardest_week.isoformat(),
+                         'mean': round(sum(full_weeks[hardest_week]) / len(full_weeks[hardest_week]), 2)},
+        'longest_hard_run': {'days': longest,
+                             'ending': run_end.isoformat() if run_end else None},
+    }
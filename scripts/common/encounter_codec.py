@@ -0,0 +1,185 @@
+"""Interned, integer-coded encounters for pokemon_data.json.
+
+Each encounter in `location_area_encounters` / `preevolution_location_area_encounters`
+repeats the same location, region, game, method, level range and chance
+strings thousands of times. `encode_dataset` moves those strings into shared
+tables and stores every encounter as a row of integer codes:
+
+    {
+      "format": "pokedle-encounters/1",
+      "fields": ["name", "region", "generation", "games", "method", "level_range", "chance"],
+      "tables": {
+        "location": ["Cerulean City", ...],
+        "region": ["Kanto", ...],
+        "game": ["yellow", "red", ...],
+        "game_set": [[0], [1, 2], ...],        # ordered game lists, as codes into "game"
+        "method": ["gift", ...],
+        "level_range": ["10", ...],
+        "chance": ["One", ...]
+      },
+      "pokemon": [
+        {"id": "1", ..., "location_area_encounters": [[0, 0, 1, 0, 0, 0, 0], ...]}
+      ]
+    }
+
+Rows list the codes in `fields` order; `generation` is stored as-is (null when
+the entry had no generation key). Entries that don't fit the row schema (other
+keys, key order or value types) are kept as plain dicts, so `decode_dataset`
+always reproduces the input exactly.
+
+Scripts read either form through `load_pokemon_data(path)`. Decoded entries
+share one string object per distinct value, which keeps load-time memory down
+compared with `json.load` on the expanded file.
+"""
+
+import json
+
+
+FORMAT = 'pokedle-encounters/1'
+ENCOUNTER_LISTS = ('location_area_encounters', 'preevolution_location_area_encounters')
+FIELDS = ('name', 'region', 'generation', 'games', 'method', 'level_range', 'chance')
+FIELDS_NO_GENERATION = tuple(f for f in FIELDS if f != 'generation')
+# field -> string table it is coded against
+STRING_FIELDS = {
+    'name': 'location',
+    'region': 'region',
+    'method': 'method',
+    'level_range': 'level_range',
+    'chance': 'chance',
+}
+TABLES = ('location', 'region', 'game', 'game_set', 'method', 'level_range', 'chance')
+
+
+class StringTable:
+    """Intern values to dense integer codes (first-seen order)."""
+
+    def __init__(self, values=()):
+        self.values = []
+        self.index = {}
+        for v in values:
+            self.code(v)
+
+    def code(self, value):
+        c = self.index.get(value)
+        if c is None:
+            c = len(self.values)
+            self.index[value] = c
+            self.values.append(value)
+        return c
+
+    def get(self, value, default=-1):
+        return self.index.get(value, default)
+
+    def __getitem__(self, code):
+        return self.values[code]
+
+    def __len__(self):
+        return len(self.values)
+
+
+def _encodable(enc):
+    """Return True if an encounter dict fits the row schema exactly."""
+    if not isinstance(enc, dict):
+        return False
+    keys = tuple(enc.keys())
+    if keys == FIELDS:
+        gen = enc['generation']
+        if not isinstance(gen, int) or isinstance(gen, bool):
+            return False
+    elif keys != FIELDS_NO_GENERATION:
+        return False
+    if not all(isinstance(enc[f], str) for f in STRING_FIELDS):
+        return False
+    games = enc['games']
+    return isinstance(games, list) and all(isinstance(g, str) for g in games)
+
+
+def encode_encounter(enc, tables):
+    if not _encodable(enc):
+        return enc
+    games = tuple(tables['game'].code(g) for g in enc['games'])
+    return [
+        tables['location'].code(enc['name']),
+        tables['region'].code(enc['region']),
+        enc.get('generation'),
+        tables['game_set'].code(games),
+        tables['method'].code(enc['method']),
+        tables['level_range'].code(enc['level_range']),
+        tables['chance'].code(enc['chance']),
+    ]
+
+
+def encode_dataset(data):
+    """Encode a list of Pokemon dicts into the compact document."""
+    tables = {name: StringTable() for name in TABLES}
+    pokemon = []
+    for p in data:
+        out = dict(p)
+        for key in ENCOUNTER_LISTS:
+            encs = p.get(key)
+            if isinstance(encs, list):
+                out[key] = [encode_encounter(e, tables) for e in encs]
+        pokemon.append(out)
+    table_values = {name: t.values for name, t in tables.items()}
+    table_values['game_set'] = [list(gs) for gs in table_values['game_set']]
+    return {'format': FORMAT, 'fields': list(FIELDS), 'tables': table_values, 'pokemon': pokemon}
+
+
+def is_encoded(doc):
+    return isinstance(doc, dict) and doc.get('format') == FORMAT
+
+
+class Decoder:
+    """Decode rows against a document's tables (strings are shared, not copied)."""
+
+    def __init__(self, tables):
+        self.location = tables['location']
+        self.region = tables['region']
+        games = tables['game']
+        self.game_set = [tuple(games[c] for c in gs) for gs in tables['game_set']]
+        self.method = tables['method']
+        self.level_range = tables['level_range']
+        self.chance = tables['chance']
+
+    def encounter(self, row):
+        if not isinstance(row, list):
+            return row
+        loc, region, gen, games, method, level_range, chance = row
+        enc = {'name': self.location[loc], 'region': self.region[region]}
+        if gen is not None:
+            enc['generation'] = gen
+        enc['games'] = list(self.game_set[games])
+        enc['method'] = self.method[method]
+        enc['level_range'] = self.level_range[level_range]
+        enc['chance'] = self.chance[chance]
+        return enc
+
+    def pokemon(self, p):
+        out = dict(p)
+        for key in ENCOUNTER_LISTS:
+            rows = p.get(key)
+            if isinstance(rows, list):
+                out[key] = [self.encounter(r) for r in rows]
+        return out
+
+
+def decode_dataset(doc):
+    """Decode a compact document back to the list-of-Pokemon form."""
+    if not is_encoded(doc):
+        return doc
+    if tuple(doc.get('fields') or ()) != FIELDS:
+        raise ValueError(f"Unsupported encounter fields: {doc.get('fields')}")
+    decoder = Decoder(doc['tables'])
+    return [decoder.pokemon(p) for p in doc['pokemon']]
+
+
+def load_pokemon_data(path):
+    """Load pokemon_data.json in either the expanded or the compact encoded form."""
+    with open(path, 'r', encoding='utf-8') as f:
+        doc = json.load(f)
+    return decode_dataset(doc)
+
+
+def dump_compact(doc, fh):
+    """Write an encoded document with minimal whitespace."""
+    json.dump(doc, fh, ensure_ascii=False, separators=(',', ':'))
@@ -0,0 +1,236 @@
+"""Normalized, columnar encounter table built from pokemon_data.json.
+
+Encounters are nested per Pokemon as `location_area_encounters` and
+`preevolution_location_area_encounters` lists of dicts. `EncounterTable`
+flattens both into one row per encounter, held as NumPy columns with interned
+string codes, so analysis questions become vectorized filters instead of
+nested loops:
+
+    table = EncounterTable.from_pokemon_data(data)       # or EncounterTable.load(path)
+    table.pokemon_by_method()                            # {'grass': ['Bulbasaur', ...], ...}
+    table.locations_by_game('crystal')                   # ['Route 29', ...]
+    table.select(method='surfing', generation=2)         # boolean row mask
+
+Columns (one entry per encounter row):
+    pokemon      index into `pokemon_ids` / `pokemon_names`
+    source       0 = location_area_encounters, 1 = preevolution_location_area_encounters
+    position     index of the entry within its source list
+    location     code into tables['location']
+    region       code into tables['region']
+    generation   int (-1 when missing)
+    method       code into tables['method'] (the raw method string)
+    level_range  code into tables['level_range']
+    chance       code into tables['chance']
+    games        bitmask over tables['game']
+    method_tokens bitmask over tables['method_token'] (comma-split, stripped methods)
+
+`save` writes a single .npz (columns plus a JSON header with the string tables).
+Build it with `scripts/pokemon_data_scripts/build_encounter_table.py`.
+"""
+
+import json
+
+import numpy as np
+
+from common.encounter_codec import StringTable, load_pokemon_data
+
+
+ENCOUNTER_LISTS = ('location_area_encounters', 'preevolution_location_area_encounters')
+SOURCE_OWN = 0
+SOURCE_PREEVOLUTION = 1
+
+
+def split_methods(method):
+    """Split a comma-separated method string into stripped tokens."""
+    return [m.strip() for m in (method or '').split(',')]
+
+
+def _mask_dtype(n):
+    if n <= 32:
+        return np.uint32
+    if n <= 64:
+        return np.uint64
+    raise ValueError(f'Too many distinct values for a bitmask column: {n}')
+
+
+class EncounterTable:
+    COLUMNS = ('pokemon', 'source', 'position', 'location', 'region', 'generation',
+               'method', 'level_range', 'chance', 'games', 'method_tokens')
+    TABLES = ('location', 'region', 'method', 'level_range', 'chance', 'game', 'method_token')
+
+    def __init__(self, columns, tables, pokemon_ids, pokemon_names):
+        self.columns = columns
+        self.tables = tables
+        self.pokemon_ids = list(pokemon_ids)
+        self.pokemon_names = list(pokemon_names)
+        self._lookup = {name: {v: i for i, v in enumerate(values)} for name, values in tables.items()}
+
+    def __len__(self):
+        return len(self.columns['pokemon'])
+
+    def __getattr__(self, name):
+        columns = self.__dict__.get('columns')
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    # ------------------------------------------------------------------ build
+
+    @classmethod
+    def from_pokemon_data(cls, data):
+        tables = {name: StringTable() for name in cls.TABLES}
+        rows = {name: [] for name in cls.COLUMNS}
+        pokemon_ids = []
+        pokemon_names = []
+        for p_idx, p in enumerate(data):
+            pokemon_ids.append(str(p.get('id', '')))
+            pokemon_names.append(p.get('name', 'Unknown'))
+            for source, key in enumerate(ENCOUNTER_LISTS):
+                for pos, enc in enumerate(p.get(key) or []):
+                    if not isinstance(enc, dict):
+                        enc = {'name': str(enc)}
+                    games_mask = 0
+                    for g in enc.get('games') or []:
+                        games_mask |= 1 << tables['game'].code(g)
+                    token_mask = 0
+                    for t in split_methods(enc.get('method', 'Unknown')):
+                        token_mask |= 1 << tables['method_token'].code(t)
+                    gen = enc.get('generation')
+                    rows['pokemon'].append(p_idx)
+                    rows['source'].append(source)
+                    rows['position'].append(pos)
+                    rows['location'].append(tables['location'].code(enc.get('name') or ''))
+                    rows['region'].append(tables['region'].code(enc.get('region') or ''))
+                    rows['generation'].append(int(gen) if gen is not None and str(gen).lstrip('-').isdigit() else -1)
+                    rows['method'].append(tables['method'].code(enc.get('method', 'Unknown')))
+                    rows['level_range'].append(tables['level_range'].code(str(enc.get('level_range') or '')))
+                    rows['chance'].append(tables['chance'].code(str(enc.get('chance') or '')))
+                    rows['games'].append(games_mask)
+                    rows['method_tokens'].append(token_mask)
+
+        dtypes = {
+            'pokemon': np.int32, 'source': np.int8, 'position': np.int16,
+            'location': np.int32, 'region': np.int16, 'generation': np.int8,
+            'method': np.int16, 'level_range': np.int32, 'chance': np.int32,
+            'games': _mask_dtype(len(tables['game'])),
+            'method_tokens': _mask_dtype(len(tables['method_token'])),
+        }
+        columns = {name: np.asarray(rows[name], dtype=dtypes[name]) for name in cls.COLUMNS}
+        return cls(columns, {k: t.values for k, t in tables.items()}, pokemon_ids, pokemon_names)
+
+    @classmethod
+    def from_json(cls, path):
+        """Build from pokemon_data.json (expanded or encoded form)."""
+        return cls.from_pokemon_data(load_pokemon_data(path))
+
+    # ------------------------------------------------------------- persistence
+
+    def save(self, path):
+        header = {
+            'tables': self.tables,
+            'pokemon_ids': self.pokemon_ids,
+            'pokemon_names': self.pokemon_names,
+        }
+        np.savez_compressed(path, header=np.frombuffer(json.dumps(header).encode('utf-8'), dtype=np.uint8),
+                            **self.columns)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as npz:
+            header = json.loads(npz['header'].tobytes().decode('utf-8'))
+            columns = {name: npz[name] for name in cls.COLUMNS}
+        return cls(columns, header['tables'], header['pokemon_ids'], header['pokemon_names'])
+
+    # ----------------------------------------------------------------- queries
+
+    def code(self, table, value):
+        """Return the code of value in a string table, or -1 when absent."""
+        return self._lookup[table].get(value, -1)
+
+    def bit(self, table, value):
+        c = self.code(table, value)
+        dtype = self.columns['games' if table == 'game' else 'method_tokens'].dtype
+        return dtype.type(0) if c < 0 else dtype.type(1) << dtype.type(c)
+
+    def select(self, source=SOURCE_OWN, location=None, region=None, generation=None,
+               method=None, method_token=None, game=None, pokemon=None):
+        """Return a boolean row mask for the given filters (None = any).
+
+        source may be 0 (own encounters), 1 (pre-evolution) or None for both.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if source is not None:
+            mask &= self.columns['source'] == source
+        if location is not None:
+            mask &= self.columns['location'] == self.code('location', location)
+        if region is not None:
+            mask &= self.columns['region'] == self.code('region', region)
+        if generation is not None:
+            mask &= self.columns['generation'] == int(generation)
+        if method is not None:
+            mask &= self.columns['method'] == self.code('method', method)
+        if method_token is not None:
+            mask &= (self.columns['method_tokens'] & self.bit('method_token', method_token)) != 0
+        if game is not None:
+            mask &= (self.columns['games'] & self.bit('game', game)) != 0
+        if pokemon is not None:
+            try:
+                p_idx = self.pokemon_names.index(pokemon)
+            except ValueError:
+                p_idx = -1
+            mask &= self.columns['pokemon'] == p_idx
+        return mask
+
+    def names_for(self, pokemon_indices):
+        return sorted({self.pokemon_names[i] for i in np.unique(pokemon_indices).tolist()})
+
+    def pokemon_by_method(self, source=SOURCE_OWN):
+        """{method token: sorted unique Pokemon names}, keys sorted."""
+        base = self.select(source=source)
+        tokens = self.columns['method_tokens'][base]
+        pokemon = self.columns['pokemon'][base]
+        out = {}
+        for code, token in enumerate(self.tables['method_token']):
+            bit = tokens.dtype.type(1) << tokens.dtype.type(code)
+            hit = pokemon[(tokens & bit) != 0]
+            if hit.size:
+                out[token] = self.names_for(hit)
+        return {k: out[k] for k in sorted(out)}
+
+    def unique_locations(self, mask=None, first_seen=True):
+        """Location names for rows in mask; first-seen row order, or sorted if first_seen is False."""
+        codes = self.columns['location'] if mask is None else self.columns['location'][mask]
+        if codes.size == 0:
+            return []
+        uniq, first = np.unique(codes, return_index=True)
+        if first_seen:
+            uniq = uniq[np.argsort(first, kind='stable')]
+        names = [self.tables['location'][c] for c in uniq.tolist()]
+        names = [n for n in names if n]
+        return names if first_seen else sorted(names)
+
+    def locations_by_game(self, game, source=SOURCE_OWN):
+        return self.unique_locations(self.select(source=source, game=game), first_seen=False)
+
+    def pokemon_at_location(self, location, source=SOURCE_OWN):
+        return self.names_for(self.columns['pokemon'][self.select(source=source, location=location)])
+
+    def methods_for_pokemon(self, name, source=SOURCE_OWN):
+        tokens = self.columns['method_tokens'][self.select(source=source, pokemon=name)]
+        combined = int(np.bitwise_or.reduce(tokens)) if tokens.size else 0
+        return sorted(t for i, t in enumerate(self.tables['method_token']) if combined >> i & 1)
+
+    def counts_by(self, column, mask=None):
+        """{value: row count} for an interned column ('location', 'region', 'method', ...)."""
+        codes = self.columns[column] if mask is None else self.columns[column][mask]
+        uniq, counts = np.unique(codes, return_counts=True)
+        if column == 'generation':
+            return {int(u): int(c) for u, c in zip(uniq, counts)}
+        return {self.tables[column][int(u)]: int(c) for u, c in zip(uniq, counts)}
+
+
+def load_table(input_json=None, table_path=None):
+    """Load a prebuilt table from table_path, or build one from input_json."""
+    if table_path:
+        return EncounterTable.load(table_path)
+    return EncounterTable.from_json(input_json)
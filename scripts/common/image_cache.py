@@ -0,0 +1,244 @@
+"""Decoded-pixel cache shared by the image scripts.
+
+Most image scripts start by decoding the same sprites and artwork from
+PNG/WebP/JPEG. This cache keeps each decoded image as an RGBA array in a `.npy`
+file named after the source file's sha256, and hands it back memory-mapped,
+so a second script (or a rerun) skips the decode and the pages are shared
+between processes:
+
+    im = open_rgba(path)          # read-only RGBA PIL image over the cached pixels
+    arr = rgba_array(path)        # read-only (height, width, 4) uint8 array
+
+On a miss the file is decoded with Pillow, converted to RGBA and stored. The
+images come back read-only without copying the pixels: Pillow copies an image
+the first time it is drawn on or pasted into, and np.array(arr) gives a
+writable copy of an array.
+
+Entries live at `<root>/<sha256[:2]>/<sha256>.npy` (writes go through a temp
+file and a rename, so worker processes can share a cache). A hit bumps the
+entry's mtime, and once a process has added more than the byte budget allows,
+the least recently used entries are deleted until the cache is at 90% of it.
+
+The default cache used by open_rgba / rgba_array is configured from the
+environment:
+
+    IMAGE_CACHE_DIR      cache directory (default scripts/data/image_cache)
+    IMAGE_CACHE_MAX_MB   byte budget in MB (default 2048)
+    IMAGE_CACHE=0        decode every time, without the cache
+
+Without NumPy there is no cache and open_rgba just decodes.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+
+from PIL import Image
+
+from common import instrument
+from common.atomic_output import file_digest, replace_atomic
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'image_cache')
+DEFAULT_MAX_MB = 2048
+
+ENV_ROOT = 'IMAGE_CACHE_DIR'
+ENV_MAX_MB = 'IMAGE_CACHE_MAX_MB'
+ENV_ENABLED = 'IMAGE_CACHE'
+
+
+def decode_rgba(path):
+    """Decode path with Pillow into a loaded RGBA image (the file is closed)."""
+    with Image.open(path) as im:
+        im.load()
+        rgba = im if im.mode == 'RGBA' else im.convert('RGBA')
+    instrument.count('images_decoded')
+    return rgba
+
+
+def array_image(arr):
+    """Read-only RGBA image sharing arr's memory."""
+    height, width = arr.shape[:2]
+    return Image.frombuffer('RGBA', (width, height), arr, 'raw', 'RGBA', 0, 1)
+
+
+class ImageCache:
+    """sha256-keyed store of decoded RGBA arrays with LRU eviction by total bytes."""
+
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_MB << 20):
+        if np is None:
+            raise ImportError('ImageCache needs NumPy')
+        self.root = root or DEFAULT_ROOT
+        self.max_bytes = max_bytes
+        self._digests = {}  # (path, size, mtime_ns) -> sha256, so a file is hashed once per process
+        self._total = None  # bytes in the cache, counted on the first store
+        self._lock = threading.Lock()
+        self._warned = False
+
+    @classmethod
+    def from_env(cls, root=None, max_bytes=None):
+        """Cache configured from IMAGE_CACHE_DIR / IMAGE_CACHE_MAX_MB; explicit arguments win."""
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get(ENV_MAX_MB) or DEFAULT_MAX_MB) * (1 << 20))
+        return cls(root=root or os.environ.get(ENV_ROOT) or None, max_bytes=max_bytes)
+
+    def digest(self, path):
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = self._digests[key] = file_digest(path)
+        return digest
+
+    def path_for(self, digest):
+        return os.path.join(self.root, digest[:2], digest + '.npy')
+
+    def _load(self, entry):
+        try:
+            arr = np.load(entry, mmap_mode='r', allow_pickle=False)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # Truncated or foreign file: drop it and decode again
+            self._remove(entry)
+            return None
+        if arr.dtype != np.uint8 or arr.ndim != 3 or arr.shape[2] != 4:
+            self._remove(entry)
+            return None
+        try:
+            os.utime(entry)  # LRU order is mtime order
+        except OSError:
+            pass
+        return arr
+
+    def array(self, path, digest=None):
+        """Read-only (height, width, 4) uint8 pixels of path; digest is its sha256 if already known."""
+        entry = self.path_for(digest or self.digest(path))
+        arr = self._load(entry)
+        if arr is not None:
+            instrument.count('image_cache_hits')
+            return arr
+        instrument.count('image_cache_misses')
+        arr = np.asarray(decode_rgba(path))
+        self._store(entry, arr)
+        return arr
+
+    def image(self, path, digest=None):
+        """Read-only RGBA PIL image of path (see array)."""
+        return array_image(self.array(path, digest))
+
+    def _store(self, entry, arr):
+        folder = os.path.dirname(entry)
+        try:
+            os.makedirs(folder, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix='.', suffix='.tmp', dir=folder)
+            try:
+                with os.fdopen(fd, 'wb') as fh:
+                    np.save(fh, arr, allow_pickle=False)
+                replace_atomic(tmp, entry, fsync=False)
+            except BaseException:
+                self._remove(tmp)
+                raise
+        except OSError as e:
+            if not self._warned:
+                self._warned = True
+                print(f'Image cache at {self.root} is not writable ({e}); decoding without it', file=sys.stderr)
+            return
+        with self._lock:
+            if self._total is None:
+                self._total = self.usage()[1]
+            else:
+                self._total += os.path.getsize(entry)
+            over = self._total > self.max_bytes
+        if over:
+            self.evict()
+
+    def _remove(self, path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass  # gone already, or still mapped on Windows
+
+    def _entries(self):
+        """[(mtime, size, path)] of every cached array."""
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        for sub in os.scandir(self.root):
+            if not sub.is_dir():
+                continue
+            for f in os.scandir(sub.path):
+                if f.name.endswith('.npy'):
+                    try:
+                        st = f.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_mtime_ns, st.st_size, f.path))
+        return entries
+
+    def usage(self):
+        """(entries, bytes) currently in the cache."""
+        entries = self._entries()
+        return len(entries), sum(size for _, size, _ in entries)
+
+    def evict(self, max_bytes=None):
+        """Delete least recently used entries down to 90% of max_bytes. Returns (files, bytes) removed."""
+        limit = (self.max_bytes if max_bytes is None else max_bytes) * 0.9
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = freed = 0
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+            freed += size
+        with self._lock:
+            self._total = total
+        instrument.count('image_cache_evicted', removed)
+        return removed, freed
+
+    def clear(self):
+        return self.evict(max_bytes=0)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide default cache
+# ---------------------------------------------------------------------------
+
+_default = None
+_default_ready = False
+
+
+def default_cache():
+    """The environment-configured cache, or None when disabled or NumPy is missing."""
+    global _default, _default_ready
+    if not _default_ready:
+        _default_ready = True
+        disabled = os.environ.get(ENV_ENABLED, '').strip().lower() in ('0', 'false', 'no', 'off')
+        if np is not None and not disabled:
+            _default = ImageCache.from_env()
+    return _default
+
+
+def open_rgba(path, digest=None):
+    """RGBA image of path, through the default cache when there is one."""
+    cache = default_cache()
+    if cache is None:
+        return decode_rgba(path)
+    return cache.image(path, digest)
+
+
+def rgba_array(path, digest=None):
+    """(height, width, 4) uint8 pixels of path, through the default cache when there is one."""
+    cache = default_cache()
+    if cache is None:
+        return np.asarray(decode_rgba(path))
+    return cache.array(path, digest)
@@ -0,0 +1,254 @@
+"""Per-stage timing, counters and optional profiling for the long-running scripts.
+
+    parser = argparse.ArgumentParser(...)
+    instrument.add_arguments(parser)          # --trace, --profile, --profile-out
+    args = parser.parse_args()
+    instrument.setup(args)
+
+    with instrument.span('load'):
+        data = load(...)
+    for fname in files:
+        with instrument.span('image', item=fname):
+            instrument.count('images_decoded')
+            ...
+
+Spans nest: a span's path is its name under its parents' ('page/section/fetch'),
+and the summary aggregates every span with the same path (count, total, mean,
+max). count() adds to a run-wide counter and to the innermost open span, and
+a finished span passes its counts up to its parent, so each span reports what
+happened inside it.
+
+Nothing is written unless asked: with --trace PATH every finished span becomes
+one JSON line ({"type": "span", "path", "item", "start", "duration",
+"counts", "error"}), between a "run" header and a closing "summary" line.
+--profile cprofile|pyinstrument profiles the whole run and saves the result to
+--profile-out. The summary table prints when the script exits.
+
+The module-level span() / count() go to the tracer installed by setup() (an
+unconfigured one before that), so helpers deep in a script can record
+counters without having a tracer passed in.
+"""
+
+import atexit
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+
+class Tracer:
+    """Records nested timed spans and counters; see the module docstring."""
+
+    def __init__(self, trace_path=None, profile=None, profile_out=None, summary=True, name=None):
+        self.name = name or os.path.basename(sys.argv[0] or 'script')
+        self.summary = summary
+        self.counters = Counter()
+        self.stats = defaultdict(lambda: [0, 0.0, 0.0, 0])  # path -> [count, total, max, errors]
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._t0 = time.perf_counter()
+        self._closed = False
+        self._trace = None
+        if trace_path:
+            folder = os.path.dirname(trace_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self._trace = open(trace_path, 'w', encoding='utf-8')
+            self._emit({'type': 'run', 'script': self.name, 'argv': sys.argv[1:],
+                        'started': time.strftime('%Y-%m-%dT%H:%M:%S')})
+        self.profile_out = profile_out
+        self._profiler = None
+        self._profile_kind = None
+        if profile:
+            self._start_profiler(profile)
+
+    # -- spans and counters --------------------------------------------------
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name, item=None, **attrs):
+        stack = self._stack()
+        path = f"{stack[-1]['path']}/{name}" if stack else name
+        frame = {'path': path, 'counts': Counter()}
+        stack.append(frame)
+        start = time.perf_counter()
+        error = None
+        try:
+            yield frame
+        except BaseException as e:
+            error = f'{type(e).__name__}: {e}'
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1]['counts'].update(frame['counts'])
+            with self._lock:
+                entry = self.stats[path]
+                entry[0] += 1
+                entry[1] += duration
+                entry[2] = max(entry[2], duration)
+                entry[3] += error is not None
+            if self._trace:
+                record = {'type': 'span', 'path': path, 'start': round(start - self._t0, 6),
+                          'duration': round(duration, 6)}
+                if item is not None:
+                    record['item'] = str(item)
+                if attrs:
+                    record['attrs'] = attrs
+                if frame['counts']:
+                    record['counts'] = dict(frame['counts'])
+                if error:
+                    record['error'] = error
+                self._emit(record)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+        stack = self._stack()
+        if stack:
+            stack[-1]['counts'][name] += n
+
+    def _emit(self, record):
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._trace.write(line + '\n')
+
+    # -- profiling -----------------------------------------------------------
+
+    def _start_profiler(self, kind):
+        if kind == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                print('pyinstrument is not installed; profiling with cProfile instead', file=sys.stderr)
+                kind = 'cprofile'
+            else:
+                self._profiler = Profiler()
+        self._profile_kind = kind
+        if kind == 'pyinstrument':
+            self._profiler.start()
+        else:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def _stop_profiler(self):
+        stem = os.path.splitext(self.name)[0]
+        if self._profile_kind == 'pyinstrument':
+            self._profiler.stop()
+            out = self.profile_out or f'{stem}.profile.html'
+            with open(out, 'w', encoding='utf-8') as fh:
+                fh.write(self._profiler.output_html())
+            print(self._profiler.output_text(unicode=True, color=False)[:4000])
+        else:
+            self._profiler.disable()
+            out = self.profile_out or f'{stem}.prof'
+            self._profiler.dump_stats(out)
+            buf = io.StringIO()
+            pstats.Stats(self._profiler, stream=buf).sort_stats('cumulative').print_stats(15)
+            print(buf.getvalue().rstrip())
+        print(f'Profile written to {out}')
+
+    # -- summary -------------------------------------------------------------
+
+    def summary_lines(self):
+        wall = time.perf_counter() - self._t0
+        lines = [f'Timings for {self.name} (wall {format_seconds(wall)})']
+        if self.stats:
+            width = max(len('stage'), *(len(p) for p in self.stats)) + 2
+            failures = any(e for *_, e in self.stats.values())
+            lines.append(f"{'stage':<{width}}{'count':>8}{'total':>11}{'mean':>11}{'max':>11}"
+                         + (f"{'errors':>8}" if failures else ''))
+            for path in sorted(self.stats):
+                n, total, longest, errors = self.stats[path]
+                lines.append(f'{path:<{width}}{n:>8}{format_seconds(total):>11}'
+                             f'{format_seconds(total / n):>11}{format_seconds(longest):>11}'
+                             + (f'{errors:>8}' if failures else ''))
+        if self.counters:
+            lines.append('Counters: ' + ', '.join(
+                f'{name}={format_count(name, value)}' for name, value in sorted(self.counters.items())))
+        return lines
+
+    def close(self):
+        """Stop profiling, write the trace summary and print the table (once)."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._profiler is not None:
+            self._stop_profiler()
+        if self._trace:
+            self._emit({'type': 'summary', 'wall': round(time.perf_counter() - self._t0, 6),
+                        'spans': {p: {'count': n, 'total': round(t, 6), 'max': round(m, 6), 'errors': e}
+                                  for p, (n, t, m, e) in sorted(self.stats.items())},
+                        'counters': dict(self.counters)})
+            self._trace.close()
+        if self.summary and (self.stats or self.counters):
+            print('\n' + '\n'.join(self.summary_lines()))
+
+
+def format_seconds(seconds):
+    if seconds >= 120:
+        return f'{seconds / 60:.1f}m'
+    if seconds >= 1:
+        return f'{seconds:.2f}s'
+    return f'{seconds * 1000:.1f}ms'
+
+
+def format_count(name, value):
+    if name.endswith('bytes') and value >= 1024:
+        for unit in ('KB', 'MB', 'GB'):
+            value /= 1024
+            if value < 1024 or unit == 'GB':
+                return f'{value:.1f}{unit}'
+    return str(value)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide tracer
+# ---------------------------------------------------------------------------
+
+_active = Tracer(summary=False)
+
+
+def add_arguments(parser):
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--trace', metavar='PATH', help='Write every timed span as JSON lines to PATH')
+    group.add_argument('--profile', choices=('cprofile', 'pyinstrument'), help='Profile the whole run')
+    group.add_argument('--profile-out', metavar='PATH',
+                       help='Where to save the profile (default <script>.prof / <script>.profile.html)')
+    return group
+
+
+def setup(args=None, trace=None, profile=None, profile_out=None, summary=True):
+    """Install a tracer for this run (options from add_arguments' args) and close it at exit."""
+    global _active
+    if args is not None:
+        trace = trace or getattr(args, 'trace', None)
+        profile = profile or getattr(args, 'profile', None)
+        profile_out = profile_out or getattr(args, 'profile_out', None)
+    _active = Tracer(trace_path=trace, profile=profile, profile_out=profile_out, summary=summary)
+    atexit.register(_active.close)
+    return _active
+
+
+def tracer():
+    return _active
+
+
+def span(name, item=None, **attrs):
+    return _active.span(name, item=item, **attrs)
+
+
+def count(name, n=1):
+    _active.count(name, n)
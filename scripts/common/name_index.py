@@ -0,0 +1,202 @@
+"""Compact prefix / trigram search index over Pokemon names.
+
+The guess inputs filter every name with startsWith on each keystroke. This
+index answers the same question with a binary search over sorted keys:
+
+  keys      every normalised spelling of every name (names.search_keys),
+            sorted and front-coded: each record is one character giving the
+            length shared with the previous key (chr(48 + n)), then the rest
+            of the key, then '\\n'. Every BLOCK records the coding restarts
+            (shared length 0) and `offsets` gives each restart's position in
+            the string, so a lookup binary-searches the restarts and decodes
+            at most a block or two.
+  postings  the entry (index into `ids`, i.e. pokemon_data.json order) for
+            each key, in key order.
+  trigrams  trigram -> entries containing it, as gaps between increasing
+            entry numbers, for substring search when a prefix finds nothing.
+            trigrams_complete is false once common trigrams were dropped.
+
+`build_index` returns the JSON document and shrinks it to fit a byte budget
+(dropping the most common trigrams, then all trigrams, then the spaceless
+key variants). `NameIndex` is the reference lookup the client mirrors:
+
+    index = NameIndex(build_index(pokemon))
+    index.prefix('mr. m')       # entries whose name starts that way, data order
+    index.search('chu')         # prefix, falling back to substring
+"""
+
+import bisect
+import json
+
+from common.names import normalize_query, search_keys
+
+
+BLOCK = 16
+MAX_SHARED = 78  # shared length must fit one character from '0'
+
+
+def _shared(a, b):
+    n = min(len(a), len(b), MAX_SHARED)
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def front_code(keys, block=BLOCK):
+    """(front-coded string, restart offsets) for sorted keys."""
+    parts, offsets = [], []
+    pos = 0
+    prev = ''
+    for i, key in enumerate(keys):
+        if i % block == 0:
+            offsets.append(pos)
+            shared = 0
+        else:
+            shared = _shared(prev, key)
+        record = chr(48 + shared) + key[shared:] + '\n'
+        parts.append(record)
+        pos += len(record)
+        prev = key
+    return ''.join(parts), offsets
+
+
+def trigrams(key):
+    padded = f' {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _index_doc(pokemon, variants, grams, complete, block):
+    entries = []
+    for n, p in enumerate(pokemon):
+        keys = search_keys(p['name'])
+        for key in (keys if variants else keys[:1]):
+            entries.append((key, n))
+    entries.sort()
+    keys, offsets = front_code([k for k, _ in entries], block)
+    doc = {
+        'version': 1,
+        'block': block,
+        'ids': [p['id'] for p in pokemon],
+        'keys': keys,
+        'offsets': offsets,
+        'postings': [n for _, n in entries],
+    }
+    if grams is not None:
+        doc['trigrams'] = grams
+        doc['trigrams_complete'] = complete
+    return doc
+
+
+def _trigram_postings(pokemon, max_share=None):
+    postings = {}
+    for n, p in enumerate(pokemon):
+        for gram in trigrams(search_keys(p['name'])[0]):
+            postings.setdefault(gram, []).append(n)
+    limit = len(pokemon) * max_share if max_share else None
+    out = {}
+    for gram in sorted(postings):
+        entries = postings[gram]
+        if limit is not None and len(entries) > limit:
+            continue
+        out[gram] = [entries[0]] + [b - a for a, b in zip(entries, entries[1:])]
+    return out
+
+
+def index_size(doc):
+    return len(json.dumps(doc, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def build_index(pokemon, max_bytes=None, block=BLOCK):
+    """(index document, list of what was dropped to meet max_bytes).
+
+    Raises ValueError if even the smallest form is over budget.
+    """
+    steps = [
+        ('nothing', True, None),
+        ('trigrams in over 5% of names', True, 0.05),
+        ('all trigrams', True, False),
+        ('spaceless variants', False, False),
+    ]
+    dropped = []
+    for label, variants, share in steps:
+        grams = None if share is False else _trigram_postings(pokemon, share)
+        doc = _index_doc(pokemon, variants, grams, not share, block)
+        if label != 'nothing':
+            dropped.append(label)
+        if max_bytes is None or index_size(doc) <= max_bytes:
+            return doc, dropped
+    raise ValueError(f'Name index is {index_size(doc)} bytes even without trigrams, over the {max_bytes} budget')
+
+
+class NameIndex:
+    """Lookups over a build_index document, without decoding it up front."""
+
+    def __init__(self, doc):
+        self.ids = doc['ids']
+        self.keys = doc['keys']
+        self.offsets = doc['offsets']
+        self.block = doc['block']
+        self.postings = doc['postings']
+        self.trigrams = doc.get('trigrams')
+        self.trigrams_complete = doc.get('trigrams_complete', False)
+        self._by_entry = None
+        # First key of each block (restart records hold the whole key)
+        self._firsts = [self.keys[o + 1:self.keys.index('\n', o)] for o in self.offsets]
+
+    def _decode(self, block_no=0):
+        """Yield (key number, key) from the start of block_no to the end."""
+        pos = self.offsets[block_no]
+        n = block_no * self.block
+        prev = ''
+        while pos < len(self.keys):
+            end = self.keys.index('\n', pos)
+            key = prev[:ord(self.keys[pos]) - 48] + self.keys[pos + 1:end]
+            yield n, key
+            prev = key
+            pos = end + 1
+            n += 1
+
+    def prefix(self, query, limit=50):
+        """Entries with a key starting with the normalised query, in data order."""
+        q = normalize_query(query)
+        if not q:
+            return []
+        # The last block starting before q may still hold keys starting with q
+        block_no = max(bisect.bisect_left(self._firsts, q) - 1, 0)
+        found = set()
+        for n, key in self._decode(block_no):
+            if key.startswith(q):
+                found.add(self.postings[n])
+            elif key > q:
+                break
+        return sorted(found)[:limit]
+
+    def substring(self, query, limit=50):
+        """Entries containing the query anywhere (needs trigrams and 3+ characters)."""
+        q = normalize_query(query)
+        if self.trigrams is None or len(q) < 3:
+            return []
+        candidates = None
+        for gram in trigrams(q):
+            if gram[0] == ' ' or gram[-1] == ' ':
+                continue  # the query's ends needn't be word ends
+            if gram not in self.trigrams:
+                if self.trigrams_complete:
+                    return []
+                continue  # dropped as too common; can't narrow anything
+            entries, total = set(), 0
+            for gap in self.trigrams[gram]:
+                total += gap
+                entries.add(total)
+            candidates = entries if candidates is None else candidates & entries
+        if candidates is None:
+            candidates = range(len(self.ids))
+        if self._by_entry is None:
+            self._by_entry = {}
+            for n, key in self._decode():
+                self._by_entry.setdefault(self.postings[n], []).append(key)
+        return sorted(n for n in candidates if any(q in key for key in self._by_entry.get(n, ())))[:limit]
+
+    def search(self, query, limit=50):
+        return self.prefix(query, limit) or self.substring(query, limit)
@@ -0,0 +1,46 @@
+"""Pokemon name normalisation shared by the scrapers and the search index.
+
+    normalize_name("Farfetch'd")  -> 'farfetchd'
+    normalize_name('Nidoran♀')    -> 'nidoranf'
+    normalize_name('Mr. Mime')    -> 'mr mime'
+    search_keys('Mr. Mime')       -> ['mr mime', 'mrmime']
+"""
+
+import re
+import unicodedata
+
+
+def normalize_name(s: str) -> str:
+    """Normalize Pokemon names for lookup: lower, strip apostrophes, replace hyphens with spaces,
+    remove periods, normalize gender symbols (♀/♂ -> f/m), collapse whitespace."""
+    if not s:
+        return ""
+    s = s.lower()
+    s = s.replace("'", "")
+    s = s.replace("-", " ")
+    s = s.replace(".", "")
+    s = s.replace("♀", "f")
+    s = s.replace("♂", "m")
+    # collapse multiple spaces
+    s = re.sub(r"\s+", " ", s)
+    return s.strip()
+
+
+def fold_accents(s: str) -> str:
+    """Drop combining marks: 'flabébé' -> 'flabebe'."""
+    decomposed = unicodedata.normalize("NFKD", s)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def normalize_query(s: str) -> str:
+    """What a typed guess is matched as: normalize_name plus accent folding."""
+    return fold_accents(normalize_name(s))
+
+
+def search_keys(name: str) -> list:
+    """Normalised spellings a name can be found under, most canonical first."""
+    base = normalize_query(name)
+    keys = [base]
+    if " " in base:
+        keys.append(base.replace(" ", ""))
+    return keys
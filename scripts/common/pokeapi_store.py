@@ -0,0 +1,404 @@
+"""Local mirror of PokeAPI responses shared by the enrichment scripts.
+
+Every script reads PokeAPI through a `PokeAPIStore` instead of calling
+requests itself, so each resource is fetched once per mirror rather than once
+per script:
+
+    store = PokeAPIStore()                                   # scripts/data/pokeapi
+    pokemon = store.get('https://pokeapi.co/api/v2/pokemon/25/')
+    species = store.get('pokemon-species/25')                # same resource key style
+    store.close()                                            # writes the index
+
+Resources are keyed by their URL path below /api/v2/ ('pokemon/25',
+'pokemon/25/encounters', 'item/master-ball'), so the host, a trailing slash
+and query-parameter order don't matter. Each response is stored verbatim as
+`<root>/<key>.json`, and `<root>/index.json` records every key's status and
+fetch time. 404s are recorded too, so a missing resource isn't requested again.
+
+Offline mode (offline=True, or POKEAPI_OFFLINE=1) never touches the network
+and raises OfflineMiss for resources that aren't mirrored. `prefetch` fills the
+mirror for an id range, following the links the scripts use (evolution chains,
+abilities, held items, encounter locations), and `serve` exposes the mirror as
+a local HTTP stand-in for https://pokeapi.co/api/v2/. The environment
+variables POKEAPI_MIRROR, POKEAPI_OFFLINE and POKEAPI_BASE_URL (e.g. the
+stand-in's address) configure the default store used by the scripts.
+
+See pokemon_data_scripts/pokeapi_mirror.py for the command-line front end.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from common import instrument
+from common.atomic_output import read_bytes, write_bytes_atomic, write_json
+from common.rate_limit import RateLimiter
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+
+API_BASE = 'https://pokeapi.co/api/v2/'
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'pokeapi')
+INDEX_NAME = 'index.json'
+INDEX_VERSION = 1
+USER_AGENT = 'pokedle-data-scripts/1.0 (+https://github.com/Pythagean/pokedle)'
+
+ENV_ROOT = 'POKEAPI_MIRROR'
+ENV_OFFLINE = 'POKEAPI_OFFLINE'
+ENV_BASE_URL = 'POKEAPI_BASE_URL'
+
+# prefetch groups: per-id resources, then links followed from fetched resources
+ID_RESOURCES = {
+    'pokemon': 'pokemon/{id}',
+    'species': 'pokemon-species/{id}',
+    'encounters': 'pokemon/{id}/encounters',
+}
+LINK_GROUPS = ('chains', 'abilities', 'items', 'locations')
+PREFETCH_GROUPS = tuple(ID_RESOURCES) + LINK_GROUPS
+
+
+class OfflineMiss(LookupError):
+    """An offline store was asked for a resource it doesn't have."""
+
+
+class ResourceNotFound(LookupError):
+    """PokeAPI answered 404 for the resource (now or on an earlier fetch)."""
+
+
+# What a failed store read can raise: requests' exceptions are OSErrors, bad
+# JSON bodies ValueErrors, and 404s / offline misses LookupErrors
+FETCH_ERRORS = (OSError, ValueError, LookupError)
+
+
+def resource_key(url):
+    """Normalise a PokeAPI URL (or a bare 'pokemon/1' path) to its resource key."""
+    parts = urlsplit(str(url).strip())
+    path = parts.path
+    if '/api/v2/' in path:
+        path = path.split('/api/v2/', 1)[1]
+    key = path.strip('/')
+    if parts.query:
+        key += '?' + '&'.join(sorted(parts.query.split('&')))
+    return key
+
+
+def _env_flag(name):
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class PokeAPIStore:
+    """URL-keyed on-disk mirror of PokeAPI responses with fetch-on-miss.
+
+    delay is the minimum time between network requests (shared by all
+    threads); cached reads are never delayed. refresh=True refetches
+    resources even when they are mirrored.
+    """
+
+    def __init__(self, root=None, offline=False, base_url=API_BASE, delay=0.2, retries=3,
+                 timeout=10.0, refresh=False, flush_every=50):
+        self.root = root or DEFAULT_ROOT
+        self.offline = offline
+        self.base_url = base_url.rstrip('/') + '/'
+        self.retries = max(1, retries)
+        self.timeout = timeout
+        self.refresh = refresh
+        self.flush_every = flush_every
+        self.limiter = RateLimiter(delay)
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._dirty = 0
+        self._refreshed = set()
+        self.index = self._load_index()
+
+    @classmethod
+    def from_env(cls, root=None, offline=None, **kwargs):
+        """Store configured from POKEAPI_MIRROR / POKEAPI_OFFLINE / POKEAPI_BASE_URL.
+
+        Explicit arguments win over the environment.
+        """
+        kwargs.setdefault('base_url', os.environ.get(ENV_BASE_URL) or API_BASE)
+        return cls(root=root or os.environ.get(ENV_ROOT) or None,
+                   offline=_env_flag(ENV_OFFLINE) if offline is None else offline, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    # ---------------------------------------------------------------- index
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.root, INDEX_NAME), 'r', encoding='utf-8') as fh:
+                index = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        if index.get('version') != INDEX_VERSION:
+            return {}
+        return index.get('resources', {})
+
+    def flush(self):
+        """Write the index if anything was fetched since the last flush."""
+        with self._lock:
+            if not self._dirty:
+                return
+            resources = dict(sorted(self.index.items()))
+            self._dirty = 0
+        write_json(os.path.join(self.root, INDEX_NAME),
+                   {'version': INDEX_VERSION, 'resources': resources}, verbose=False)
+
+    def close(self):
+        self.flush()
+
+    def _record(self, key, status):
+        with self._lock:
+            self.index[key] = {'status': status, 'fetched': _now()}
+            self._dirty += 1
+            due = self.flush_every and self._dirty >= self.flush_every
+        if due:
+            self.flush()
+
+    # ---------------------------------------------------------------- paths
+
+    def path_for(self, key):
+        # '?' isn't valid in Windows file names
+        return os.path.join(self.root, *key.replace('?', '@').split('/')) + '.json'
+
+    def status(self, url):
+        """200 or 404 for mirrored resources, None when the mirror doesn't know it."""
+        entry = self.index.get(resource_key(url))
+        return entry['status'] if entry else None
+
+    def __contains__(self, url):
+        return self.status(url) == 200
+
+    def __len__(self):
+        return len(self.index)
+
+    # ---------------------------------------------------------------- fetch
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            if requests is None:
+                raise RuntimeError('Fetching from PokeAPI needs the requests package (pip install requests)')
+            session = requests.Session()
+            session.headers.update({'User-Agent': USER_AGENT})
+            self._local.session = session
+        return session
+
+    def _fetch(self, key):
+        """Download key from the API into the mirror; returns the body or None on 404."""
+        url = self.base_url + key.split('?', 1)[0] + '/'
+        if '?' in key:
+            url += '?' + key.split('?', 1)[1]
+        for attempt in range(1, self.retries + 1):
+            self.limiter.wait()
+            try:
+                r = self._session().get(url, timeout=self.timeout)
+                instrument.count('http_calls')
+                instrument.count('http_bytes', len(r.content))
+                if r.status_code == 404:
+                    self.stats['missing'] += 1
+                    self._record(key, 404)
+                    return None
+                r.raise_for_status()
+                body = r.content
+                json.loads(body)
+                break
+            except Exception:
+                if attempt == self.retries:
+                    self.stats['failed'] += 1
+                    raise
+                time.sleep(0.5 * attempt)
+        if self.base_url != API_BASE:
+            # Store canonical links, whichever stand-in the body came from
+            body = body.replace(self.base_url.encode('utf-8'), API_BASE.encode('utf-8'))
+        write_bytes_atomic(self.path_for(key), body, fsync=False)
+        self.stats['fetched'] += 1
+        self._record(key, 200)
+        return body
+
+    def _needs_fetch(self, key):
+        if self.refresh and key not in self._refreshed:
+            return True
+        entry = self.index.get(key)
+        if entry is None:
+            return True
+        return entry['status'] == 200 and not os.path.exists(self.path_for(key))
+
+    def get_bytes(self, url):
+        """Raw JSON body for url, fetching it on a miss.
+
+        Raises ResourceNotFound for 404s and OfflineMiss when offline and the
+        resource isn't mirrored.
+        """
+        key = resource_key(url)
+        if self._needs_fetch(key):
+            if self.offline:
+                self.stats['offline_miss'] += 1
+                raise OfflineMiss(f'{key} is not in the PokeAPI mirror at {self.root} (offline mode)')
+            self._refreshed.add(key)
+            body = self._fetch(key)
+        else:
+            self.stats['cached'] += 1
+            instrument.count('cache_hits')
+            body = None if self.index[key]['status'] == 404 else read_bytes(self.path_for(key))
+        if body is None:
+            raise ResourceNotFound(f'PokeAPI has no resource {key}')
+        return body
+
+    def get(self, url):
+        """Parsed JSON for url (see get_bytes for errors)."""
+        return json.loads(self.get_bytes(url))
+
+    def get_or_none(self, url):
+        """Like get, but None for resources PokeAPI doesn't have."""
+        try:
+            return self.get(url)
+        except ResourceNotFound:
+            return None
+
+    # ------------------------------------------------------------- prefetch
+
+    def _links(self, key, data, groups):
+        """Resource URLs the scripts read after key, limited to the link groups."""
+        parts = key.split('/')
+        links = []
+        if parts[0] == 'pokemon-species' and 'chains' in groups:
+            links.append((data.get('evolution_chain') or {}).get('url'))
+        elif parts[0] == 'pokemon' and len(parts) == 2:
+            if 'abilities' in groups:
+                links += [(a.get('ability') or {}).get('url') for a in data.get('abilities') or []]
+            if 'items' in groups:
+                links += [(h.get('item') or {}).get('url') for h in data.get('held_items') or []]
+        elif parts[0] == 'pokemon' and parts[-1] == 'encounters' and 'locations' in groups:
+            links += [(e.get('location_area') or {}).get('url') for e in data or []]
+        elif parts[0] == 'location-area' and 'locations' in groups:
+            links.append((data.get('location') or {}).get('url'))
+        return [resource_key(u) for u in links if u]
+
+    def _prefetch_one(self, key):
+        try:
+            data = json.loads(self.get_bytes(key))
+        except ResourceNotFound:
+            return key, 'missing', None
+        except OfflineMiss:
+            return key, 'offline_miss', None
+        except Exception as e:
+            return key, f'failed: {e}', None
+        return key, 'ok', data
+
+    def prefetch(self, ids, groups=PREFETCH_GROUPS, workers=4, verbose=True):
+        """Mirror the per-id resources for ids and everything they link to.
+
+        Returns a Counter of outcomes ('ok', 'missing', 'failed', ...).
+        """
+        unknown = set(groups) - set(PREFETCH_GROUPS)
+        if unknown:
+            raise ValueError(f'Unknown prefetch groups: {sorted(unknown)} (expected {PREFETCH_GROUPS})')
+        pending = [tmpl.format(id=i) for i in ids for g, tmpl in ID_RESOURCES.items() if g in groups]
+        # Linked resources need their parent; include parents that weren't asked for
+        if 'chains' in groups and 'species' not in groups:
+            pending += [ID_RESOURCES['species'].format(id=i) for i in ids]
+        if {'abilities', 'items'} & set(groups) and 'pokemon' not in groups:
+            pending += [ID_RESOURCES['pokemon'].format(id=i) for i in ids]
+        if 'locations' in groups and 'encounters' not in groups:
+            pending += [ID_RESOURCES['encounters'].format(id=i) for i in ids]
+
+        outcomes = Counter()
+        seen = set()
+        depth = 0
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            while pending:
+                batch = [k for k in dict.fromkeys(pending) if k not in seen]
+                seen.update(batch)
+                pending = []
+                for n, (key, outcome, data) in enumerate(pool.map(self._prefetch_one, batch), 1):
+                    outcomes[outcome.split(':')[0]] += 1
+                    if outcome != 'ok':
+                        if verbose:
+                            print(f'  {key}: {outcome}')
+                    elif data is not None:
+                        pending += self._links(key, data, groups)
+                    if verbose and (n % 100 == 0 or n == len(batch)):
+                        print(f'  level {depth}: {n}/{len(batch)} resources')
+                depth += 1
+        self.flush()
+        return outcomes
+
+    # ---------------------------------------------------------------- serve
+
+    def serve(self, host='127.0.0.1', port=8765):
+        """Serve the mirror over HTTP as a stand-in for https://pokeapi.co/api/v2/.
+
+        API links inside responses are rewritten to point at the stand-in.
+        Blocks until interrupted.
+        """
+        store = self
+        local_base = f'http://{host}:{port}/api/v2/'.encode('utf-8')
+        api_base = API_BASE.encode('utf-8')
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                try:
+                    body = store.get_bytes(self.path).replace(api_base, local_base)
+                except ResourceNotFound as e:
+                    self.send_error(404, str(e))
+                    return
+                except OfflineMiss as e:
+                    # Not mirrored yet is not "missing on PokeAPI": a 503 keeps
+                    # client stores from recording a permanent 404 for it
+                    self.send_error(503, str(e))
+                    return
+                except Exception as e:
+                    self.send_error(502, str(e))
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, fmt, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        print(f'Serving {len(self.index)} mirrored resources from {self.root} at {local_base.decode()}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.flush()
+
+
+def add_store_arguments(parser):
+    """--mirror / --offline / --refresh options for scripts that read PokeAPI."""
+    parser.add_argument('--mirror', default=None,
+                        help=f'PokeAPI mirror directory (default: ${ENV_ROOT} or {os.path.relpath(DEFAULT_ROOT)})')
+    parser.add_argument('--offline', action='store_true', default=None,
+                        help=f'Only read the PokeAPI mirror, never the network (or set {ENV_OFFLINE}=1)')
+    parser.add_argument('--refresh', action='store_true', help='Refetch PokeAPI resources even when mirrored')
+    return parser
+
+
+def store_from_args(args, **kwargs):
+    return PokeAPIStore.from_env(root=args.mirror, offline=args.offline, refresh=args.refresh, **kwargs)
@@ -0,0 +1,252 @@
+"""Columnar CSV bridge for pokemon_data.json.
+
+`PokemonFrame` holds selected fields as encoded string columns keyed by `id`,
+with one dtype per column (a schema) instead of guessing types cell by cell:
+
+    int    42            float  0.7 (repr, round-trips exactly)
+    bool   true / false  str    the string as-is
+    json   lists, dicts and mixed-type columns as compact JSON
+           (ensure_ascii=False, key order preserved), e.g. ["Grass","Poison"]
+
+A missing field or a null encodes as an empty cell (json columns write null as
+`null`).
+
+Export writes the CSV plus a schema sidecar recording each column's dtype,
+named after the CSV without its extension (output.csv -> output.schema.json). Import joins rows to Pokemon by id and re-encodes the current
+JSON values with the same schema. Only cells whose text differs are decoded
+and written back, so exporting and reimporting an unedited CSV changes
+nothing, and edited cells come back with their column's type. Empty cells
+keep the original value.
+
+    frame = PokemonFrame.from_pokemon(data, ['generation', 'types'])
+    frame.to_csv('out.csv')
+    edited = PokemonFrame.read_csv('out.csv')
+    changes, problems = edited.apply(data)
+"""
+
+import csv
+import json
+import os
+
+from common.atomic_output import write_json
+
+
+KEY = 'id'
+LABEL = 'name'
+DTYPES = ('int', 'float', 'bool', 'str', 'json')
+SCHEMA_SUFFIX = '.schema.json'
+
+_TRUE = {'true', '1', 'yes', 'y'}
+_FALSE = {'false', '0', 'no', 'n'}
+
+
+def _encode_json(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _decode_bool(text):
+    t = text.strip().lower()
+    if t in _TRUE:
+        return True
+    if t in _FALSE:
+        return False
+    raise ValueError(f'not a boolean: {text!r}')
+
+
+ENCODERS = {
+    'int': str,
+    'float': repr,
+    'bool': lambda v: 'true' if v else 'false',
+    'str': str,
+    'json': _encode_json,
+}
+
+DECODERS = {
+    'int': lambda s: int(s.strip()),
+    'float': lambda s: float(s.strip()),
+    'bool': _decode_bool,
+    'str': lambda s: s,
+    'json': json.loads,
+}
+
+
+def infer_dtype(values):
+    """Column dtype for a list of JSON values (None / missing entries are ignored)."""
+    kinds = {type(v) for v in values if v is not None}
+    if not kinds:
+        return 'str'
+    if kinds == {bool}:
+        return 'bool'
+    if kinds == {int}:
+        return 'int'
+    if kinds <= {int, float}:
+        return 'float'
+    if kinds == {str}:
+        return 'str'
+    return 'json'
+
+
+def infer_dtype_from_cells(cells):
+    """Column dtype for a new field that only exists in the CSV."""
+    filled = [c for c in cells if c != '']
+    for dtype in ('int', 'float', 'bool'):
+        try:
+            for c in filled:
+                DECODERS[dtype](c)
+        except ValueError:
+            continue
+        return dtype if filled else 'str'
+    return 'str'
+
+
+def encode_column(values, dtype, present=None):
+    """Encode a column; present[i] False marks a missing field."""
+    encode = ENCODERS[dtype]
+    out = []
+    for i, v in enumerate(values):
+        if present is not None and not present[i]:
+            out.append('')
+        elif v is None:
+            out.append('null' if dtype == 'json' else '')
+        else:
+            out.append(encode(v))
+    return out
+
+
+def schema_path(csv_path):
+    base, _ = os.path.splitext(csv_path)
+    return base + SCHEMA_SUFFIX
+
+
+def _id_key(value):
+    """Join key: ids compare as text, so 1, '1' and '001' -> '1' all match."""
+    text = str(value).strip()
+    return str(int(text)) if text.lstrip('-').isdigit() else text
+
+
+class PokemonFrame:
+    """Encoded string columns for a set of fields, one row per Pokemon."""
+
+    def __init__(self, ids, labels, columns, schema):
+        self.ids = list(ids)
+        self.labels = list(labels)
+        self.columns = columns          # field -> list of encoded cells
+        self.schema = dict(schema)      # field -> dtype
+
+    @property
+    def fields(self):
+        return list(self.columns)
+
+    def __len__(self):
+        return len(self.ids)
+
+    # ------------------------------------------------------------------ build
+
+    @classmethod
+    def from_pokemon(cls, data, fields, schema=None):
+        """Build from a list of Pokemon dicts; rows without id or name are skipped."""
+        rows = [p for p in data if isinstance(p, dict) and KEY in p and LABEL in p]
+        schema = dict(schema or {})
+        columns = {}
+        for field in fields:
+            present = [field in p for p in rows]
+            values = [p.get(field) for p in rows]
+            dtype = schema.setdefault(field, infer_dtype(values))
+            if dtype not in DTYPES:
+                raise ValueError(f'Unknown dtype {dtype!r} for field {field!r}')
+            columns[field] = encode_column(values, dtype, present)
+        return cls([p[KEY] for p in rows], [p[LABEL] for p in rows], columns,
+                   {f: schema[f] for f in fields})
+
+    # ------------------------------------------------------------------- CSV
+
+    def to_csv(self, path, write_schema=True):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow([KEY, LABEL] + self.fields)
+            writer.writerows(zip(self.ids, self.labels, *self.columns.values()))
+        if write_schema:
+            write_json(schema_path(path), {'key': KEY, 'fields': self.schema}, verbose=False)
+
+    @classmethod
+    def read_csv(cls, path, schema=None):
+        """Read a CSV written by to_csv (and possibly edited).
+
+        schema: {field: dtype}; defaults to the sidecar next to the CSV if any.
+        Fields without a dtype are resolved later against the JSON in apply().
+        """
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                raise ValueError('CSV file is empty')
+            if KEY not in header:
+                raise ValueError(f"CSV has no '{KEY}' column")
+            # Spreadsheets may drop trailing empty cells; pad rows to the header width
+            rows = [r + [''] * (len(header) - len(r)) for r in reader if any(c.strip() for c in r)]
+        cols = [list(c) for c in zip(*rows)] if rows else [[] for _ in header]
+        table = dict(zip(header, cols))
+        if schema is None:
+            sidecar = schema_path(path)
+            if os.path.exists(sidecar):
+                with open(sidecar, 'r', encoding='utf-8') as f:
+                    schema = json.load(f).get('fields', {})
+        fields = [h for h in header if h not in (KEY, LABEL)]
+        labels = table.get(LABEL, [''] * len(table[KEY]))
+        return cls(table[KEY], labels, {f: table[f] for f in fields},
+                   {f: schema[f] for f in fields if schema and f in schema})
+
+    # ----------------------------------------------------------------- apply
+
+    def resolve_schema(self, data):
+        """Fill in dtypes missing from the schema, from the JSON column or the CSV cells."""
+        for field, cells in self.columns.items():
+            if field in self.schema:
+                continue
+            values = [p.get(field) for p in data if isinstance(p, dict) and field in p]
+            self.schema[field] = infer_dtype(values) if values else infer_dtype_from_cells(cells)
+
+    def apply(self, data):
+        """Write edited cells back into data (a list of Pokemon dicts), joined by id.
+
+        Returns (changes, problems): changes maps field -> number of Pokemon
+        updated; problems lists warning strings (unknown ids, undecodable cells).
+        """
+        self.resolve_schema(data)
+        index = {}
+        for p in data:
+            if isinstance(p, dict) and KEY in p:
+                index.setdefault(_id_key(p[KEY]), p)
+
+        problems = []
+        targets = []
+        for row, raw_id in enumerate(self.ids):
+            p = index.get(_id_key(raw_id)) if str(raw_id).strip() else None
+            if p is None:
+                problems.append(f'row {row + 2}: Pokemon with id {raw_id!r} not found in JSON')
+            targets.append(p)
+
+        changes = {}
+        for field, cells in self.columns.items():
+            dtype = self.schema[field]
+            decode = DECODERS[dtype]
+            rows = [(t, c) for t, c in zip(targets, cells) if t is not None]
+            # Current values encoded with the same schema; only differing cells are applied
+            current = encode_column([t.get(field) for t, _ in rows], dtype, [field in t for t, _ in rows])
+            n = 0
+            for (pokemon, cell), cur in zip(rows, current):
+                if cell == cur or cell == '':
+                    continue
+                try:
+                    value = decode(cell)
+                except ValueError as e:
+                    problems.append(f"id {pokemon[KEY]} field '{field}' ({dtype}): {e}")
+                    continue
+                # '0.70' for 0.7 etc. is a different spelling, not an edit
+                if field in pokemon and type(pokemon[field]) is type(value) and pokemon[field] == value:
+                    continue
+                pokemon[field] = value
+                n += 1
+            if n:
+                changes[field] = n
+        return changes, problems
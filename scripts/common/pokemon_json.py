@@ -0,0 +1,213 @@
+"""Streaming reader and writer for pokemon_data.json-style arrays.
+
+`iter_pokemon` yields one top-level array entry at a time, reading the file in
+chunks, so a transform only ever holds the entry it is working on (plus the
+current chunk). `PokemonWriter` / `write_pokemon` emit entries one at a time in
+exactly the layout `json.dump(data, f, indent=2, ensure_ascii=False)` produces,
+so a streamed rewrite of an unchanged file is byte-identical:
+
+    entries = iter_pokemon('public/data/pokemon_data.json')
+    entries = (strip(p) for p in entries)
+    write_pokemon('out.json', entries)
+
+Compact encoded files (see `encounter_codec`) are accepted too: the string
+tables are loaded once and entries are decoded as they are yielded.
+
+Array entries are parsed with the C-accelerated `JSONDecoder.raw_decode`, which
+also finds where each entry ends. Serialising goes through orjson when it is
+installed (the 'orjson' backend) and the stdlib json module otherwise; pass
+backend='json' to force the stdlib. Entries orjson can't serialise (non-string
+keys, very large ints) or would write differently (NaN/Infinity, which it
+turns into null, and floats json writes in exponent form, like 1e+16) fall
+back to json per entry.
+
+The writer goes through a temporary file that replaces the target on close
+(see `atomic_output.commit_temp`), so reading and writing the same path in one
+pipeline is safe, and an output identical to the existing file leaves it
+untouched.
+"""
+
+import json
+import math
+import os
+import re
+
+from common.atomic_output import commit_temp
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+BACKENDS = ('json', 'orjson')
+DEFAULT_BACKEND = 'orjson' if orjson is not None else 'json'
+CHUNK_SIZE = 1 << 16
+
+_DECODER = json.JSONDecoder()
+_SEPARATOR_RE = re.compile(r'[\s,]*')
+
+
+def resolve_backend(backend=None):
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f'Unknown JSON backend: {backend!r} (expected one of {BACKENDS})')
+    if backend == 'orjson' and orjson is None:
+        raise ValueError('The orjson backend needs the orjson package (pip install orjson)')
+    return backend
+
+
+def loads(text, backend=None):
+    if resolve_backend(backend) == 'orjson':
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _orjson_floats_match(obj):
+    """False if obj holds a float orjson writes differently from json.
+
+    json uses repr(): NaN/Infinity literals, and exponent form ('1e+16',
+    '1e-05') outside 1e-4 <= |x| < 1e16. orjson writes null and '1e16'.
+    """
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        t = type(o)
+        if t is dict:
+            stack.extend(o.values())
+        elif t is list or t is tuple:
+            stack.extend(o)
+        elif t is float and (not math.isfinite(o) or (o and not 1e-4 <= abs(o) < 1e16)):
+            return False
+    return True
+
+
+def dumps(obj, indent=2, backend=None):
+    """Serialise one value like json.dumps(obj, indent=indent, ensure_ascii=False)."""
+    # orjson only has the indent=2 layout; other layouts always use json
+    if resolve_backend(backend) == 'orjson' and indent == 2 and _orjson_floats_match(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=indent, ensure_ascii=False)
+
+
+def _read_array(fh, buf, chunk_size):
+    """Yield parsed elements of a JSON array; buf holds the text after '['."""
+    pos = 0
+    eof = False
+    while True:
+        pos = _SEPARATOR_RE.match(buf, pos).end()
+        if pos == len(buf):
+            if eof:
+                raise ValueError('Unterminated JSON array')
+            buf, pos = fh.read(chunk_size), 0
+            eof = not buf
+            continue
+        if buf[pos] == ']':
+            return
+        try:
+            value, end = _DECODER.raw_decode(buf, pos)
+            # A value ending exactly at the buffer edge may continue in the next chunk
+            complete = end < len(buf) or eof
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if not complete:
+            # Read at least as much again, so large entries aren't re-parsed per chunk
+            more = fh.read(max(chunk_size, len(buf) - pos))
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+        yield value
+        pos = end
+
+
+def iter_pokemon(path, backend=None, chunk_size=CHUNK_SIZE):
+    """Yield the entries of a pokemon_data-style JSON array one at a time."""
+    backend = resolve_backend(backend)
+    with open(path, 'r', encoding='utf-8') as fh:
+        head = fh.read(chunk_size).lstrip('\ufeff').lstrip()
+        while not head:
+            more = fh.read(chunk_size)
+            if not more:
+                raise ValueError(f'Empty JSON file: {path}')
+            head = more.lstrip()
+        if head[0] == '[':
+            yield from _read_array(fh, head[1:], chunk_size)
+            return
+        doc = loads(head + fh.read(), backend)
+
+    # Compact encoded document: tables up front, entries decoded lazily
+    from common.encounter_codec import Decoder, is_encoded
+    if not is_encoded(doc):
+        raise ValueError(f'Expected a JSON array of Pokemon in {path}')
+    decoder = Decoder(doc['tables'])
+    for p in doc['pokemon']:
+        yield decoder.pokemon(p)
+
+
+class PokemonWriter:
+    """Write a JSON array one entry at a time.
+
+    Use as a context manager; the target is only replaced when the block exits
+    without an exception and the output differs from it. `changed` records
+    whether it was.
+    """
+
+    def __init__(self, path, indent=2, backend=None, fsync=True):
+        self.path = path
+        self.indent = indent
+        self.backend = resolve_backend(backend)
+        self.fsync = fsync
+        self.count = 0
+        self.changed = None
+        self._tmp_path = os.path.join(os.path.dirname(os.path.abspath(path)),
+                                      f'.{os.path.basename(path)}.{os.getpid()}.tmp')
+        self._fh = None
+
+    def __enter__(self):
+        out_dir = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(out_dir, exist_ok=True)
+        self._fh = open(self._tmp_path, 'w', encoding='utf-8')
+        return self
+
+    def write(self, entry):
+        text = dumps(entry, indent=self.indent, backend=self.backend)
+        if self.indent is None:
+            self._fh.write(('[' if self.count == 0 else ', ') + text)
+        else:
+            pad = ' ' * self.indent
+            self._fh.write(('[\n' if self.count == 0 else ',\n') + pad + text.replace('\n', '\n' + pad))
+        self.count += 1
+
+    def write_all(self, entries):
+        for entry in entries:
+            self.write(entry)
+        return self.count
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                if self.count == 0:
+                    self._fh.write('[]')
+                else:
+                    self._fh.write(']' if self.indent is None else '\n]')
+        finally:
+            self._fh.close()
+        if exc_type is None:
+            self.changed = commit_temp(self._tmp_path, self.path, fsync=self.fsync)
+        else:
+            os.remove(self._tmp_path)
+        return False
+
+
+def write_pokemon(path, entries, indent=2, backend=None, verbose=False):
+    """Stream entries to path as a JSON array; returns the number written."""
+    with PokemonWriter(path, indent=indent, backend=backend) as writer:
+        writer.write_all(entries)
+    if verbose:
+        print(f'Wrote {path}' if writer.changed else f'Unchanged: {path} (write skipped)')
+    return writer.count
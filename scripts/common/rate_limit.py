@@ -0,0 +1,52 @@
+"""Thread-safe request pacing shared by the download scripts.
+
+    limiter = RateLimiter(0.5)
+    limiter.wait()      # returns immediately the first time
+    limiter.wait()      # sleeps until 0.5s after the previous call's slot
+
+Each wait() reserves the next free slot under a lock and sleeps outside it, so
+any number of worker threads together make at most one call per min_interval.
+HostRateLimiter keeps one such limiter per URL host:
+
+    limiter = HostRateLimiter(0.25)
+    limiter.wait(url)   # paced against earlier calls to the same host only
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class RateLimiter:
+    """Space wait() calls at least min_interval seconds apart, across threads."""
+
+    def __init__(self, min_interval):
+        self.min_interval = max(0.0, float(min_interval))
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        # Reserve the next slot under the lock, sleep outside it
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class HostRateLimiter:
+    """A RateLimiter per URL host, so pacing one site doesn't hold up another."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._limiters = {}
+
+    def wait(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = RateLimiter(self.min_interval)
+        limiter.wait()
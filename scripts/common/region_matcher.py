@@ -0,0 +1,135 @@
+"""Compiled location -> region matcher shared by the location scripts.
+
+`RegionMatcher` is built once from a substring -> region mapping (e.g.
+`scripts/data/region_map.json` or `region_map_overrides.json`). Every substring
+is compiled into a single Aho-Corasick automaton, so a location string is
+scanned once regardless of how many entries the map has, and results are
+memoized per unique location name.
+
+Matching semantics follow the original loops: keys are matched
+case-insensitively as substrings, and when several keys occur in a location the
+one listed first in the mapping wins. An exact (case-insensitive) key match is
+always preferred.
+
+    matcher = RegionMatcher.from_json('scripts/data/region_map.json')
+    matcher.region_for('Lake of Rage')      # -> 'johto'
+    matcher.keywords_in('Kanto Safari Zone')  # -> frozenset({'kanto'})
+"""
+
+import json
+from collections import deque
+from functools import lru_cache
+
+
+# Region keywords recognised in location names when no explicit mapping applies
+REGION_KEYWORDS = (
+    'kanto', 'johto', 'hoenn', 'sinnoh', 'unova', 'kalos',
+    'alola', 'galar', 'paldea', 'scarlet', 'violet',
+)
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher. Patterns are matched against lowercased text."""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for idx, pat in enumerate(self.patterns):
+            node = 0
+            for ch in pat:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                node = nxt
+            self.out[node].append(idx)
+        # Breadth-first pass to fill failure links and merge outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                cand = self.goto[f].get(ch, 0)
+                self.fail[nxt] = cand if cand != nxt else 0
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find_all(self, text):
+        """Return the set of pattern indices occurring anywhere in text."""
+        found = set()
+        node = 0
+        goto, fail, out = self.goto, self.fail, self.out
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+class RegionMatcher:
+    """Resolve location names to regions using a compiled substring map."""
+
+    def __init__(self, mapping=None, keywords=REGION_KEYWORDS, cache_size=None):
+        mapping = mapping or {}
+        self.keys = [k.lower() for k in mapping.keys()]
+        self.values = list(mapping.values())
+        self.exact = {}
+        for k, v in zip(self.keys, self.values):
+            self.exact.setdefault(k, v)
+        self._map_automaton = AhoCorasick(self.keys)
+        self.keywords = [k.lower() for k in keywords]
+        self._kw_automaton = AhoCorasick(self.keywords)
+        # Memoize per unique location string
+        self.region_for = lru_cache(maxsize=cache_size)(self._region_for)
+        self.keywords_in = lru_cache(maxsize=cache_size)(self._keywords_in)
+
+    @classmethod
+    def from_json(cls, *paths, lowercase_values=False, **kwargs):
+        """Build from one or more JSON mapping files; later files take precedence."""
+        mapping = {}
+        for path in paths:
+            if not path:
+                continue
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            # Later files override earlier ones, so put their keys first
+            merged = {k: v for k, v in data.items()}
+            merged.update({k: v for k, v in mapping.items() if k not in merged})
+            mapping = merged
+        if lowercase_values:
+            mapping = {k: v.lower() if isinstance(v, str) else v for k, v in mapping.items()}
+        return cls(mapping, **kwargs)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _region_for(self, location):
+        """Return the mapped region for a location, or None when no key matches."""
+        if not location:
+            return None
+        s = location.lower()
+        if s in self.exact:
+            return self.exact[s]
+        hits = self._map_automaton.find_all(s)
+        if not hits:
+            return None
+        return self.values[min(hits)]
+
+    def _keywords_in(self, location):
+        """Return the region keywords contained in a location name."""
+        if not location:
+            return frozenset()
+        hits = self._kw_automaton.find_all(location.lower())
+        return frozenset(self.keywords[i] for i in hits)
+
+    def cache_info(self):
+        return {'region_for': self.region_for.cache_info(), 'keywords_in': self.keywords_in.cache_info()}
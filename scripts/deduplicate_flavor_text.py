@@ -1,100 +1,318 @@
+"""
+Remove duplicate flavor text entries from Pokemon data JSON.
+
+Usage:
+  python scripts/deduplicate_flavor_text.py --input-json public/data/pokemon_data.json
+  python scripts/deduplicate_flavor_text.py --input-json public/data/pokemon_data.json --near-duplicates --similarity 0.6
+
+Entries are compared by a normalized key (accents stripped, lowercased), and
+the first occurrence is kept. The indices to drop are chosen from
+flavor_text_entries and removed from flavor_text_entries_original too, so the
+two arrays stay aligned. Keys are memoized, and accents are removed with a
+str.translate table rather than a per-character filter.
+
+Runs are incremental: the hash of every Pokemon's text arrays that is known to
+be duplicate-free is recorded in a state file (--state, default
+scripts/data/flavor_dedupe_state.json), and those Pokemon are skipped next time
+unless their text changed or --full is given.
+
+--near-duplicates also drops reworded entries ("could build" / "can build"):
+each entry's word shingles are MinHashed and bucketed with LSH bands, so only
+entries sharing a bucket are compared (exact Jaccard >= --similarity) instead
+of every pair.
+"""
+
 import json
 import argparse
+import hashlib
+import os
+import re
+import sys
 import unicodedata
-from typing import List
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from common.atomic_output import write_json
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+FIELDS = ('flavor_text_entries', 'flavor_text_entries_original')
+DEFAULT_STATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'flavor_dedupe_state.json')
+STATE_VERSION = 1
+
 
+class _MarkTable(dict):
+    """str.translate table deleting nonspacing marks (category 'Mn'), filled on demand."""
 
+    def __missing__(self, codepoint):
+        value = None if unicodedata.category(chr(codepoint)) == 'Mn' else codepoint
+        self[codepoint] = value
+        return value
+
+
+_STRIP_MARKS = _MarkTable()
+
+
+@lru_cache(maxsize=None)
 def normalize_text(text: str) -> str:
     """Normalize text by removing accents and converting to a canonical form."""
-    # Normalize unicode characters (NFD = decompose accented chars)
-    normalized = unicodedata.normalize('NFD', text)
-    # Remove accent marks (category 'Mn' = Nonspacing Mark)
-    without_accents = ''.join(char for char in normalized if unicodedata.category(char) != 'Mn')
-    # Convert back to NFC form and lowercase for comparison
+    # Decompose accented chars (NFD), drop the accent marks, recompose and lowercase
+    without_accents = unicodedata.normalize('NFD', text).translate(_STRIP_MARKS)
     return unicodedata.normalize('NFC', without_accents).lower()
 
 
+def duplicate_indices(entries: List[str]) -> List[int]:
+    """Indices of entries whose normalized text already appeared earlier in the list."""
+    seen = set()
+    dupes = []
+    for i, entry in enumerate(entries):
+        normalized = normalize_text(entry)
+        if normalized in seen:
+            dupes.append(i)
+        else:
+            seen.add(normalized)
+    return dupes
+
+
 def remove_duplicates(entries: List[str]) -> List[str]:
     """Remove duplicates from a list while preserving order.
-    
+
     Duplicates are detected by normalizing text (removing accents, case-insensitive).
     The first occurrence of each unique entry is kept.
     """
-    seen = set()
-    result = []
-    for entry in entries:
-        normalized = normalize_text(entry)
-        if normalized not in seen:
-            seen.add(normalized)
-            result.append(entry)
-    return result
+    dupes = set(duplicate_indices(entries))
+    return [entry for i, entry in enumerate(entries) if i not in dupes]
+
+
+# ---------------------------------------------------------------------------
+# Near-duplicate detection (MinHash + LSH)
+# ---------------------------------------------------------------------------
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+# Hashes and permutation coefficients stay below 2**31, so a*h + b fits in uint64
+_PRIME = (1 << 31) - 1
+
+
+@lru_cache(maxsize=None)
+def shingles(text: str, size: int = 2) -> frozenset:
+    """Set of `size`-word shingles of the normalized text."""
+    words = _WORD_RE.findall(normalize_text(text))
+    if len(words) <= size:
+        return frozenset([' '.join(words)])
+    return frozenset(' '.join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+
+@lru_cache(maxsize=None)
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little') % _PRIME
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateFilter:
+    """Keep-first filter for reworded entries using MinHash signatures and LSH bands."""
+
+    def __init__(self, similarity=0.6, shingle_size=2, bands=16, rows=4, seed=1):
+        self.similarity = similarity
+        self.shingle_size = shingle_size
+        self.bands = bands
+        self.rows = rows
+        # Deterministic permutation coefficients
+        coeff = hashlib.blake2b(f'minhash-{seed}'.encode(), digest_size=64).digest()
+        rng = int.from_bytes(coeff, 'little')
+        self.perms = []
+        for _ in range(bands * rows):
+            rng = (rng * 6364136223846793005 + 1442695040888963407) % (1 << 128)
+            a = (rng >> 64) % (_PRIME - 1) + 1
+            b = rng % _PRIME
+            self.perms.append((a, b))
+        if np is not None:
+            self._a = np.array([a for a, _ in self.perms], dtype=np.uint64)[:, None]
+            self._b = np.array([b for _, b in self.perms], dtype=np.uint64)[:, None]
+        self.signature = lru_cache(maxsize=None)(self._signature)
+
+    def settings(self):
+        return {'similarity': self.similarity, 'shingle_size': self.shingle_size,
+                'bands': self.bands, 'rows': self.rows}
+
+    def _signature(self, text: str) -> tuple:
+        hashes = [_shingle_hash(s) for s in shingles(text, self.shingle_size)]
+        if np is not None:
+            h = np.array(hashes, dtype=np.uint64)[None, :]
+            return tuple(((self._a * h + self._b) % _PRIME).min(axis=1).tolist())
+        return tuple(min([(a * h + b) % _PRIME for h in hashes]) for a, b in self.perms)
+
+    def near_indices(self, entries: List[str], skip=()):
+        """[(index, index of the kept entry it matches)] for reworded entries, ignoring indices in skip."""
+        buckets: Dict[tuple, List[int]] = {}
+        kept: List[int] = []
+        dropped = []
+        r = self.rows
+        for i, entry in enumerate(entries):
+            if i in skip:
+                continue
+            sig = self.signature(entry)
+            keys = [(band, sig[band * r:(band + 1) * r]) for band in range(self.bands)]
+            candidates = set()
+            for key in keys:
+                candidates.update(buckets.get(key, ()))
+            own = shingles(entry, self.shingle_size)
+            match = None
+            for idx in sorted(candidates):
+                if jaccard(own, shingles(entries[kept[idx]], self.shingle_size)) >= self.similarity:
+                    match = kept[idx]
+                    break
+            if match is not None:
+                dropped.append((i, match))
+                continue
+            for key in keys:
+                buckets.setdefault(key, []).append(len(kept))
+            kept.append(i)
+        return dropped
 
+    def filter(self, entries: List[str]):
+        """Return (kept, dropped) where dropped is a list of (entry, kept_match)."""
+        pairs = self.near_indices(entries)
+        gone = {i for i, _ in pairs}
+        kept = [entry for i, entry in enumerate(entries) if i not in gone]
+        return kept, [(entries[i], entries[j]) for i, j in pairs]
 
-def deduplicate_flavor_text(input_file: str, output_file: str = None):
+
+# ---------------------------------------------------------------------------
+# Incremental state
+# ---------------------------------------------------------------------------
+
+def text_hash(pokemon: dict) -> str:
+    """Hash of a Pokemon's flavor text arrays."""
+    payload = json.dumps([pokemon.get(f) for f in FIELDS], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def load_state(path: Optional[str], settings: dict) -> Dict[str, str]:
+    """Return {pokemon id: clean text hash}, empty if missing or built with other settings."""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if state.get('version') != STATE_VERSION or state.get('settings') != settings:
+        return {}
+    return state.get('clean', {})
+
+
+def save_state(path: str, settings: dict, clean: Dict[str, str]):
+    state = {'version': STATE_VERSION, 'settings': settings, 'clean': dict(sorted(clean.items()))}
+    write_json(path, state, verbose=False)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def deduplicate_flavor_text(input_file: str, output_file: str = None, near: Optional[NearDuplicateFilter] = None,
+                            state_file: Optional[str] = DEFAULT_STATE, full: bool = False):
     """
     Remove duplicate flavor text entries from Pokemon data.
-    
+
     Args:
         input_file: Path to the input JSON file
         output_file: Path to the output JSON file (defaults to input_file)
+        near: Optional NearDuplicateFilter for reworded entries
+        state_file: Incremental state path (None disables it)
+        full: Reprocess every Pokemon regardless of the state file
     """
     if output_file is None:
         output_file = input_file
-    
+
     # Load the Pokemon data
     print(f"Loading Pokemon data from {input_file}...")
     with open(input_file, 'r', encoding='utf-8') as f:
         pokemon_data = json.load(f)
-    
+
+    settings = {'near_duplicates': near.settings() if near else None}
+    clean = {} if full else load_state(state_file, settings)
+
     # Track statistics
     total_pokemon = len(pokemon_data)
+    pokemon_skipped = 0
     pokemon_modified = 0
     total_duplicates_removed = 0
-    
+    total_near_removed = 0
+
     # Process each Pokemon
     for pokemon in pokemon_data:
+        key = str(pokemon.get('id'))
+        if clean.get(key) == text_hash(pokemon):
+            pokemon_skipped += 1
+            continue
+
         original_count = 0
         modified = False
-        
-        # Deduplicate flavor_text_entries
-        if 'flavor_text_entries' in pokemon and isinstance(pokemon['flavor_text_entries'], list):
-            original_len = len(pokemon['flavor_text_entries'])
-            pokemon['flavor_text_entries'] = remove_duplicates(pokemon['flavor_text_entries'])
-            new_len = len(pokemon['flavor_text_entries'])
-            
-            if original_len != new_len:
-                duplicates = original_len - new_len
-                original_count += duplicates
-                modified = True
-                print(f"  - {pokemon['name']} (#{pokemon['id']}): Removed {duplicates} duplicate(s) from flavor_text_entries")
-        
-        # Deduplicate flavor_text_entries_original
-        if 'flavor_text_entries_original' in pokemon and isinstance(pokemon['flavor_text_entries_original'], list):
-            original_len = len(pokemon['flavor_text_entries_original'])
-            pokemon['flavor_text_entries_original'] = remove_duplicates(pokemon['flavor_text_entries_original'])
-            new_len = len(pokemon['flavor_text_entries_original'])
-            
-            if original_len != new_len:
-                duplicates = original_len - new_len
+
+        # Indices are chosen from the English entries and dropped from every array,
+        # because the Pokedex page shows _original[i] once flavor_text_entries[i] is solved
+        entries = pokemon.get(FIELDS[0])
+        exact, near_pairs = [], []
+        if isinstance(entries, list):
+            exact = duplicate_indices(entries)
+            if near is not None:
+                near_pairs = near.near_indices(entries, skip=set(exact))
+        drop = set(exact) | {i for i, _ in near_pairs}
+
+        for field in FIELDS:
+            values = pokemon.get(field)
+            if not isinstance(values, list):
+                continue
+            field_drop = drop
+            if field != FIELDS[0] and (not isinstance(entries, list) or len(values) != len(entries)):
+                # Not index-aligned with flavor_text_entries: only drop its own exact duplicates
+                field_drop = set(duplicate_indices(values))
+            if not field_drop:
+                continue
+            pokemon[field] = [v for i, v in enumerate(values) if i not in field_drop]
+            modified = True
+            duplicates = len(field_drop) - (len(near_pairs) if field_drop is drop else 0)
+            if duplicates:
                 original_count += duplicates
-                modified = True
-                print(f"  - {pokemon['name']} (#{pokemon['id']}): Removed {duplicates} duplicate(s) from flavor_text_entries_original")
-        
+                print(f"  - {pokemon['name']} (#{pokemon['id']}): Removed {duplicates} duplicate(s) from {field}")
+
+        for i, j in near_pairs:
+            total_near_removed += 1
+            print(f"  - {pokemon['name']} (#{pokemon['id']}): Removed near-duplicate from {FIELDS[0]} "
+                  f"(and the same index from {FIELDS[1]}):")
+            print(f"      kept:    {entries[j]}")
+            print(f"      removed: {entries[i]}")
+
         if modified:
             pokemon_modified += 1
             total_duplicates_removed += original_count
-    
+        clean[key] = text_hash(pokemon)
+
     # Save the modified data
     print(f"\nSaving modified data to {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(pokemon_data, f, indent=2, ensure_ascii=False)
-    
+    write_json(output_file, pokemon_data)
+    if state_file:
+        save_state(state_file, settings, clean)
+
     # Print summary
     print(f"\n{'='*60}")
     print(f"Summary:")
-    print(f"  Total Pokemon processed: {total_pokemon}")
+    print(f"  Total Pokemon processed: {total_pokemon - pokemon_skipped}")
+    print(f"  Unchanged since last run (skipped): {pokemon_skipped}")
     print(f"  Pokemon modified: {pokemon_modified}")
     print(f"  Total duplicates removed: {total_duplicates_removed}")
+    if near is not None:
+        print(f"  Near-duplicates removed: {total_near_removed}")
     print(f"{'='*60}")
 
 
@@ -112,7 +330,45 @@ if __name__ == '__main__':
         default=None,
         help='Path to the output JSON file (defaults to overwriting input file)'
     )
-    
+    parser.add_argument(
+        '--near-duplicates',
+        action='store_true',
+        help='Also remove reworded entries (MinHash/LSH over word shingles)'
+    )
+    parser.add_argument(
+        '--similarity',
+        type=float,
+        default=0.6,
+        help='Shingle Jaccard similarity at which an entry counts as a near-duplicate (default: 0.6)'
+    )
+    parser.add_argument(
+        '--shingle-size',
+        type=int,
+        default=2,
+        help='Words per shingle for near-duplicate detection (default: 2)'
+    )
+    parser.add_argument(
+        '--state',
+        default=DEFAULT_STATE,
+        help=f'Incremental state file (default: {os.path.relpath(DEFAULT_STATE)})'
+    )
+    parser.add_argument(
+        '--no-state',
+        action='store_true',
+        help='Do not read or write the incremental state file'
+    )
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Reprocess every Pokemon, ignoring the state file'
+    )
+
     args = parser.parse_args()
-    
-    deduplicate_flavor_text(args.input_json, args.output_json)
+
+    if not 0.0 < args.similarity <= 1.0:
+        print('Error: --similarity must be in (0, 1]', file=sys.stderr)
+        sys.exit(1)
+    near = NearDuplicateFilter(args.similarity, args.shingle_size) if args.near_duplicates else None
+
+    deduplicate_flavor_text(args.input_json, args.output_json, near=near,
+                            state_file=None if args.no_state else args.state, full=args.full)
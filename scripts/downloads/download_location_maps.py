@@ -8,27 +8,58 @@ Usage:
 
 Notes:
 - Provide an optional `--region-map` JSON mapping of location-name -> RegionName
-  (e.g. {"Pewter City": "Kanto", "Cerulean City": "Kanto").
+  (e.g. {"Pewter City": "Kanto", "Cerulean City": "Kanto"). Lookups go through
+  the shared RegionMatcher: exact names first (case-insensitive), then keys that
+  occur as substrings of the location (so "Lake of Rage" also covers
+  "Lake of Rage (north)"). Overrides files are matched by exact name only.
 - If a location contains the word "Route" we will NOT prepend a region.
-- The script fetches the Bulbapedia file page (e.g. /wiki/File:Kanto_Pewter_City_Map.png)
-  and scrapes the actual image URL from the page, then downloads the PNG.
+- Image URLs are resolved through the MediaWiki imageinfo API, 50 `File:`
+  titles per request (e.g. File:Kanto_Pewter_City_Map.png). If an API request
+  fails, its titles fall back to scraping the file page.
+- Images download on --workers threads. Requests to each host (the wiki for
+  API and file pages, the image archive for downloads) are kept at least
+  --delay seconds apart, shared by all workers. Downloads therefore run at
+  most 1/--delay per second whatever --workers is; workers only overlap the
+  transfers.
+- Identical maps are stored once: titles with the same API sha1 are downloaded
+  once, and a sha256 index of the output folder (.map_hashes.json) catches the
+  rest. The index also records aliased names, so later runs skip them. When
+  --overwrite replaces a file with different content, its old hash and the
+  names aliased to it are dropped.
+- Every location is recorded in `location_to_file_map.json` (--file-map,
+  default inside --output-dir) against the stored file, so locations sharing
+  a map become aliases of one file. An existing map is merged, not replaced.
 
 Dependencies:
   pip install requests beautifulsoup4
 
 """
 import argparse
+import hashlib
 import json
 import os
 import re
 import sys
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urljoin
 
 import requests
 from bs4 import BeautifulSoup
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import write_bytes_atomic, write_json
+from common.encounter_codec import load_pokemon_data
+from common.rate_limit import HostRateLimiter
+from common.region_matcher import RegionMatcher
+
 BASE_PAGE = "https://bulbapedia.bulbagarden.net"
+API_URL = f"{BASE_PAGE}/w/api.php"
+USER_AGENT = 'pokedle-map-downloader/1.0 (+https://github.com/Pythagean/pokedle)'
+# MediaWiki accepts up to 50 titles per query for regular clients
+API_BATCH = 50
+HASH_INDEX = '.map_hashes.json'
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.gif', '.webp')
 
 # Default (empty) mapping - you can pass a JSON map via --region-map
 # Format: { "Pewter City": "Kanto", "Goldenrod City": "Johto" }
@@ -110,14 +141,203 @@ def find_image_url_from_file_page(page_html):
     return None
 
 
+_thread_state = threading.local()
+
+
+def get_session():
+    """One requests.Session per thread (sessions aren't thread-safe)."""
+    session = getattr(_thread_state, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update({'User-Agent': USER_AGENT})
+        _thread_state.session = session
+    return session
+
+
+def build_plan(locations, region_map, matcher, overrides_mode):
+    """Return ([(location, file page title, output file name)], missing locations)."""
+    plan = []
+    missing = set()
+    for loc in sorted(locations):
+        # Skip blank
+        if not loc or not loc.strip():
+            continue
+        # Determine whether to prefix region
+        is_route = 'Route' in loc or 'route' in loc
+        name_clean = clean_name_for_file(loc)
+        if is_route:
+            page_name = f'File:{name_clean}_Map.png'
+            out_name = f'{name_clean}.png'
+        else:
+            override_val = region_map.get(loc) if overrides_mode else matcher.region_for(loc)
+            if not override_val:
+                print(f'WARNING: no region mapping for "{loc}"; skipping (will add to region_map_todo.json)')
+                missing.add(loc)
+                continue
+
+            # If we're in overrides mode, the value is the full file prefix to use
+            # e.g. "Kanto_Pewter_City" -> File:Kanto_Pewter_City_Map.png
+            if overrides_mode:
+                override_clean = clean_name_for_file(override_val)
+                page_name = f'File:{override_clean}_Map.png'
+                out_name = f'{override_clean}.png'
+            else:
+                # legacy behavior: value is a Region name
+                region = override_val
+                region_clean = clean_name_for_file(region)
+                page_name = f'File:{region_clean}_{name_clean}_Map.png'
+                out_name = f'{region_clean}_{name_clean}.png'
+        plan.append((loc, page_name, out_name))
+    return plan, missing
+
+
+def query_imageinfo(titles, limiter):
+    """Resolve up to API_BATCH File: titles with one imageinfo request.
+
+    Returns {title: {'url', 'sha1', 'size'}}, with None for titles the wiki
+    has no file for.
+    """
+    limiter.wait(API_URL)
+    r = get_session().get(API_URL, timeout=30, params={
+        'action': 'query',
+        'format': 'json',
+        'formatversion': '2',
+        'redirects': '1',
+        'prop': 'imageinfo',
+        'iiprop': 'url|sha1|size',
+        'titles': '|'.join(titles),
+    })
+    r.raise_for_status()
+    query = r.json().get('query', {})
+    # The API answers under rewritten titles (underscores -> spaces, redirects)
+    renamed = {}
+    for step in query.get('normalized', []) + query.get('redirects', []):
+        renamed[step['from']] = step['to']
+    pages = {}
+    for page in query.get('pages', []):
+        info = (page.get('imageinfo') or [None])[0]
+        if page.get('missing') or not info or not info.get('url'):
+            pages[page.get('title')] = None
+        else:
+            pages[page.get('title')] = {
+                'url': urljoin(BASE_PAGE, info['url']),
+                'sha1': info.get('sha1'),
+                'size': info.get('size'),
+            }
+    out = {}
+    for title in titles:
+        resolved, seen = title, set()
+        while resolved in renamed and resolved not in seen:
+            seen.add(resolved)
+            resolved = renamed[resolved]
+        out[title] = pages.get(resolved)
+    return out
+
+
+def scrape_image_info(title, limiter):
+    """Fallback for one title: fetch its File: page and scrape the image URL."""
+    url = f'{BASE_PAGE}/wiki/{title}'
+    limiter.wait(url)
+    r = get_session().get(url, timeout=15)
+    if r.status_code == 404:
+        return None
+    if r.status_code != 200:
+        raise RuntimeError(f'page_fetch_status_{r.status_code}')
+    url = find_image_url_from_file_page(r.text)
+    if not url:
+        raise RuntimeError('no_image_url_found_on_page')
+    return {'url': url, 'sha1': None, 'size': None}
+
+
+def resolve_image_urls(titles, limiter, batch_size=API_BATCH):
+    """Resolve File: titles in API batches.
+
+    Returns ({title: info or None}, {title: error message}).
+    """
+    resolved = {}
+    errors = {}
+    titles = sorted(set(titles))
+    for start in range(0, len(titles), batch_size):
+        batch = titles[start:start + batch_size]
+        try:
+            resolved.update(query_imageinfo(batch, limiter))
+            print(f'Resolved {start + len(batch)}/{len(titles)} file titles')
+        except Exception as e:
+            print(f'  imageinfo request failed ({e}); scraping {len(batch)} file pages instead')
+            for title in batch:
+                try:
+                    resolved[title] = scrape_image_info(title, limiter)
+                except Exception as fe:
+                    errors[title] = str(fe)
+    return resolved, errors
+
+
+def download_image(url, limiter):
+    limiter.wait(url)
+    r = get_session().get(url, timeout=30)
+    if r.status_code != 200:
+        raise RuntimeError(f'image_download_status_{r.status_code}')
+    return r.content
+
+
+def load_hash_index(output_dir):
+    """Return ({file name: {'sha256', 'size'}}, {alias: stored file}) for output_dir.
+
+    Cached in HASH_INDEX; files that are new or changed size since are rehashed.
+    Aliases are file names that were never stored because their image matched
+    an existing file; ones whose stored file has gone are dropped.
+    """
+    index, aliases = {}, {}
+    try:
+        with open(os.path.join(output_dir, HASH_INDEX), 'r', encoding='utf-8') as fh:
+            cached = json.load(fh)
+        index, aliases = cached.get('files', {}), cached.get('aliases', {})
+    except (OSError, ValueError):
+        pass
+    current = {}
+    for name in sorted(os.listdir(output_dir)):
+        if not name.lower().endswith(IMAGE_EXTS):
+            continue
+        path = os.path.join(output_dir, name)
+        size = os.path.getsize(path)
+        meta = index.get(name)
+        if not meta or meta.get('size') != size:
+            with open(path, 'rb') as fh:
+                meta = {'sha256': hashlib.sha256(fh.read()).hexdigest(), 'size': size}
+        current[name] = meta
+    aliases = {a: f for a, f in aliases.items() if f in current and a not in current}
+    return current, aliases
+
+
+def save_hash_index(output_dir, index, aliases):
+    write_json(os.path.join(output_dir, HASH_INDEX),
+               {'files': dict(sorted(index.items())), 'aliases': dict(sorted(aliases.items()))},
+               verbose=False)
+
+
+def load_json_dict(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as fh:
+            return json.load(fh) or {}
+    except Exception:
+        return {}
+
+
 def main():
     p = argparse.ArgumentParser(description='Download Bulbapedia location map images from pokemon_data.json')
     p.add_argument('--input-json', required=True, help='Path to pokemon_data.json')
     p.add_argument('--output-dir', required=True, help='Directory to save downloaded maps')
     p.add_argument('--region-map', help='Optional JSON file mapping location name -> Region name')
     p.add_argument('--overwrite', action='store_true', help='Overwrite existing files (by default existing files are skipped)')
-    p.add_argument('--delay', type=float, default=1.0, help='Delay (seconds) between requests to avoid hammering the site')
+    p.add_argument('--delay', type=float, default=0.25,
+                   help='Minimum seconds between requests to the same host, shared by all workers (default 0.25)')
+    p.add_argument('--workers', type=int, default=4, help='Concurrent image downloads (default 4)')
+    p.add_argument('--file-map', help='location -> file JSON to update (default: <output-dir>/location_to_file_map.json)')
     args = p.parse_args()
+    if not args.file_map:
+        args.file_map = os.path.join(args.output_dir, 'location_to_file_map.json')
 
     if not os.path.exists(args.input_json):
         print('Input JSON not found:', args.input_json)
@@ -131,8 +351,7 @@ def main():
         with open(args.region_map, 'r', encoding='utf-8') as fh:
             region_map = json.load(fh)
 
-    with open(args.input_json, 'r', encoding='utf-8') as fh:
-        data = json.load(fh)
+    data = load_pokemon_data(args.input_json)
 
     # Collect unique location strings
     locations = set()
@@ -160,10 +379,6 @@ def main():
     print(f'Found {len(locations)} unique locations')
     os.makedirs(args.output_dir, exist_ok=True)
 
-    session = requests.Session()
-    session.headers.update({'User-Agent': 'pokedle-map-downloader/1.0 (+https://github.com/Pythagean/pokedle)'})
-
-    missing_locations = set()
     # If the provided region_map filename looks like an overrides file, treat
     # values as full file-prefix overrides (don't append the original location name).
     overrides_mode = False
@@ -172,94 +387,126 @@ def main():
             overrides_mode = 'override' in os.path.basename(args.region_map).lower()
         except Exception:
             overrides_mode = False
+    # Region names may be resolved by substring; override prefixes are per-location
+    matcher = RegionMatcher(region_map, keywords=())
+    plan, missing_locations = build_plan(locations, region_map, matcher, overrides_mode)
+
+    # sha256 -> stored file; the first file (by name) with a given hash is canonical
+    hash_index, aliases = load_hash_index(args.output_dir)
+    file_for_hash = {}
+    for name in sorted(hash_index):
+        file_for_hash.setdefault(hash_index[name]['sha256'], name)
+    stored_as = {name: file_for_hash[meta['sha256']] for name, meta in hash_index.items()}
+    stored_as.update(aliases)
+
+    todo = [(loc, title, out) for loc, title, out in plan if args.overwrite or out not in stored_as]
+    print(f'{len(plan)} locations planned: {len(plan) - len(todo)} already downloaded '
+          f'(use --overwrite to replace), {len(todo)} to fetch')
+
+    limiter = HostRateLimiter(args.delay)
     failed_locations = {}
-    for idx, loc in enumerate(sorted(locations)):
-        # Skip blank
-        if not loc or not loc.strip():
-            continue
-        # Determine whether to prefix region
-        is_route = 'Route' in loc or 'route' in loc
-        name_clean = clean_name_for_file(loc)
-        if is_route:
-            page_name = f'File:{name_clean}_Map.png'
-            out_name = f'{name_clean}.png'
-        else:
-            override_val = region_map.get(loc)
-            if not override_val:
-                print(f'WARNING: no region mapping for "{loc}"; skipping (will add to region_map_todo.json)')
-                missing_locations.add(loc)
-                continue
+    resolved, errors = resolve_image_urls([title for _, title, _ in todo], limiter)
 
-            # If we're in overrides mode, the value is the full file prefix to use
-            # e.g. "Kanto_Pewter_City" -> File:Kanto_Pewter_City_Map.png
-            if overrides_mode:
-                override_clean = clean_name_for_file(override_val)
-                page_name = f'File:{override_clean}_Map.png'
-                out_name = f'{override_clean}.png'
-            else:
-                # legacy behavior: value is a Region name
-                region = override_val
-                region_clean = clean_name_for_file(region)
-                page_name = f'File:{region_clean}_{name_clean}_Map.png'
-                out_name = f'{region_clean}_{name_clean}.png'
-
-        out_path = os.path.join(args.output_dir, out_name)
-        if os.path.exists(out_path) and not args.overwrite:
-            print(f'[{idx+1}/{len(locations)}] Skipping existing: {out_name} (use --overwrite to replace)')
+    # Titles resolving to the same image (API sha1, else URL) are downloaded once
+    sources = {}
+    for loc, title, out in todo:
+        if title in errors:
+            failed_locations[loc] = errors[title]
+            continue
+        info = resolved.get(title)
+        if info is None:
+            print(f'  No such file on the wiki: {title}')
+            failed_locations[loc] = 'file_page_missing'
             continue
+        key = info['sha1'] or info['url']
+        sources.setdefault(key, (info, set()))[1].add(out)
 
-        page_url = f'{BASE_PAGE}/wiki/{page_name}'
-        print(f'[{idx+1}/{len(locations)}] Fetching page: {page_url}')
-        try:
-            r = session.get(page_url, timeout=15)
-            if r.status_code == 200:
-                image_url = find_image_url_from_file_page(r.text)
-                if not image_url:
-                    print('  Could not locate image URL on page; skipping')
-                    failed_locations[loc] = 'no_image_url_found_on_page'
-                    continue
-                print(f'  Found image URL: {image_url}')
-                # Download the image
-                ir = session.get(image_url, stream=True, timeout=30)
-                if ir.status_code == 200:
-                    with open(out_path, 'wb') as of:
-                        for chunk in ir.iter_content(1024 * 8):
-                            if not chunk:
-                                break
-                            of.write(chunk)
-                    print(f'  Saved to {out_path}')
-                else:
-                    print(f'  Failed to download image (status {ir.status_code})')
-                    failed_locations[loc] = f'image_download_status_{ir.status_code}'
+    hash_lock = threading.Lock()
+
+    def forget_content(name, old_digest, outs):
+        """name now holds other bytes: repoint or drop what referred to its old content."""
+        twin = min((n for n, m in hash_index.items() if n != name and m['sha256'] == old_digest), default=None)
+        if file_for_hash.get(old_digest) == name:
+            if twin:
+                file_for_hash[old_digest] = twin
             else:
-                print(f'  Failed to fetch page (status {r.status_code})')
-                failed_locations[loc] = f'page_fetch_status_{r.status_code}'
-        except Exception as e:
-            print('  Error fetching:', e)
+                del file_for_hash[old_digest]
+        for alias in [a for a, f in aliases.items() if f == name and a not in outs]:
+            if twin:
+                aliases[alias] = stored_as[alias] = twin
+            else:
+                del aliases[alias]
+                stored_as.pop(alias, None)
+
+    def fetch(info, outs):
+        """Download one image; returns (stored file name, whether it was written)."""
+        payload = download_image(info['url'], limiter)
+        digest = hashlib.sha256(payload).hexdigest()
+        with hash_lock:
+            stored = file_for_hash.get(digest)
+            written = stored is None or (args.overwrite and stored in outs)
+            if stored is None:
+                stored = min(outs)
+                file_for_hash[digest] = stored
+        if written:
+            write_bytes_atomic(os.path.join(args.output_dir, stored), payload)
+            with hash_lock:
+                old = hash_index.get(stored)
+                if old and old['sha256'] != digest:
+                    forget_content(stored, old['sha256'], outs)
+                hash_index[stored] = {'sha256': digest, 'size': len(payload)}
+        return stored, written
+
+    downloaded = aliased = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {pool.submit(fetch, info, outs): (info, outs) for info, outs in sources.values()}
+        for n, fut in enumerate(as_completed(futures), 1):
+            info, outs = futures[fut]
             try:
-                failed_locations[loc] = str(e)
-            except Exception:
-                failed_locations[loc] = 'exception_when_fetching'
-        time.sleep(args.delay)
+                stored, written = fut.result()
+            except Exception as e:
+                print(f'[{n}/{len(futures)}] Error fetching {info["url"]}: {e}')
+                for loc, _, out in todo:
+                    if out in outs:
+                        failed_locations[loc] = str(e)
+                continue
+            downloaded += written
+            with hash_lock:
+                for out in outs:
+                    stored_as[out] = stored
+                    if out != stored:
+                        aliases[out] = stored
+                    else:
+                        aliases.pop(out, None)
+            also = sorted(outs - {stored})
+            aliased += len(also)
+            if written:
+                note = f' (also {", ".join(also)})' if also else ''
+                print(f'[{n}/{len(futures)}] Saved {stored}{note}')
+            else:
+                print(f'[{n}/{len(futures)}] {", ".join(also)} identical to {stored}')
 
-    print('Done.')
+    save_hash_index(args.output_dir, hash_index, aliases)
+    print(f'Done. {downloaded} files downloaded, {aliased} names aliased to an identical map.')
 
-    # Write out missing locations to a todo JSON next to the provided region_map (or in scripts/ if none provided)
-    if missing_locations:
-        if args.region_map:
-            todo_dir = os.path.dirname(os.path.abspath(args.region_map))
-        else:
-            todo_dir = os.path.dirname(os.path.abspath(__file__))
-        todo_path = os.path.join(todo_dir, 'region_map_todo.json')
+    # Point every planned location at the file its map is stored in
+    file_map = load_json_dict(args.file_map)
+    for loc, _, out in plan:
+        stored = stored_as.get(out)
+        if stored:
+            file_map[loc] = stored
+    write_json(args.file_map, dict(sorted(file_map.items())))
 
-        # Load existing todo map if present
-        todo_map = {}
-        if os.path.exists(todo_path):
-            try:
-                with open(todo_path, 'r', encoding='utf-8') as tf:
-                    todo_map = json.load(tf) or {}
-            except Exception:
-                todo_map = {}
+    # Reports go next to the provided region_map (or in scripts/ if none provided)
+    if args.region_map:
+        report_dir = os.path.dirname(os.path.abspath(args.region_map))
+    else:
+        report_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # Write out missing locations to a todo JSON
+    if missing_locations:
+        todo_path = os.path.join(report_dir, 'region_map_todo.json')
+        todo_map = load_json_dict(todo_path)
 
         # Insert missing locations with empty string values if not present
         added = 0
@@ -269,35 +516,21 @@ def main():
                 added += 1
 
         try:
-            with open(todo_path, 'w', encoding='utf-8') as tf:
-                json.dump(dict(sorted(todo_map.items())), tf, indent=2, ensure_ascii=False)
+            write_json(todo_path, dict(sorted(todo_map.items())), verbose=False)
             print(f'Wrote {added} missing locations to {todo_path} (fill region names and merge into your region_map.json)')
         except Exception as e:
             print('Failed to write todo file:', e)
 
-    # Write failed locations to a _failed json next to the region_map (or scripts/ if none provided)
+    # Write failed locations to a _failed json
     if failed_locations:
-        if args.region_map:
-            failed_dir = os.path.dirname(os.path.abspath(args.region_map))
-        else:
-            failed_dir = os.path.dirname(os.path.abspath(__file__))
-        failed_path = os.path.join(failed_dir, 'region_map_failed.json')
-
-        # Load existing failed map if present
-        failed_map = {}
-        if os.path.exists(failed_path):
-            try:
-                with open(failed_path, 'r', encoding='utf-8') as ff:
-                    failed_map = json.load(ff) or {}
-            except Exception:
-                failed_map = {}
+        failed_path = os.path.join(report_dir, 'region_map_failed.json')
+        failed_map = load_json_dict(failed_path)
 
         # Merge new failures (overwrite existing message for the same key)
         failed_map.update(failed_locations)
 
         try:
-            with open(failed_path, 'w', encoding='utf-8') as ff:
-                json.dump(dict(sorted(failed_map.items())), ff, indent=2, ensure_ascii=False)
+            write_json(failed_path, dict(sorted(failed_map.items())), verbose=False)
             print(f'Wrote {len(failed_locations)} failed locations to {failed_path}')
         except Exception as e:
             print('Failed to write failed file:', e)
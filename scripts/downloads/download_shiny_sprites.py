@@ -13,6 +13,8 @@ Usage:
 Notes:
  - The input file is expected to be a JSON array of Pokemon objects with an `id` field.
  - The script will skip IDs that do not return a shiny sprite and will report them at the end.
+ - Pokemon responses are read through the local PokeAPI mirror
+   (common/pokeapi_store.py); --offline reads only the mirror.
 """
 
 from __future__ import annotations
@@ -26,6 +28,9 @@ from typing import List
 
 import requests
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.pokeapi_store import FETCH_ERRORS, PokeAPIStore, add_store_arguments, store_from_args
+
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description='Download shiny front sprites via PokeAPI')
@@ -36,6 +41,7 @@ def parse_args() -> argparse.Namespace:
     p.add_argument('--retry', type=int, default=3, help='Number of retries for API/image requests')
     p.add_argument('--delay', type=float, default=0.35, help='Delay (seconds) between API requests to avoid rate limits')
     p.add_argument('--partial', type=int, default=None, help='Only download up to this many successful sprites and then exit')
+    add_store_arguments(p)
     return p.parse_args()
 
 
@@ -61,30 +67,19 @@ def load_pokemon_ids(input_path: str) -> List[int]:
     return sorted(set(ids))
 
 
-def get_shiny_url(session: requests.Session, poke_id: int, retries: int = 3) -> str | None:
-    url = f'https://pokeapi.co/api/v2/pokemon/{poke_id}'
-    for attempt in range(1, retries + 1):
-        try:
-            resp = session.get(url, timeout=10)
-            if resp.status_code == 404:
-                return None
-            resp.raise_for_status()
-            j = resp.json()
-            # navigate to sprites.front_shiny, tolerate missing keys
-            sprites = j.get('sprites') if isinstance(j, dict) else None
-            if sprites:
-                shiny = sprites.get('front_shiny')
-                if shiny:
-                    return shiny
-            return None
-        except requests.RequestException as e:
-            if attempt < retries:
-                wait = 1.0 * attempt
-                print(f'Warning: request for id {poke_id} failed (attempt {attempt}/{retries}): {e}; retrying in {wait}s', file=sys.stderr)
-                time.sleep(wait)
-                continue
-            print(f'Error: request for id {poke_id} failed after {retries} attempts: {e}', file=sys.stderr)
-            return None
+def get_shiny_url(store: PokeAPIStore, poke_id: int) -> str | None:
+    try:
+        j = store.get_or_none(f'https://pokeapi.co/api/v2/pokemon/{poke_id}')
+    except FETCH_ERRORS as e:
+        print(f'Error: request for id {poke_id} failed: {e}', file=sys.stderr)
+        return None
+    # navigate to sprites.front_shiny, tolerate missing keys
+    sprites = j.get('sprites') if isinstance(j, dict) else None
+    if sprites:
+        shiny = sprites.get('front_shiny')
+        if shiny:
+            return shiny
+    return None
 
 
 def download_image(session: requests.Session, url: str, dest_path: str, retries: int = 3) -> bool:
@@ -128,6 +123,8 @@ def main() -> int:
         return 1
 
     session = requests.Session()
+    # API requests are retried and spaced by the store; mirrored reads aren't delayed
+    store = store_from_args(args, delay=args.delay, retries=args.retry)
     missing: List[int] = []
     failed_downloads: List[int] = []
 
@@ -138,17 +135,15 @@ def main() -> int:
             print(f'Reached partial download target: {downloaded_count} sprites saved; exiting.')
             break
         print(f'[{i}/{len(ids)}] Processing id {pid}...')
-        shiny_url = get_shiny_url(session, pid, retries=args.retry)
+        shiny_url = get_shiny_url(store, pid)
         if not shiny_url:
             print(f'  - No shiny sprite URL for id {pid} (skipping)')
             missing.append(pid)
-            time.sleep(args.delay)
             continue
 
         dest = os.path.join(args.output_dir, f'{pid}-shiny.png')
         if os.path.exists(dest):
             print(f'  - File exists: {dest} (skipping download)')
-            time.sleep(args.delay)
             continue
 
         ok = download_image(session, shiny_url, dest, retries=args.retry)
@@ -160,6 +155,7 @@ def main() -> int:
 
         time.sleep(args.delay)
 
+    store.close()
     print('\nDone.')
     print(f'Total processed: {len(ids)}')
     if missing:
@@ -1,6 +1,7 @@
-import json
 import argparse
 
+from common.pokemon_json import iter_pokemon, write_pokemon
+
 def extract_fields(input_json, output_json):
     """
     Extract specific fields from Pokemon data and write to a new JSON file.
@@ -12,27 +13,15 @@ def extract_fields(input_json, output_json):
     # Fields to extract
     fields_to_extract = ['id', 'name', 'generation', 'habitat', 'height', 'weight', 'types', 'bulbapedia_shape']
     
-    # Read input file
-    with open(input_json, 'r', encoding='utf-8') as f:
-        pokemon_data = json.load(f)
-    
-    # Extract specified fields
-    filtered_data = []
-    for pokemon in pokemon_data:
-        filtered_pokemon = {}
-        for field in fields_to_extract:
-            if field in pokemon:
-                filtered_pokemon[field] = pokemon[field]
-            else:
-                # Handle missing fields (optional - set to None or skip)
-                filtered_pokemon[field] = None
-        filtered_data.append(filtered_pokemon)
-    
-    # Write output file
-    with open(output_json, 'w', encoding='utf-8') as f:
-        json.dump(filtered_data, f, indent=2, ensure_ascii=False)
+    # Stream input entries through the field filter into the output file
+    filtered_data = (
+        # Missing fields are written as None
+        {field: pokemon.get(field) for field in fields_to_extract}
+        for pokemon in iter_pokemon(input_json)
+    )
+    count = write_pokemon(output_json, filtered_data)
     
-    print(f"✓ Extracted {len(filtered_data)} Pokemon with {len(fields_to_extract)} fields")
+    print(f"✓ Extracted {count} Pokemon with {len(fields_to_extract)} fields")
     print(f"✓ Written to {output_json}")
 
 def main():
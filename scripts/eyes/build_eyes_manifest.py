@@ -2,46 +2,31 @@
 """
 Build an eyes manifest JSON from eye image files.
 
-This script scans a directory of eye images and organizes
-filenames by their Pokemon ID (the filename without extension).
+This script scans a directory of eye images and orders the filenames by
+their Pokemon ID (the filename without extension). Unchanged files are not
+re-read between runs (see common/asset_manifests.py).
 
 Usage:
     python build_eyes_manifest.py --input-dir ./eyes/trimmed --output-json ./eyes_manifest.json
 """
 
 import argparse
-import json
 import os
-from pathlib import Path
+import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import instrument
+from common.asset_manifests import AssetScan, build_eyes_manifest, eyes_folders
+from common.atomic_output import write_json
 
-def get_pokemon_id(filename):
-    """Extract the Pokemon ID from a filename like '1.png' -> '1'"""
-    # Remove extension
-    name_without_ext = os.path.splitext(filename)[0]
-    return name_without_ext
 
-
-def scan_directory(dir_path):
-    """Scan a directory and return list of filenames sorted by Pokemon ID"""
-    files = []
-    
-    if not os.path.exists(dir_path):
-        return files
-    
-    for filename in os.listdir(dir_path):
-        # Skip directories and hidden files
-        if os.path.isdir(os.path.join(dir_path, filename)) or filename.startswith('.'):
-            continue
-        
-        # Only include image files
-        if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.webp')):
-            files.append(filename)
-    
-    # Sort by Pokemon ID (numeric)
-    files.sort(key=lambda f: int(get_pokemon_id(f)) if get_pokemon_id(f).isdigit() else 999999)
-    
-    return files
+def scan_directory(dir_path, state_path=None):
+    """Return the image filenames in a directory sorted by Pokemon ID"""
+    scan = AssetScan(dir_path, state_path=state_path)
+    scan.scan(eyes_folders(''))
+    print(f"  {scan.summary()}")
+    scan.save()
+    return build_eyes_manifest(scan, '')
 
 
 def main():
@@ -58,8 +43,14 @@ def main():
         required=True,
         help='Output JSON file path'
     )
+    parser.add_argument(
+        '--state',
+        help='Scan state file (default scripts/data/manifest_state/)'
+    )
     
+    instrument.add_arguments(parser)
     args = parser.parse_args()
+    instrument.setup(args)
     
     # Validate input directory
     if not os.path.isdir(args.input_dir):
@@ -69,21 +60,22 @@ def main():
     print(f"Scanning directory: {args.input_dir}")
     
     # Build manifest
-    files = scan_directory(args.input_dir)
+    with instrument.span('scan'):
+        files = scan_directory(args.input_dir, args.state)
     
     if not files:
         print("Warning: No image files found. Output will be empty.")
     else:
         print(f"  Found {len(files)} eye image files")
     
-    # Write output JSON
-    output_path = Path(args.output_json)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # Write output JSON (skipped when unchanged, so the frontend's cached copy stays valid)
+    with instrument.span('write'):
+        result = write_json(args.output_json, files, verbose=False)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(files, f, indent=2, ensure_ascii=False)
-    
-    print(f"\nManifest written to: {args.output_json}")
+    if result.changed:
+        print(f"\nManifest written to: {args.output_json}")
+    else:
+        print(f"\nManifest unchanged: {args.output_json}")
     return 0
 
 
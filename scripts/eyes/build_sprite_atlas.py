@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Pack body part, eye or footprint images into texture atlases.
+
+The Eyes/body-parts modes otherwise fetch every part as its own PNG. This
+script bin-packs the images (per Pokemon, or the whole set) into atlas sheets
+using a MaxRects packer and writes a manifest with the atlas coordinates of
+every frame, so the frontend can load one image per puzzle.
+
+Images are grouped by the Pokemon ID at the start of the filename
+('1-3.png' -> '1', '25.png' -> '25'). If --manifest is given, the groups and
+file order are taken from it instead (either a flat list like
+eyes_manifest.json, or an {id: [files]} mapping like the "trimmed" section of
+body_parts_manifest.json).
+
+Usage:
+    python build_sprite_atlas.py --input-dir ./body_parts/trimmed --output-dir ./body_parts/atlas \
+        --manifest ../../public/data/body_parts_manifest.json --manifest-key trimmed
+    python build_sprite_atlas.py --input-dir ./eyes/trimmed --output-dir ./eyes/atlas --group all
+    python build_sprite_atlas.py --input-dir ./footprints --output-dir ./footprints/atlas --group all --max-size 1024
+
+Output manifest format (atlas_manifest.json):
+{
+  "1": {
+    "image": "1.png",
+    "width": 212,
+    "height": 180,
+    "frames": {
+      "1-1.png": {"x": 0, "y": 0, "w": 120, "h": 96},
+      ...
+    }
+  }
+}
+
+With --group all the keys are page names ('atlas-0', 'atlas-1', ...) and an
+extra "index" section maps each source filename to its page.
+
+Requirements:
+    pip install pillow
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+from pathlib import Path
+
+from PIL import Image
+
+
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.webp')
+
+
+def get_pokemon_id(filename):
+    """Extract the Pokemon ID from a filename like '1-3.png' or '1.png' -> '1'"""
+    m = re.match(r'(\d+)', os.path.splitext(filename)[0])
+    return m.group(1) if m else None
+
+
+def natural_key(filename):
+    """Sort key that orders '1-2.png' before '1-11.png'"""
+    return [int(t) if t.isdigit() else t for t in re.split(r'(\d+)', filename)]
+
+
+def scan_groups(input_dir):
+    """Group image filenames in input_dir by Pokemon ID"""
+    groups = {}
+    for filename in os.listdir(input_dir):
+        if filename.startswith('.') or not filename.lower().endswith(IMAGE_EXTS):
+            continue
+        pid = get_pokemon_id(filename)
+        if pid is None:
+            continue
+        groups.setdefault(pid, []).append(filename)
+    for files in groups.values():
+        files.sort(key=natural_key)
+    return {k: groups[k] for k in sorted(groups, key=int)}
+
+
+def groups_from_manifest(manifest_path, key=None):
+    """Read groups from an existing manifest (flat list or {id: [files]} mapping)"""
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if key:
+        data = data[key]
+    if isinstance(data, list):
+        groups = {}
+        for filename in data:
+            pid = get_pokemon_id(filename)
+            if pid is not None:
+                groups.setdefault(pid, []).append(filename)
+        return groups
+    return {str(k): list(v) for k, v in data.items()}
+
+
+class MaxRectsBin:
+    """MaxRects bin packer using the best-short-side-fit heuristic (no rotation)."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.free = [(0, 0, width, height)]
+
+    def insert(self, w, h):
+        """Place a w x h rectangle; return (x, y) or None if it does not fit."""
+        best = None
+        best_score = None
+        for fx, fy, fw, fh in self.free:
+            if w <= fw and h <= fh:
+                score = (min(fw - w, fh - h), max(fw - w, fh - h))
+                if best_score is None or score < best_score:
+                    best_score = score
+                    best = (fx, fy)
+        if best is None:
+            return None
+        self._split(best[0], best[1], w, h)
+        return best
+
+    def _split(self, x, y, w, h):
+        new_free = []
+        for fx, fy, fw, fh in self.free:
+            # Keep free rects that don't intersect the placed rect
+            if x >= fx + fw or x + w <= fx or y >= fy + fh or y + h <= fy:
+                new_free.append((fx, fy, fw, fh))
+                continue
+            if x > fx:
+                new_free.append((fx, fy, x - fx, fh))
+            if x + w < fx + fw:
+                new_free.append((x + w, fy, fx + fw - (x + w), fh))
+            if y > fy:
+                new_free.append((fx, fy, fw, y - fy))
+            if y + h < fy + fh:
+                new_free.append((fx, y + h, fw, fy + fh - (y + h)))
+        # Prune free rects contained in another free rect
+        pruned = []
+        for i, a in enumerate(new_free):
+            contained = False
+            for j, b in enumerate(new_free):
+                if i != j and a[0] >= b[0] and a[1] >= b[1] \
+                        and a[0] + a[2] <= b[0] + b[2] and a[1] + a[3] <= b[1] + b[3] \
+                        and (a != b or i > j):
+                    contained = True
+                    break
+            if not contained:
+                pruned.append(a)
+        self.free = pruned
+
+
+def next_pow2(n):
+    return 1 << max(0, math.ceil(math.log2(max(1, n))))
+
+
+def pack_fixed(sizes, width, height, padding):
+    """Pack as many (name, w, h) as fit into one width x height bin.
+
+    Returns (placements, leftover) where placements maps name -> (x, y, w, h).
+    """
+    packer = MaxRectsBin(width, height)
+    placements = {}
+    leftover = []
+    for name, w, h in sizes:
+        pos = packer.insert(w + padding, h + padding)
+        if pos is None:
+            leftover.append((name, w, h))
+        else:
+            placements[name] = (pos[0], pos[1], w, h)
+    return placements, leftover
+
+
+def pack_group(sizes, padding=1, max_size=2048, power_of_two=False):
+    """Pack sizes into the smallest atlas that holds all of them.
+
+    Starts from a square close to the total area and grows the shorter side until
+    everything fits. Returns (placements, width, height), or raises ValueError if
+    the group does not fit within max_size.
+    """
+    sizes = sorted(sizes, key=lambda s: (max(s[1], s[2]), s[1] * s[2]), reverse=True)
+    total = sum((w + padding) * (h + padding) for _, w, h in sizes)
+    widest = max(w for _, w, _ in sizes) + padding
+    tallest = max(h for _, _, h in sizes) + padding
+    side = max(int(math.ceil(math.sqrt(total))), 1)
+    width, height = max(side, widest), max(side, tallest)
+    while True:
+        if power_of_two:
+            width, height = next_pow2(width), next_pow2(height)
+        if width > max_size or height > max_size:
+            raise ValueError(f'group does not fit in {max_size}x{max_size}')
+        placements, leftover = pack_fixed(sizes, width, height, padding)
+        if not leftover:
+            break
+        if width <= height:
+            width = width * 2 if power_of_two else int(math.ceil(width * 1.1)) + 1
+        else:
+            height = height * 2 if power_of_two else int(math.ceil(height * 1.1)) + 1
+    if not power_of_two:
+        # Trim unused space on the right/bottom edge
+        width = max(x + w for x, y, w, h in placements.values())
+        height = max(y + h for x, y, w, h in placements.values())
+    return placements, width, height
+
+
+def pack_pages(sizes, padding=1, max_size=2048, power_of_two=False):
+    """Pack sizes into as many max_size pages as needed. Yields (placements, width, height)."""
+    remaining = sorted(sizes, key=lambda s: (max(s[1], s[2]), s[1] * s[2]), reverse=True)
+    while remaining:
+        try:
+            yield pack_group(remaining, padding, max_size, power_of_two)
+            return
+        except ValueError:
+            pass
+        placements, leftover = pack_fixed(remaining, max_size, max_size, padding)
+        if not placements:
+            name, w, h = remaining[0]
+            raise ValueError(f'{name} ({w}x{h}) is larger than the {max_size}px atlas limit')
+        width = max(x + w for x, y, w, h in placements.values())
+        height = max(y + h for x, y, w, h in placements.values())
+        if power_of_two:
+            width, height = next_pow2(width), next_pow2(height)
+        yield placements, width, height
+        remaining = leftover
+
+
+def render_atlas(images, placements, width, height):
+    atlas = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    for name, (x, y, w, h) in placements.items():
+        atlas.paste(images[name], (x, y))
+    return atlas
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Pack body part / eye / footprint images into texture atlases'
+    )
+    parser.add_argument('--input-dir', required=True, help='Directory containing the source images')
+    parser.add_argument('--output-dir', required=True, help='Directory to write atlas images into')
+    parser.add_argument('--output-json', help='Atlas manifest path (default: <output-dir>/atlas_manifest.json)')
+    parser.add_argument('--manifest', help='Existing manifest to take groups/order from (default: scan input dir)')
+    parser.add_argument('--manifest-key', help="Key inside --manifest holding the groups (e.g. 'trimmed')")
+    parser.add_argument('--group', choices=('pokemon', 'all'), default='pokemon',
+                        help="One atlas per Pokemon, or pack the whole set into shared pages (default: pokemon)")
+    parser.add_argument('--padding', type=int, default=1, help='Transparent pixels between frames (default: 1)')
+    parser.add_argument('--max-size', type=int, default=2048, help='Maximum atlas width/height (default: 2048)')
+    parser.add_argument('--power-of-two', action='store_true', help='Round atlas dimensions up to powers of two')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input_dir):
+        print(f"Error: Input directory '{args.input_dir}' does not exist")
+        return 1
+
+    groups = groups_from_manifest(args.manifest, args.manifest_key) if args.manifest else scan_groups(args.input_dir)
+    if not groups:
+        print('Warning: No image files found. Nothing to pack.')
+        return 0
+
+    if args.group == 'all':
+        groups = {'all': [f for files in groups.values() for f in files]}
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    padding = max(0, args.padding)
+
+    manifest = {}
+    index = {}
+    used_area = 0
+    atlas_area = 0
+    failed = 0
+    for key, files in groups.items():
+        images = {}
+        for filename in files:
+            path = os.path.join(args.input_dir, filename)
+            if not os.path.exists(path):
+                print(f'  Missing: {path}')
+                continue
+            images[filename] = Image.open(path).convert('RGBA')
+        if not images:
+            continue
+        sizes = [(name, im.width, im.height) for name, im in images.items()]
+        try:
+            if args.group == 'all':
+                pages = list(pack_pages(sizes, padding, args.max_size, args.power_of_two))
+            else:
+                pages = [pack_group(sizes, padding, args.max_size, args.power_of_two)]
+        except ValueError as e:
+            print(f'  Failed to pack {key}: {e}')
+            failed += 1
+            continue
+
+        for page_no, (placements, width, height) in enumerate(pages):
+            page_key = f'atlas-{page_no}' if args.group == 'all' else key
+            image_name = f'{page_key}.png'
+            render_atlas(images, placements, width, height).save(output_dir / image_name, optimize=True)
+            # Keep frames in source order so consumers can index parts positionally
+            frames = {
+                name: dict(zip(('x', 'y', 'w', 'h'), placements[name]))
+                for name in files if name in placements
+            }
+            manifest[page_key] = {'image': image_name, 'width': width, 'height': height, 'frames': frames}
+            for name in frames:
+                index[name] = page_key
+            page_used = sum(w * h for x, y, w, h in placements.values())
+            used_area += page_used
+            atlas_area += width * height
+            if args.group == 'all':
+                print(f'  {image_name}: {len(frames)} frames, {width}x{height}, '
+                      f'{100.0 * page_used / (width * height):.1f}% used')
+
+    if args.group == 'all':
+        manifest['index'] = index
+
+    output_json = Path(args.output_json) if args.output_json else output_dir / 'atlas_manifest.json'
+    output_json.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_json, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    atlases = len(manifest) - (1 if 'index' in manifest else 0)
+    efficiency = (100.0 * used_area / atlas_area) if atlas_area else 0.0
+    print(f'\nPacked {len(index)} images into {atlases} atlases ({failed} groups failed)')
+    print(f'Packing efficiency: {efficiency:.1f}% ({used_area} of {atlas_area} pixels used)')
+    print(f'Manifest written to: {output_json}')
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
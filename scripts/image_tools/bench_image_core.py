@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the image_core mask helpers.
+
+Each helper is timed against the lambda-based `Image.point` code it replaced,
+on synthetic sprites (or real images from `--images-dir`). Results are printed
+as a table of mean milliseconds per call and the speedup.
+
+Usage:
+  python scripts/image_tools/bench_image_core.py
+  python scripts/image_tools/bench_image_core.py --images-dir ./sprites --repeat 20 --size 475
+
+Requires: Pillow (NumPy optional; the NumPy bbox paths are only measured if installed)
+"""
+
+import argparse
+import os
+import random
+import timeit
+
+from PIL import Image, ImageChops, ImageDraw
+
+import image_core
+
+
+def make_sprite(size, seed):
+    """Synthetic sprite: a few filled, outlined shapes on a transparent canvas."""
+    rnd = random.Random(seed)
+    im = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(im)
+    for _ in range(6):
+        x0, y0 = rnd.randint(size // 8, size // 2), rnd.randint(size // 8, size // 2)
+        x1, y1 = x0 + rnd.randint(size // 8, size // 3), y0 + rnd.randint(size // 8, size // 3)
+        fill = tuple(rnd.randint(0, 255) for _ in range(3)) + (rnd.choice((128, 255)),)
+        draw.ellipse((x0, y0, x1, y1), fill=fill, outline=(0, 0, 0, 255), width=3)
+    return im
+
+
+def load_images(images_dir, limit):
+    exts = {'.png', '.jpg', '.jpeg', '.webp'}
+    out = []
+    for f in sorted(os.listdir(images_dir)):
+        if os.path.splitext(f)[1].lower() in exts:
+            with Image.open(os.path.join(images_dir, f)) as im:
+                out.append(im.convert('RGBA'))
+            if len(out) >= limit:
+                break
+    return out
+
+
+# --- Baselines: the code the helpers replaced ---------------------------------
+
+def old_keep_black_mask(im, threshold):
+    im_rgba = im.convert('RGBA')
+    mask = im_rgba.convert('L').point(lambda p: 255 if p <= threshold else 0)
+    return ImageChops.darker(im_rgba.split()[3], mask)
+
+
+def old_alpha_bbox(im, threshold=1):
+    alpha = im.split()[-1]
+    return alpha.point(lambda p: 255 if p >= threshold else 0).getbbox()
+
+
+def old_luma_bbox(im):
+    return im.convert('L').point(lambda p: 0 if p >= 250 else 255).getbbox()
+
+
+def old_foreground_mask(im):
+    a = im.convert('RGBA').split()[3]
+    if a.getbbox():
+        return a.point(lambda p: 255 if p > 0 else 0).convert('L')
+    return image_core.background_diff(im.convert('RGBA')).point(lambda p: 255 if p > 0 else 0)
+
+
+def old_foreground_bbox(im):
+    im_rgba = im.convert('RGBA')
+    r, g, b, a = im_rgba.split()
+    bbox = a.getbbox()
+    if bbox:
+        return bbox
+    return image_core.background_diff(im_rgba).point(lambda p: 255 if p else 0).getbbox()
+
+
+def old_binarize(mask):
+    return mask.convert('L').point(lambda p: 255 if p > 0 else 0)
+
+
+def lut_alpha_bbox(im, threshold=1):
+    return image_core.threshold(im.getchannel('A'), threshold, 'ge').getbbox()
+
+
+def cases(images, opaque, mask):
+    """Return [(name, baseline, helper)] where each callable takes no arguments."""
+    def over(fn, items):
+        return lambda: [fn(x) for x in items]
+
+    out = [
+        ('keep_black (luma_mask)',
+         over(lambda im: old_keep_black_mask(im, 48), images),
+         over(lambda im: image_core.luma_mask(im, 48, 'le'), images)),
+        ('alpha bbox (LUT)',
+         over(old_alpha_bbox, images),
+         over(lut_alpha_bbox, images)),
+        ('foreground_mask',
+         over(old_foreground_mask, images),
+         over(image_core.foreground_mask, images)),
+        ('foreground_bbox (opaque)',
+         over(old_foreground_bbox, opaque),
+         over(image_core.foreground_bbox, opaque)),
+        ('binarize',
+         over(old_binarize, mask),
+         over(image_core.binarize, mask)),
+    ]
+    if image_core.np is not None:
+        out.append(('alpha bbox (NumPy)', over(old_alpha_bbox, images), over(image_core.alpha_bbox, images)))
+        out.append(('luma bbox (NumPy)', over(old_luma_bbox, opaque),
+                    over(lambda im: image_core.channel_bbox(im.convert('L'), 250, 'lt'), opaque)))
+    return out
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description='Benchmark image_core helpers against lambda thresholds')
+    p.add_argument('--images-dir', help='Optional directory of real sprites to benchmark on')
+    p.add_argument('--count', type=int, default=20, help='Number of images per run (default 20)')
+    p.add_argument('--size', type=int, default=475, help='Synthetic sprite size in pixels (default 475)')
+    p.add_argument('--repeat', type=int, default=5, help='Timing repeats; the best run is reported (default 5)')
+    args = p.parse_args(argv)
+
+    if args.images_dir:
+        images = load_images(args.images_dir, args.count)
+        if not images:
+            print(f'No images found in {args.images_dir}')
+            return 2
+    else:
+        images = [make_sprite(args.size, seed) for seed in range(args.count)]
+
+    # Opaque copies on white exercise the no-alpha (background colour) paths
+    opaque = []
+    for im in images:
+        bg = Image.new('RGBA', im.size, (255, 255, 255, 255))
+        opaque.append(Image.alpha_composite(bg, im).convert('RGB'))
+    masks = [im.getchannel('A') for im in images]
+
+    print(f'{len(images)} images, best of {args.repeat} runs (ms per image)\n')
+    print(f"{'helper':<28}{'baseline':>10}{'helper':>10}{'speedup':>9}")
+    for name, baseline, helper in cases(images, opaque, masks):
+        t_old = min(timeit.repeat(baseline, number=1, repeat=args.repeat)) * 1000 / len(images)
+        t_new = min(timeit.repeat(helper, number=1, repeat=args.repeat)) * 1000 / len(images)
+        print(f'{name:<28}{t_old:>10.3f}{t_new:>10.3f}{t_old / t_new:>8.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -9,13 +9,21 @@ For each image this prints the top N colours (hex + count + percentage).
 If `--output-dir` is provided, writes a per-image colour-block PNG named
 `<image_basename>_colors.png` containing the top N colour swatches.
 
-Requires: Pillow
-  pip install pillow
+Histograms are computed with NumPy by packing RGB into a single uint32 per
+pixel and counting with np.unique, and images are processed in a process pool
+(`--workers`). Per-image histograms are merged into a global palette histogram
+for the whole directory; `--global-top` prints it and `--global-out` saves it
+as an .npz (`codes`, `counts`) for later merging.
+
+Requires: Pillow, NumPy
+  pip install pillow numpy
 """
 
 import argparse
 import os
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from PIL import Image
 
 IMAGE_EXTS = {'.png', '.jpg', '.jpeg', '.webp', '.gif', '.bmp', '.tiff'}
@@ -29,11 +37,19 @@ def rgb_to_hex(rgb):
     return '#{:02x}{:02x}{:02x}'.format(*rgb)
 
 
-def collect_colors_from_image(path, max_dim=None, skip_transparent=True):
-    """Open image, optionally downsample, and return Counter of (r,g,b) -> count.
+def pack_rgb(rgb):
+    """Pack an (..., 3) uint8 array into uint32 codes 0xRRGGBB."""
+    rgb = rgb.astype(np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
 
-    If skip_transparent is True, fully transparent pixels (a==0) are ignored.
-    """
+
+def unpack_rgb(code):
+    code = int(code)
+    return ((code >> 16) & 0xFF, (code >> 8) & 0xFF, code & 0xFF)
+
+
+def load_rgba_array(path, max_dim=None):
+    """Open image as an HxWx4 uint8 array, optionally downsampled to max_dim."""
     try:
         im = Image.open(path).convert('RGBA')
     except Exception as e:
@@ -45,17 +61,100 @@ def collect_colors_from_image(path, max_dim=None, skip_transparent=True):
         if max(w, h) > max_dim:
             scale = max_dim / float(max(w, h))
             im = im.resize((int(w * scale), int(h * scale)), Image.Resampling.LANCZOS)
+    return np.asarray(im)
+
+
+def color_histogram(arr, skip_transparent=True):
+    """Return (codes, counts) for an HxWx4 RGBA array.
 
-    data = im.getdata()
+    `codes` are packed 0xRRGGBB uint32 values ordered by first appearance in
+    the image (matching the insertion order of the old Counter loop), and
+    `counts` the matching pixel counts.
+    """
+    px = arr.reshape(-1, 4)
+    if skip_transparent:
+        px = px[px[:, 3] != 0]
+    codes = pack_rgb(px[:, :3])
+    uniq, first, counts = np.unique(codes, return_index=True, return_counts=True)
+    order = np.argsort(first, kind='stable')
+    return uniq[order], counts[order].astype(np.int64)
+
+
+def histogram_from_image(path, max_dim=None, skip_transparent=True):
+    return color_histogram(load_rgba_array(path, max_dim=max_dim), skip_transparent=skip_transparent)
+
+
+def histogram_to_counter(codes, counts):
     c = Counter()
-    for px in data:
-        r, g, b, a = px
-        if skip_transparent and a == 0:
-            continue
-        c[(r, g, b)] += 1
+    for code, cnt in zip(codes.tolist(), counts.tolist()):
+        c[unpack_rgb(code)] = cnt
     return c
 
 
+def merge_histograms(histograms):
+    """Merge an iterable of (codes, counts) into one (codes, counts) histogram."""
+    all_codes = []
+    all_counts = []
+    for codes, counts in histograms:
+        all_codes.append(codes)
+        all_counts.append(counts)
+    if not all_codes:
+        return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.int64)
+    uniq, inverse = np.unique(np.concatenate(all_codes), return_inverse=True)
+    merged = np.bincount(inverse.ravel(), weights=np.concatenate(all_counts), minlength=len(uniq))
+    return uniq, merged.astype(np.int64)
+
+
+def top_colors(codes, counts, n):
+    """Return [((r, g, b), count), ...] for the n most common codes."""
+    if n <= 0 or len(codes) == 0:
+        return []
+    # stable sort keeps first-appearance order for ties, like Counter.most_common
+    order = np.argsort(-counts, kind='stable')[:n]
+    return [(unpack_rgb(codes[i]), int(counts[i])) for i in order]
+
+
+def collect_colors_from_image(path, max_dim=None, skip_transparent=True):
+    """Open image, optionally downsample, and return Counter of (r,g,b) -> count.
+
+    If skip_transparent is True, fully transparent pixels (a==0) are ignored.
+    """
+    codes, counts = histogram_from_image(path, max_dim=max_dim, skip_transparent=skip_transparent)
+    return histogram_to_counter(codes, counts)
+
+
+def _histogram_worker(job):
+    fname, path, max_dim, skip_transparent = job
+    try:
+        codes, counts = histogram_from_image(path, max_dim=max_dim, skip_transparent=skip_transparent)
+    except Exception as e:
+        return fname, None, None, str(e)
+    return fname, codes, counts, None
+
+
+def iter_histograms(images_dir, img_files, max_dim=None, skip_transparent=True, workers=None):
+    """Yield (fname, codes, counts, error) for each file, in order.
+
+    With workers > 1 the images are decoded and counted in a process pool. At most
+    4 jobs per worker are submitted ahead of the one being yielded, so memory stays
+    bounded by that window rather than the whole directory.
+    """
+    jobs = ((f, os.path.join(images_dir, f), max_dim, skip_transparent) for f in img_files)
+    if workers is not None and workers <= 1:
+        for job in jobs:
+            yield _histogram_worker(job)
+        return
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        pending = deque()
+        for job in jobs:
+            pending.append(ex.submit(_histogram_worker, job))
+            if len(pending) >= workers * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
 def write_color_blocks(out_path, colors, block_size=100, cols=10, padding=4):
     """Write a small PNG showing colour blocks for the provided colours.
 
@@ -89,6 +188,9 @@ def main():
     p.add_argument('--output-dir', required=False, help='Optional output dir to save per-image colour blocks')
     p.add_argument('--top', type=int, default=20, help='How many top colours to show per image')
     p.add_argument('--max-dim', type=int, default=800, help='If set, downsample images to this max dimension for counting')
+    p.add_argument('--workers', type=int, default=None, help='Worker processes for decoding/counting (default: CPU count, 1 = no pool)')
+    p.add_argument('--global-top', type=int, default=0, help='Also print the top N colours across all images')
+    p.add_argument('--global-out', help='Optional .npz path to save the merged palette histogram (codes, counts)')
     args = p.parse_args()
 
     images_dir = args.images_dir
@@ -106,24 +208,34 @@ def main():
         print('No image files found in', images_dir)
         return 0
 
-    for fname in img_files:
-        path = os.path.join(images_dir, fname)
-        try:
-            ctr = collect_colors_from_image(path, max_dim=args.max_dim, skip_transparent=True)
-        except Exception as e:
-            print(f'ERROR reading {fname}: {e}')
+    # Remove pure black and a few near-black artefacts from results entirely
+    # Exclude these exact RGB tuples: #000000, #010101, #010000, #0a080b
+    bad_codes = pack_rgb(np.array([(0, 0, 0), (1, 1, 1), (1, 0, 0), (10, 8, 11)], dtype=np.uint8))
+
+    want_global = bool(args.global_top or args.global_out)
+    g_hist = merge_histograms([])
+    pending = []
+    n_counted = 0
+    for fname, codes, counts, err in iter_histograms(images_dir, img_files, max_dim=args.max_dim,
+                                                     skip_transparent=True, workers=args.workers):
+        if err is not None:
+            print(f'ERROR reading {fname}: {err}')
             continue
-        # Remove pure black and a few near-black artefacts from results entirely
-        # Exclude these exact RGB tuples: #000000, #010101, #010000, #0a080b
-        for bad in ((0, 0, 0), (1, 1, 1), (1, 0, 0), (10, 8, 11)):
-            if bad in ctr:
-                del ctr[bad]
-        total = sum(ctr.values())
+        keep = ~np.isin(codes, bad_codes)
+        codes, counts = codes[keep], counts[keep]
+        if want_global:
+            # fold into the running global histogram in batches to bound memory
+            pending.append((codes, counts))
+            n_counted += 1
+            if len(pending) >= 32:
+                g_hist = merge_histograms([g_hist] + pending)
+                pending = []
+        total = int(counts.sum())
         print(f"\n{fname}  (pixels counted: {total})")
         if total == 0:
             print('  No opaque pixels found')
             continue
-        topn = ctr.most_common(args.top)
+        topn = top_colors(codes, counts, args.top)
         for i, (rgb, c) in enumerate(topn, start=1):
             print(f'  {i:2d}. {rgb_to_hex(rgb)}  count={c}  ({c/total:.2%})')
 
@@ -139,6 +251,17 @@ def main():
             else:
                 print(f'  Wrote color blocks to {out_path}')
 
+    if want_global:
+        g_codes, g_counts = merge_histograms([g_hist] + pending)
+        g_total = int(g_counts.sum())
+        if args.global_top and g_total:
+            print(f"\nAll images  ({n_counted} images, {len(g_codes)} distinct colours, pixels counted: {g_total})")
+            for i, (rgb, c) in enumerate(top_colors(g_codes, g_counts, args.global_top), start=1):
+                print(f'  {i:2d}. {rgb_to_hex(rgb)}  count={c}  ({c/g_total:.2%})')
+        if args.global_out:
+            np.savez_compressed(args.global_out, codes=g_codes, counts=g_counts)
+            print(f'\nWrote global palette histogram to {args.global_out}')
+
     return 0
 
 
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Shared mask and bounding-box helpers for the image_tools scripts.
+
+The scripts in this folder used to threshold with `Image.point(lambda p: ...)`,
+which calls back into Python for every distinct value, and converted each image
+RGBA -> L -> mask through several intermediate copies. These helpers use
+precomputed 256-entry lookup tables (applied in C by Pillow), convert each image
+at most once, and pull single channels with `getchannel` instead of `split`.
+
+Bounding boxes are found with NumPy when it is installed (one pass over the
+channel, no thresholded image is built). Without NumPy the helpers fall back to
+LUT + `getbbox`, so scripts that only need Pillow keep working.
+
+Import from sibling scripts with:
+
+    from image_core import alpha_bbox, foreground_mask, luma_mask
+
+Benchmarks for each helper live in `bench_image_core.py`.
+"""
+
+from functools import lru_cache
+
+from PIL import Image, ImageChops
+
+try:
+    import numpy as np
+except ImportError:  # Pillow-only environments
+    np = None
+
+
+@lru_cache(maxsize=None)
+def threshold_lut(threshold: int, mode: str = 'ge'):
+    """Return a 256-entry LUT mapping values to 255/0.
+
+    mode is one of 'ge' (p >= threshold), 'gt' (p > threshold),
+    'le' (p <= threshold) or 'lt' (p < threshold).
+    """
+    if mode == 'ge':
+        return tuple(255 if p >= threshold else 0 for p in range(256))
+    if mode == 'gt':
+        return tuple(255 if p > threshold else 0 for p in range(256))
+    if mode == 'le':
+        return tuple(255 if p <= threshold else 0 for p in range(256))
+    if mode == 'lt':
+        return tuple(255 if p < threshold else 0 for p in range(256))
+    raise ValueError(f'Unknown threshold mode: {mode}')
+
+
+# Any non-zero value -> 255
+NONZERO_LUT = threshold_lut(0, 'gt')
+
+
+def to_rgba(im: Image.Image):
+    """Return im as RGBA, without copying when it already is."""
+    return im if im.mode == 'RGBA' else im.convert('RGBA')
+
+
+def has_alpha(im: Image.Image):
+    return im.mode in ('RGBA', 'LA') or ('transparency' in im.info)
+
+
+def threshold(channel: Image.Image, value: int, mode: str = 'ge'):
+    """Threshold a single-channel (L) image to a 0/255 mask using a cached LUT."""
+    return channel.point(threshold_lut(value, mode))
+
+
+def binarize(mask: Image.Image):
+    """Return an L mask where every non-zero pixel is 255."""
+    if mask.mode != 'L':
+        mask = mask.convert('L')
+    return mask.point(NONZERO_LUT)
+
+
+def array_bbox(mask):
+    """Return (left, upper, right, lower) of True/non-zero entries in a 2D array, or None."""
+    rows = np.flatnonzero(mask.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(mask.any(axis=0))
+    return (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+
+
+def channel_bbox(channel: Image.Image, value: int = 1, mode: str = 'ge'):
+    """Bounding box of pixels in a single-channel image passing the threshold.
+
+    Uses NumPy when available; otherwise thresholds with a LUT and calls getbbox.
+    """
+    if np is not None:
+        arr = np.asarray(channel)
+        if mode == 'ge':
+            sel = arr >= value
+        elif mode == 'gt':
+            sel = arr > value
+        elif mode == 'le':
+            sel = arr <= value
+        elif mode == 'lt':
+            sel = arr < value
+        else:
+            raise ValueError(f'Unknown threshold mode: {mode}')
+        return array_bbox(sel)
+    return threshold(channel, value, mode).getbbox()
+
+
+def alpha_bbox(im: Image.Image, value: int = 1):
+    """Bounding box of pixels with alpha >= value (im must have an alpha channel)."""
+    return channel_bbox(im.getchannel('A'), value, 'ge')
+
+
+def background_diff(im_rgba: Image.Image):
+    """Return an L image of the difference from the top-left pixel colour.
+
+    Non-zero pixels differ from the assumed background. This mirrors the old
+    `ImageChops.difference(...).convert('L')` behaviour exactly.
+    """
+    bg_color = im_rgba.getpixel((0, 0))[:3]
+    img_rgb = im_rgba.convert('RGB')
+    bg = Image.new('RGB', img_rgb.size, bg_color)
+    return ImageChops.difference(img_rgb, bg).convert('L')
+
+
+def foreground_mask(im: Image.Image):
+    """Return a binary mask (L mode) where foreground pixels are 255.
+
+    Uses alpha channel if any non-zero alpha exists; otherwise uses top-left
+    pixel as background and marks differing pixels as foreground.
+    """
+    im_rgba = to_rgba(im)
+    a = im_rgba.getchannel('A')
+    if a.getbbox():
+        return a.point(NONZERO_LUT)
+    return background_diff(im_rgba).point(NONZERO_LUT)
+
+
+def foreground_bbox(im: Image.Image):
+    """Bounding box of the foreground as defined by `foreground_mask`, or None."""
+    im_rgba = to_rgba(im)
+    bbox = im_rgba.getchannel('A').getbbox()
+    if bbox:
+        return bbox
+    # getbbox on L already means "any non-zero", so no threshold pass is needed
+    return background_diff(im_rgba).getbbox()
+
+
+def luma_mask(im: Image.Image, value: int, mode: str = 'le', respect_alpha: bool = True):
+    """Return an L mask of pixels whose luma passes the threshold.
+
+    If respect_alpha is True the mask is AND-ed with the image's alpha channel
+    so fully transparent pixels are never selected.
+    """
+    im_rgba = to_rgba(im)
+    mask = threshold(im_rgba.convert('L'), value, mode)
+    if respect_alpha:
+        # darker (min) is a logical AND on 0/255 images
+        mask = ImageChops.darker(im_rgba.getchannel('A'), mask)
+    return mask
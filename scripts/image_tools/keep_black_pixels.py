@@ -17,32 +17,28 @@ Options:
   --overwrite    Overwrite existing outputs
 
 Notes:
- - The script uses Pillow only. It preserves existing alpha by AND-ing the
-   computed black mask with the original alpha channel if present.
+ - The script uses Pillow only (mask helpers come from image_core.py). It
+   preserves existing alpha by AND-ing the computed black mask with the
+   original alpha channel if present.
  - Output will be PNG if the chosen output extension doesn't support alpha.
 """
 
-from PIL import Image, ImageChops
+from PIL import Image
 import argparse
 import os
 import sys
 
+from image_core import luma_mask, to_rgba
+
 
 def keep_black_image(im: Image.Image, threshold: int):
     """Return an RGBA image where only near-black pixels are kept (black on transparent)."""
-    im_rgba = im.convert('RGBA')
+    im_rgba = to_rgba(im)
     w, h = im_rgba.size
 
-    # Convert to luma (Pillow's 'L' uses the standard coefficients)
-    luma = im_rgba.convert('L')
-
-    # Binary mask where luma <= threshold -> 255 else 0
-    mask = luma.point(lambda p: 255 if p <= threshold else 0)
-
-    # Combine with original alpha so we don't resurrect fully transparent pixels
-    orig_alpha = im_rgba.split()[3]
-    # Use darker (min) to perform logical AND on 0/255 images
-    combined = ImageChops.darker(orig_alpha, mask)
+    # Luma <= threshold -> 255, AND-ed with the original alpha so we don't
+    # resurrect fully transparent pixels
+    combined = luma_mask(im_rgba, threshold, 'le', respect_alpha=True)
 
     # Create black image and apply combined as alpha
     black = Image.new('RGBA', (w, h), (0, 0, 0, 255))
@@ -41,6 +41,10 @@ import numpy as np
 from skimage.color import rgb2lab
 from sklearn.cluster import KMeans
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import instrument
+from common.image_cache import open_rgba
+
 # --- Argument parsing ---
 def parse_args():
     parser = argparse.ArgumentParser(description="Extract most common colors from images in a directory and create color block images.")
@@ -53,6 +57,7 @@ def parse_args():
     parser.add_argument('--num-blocks', type=int, default=None, help='Number of color blocks to produce in the output image (defaults to --num-colors)')
     parser.add_argument('--threshold', type=float, default=3.0, help='Lab distance threshold for considering colors similar (default: 3.0)')
     parser.add_argument('--jpg', action='store_true', help='Save color block images as JPEG instead of PNG')
+    instrument.add_arguments(parser)
     return parser.parse_args()
 
 # --- Main processing ---
@@ -69,8 +74,7 @@ def lab_distance(lab1, lab2):
     return np.linalg.norm(lab1 - lab2)
 
 def get_most_common_colors(image_path, num_colors=10):
-    with Image.open(image_path) as img:
-        img = img.convert('RGBA')
+    with open_rgba(image_path) as img:
         # Resize to speed up color counting
         small = img.resize((256, 256), Image.LANCZOS)
         # If verbose/debug mode is enabled, save the resized image to the debug dir
@@ -240,6 +244,7 @@ def create_color_blocks(colors, out_path):
 
 def main():
     args = parse_args()
+    instrument.setup(args)
     # Expose verbose to other helper functions for diagnostic printing
     global VERBOSE
     VERBOSE = bool(args.verbose)
@@ -304,11 +309,13 @@ def main():
         if args.verbose:
             print(f"[{idx+1}/{len(files)}] Processing {fname} -> {out_fname} ...")
         try:
-            colors = get_most_common_colors(in_path, args.num_colors)
-            # Optionally merge visually-similar clusters before drawing blocks
-            merged_colors = merge_similar_clusters(colors, threshold=args.threshold)
-            # Reduce to requested number of blocks if necessary
-            reduced_colors = reduce_clusters_to_n(merged_colors, args.num_blocks)
+            with instrument.span('kmeans', item=fname):
+                colors = get_most_common_colors(in_path, args.num_colors)
+            with instrument.span('merge', item=fname):
+                # Optionally merge visually-similar clusters before drawing blocks
+                merged_colors = merge_similar_clusters(colors, threshold=args.threshold)
+                # Reduce to requested number of blocks if necessary
+                reduced_colors = reduce_clusters_to_n(merged_colors, args.num_blocks)
             if args.verbose:
                 print("    After merging/reducing clusters:")
                 for i, (c, cnt) in enumerate(reduced_colors, start=1):
@@ -317,7 +324,8 @@ def main():
                     except Exception:
                         rgb = c
                     print(f"      {i}: {rgb} - {cnt} px")
-            create_color_blocks(reduced_colors, out_path)
+            with instrument.span('blocks', item=fname):
+                create_color_blocks(reduced_colors, out_path)
             # Only consider top 5 colors (after merging/reducing), and select up to 3 visually distinct names with special rules
             top_colors = reduced_colors[:5]
             csv_colors = []  # (rgb, name) for csv
@@ -385,6 +393,7 @@ def main():
                     print(f"      {i}: {rgb} - {percent:.1f}% - {rgb_to_name(rgb)}")
                 print(f"    Saved to {out_path}")
         except Exception as e:
+            instrument.count('errors')
             print(f"Error processing {fname}: {e}", file=sys.stderr)
 
     # Sort results numerically by filename (first column)
@@ -18,6 +18,9 @@ Options:
   --extensions LIST   Comma-separated extensions to consider (default: png,jpg,jpeg)
 
 This script uses only Python standard library.
+
+Afterwards, scripts/image_tools/tile_location_maps.py cuts the matched maps
+into tiles and writes per-location crop boxes to location_map_tiles.json.
 """
 import argparse
 import json
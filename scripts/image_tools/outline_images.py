@@ -27,6 +27,11 @@ import os
 import sys
 import re
 
+from image_core import binarize, foreground_mask
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.image_cache import open_rgba
+
 
 def parse_color(col_str):
     # Accept '#RRGGBB' or common names (pass-through to Pillow may accept names)
@@ -47,32 +52,6 @@ def parse_color(col_str):
     return col_str
 
 
-def foreground_mask(im: Image.Image):
-    """Return a binary mask (L mode) where foreground pixels are 255.
-
-    Uses alpha channel if any non-zero alpha exists; otherwise uses top-left
-    pixel as background and marks differing pixels as foreground.
-    """
-    im_rgba = im.convert('RGBA')
-    r, g, b, a = im_rgba.split()
-    try:
-        alpha_bbox = a.getbbox()
-    except Exception:
-        alpha_bbox = None
-
-    if alpha_bbox:
-        # Use alpha channel: consider any non-zero as foreground
-        return a.point(lambda p: 255 if p > 0 else 0).convert('L')
-
-    # No meaningful alpha; treat top-left pixel as background color
-    bg_color = im_rgba.getpixel((0, 0))[:3]
-    img_rgb = im_rgba.convert('RGB')
-    bg = Image.new('RGB', img_rgb.size, bg_color)
-    diff = ImageChops.difference(img_rgb, bg)
-    mask = diff.convert('L').point(lambda p: 255 if p > 0 else 0)
-    return mask
-
-
 def dilate_mask(mask: Image.Image, width: int):
     """Dilate binary mask by `width` pixels using repeated MaxFilter.
 
@@ -83,7 +62,7 @@ def dilate_mask(mask: Image.Image, width: int):
     if width <= 0:
         return mask
     # Convert to 'L' and ensure binary
-    m = mask.convert('L').point(lambda p: 255 if p > 0 else 0)
+    m = binarize(mask)
     # Cap iterations to avoid pathological runs
     max_iters = min(width, 200)
     for _ in range(max_iters):
@@ -156,7 +135,7 @@ def process_file(in_path, out_path, outline_width, outline_color, overwrite=Fals
         print(f"Skipping existing: {out_path}")
         return 'skipped'
     try:
-        with Image.open(in_path) as im:
+        with open_rgba(in_path) as im:
             result_im = outline_image(im, outline_width, outline_color, pad=True, only_outline=only_outline)
             os.makedirs(os.path.dirname(out_path), exist_ok=True)
 
@@ -173,8 +152,8 @@ def process_file(in_path, out_path, outline_width, outline_color, overwrite=Fals
                 else:
                     fmt = alpha_exts.get(ext, 'PNG')
             else:
-                # prefer original format where available
-                fmt = im.format if im.format else None
+                # prefer the original format; cached images carry no .format, so go by the source extension
+                fmt = Image.registered_extensions().get(os.path.splitext(in_path)[1].lower())
 
             if fmt:
                 save_kw['format'] = fmt
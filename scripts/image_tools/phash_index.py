@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""Perceptual-hash index of image assets, for finding duplicates and near-duplicates.
+
+Usage:
+  # Hash (or re-hash what changed in) some asset folders
+  python scripts/image_tools/phash_index.py scan output/cards output/sprites output/shiny --workers 8
+
+  # Near-duplicate clusters within Hamming distance 6, grouped per Pokemon
+  python scripts/image_tools/phash_index.py dupes --radius 6 --report scripts/data/phash_dupes.json
+
+Each image gets two 64-bit hashes: pHash (top-left 8x8 of the 32x32 DCT
+against its median; needs NumPy) and dHash (9x8 horizontal gradients, Pillow
+only). Transparent pixels are flattened onto white first, so sprites with and
+without alpha compare equal. The index (--index, default
+scripts/data/phash_index.json) keeps size and mtime per file, so a rescan
+only decodes new or changed files and drops entries for deleted ones.
+
+`dupes` finds every pair of distinct hashes within --radius bits with a
+multi-index hash table (HammingIndex), which compares only hashes whose
+chunks nearly match rather than every pair, and joins matches into clusters.
+Clusters are grouped by the Pokemon id that leads the file names (e.g.
+"225-12.jpg", "25-front.png"). In each single-Pokemon cluster the largest
+image (pixels, then bytes) is kept, and the files within --radius of it are
+listed under "drop" for the manifest builders. Since clusters are chained,
+members further from the kept image are only listed as "related". Clusters
+spanning several ids or none are listed under "mixed" for review and never
+dropped.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from PIL import Image
+
+from keep_black_pixels import iter_images
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import write_json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_INDEX = os.path.join(ROOT, 'scripts', 'data', 'phash_index.json')
+POKEMON_ID = re.compile(r'^(\d+)(?=\D|$)')
+
+
+# ---------------------------------------------------------------------------
+# Hashing
+# ---------------------------------------------------------------------------
+
+def _flatten(im):
+    """Greyscale image with any transparency composited onto white."""
+    if im.mode in ('RGBA', 'LA', 'PA') or 'transparency' in im.info:
+        rgba = im.convert('RGBA')
+        bg = Image.new('RGBA', rgba.size, (255, 255, 255, 255))
+        bg.alpha_composite(rgba)
+        im = bg
+    return im.convert('L')
+
+
+def _bits_to_int(bits):
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bool(bit))
+    return value
+
+
+def dhash(grey):
+    small = grey.resize((9, 8), Image.LANCZOS)
+    px = small.tobytes()
+    return _bits_to_int(px[row * 9 + col] > px[row * 9 + col + 1] for row in range(8) for col in range(8))
+
+
+_DCT = None
+
+
+def phash(grey):
+    global _DCT
+    if np is None:
+        return None
+    if _DCT is None:
+        n = 32
+        k = np.arange(n)
+        _DCT = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n)) * np.sqrt(2 / n)
+        _DCT[0] /= np.sqrt(2)
+    pixels = np.asarray(grey.resize((32, 32), Image.LANCZOS), dtype=np.float64)
+    block = (_DCT @ pixels @ _DCT.T)[:8, :8].ravel()
+    median = np.median(block[1:])
+    return _bits_to_int(block > median)
+
+
+def hash_file(job):
+    """(key, entry or None, error or None) for one image."""
+    key, path, size, mtime_ns = job
+    try:
+        with Image.open(path) as im:
+            im.load()
+            width, height = im.size
+            grey = _flatten(im)
+        p = phash(grey)
+        return key, {
+            'size': size, 'mtime_ns': mtime_ns, 'width': width, 'height': height,
+            'phash': f'{p:016x}' if p is not None else None,
+            'dhash': f'{dhash(grey):016x}',
+        }, None
+    except Exception as e:
+        return key, None, str(e)
+
+
+# ---------------------------------------------------------------------------
+# Multi-index Hamming search
+# ---------------------------------------------------------------------------
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+class HammingIndex:
+    """Exact radius search over 64-bit ints by multi-index hashing.
+
+    The bits are split into m chunks (about log2(len(values)) bits each, so
+    buckets stay small) with one hash table per chunk. Two values within
+    `radius` bits differ by at most radius // m bits in at least one chunk, so
+    probing every chunk value within that distance of the query's finds every
+    match, and only the entries in those buckets are compared.
+    """
+
+    def __init__(self, values, radius, bits=64):
+        values = list(values)
+        self.radius = radius
+        chunk_bits = max(4, math.ceil(math.log2(max(len(values), 2))))
+        chunks = max(1, min(radius + 1, round(bits / chunk_bits)))
+        edges = [round(i * bits / chunks) for i in range(chunks + 1)]
+        self.spans = [(lo, hi - lo) for lo, hi in zip(edges, edges[1:])]
+        sub_radius = radius // chunks
+        # XOR masks to probe in each chunk: every way to flip up to sub_radius bits
+        self.probes = [[sum(1 << b for b in flip)
+                        for r in range(sub_radius + 1) for flip in combinations(range(width), r)]
+                       for _, width in self.spans]
+        self.tables = [defaultdict(list) for _ in self.spans]
+        for v in values:
+            for table, (shift, width) in zip(self.tables, self.spans):
+                table[(v >> shift) & ((1 << width) - 1)].append(v)
+
+    def search(self, value):
+        """Values within radius of value (including value itself if indexed)."""
+        candidates = set()
+        for table, probes, (shift, width) in zip(self.tables, self.probes, self.spans):
+            chunk = (value >> shift) & ((1 << width) - 1)
+            for flip in probes:
+                candidates.update(table.get(chunk ^ flip, ()))
+        return [c for c in candidates if hamming(value, c) <= self.radius]
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+def load_index(path):
+    if not os.path.exists(path):
+        return {'version': 1, 'files': {}}
+    with open(path, 'r', encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def index_key(path):
+    full = os.path.abspath(path)
+    rel = os.path.relpath(full, ROOT)
+    return full if rel.startswith('..') else rel.replace(os.sep, '/')
+
+
+def cmd_scan(args):
+    index = load_index(args.index)
+    files = index['files']
+    jobs, seen = [], set()
+    for root in args.roots:
+        if not os.path.isdir(root):
+            print('Not a directory, skipping:', root)
+            continue
+        prefix = index_key(root).rstrip('/') + '/'
+        for path in iter_images(root, recursive=True):
+            key = index_key(path)
+            seen.add(key)
+            st = os.stat(path)
+            old = files.get(key)
+            if not args.force and old and old['size'] == st.st_size and old['mtime_ns'] == st.st_mtime_ns:
+                continue
+            jobs.append((key, path, st.st_size, st.st_mtime_ns))
+        # Forget files under this root that no longer exist
+        for key in [k for k in files if k.startswith(prefix) and k not in seen]:
+            del files[key]
+
+    errors = 0
+
+    def handle(result):
+        nonlocal errors
+        key, entry, error = result
+        if error:
+            errors += 1
+            print(f'ERROR hashing {key}: {error}')
+        else:
+            files[key] = entry
+
+    try:
+        if args.workers is not None and args.workers <= 1:
+            for job in jobs:
+                handle(hash_file(job))
+        elif jobs:
+            with ProcessPoolExecutor(max_workers=args.workers) as ex:
+                for result in ex.map(hash_file, jobs, chunksize=16):
+                    handle(result)
+    finally:
+        # Keep what was hashed even if interrupted
+        index['files'] = dict(sorted(files.items()))
+        write_json(args.index, index, indent=None, separators=(',', ':'))
+    print(f'{len(jobs) - errors} hashed, {errors} errors, {len(files)} files in the index')
+    return 1 if errors else 0
+
+
+def pokemon_of(key):
+    m = POKEMON_ID.match(os.path.basename(key))
+    return int(m.group(1)) if m else None
+
+
+def find_clusters(files, algo, radius):
+    """Lists of index keys whose hashes are within radius of each other (transitively)."""
+    by_hash = defaultdict(list)
+    for key, entry in files.items():
+        if entry.get(algo):
+            by_hash[int(entry[algo], 16)].append(key)
+
+    index = HammingIndex(by_hash, radius)
+
+    parent = {h: h for h in by_hash}
+
+    def find(h):
+        while parent[h] != h:
+            parent[h] = parent[parent[h]]
+            h = parent[h]
+        return h
+
+    for h in by_hash:
+        for other in index.search(h):
+            a, b = find(h), find(other)
+            if a != b:
+                parent[a] = b
+
+    groups = defaultdict(list)
+    for h, keys in by_hash.items():
+        groups[find(h)].extend(keys)
+    return [sorted(keys) for keys in groups.values() if len(keys) > 1]
+
+
+def cmd_dupes(args):
+    files = load_index(args.index)['files']
+    algo = args.algo
+    if algo == 'phash' and not any(e.get('phash') for e in files.values()):
+        print('No pHash values in the index (NumPy was missing when scanning); using dHash')
+        algo = 'dhash'
+
+    clusters = find_clusters(files, algo, args.radius)
+    by_pokemon, mixed, drop = defaultdict(list), [], []
+    for keys in sorted(clusters):
+        hashes = {k: int(files[k][algo], 16) for k in keys}
+        max_distance = max(hamming(a, b) for a in hashes.values() for b in hashes.values())
+        ids = {pokemon_of(k) for k in keys}
+        if len(ids) != 1 or None in ids:
+            # Different Pokemon can look alike (Nidoran, small crops): report only, never drop
+            mixed.append({'files': keys, 'max_distance': max_distance})
+            continue
+        # Keep the biggest image; clusters are chained, so only drop what is within radius of it
+        keep = min(keys, key=lambda k: (-files[k]['width'] * files[k]['height'], -files[k]['size'], k))
+        near = [k for k in keys if k != keep and hamming(hashes[k], hashes[keep]) <= args.radius]
+        cluster = {
+            'keep': keep,
+            'drop': near,
+            'related': [k for k in keys if k != keep and k not in near],
+            'max_distance': max_distance,
+        }
+        drop.extend(near)
+        by_pokemon[str(ids.pop())].append(cluster)
+
+    report = {
+        'algo': algo,
+        'radius': args.radius,
+        'by_pokemon': dict(sorted(by_pokemon.items(), key=lambda kv: int(kv[0]))),
+        'mixed': mixed,
+        'drop': sorted(drop),
+    }
+    if args.report:
+        write_json(args.report, report)
+    print(f'{len(files)} files, {len(clusters)} clusters ({algo}, radius {args.radius}): '
+          f'{sum(len(v) for v in by_pokemon.values())} within one Pokemon across {len(by_pokemon)} Pokemon, '
+          f'{len(mixed)} mixed; {len(drop)} files could be dropped')
+    for cluster in mixed[:10]:
+        print(f"  mixed: {', '.join(cluster['files'])}")
+    return 0
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description='Perceptual-hash index for duplicate asset detection')
+    p.add_argument('--index', default=DEFAULT_INDEX, help='Index JSON (default scripts/data/phash_index.json)')
+    sub = p.add_subparsers(dest='command', required=True)
+
+    sc = sub.add_parser('scan', help='Hash images under the given folders')
+    sc.add_argument('roots', nargs='+')
+    sc.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count, 1 = no pool)')
+    sc.add_argument('--force', action='store_true', help='Re-hash files even if unchanged')
+    sc.set_defaults(func=cmd_scan)
+
+    du = sub.add_parser('dupes', help='Report near-duplicate clusters')
+    du.add_argument('--radius', type=int, default=6, help='Max Hamming distance (default 6 of 64 bits)')
+    du.add_argument('--algo', choices=('phash', 'dhash'), default='phash')
+    du.add_argument('--report', help='Write the clusters and drop list as JSON')
+    du.set_defaults(func=cmd_dupes)
+
+    args = p.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -2,10 +2,14 @@ import os
 import re
 import json
 import shutil
+import sys
 import argparse
 from PIL import Image
 from bs4 import BeautifulSoup
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import instrument
+
 def clean_name(name):
     name = name.replace('Mega', '').replace('ex', '').strip()
     return name
@@ -15,7 +19,9 @@ def main():
     parser.add_argument('directory', help='Directory containing the .htm and _files folder')
     parser.add_argument('--partial', action='store_true', help='Only process 3 files')
     parser.add_argument('--verbose', action='store_true', help='Print detailed actions')
+    instrument.add_arguments(parser)
     args = parser.parse_args()
+    instrument.setup(args)
     base_dir = args.directory
     htm_path = os.path.join(base_dir, 'TCG Pocket Collection Tracker.htm')
     files_dir = os.path.join(base_dir, 'TCG Pocket Collection Tracker_files')
@@ -30,7 +36,7 @@ def main():
     name_to_id = {p['name']: str(p['id']) for p in pokemon_data}
 
     # Parse HTML
-    with open(htm_path, encoding='utf-8') as f:
+    with instrument.span('parse_html'), open(htm_path, encoding='utf-8') as f:
         soup = BeautifulSoup(f, 'html.parser')
 
     # Build a mapping from card code (e.g., B1-251) to cleaned name
@@ -79,13 +85,15 @@ def main():
         try:
             if args.verbose:
                 print(f"  Converting {fname} to {new_fname}...")
-            with Image.open(src_path) as im:
+            with instrument.span('convert', item=fname), Image.open(src_path) as im:
                 rgb_im = im.convert('RGB')
+                instrument.count('images_decoded')
                 rgb_im.save(dst_path, 'JPEG')
             os.remove(src_path)
             print(f"Converted {fname} to {new_fname} and moved to success.")
         except Exception as e:
             shutil.move(src_path, os.path.join(failed_dir, fname))
+            instrument.count('errors')
             print(f"Failed to convert {fname}: {e}. Moved to failed.")
 
 if __name__ == '__main__':
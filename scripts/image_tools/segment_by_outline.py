@@ -15,24 +15,36 @@ Dependencies:
 Notes:
   - This is a heuristic approach that works best on art with clear black outlines.
   - Tune `--thresh`, `--min-area`, and `--morph-iter` for different art styles.
+  - Regions are held as masks cropped to their bounding box (from
+    connectedComponentsWithStats), so memory and time scale with region size
+    rather than regions x image area. Full-size layers are composed at write
+    time, or skipped entirely with `--offsets-only`, which writes cropped parts
+    plus a `<name>-layers.json` file recording where each part sits on the canvas.
 """
 
 import argparse
+import json
 import os
 import cv2
 import numpy as np
+import sys
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.image_cache import rgba_array
+
 
 def ensure_dir(p):
     Path(p).mkdir(parents=True, exist_ok=True)
 
 
 def load_image(path):
-    img = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
-    if img is None:
-        raise RuntimeError(f"Failed to load image: {path}")
-    return img
+    # BGRA, as cv2.imread(IMREAD_UNCHANGED) gives for sprites, from the shared decode cache
+    try:
+        rgba = rgba_array(str(path))
+    except OSError as e:
+        raise RuntimeError(f"Failed to load image: {path} ({e})")
+    return cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGRA)
 
 
 def save_png_with_alpha(path, rgba):
@@ -74,7 +86,7 @@ def visualize_overlay(img, mask, color=(0, 255, 0), alpha=0.5):
 def segment_by_outline(img, thresh=50, min_area=500, morph_iter=2, dilate_iter=2, debug_dir=None):
     """
     img: BGR or BGRA image (numpy array)
-    returns list of (mask, bbox)
+    returns list of (mask, bbox, area) where mask is cropped to bbox (x, y, w, h)
     """
     orig = img.copy()
     h, w = orig.shape[:2]
@@ -109,7 +121,8 @@ def segment_by_outline(img, thresh=50, min_area=500, morph_iter=2, dilate_iter=2
         y = stats[label, cv2.CC_STAT_TOP]
         ww = stats[label, cv2.CC_STAT_WIDTH]
         hh = stats[label, cv2.CC_STAT_HEIGHT]
-        mask = (labels == label).astype('uint8') * 255
+        # Only compare labels inside this component's bounding box
+        mask = (labels[y:y+hh, x:x+ww] == label).astype('uint8') * 255
         regions.append((mask, (x, y, ww, hh), area))
 
     # Sort by descending area
@@ -125,64 +138,102 @@ def segment_by_outline(img, thresh=50, min_area=500, morph_iter=2, dilate_iter=2
         # Overlay top regions
         overlay = orig.copy()
         drawn = np.zeros((h, w), dtype=np.uint8)
-        for i, (mask, bbox, area) in enumerate(regions[:10]):
+        for i, (mask, (x, y, ww, hh), area) in enumerate(regions[:10]):
             color = tuple(int(c) for c in np.random.randint(80, 255, size=3))
-            overlay = visualize_overlay(overlay, mask, color=color, alpha=0.4)
-            drawn = np.maximum(drawn, mask)
+            overlay[y:y+hh, x:x+ww] = visualize_overlay(overlay[y:y+hh, x:x+ww], mask, color=color, alpha=0.4)
+            drawn[y:y+hh, x:x+ww] = np.maximum(drawn[y:y+hh, x:x+ww], mask)
         cv2.imwrite(os.path.join(debug_dir, 'overlay_regions.png'), overlay)
         cv2.imwrite(os.path.join(debug_dir, 'drawn.png'), drawn)
 
     return regions
 
 
-def extract_and_save(orig_img, regions, out_dir, basename, full_only=False):
+def outline_window(mask, bbox, img_shape, thickness=2):
+    """Return (outline, (x0, y0)) for a cropped region mask.
+
+    The mask is padded by `thickness` so contour strokes that spill outside the
+    bounding box are kept, then clipped back to the image bounds. The outline is
+    a single-channel 0/255 array positioned at (x0, y0) on the full canvas.
+    """
+    x, y, w, h = bbox
+    h_full, w_full = img_shape[:2]
+    pad = thickness
+    padded = np.pad(mask, pad, mode='constant')
+    outline = np.zeros_like(padded)
+    # findContours return compatibility
+    contours_info = cv2.findContours(padded, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    contours = contours_info[0] if len(contours_info) == 2 else contours_info[1]
+    if contours:
+        cv2.drawContours(outline, contours, -1, 255, thickness=thickness)
+    # clip the padded window to the canvas
+    x0, y0 = x - pad, y - pad
+    cx0, cy0 = max(0, x0), max(0, y0)
+    cx1, cy1 = min(w_full, x0 + outline.shape[1]), min(h_full, y0 + outline.shape[0])
+    outline = outline[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0]
+    return outline, (cx0, cy0)
+
+
+def extract_and_save(orig_img, regions, out_dir, basename, full_only=False, offsets_only=False):
     ensure_dir(out_dir)
     saved = []
+    h_full, w_full = orig_img.shape[:2]
+    # One shared canvas for full-size layers; each region is written into its
+    # window, saved, then the window is cleared again for the next region.
+    canvas = None if offsets_only else np.zeros((h_full, w_full, 4), dtype=np.uint8)
+    layers = []
     for i, (mask, (x, y, w, h), area) in enumerate(regions):
-        # If not full_only, save cropped region (legacy behavior)
-        if not full_only:
-            mask_crop = mask[y:y+h, x:x+w]
+        # Save cropped region (legacy behavior) unless only full layers were requested
+        if offsets_only or not full_only:
             img_crop = orig_img[y:y+h, x:x+w]
-            bgr = img_crop[:, :, :3]
-            alpha = mask_crop
-            rgba_crop = cv2.cvtColor(bgr, cv2.COLOR_BGR2BGRA)
-            rgba_crop[:, :, 3] = alpha
+            rgba_crop = cv2.cvtColor(img_crop[:, :, :3], cv2.COLOR_BGR2BGRA)
+            rgba_crop[:, :, 3] = mask
             out_path_crop = os.path.join(out_dir, f"{basename}-{i+1}-crop.png")
             save_png_with_alpha(out_path_crop, rgba_crop)
             saved.append(out_path_crop)
+            layers.append({
+                'file': os.path.basename(out_path_crop),
+                'x': int(x),
+                'y': int(y),
+                'width': int(w),
+                'height': int(h),
+                'area': int(area),
+            })
+
+        if offsets_only:
+            continue
 
-        # Always save full-size masked image so parts can be layered back together
-        h_full, w_full = orig_img.shape[:2]
-        rgba_full = np.zeros((h_full, w_full, 4), dtype=np.uint8)
-        # copy BGR channels (handle images with alpha)
-        rgba_full[:, :, :3] = orig_img[:, :, :3]
-        # set alpha to the mask (full-size)
-        rgba_full[:, :, 3] = mask
-
-        # (Optional) draw the outline for this region so the layer contains only
-        # the outline surrounding *this* segment. We'll compute contours from the
-        # mask and draw them into the full-size image as opaque outline pixels.
+        # Full-size masked image so parts can be layered back together.
+        # Only the region's window (plus outline padding) is ever touched.
         try:
-            # findContours return compatibility
-            contours_info = cv2.findContours(mask.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            contours = contours_info[0] if len(contours_info) == 2 else contours_info[1]
-            if contours:
-                # create an outline mask and draw contours
-                outline_mask = np.zeros((h_full, w_full), dtype=np.uint8)
-                # default thickness 2; if user provided outline width it will be applied later
-                cv2.drawContours(outline_mask, contours, -1, 255, thickness=2)
-                # apply outline: make outline pixels opaque and set color to black
-                # Set outline color (black) - can be parameterized later
-                outline_color = (0, 0, 0)
-                rgba_full[outline_mask > 0, :3] = outline_color
-                rgba_full[outline_mask > 0, 3] = 255
+            outline, (ox, oy) = outline_window(mask, (x, y, w, h), orig_img.shape, thickness=2)
         except Exception:
             # ignore contour drawing failures and continue
-            pass
+            outline, (ox, oy) = None, (x, y)
+
+        if outline is not None:
+            oh, ow = outline.shape
+        else:
+            oh, ow = h, w
+        win = canvas[oy:oy+oh, ox:ox+ow]
+        win[y-oy:y-oy+h, x-ox:x-ox+w, :3] = orig_img[y:y+h, x:x+w, :3]
+        win[y-oy:y-oy+h, x-ox:x-ox+w, 3] = mask
+        if outline is not None:
+            # apply outline: make outline pixels opaque and set color to black
+            sel = outline > 0
+            win[sel, :3] = (0, 0, 0)
+            win[sel, 3] = 255
 
         out_path_full = os.path.join(out_dir, f"{basename}-{i+1}.png")
-        save_png_with_alpha(out_path_full, rgba_full)
+        save_png_with_alpha(out_path_full, canvas)
         saved.append(out_path_full)
+        win[:] = 0
+
+    if offsets_only:
+        meta = {'source': basename, 'width': int(w_full), 'height': int(h_full), 'layers': layers}
+        out_path_meta = os.path.join(out_dir, f"{basename}-layers.json")
+        with open(out_path_meta, 'w', encoding='utf-8') as fh:
+            json.dump(meta, fh, indent=2)
+        saved.append(out_path_meta)
     return saved
 
 
@@ -193,7 +244,7 @@ def process_file(path, out_dir, args):
         print(f"No regions found for {path}")
         return []
     basename = Path(path).stem
-    saved = extract_and_save(img, regions, out_dir, basename, full_only=args.full_only)
+    saved = extract_and_save(img, regions, out_dir, basename, full_only=args.full_only, offsets_only=args.offsets_only)
     print(f"Saved {len(saved)} parts for {path} -> {out_dir}")
     return saved
 
@@ -209,6 +260,7 @@ def main():
     p.add_argument('--debug', action='store_true', help='Write debug images into output directory')
     p.add_argument('--full-only', action='store_true', help='Write only full-size masked outputs (skip cropped parts)')
     p.add_argument('--segments-only', action='store_true', help='Only write segment images (suppress debug and other files)')
+    p.add_argument('--offsets-only', action='store_true', help='Write cropped parts plus a <name>-layers.json with canvas offsets instead of full-size layers')
     args = p.parse_args()
 
     inp = Path(args.input)
@@ -245,7 +297,7 @@ def main():
                 print(f"No regions found for {f}")
                 continue
             basename = Path(f).stem
-            extract_and_save(img, regions, str(out), basename, full_only=args_full_only)
+            extract_and_save(img, regions, str(out), basename, full_only=args_full_only, offsets_only=args.offsets_only)
         except Exception as e:
             print(f'Error processing {f}: {e}')
 
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Run the sprite processing chain (trim -> square -> outline -> silhouette) in one pass.
+
+Instead of running trim_images.py, trim_and_square.py, outline_images.py,
+keep_black_pixels.py and the silhouette builder one after another (each
+decoding PNGs from disk and re-encoding with optimize=True), this script
+describes the chain as a small processing graph. Every source image is decoded
+once, the operations run in memory, and only the requested leaf outputs
+(`--targets`) are encoded and written.
+
+Images are processed in parallel (`--workers`). A state file in the output
+directory records a content hash for every written output, built from the
+source file bytes and the op/params of each node on the path to it. Outputs
+whose hash is unchanged are skipped, and an image is not decoded at all when
+every requested output for it is up to date.
+
+Usage:
+  python scripts/image_tools/sprite_pipeline.py --images-dir ./images --output-dir ./out --targets square,silhouette
+  python scripts/image_tools/sprite_pipeline.py --images-dir ./images --output-dir ./out --graph graph.json --targets black
+
+Graph format (JSON; omit --graph to use DEFAULT_GRAPH below):
+{
+  "trim":       {"op": "trim",       "input": "source", "params": {"padding": 0}},
+  "square":     {"op": "square",     "input": "trim",   "params": {"padding": 4}},
+  "outline":    {"op": "outline",    "input": "square", "params": {"width": 4, "color": "#000"}},
+  ...
+}
+
+Each target is written to `<output-dir>/<node name>/<relative path>.png`.
+
+Requires: Pillow (NumPy for the silhouette op)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from keep_black_pixels import iter_images, keep_black_image
+from outline_images import outline_image, parse_color
+from trim_and_square import trim_and_square
+from trim_images import trim_image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.image_cache import open_rgba
+
+STATE_FILE = '.pipeline_state.json'
+
+DEFAULT_GRAPH = {
+    'trim': {'op': 'trim', 'input': 'source', 'params': {'padding': 0}},
+    'square': {'op': 'square', 'input': 'trim', 'params': {'padding': 0}},
+    'outline': {'op': 'outline', 'input': 'square', 'params': {'width': 4, 'color': '#000'}},
+    'black': {'op': 'keep_black', 'input': 'square', 'params': {'threshold': 48}},
+    'silhouette': {'op': 'silhouette', 'input': 'square', 'params': {'margin': 5}},
+}
+
+
+def op_trim(im, padding=0):
+    cropped = trim_image(im, padding=padding)
+    return im if cropped is None else cropped
+
+
+def op_square(im, padding=0):
+    return trim_and_square(im, padding=padding)
+
+
+def op_outline(im, width=4, color='#000', only_outline=False):
+    return outline_image(im, max(0, width), parse_color(color), only_outline=only_outline)
+
+
+def op_keep_black(im, threshold=48):
+    return keep_black_image(im, max(0, min(255, threshold)))
+
+
+def op_silhouette(im, margin=5):
+    """Black silhouette keeping the original alpha, cropped to its content plus margin."""
+    import numpy as np
+
+    arr = np.asarray(im).copy()
+    arr[:, :, :3] = 0
+    ys, xs = np.nonzero(arr[:, :, 3])
+    silhouette = Image.fromarray(arr, 'RGBA')
+    if len(xs) == 0:
+        return silhouette
+    left = max(int(xs.min()) - margin, 0)
+    upper = max(int(ys.min()) - margin, 0)
+    right = min(int(xs.max()) + margin, arr.shape[1] - 1)
+    lower = min(int(ys.max()) + margin, arr.shape[0] - 1)
+    return silhouette.crop((left, upper, right + 1, lower + 1))
+
+
+# Bump an op's version when its output changes for the same params so cached
+# outputs are rebuilt.
+OPS = {
+    'trim': (op_trim, 1),
+    'square': (op_square, 1),
+    'outline': (op_outline, 1),
+    'keep_black': (op_keep_black, 1),
+    'silhouette': (op_silhouette, 1),
+}
+
+
+def load_graph(path=None):
+    graph = DEFAULT_GRAPH
+    if path:
+        with open(path, 'r', encoding='utf-8') as fh:
+            graph = json.load(fh)
+    for name, node in graph.items():
+        if name == 'source':
+            raise ValueError("'source' is reserved for the decoded input image")
+        if node.get('op') not in OPS:
+            raise ValueError(f"Node '{name}' has unknown op: {node.get('op')}")
+        parent = node.get('input', 'source')
+        if parent != 'source' and parent not in graph:
+            raise ValueError(f"Node '{name}' reads from unknown node: {parent}")
+    # Reject cycles
+    for name in graph:
+        seen = set()
+        cur = name
+        while cur != 'source':
+            if cur in seen:
+                raise ValueError(f"Cycle in graph at node '{name}'")
+            seen.add(cur)
+            cur = graph[cur].get('input', 'source')
+    return graph
+
+
+def chain_for(graph, target):
+    """Return the node names from the source down to target, in order."""
+    chain = []
+    cur = target
+    while cur != 'source':
+        chain.append(cur)
+        cur = graph[cur].get('input', 'source')
+    return list(reversed(chain))
+
+
+def node_keys(graph, targets, source_hash):
+    """Content hash for every node needed by targets, derived from the source hash."""
+    keys = {'source': source_hash}
+    for target in targets:
+        for name in chain_for(graph, target):
+            if name in keys:
+                continue
+            node = graph[name]
+            parent = node.get('input', 'source')
+            payload = json.dumps([keys[parent], node['op'], OPS[node['op']][1], node.get('params', {})], sort_keys=True)
+            keys[name] = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    return keys
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def output_path(output_dir, target, rel):
+    return os.path.join(output_dir, target, os.path.splitext(rel)[0] + '.png')
+
+
+def process_image(job):
+    """Run the graph for one source image. Returns (rel, {target: key}, status, message)."""
+    in_path, rel, output_dir, graph, targets, state, force, optimize = job
+    try:
+        source_hash = file_hash(in_path)
+        keys = node_keys(graph, targets, source_hash)
+        stale = [
+            t for t in targets
+            if force or state.get(f'{t}/{rel}') != keys[t] or not os.path.exists(output_path(output_dir, t, rel))
+        ]
+        if not stale:
+            return rel, {}, 'skipped', None
+
+        results = {'source': open_rgba(in_path, digest=source_hash)}
+        for target in stale:
+            for name in chain_for(graph, target):
+                if name in results:
+                    continue
+                node = graph[name]
+                fn = OPS[node['op']][0]
+                results[name] = fn(results[node.get('input', 'source')], **node.get('params', {}))
+
+        written = {}
+        for target in stale:
+            out_path = output_path(output_dir, target, rel)
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+            results[target].save(out_path, format='PNG', optimize=optimize)
+            written[target] = keys[target]
+        return rel, written, 'processed', None
+    except Exception as e:
+        return rel, {}, 'error', repr(e)
+
+
+def load_state(output_dir):
+    path = os.path.join(output_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(output_dir, state):
+    path = os.path.join(output_dir, STATE_FILE)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump(state, fh, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the sprite processing graph, decoding each source once')
+    parser.add_argument('--images-dir', required=True)
+    parser.add_argument('--output-dir', required=True)
+    parser.add_argument('--graph', help='JSON file describing the processing graph (default: built-in chain)')
+    parser.add_argument('--targets', help='Comma-separated node names to write (default: all leaf nodes)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count, 1 = no pool)')
+    parser.add_argument('--recursive', action='store_true')
+    parser.add_argument('--force', action='store_true', help='Rebuild outputs even if their content hash is unchanged')
+    parser.add_argument('--no-optimize', action='store_true', help='Skip PNG optimize=True when writing outputs (faster)')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.images_dir):
+        print(f"images-dir does not exist or is not a directory: {args.images_dir}")
+        sys.exit(2)
+
+    try:
+        graph = load_graph(args.graph)
+    except ValueError as e:
+        print(f"Invalid graph: {e}")
+        sys.exit(2)
+
+    if args.targets:
+        targets = [t.strip() for t in args.targets.split(',') if t.strip()]
+        unknown = [t for t in targets if t not in graph]
+        if unknown:
+            print(f"Unknown targets: {', '.join(unknown)} (graph has: {', '.join(graph)})")
+            sys.exit(2)
+    else:
+        parents = {node.get('input', 'source') for node in graph.values()}
+        targets = [name for name in graph if name not in parents]
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    state = load_state(args.output_dir)
+
+    jobs = []
+    for in_path in iter_images(args.images_dir, recursive=args.recursive):
+        rel = os.path.relpath(in_path, args.images_dir).replace('\\', '/')
+        job_state = {f'{t}/{rel}': state.get(f'{t}/{rel}') for t in targets}
+        jobs.append((in_path, rel, args.output_dir, graph, targets, job_state, args.force, not args.no_optimize))
+    jobs.sort(key=lambda j: j[1])
+
+    print(f"Processing {len(jobs)} images -> targets: {', '.join(targets)}")
+    counts = {'processed': 0, 'skipped': 0, 'error': 0}
+
+    def handle(result):
+        rel, written, status, message = result
+        counts[status] += 1
+        for target, key in written.items():
+            state[f'{target}/{rel}'] = key
+        if status == 'error':
+            print(f"ERROR processing {rel}: {message}")
+        elif status == 'processed':
+            print(f"Wrote {', '.join(written)}: {rel}")
+
+    try:
+        if args.workers is not None and args.workers <= 1:
+            for job in jobs:
+                handle(process_image(job))
+        else:
+            with ProcessPoolExecutor(max_workers=args.workers) as ex:
+                for result in ex.map(process_image, jobs, chunksize=4):
+                    handle(result)
+    finally:
+        save_state(args.output_dir, state)
+
+    print('\nDone. Processed', len(jobs), 'files.')
+    for k, v in counts.items():
+        print(f"  {k}: {v}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Cut location maps into tile pyramids and find each location's crop box.
+
+Usage:
+  python scripts/image_tools/tile_location_maps.py --map-dir output/maps --output-dir output/map_tiles
+
+  # Tiles of 512px, crops sized for a 480px wide view
+  python scripts/image_tools/tile_location_maps.py --map-dir output/maps --output-dir output/map_tiles --tile 512 --view 480
+
+Runs after match_location_maps.py / download_location_maps.py have filled
+`location_to_file_map.json` (--manifest), which is only read. For every map
+file it references:
+
+- the map is cut into a pyramid of --tile sized tiles, <output-dir>/<stem>/<z>/<x>_<y>.png.
+  Level `levels - 1` is full size and each level below halves it, down to
+  level 0, which fits in one tile;
+- the highlighted area (Bulbapedia marks the location in red) is found and
+  padded by --margin into a crop box. Without a highlight the crop is the whole map.
+
+The results go to a sidecar manifest (--tiles-manifest, default
+public/data/location_map_tiles.json):
+
+  "settings": {"tile", "min_red", "red_delta"}
+  "tiles": {file: {"width", "height", "tile", "levels", "path", "sha256", "highlight"}}
+  "crops": {location: {"file", "box": [left, top, right, bottom], "level", "tiles": [x0, y0, x1, y1]}}
+
+`box` is in full-size pixels. `level` is the smallest level at which the box
+is at least --view pixels wide, and `tiles` the inclusive tile range covering
+the box at that level, so the client fetches just those. A file whose
+sha256 and settings are unchanged is not decoded again: its tiles and
+highlight are reused from the sidecar (use --force to recut).
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import math
+import os
+import sys
+
+from PIL import Image, ImageChops
+
+from image_core import array_bbox, threshold
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import read_bytes, write_bytes_atomic, write_json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def highlight_box(im, min_red=180, red_delta=100, min_pixels=20):
+    """Bounding box of strongly red pixels (r >= min_red, r - max(g, b) >= red_delta), or None."""
+    rgb = im.convert('RGB')
+    if np is not None:
+        a = np.asarray(rgb, dtype=np.int16)
+        r, gb = a[..., 0], np.maximum(a[..., 1], a[..., 2])
+        mask = (r >= min_red) & (r - gb >= red_delta)
+        if int(mask.sum()) < min_pixels:
+            return None
+        return array_bbox(mask)
+    r, g, b = rgb.split()
+    mask = ImageChops.multiply(threshold(r, min_red, 'ge'),
+                               threshold(ImageChops.subtract(r, ImageChops.lighter(g, b)), red_delta, 'ge'))
+    if mask.histogram()[255] < min_pixels:
+        return None
+    return mask.getbbox()
+
+
+def pad_box(box, size, margin, min_size):
+    """Grow box by margin (fraction of its size) to at least min_size, clamped to the image."""
+    width, height = size
+    left, top, right, bottom = box
+    grow_x = max((right - left) * margin, (min_size - (right - left)) / 2, 0)
+    grow_y = max((bottom - top) * margin, (min_size - (bottom - top)) / 2, 0)
+    left, right = int(max(0, left - grow_x)), int(min(width, math.ceil(right + grow_x)))
+    top, bottom = int(max(0, top - grow_y)), int(min(height, math.ceil(bottom + grow_y)))
+    return [left, top, right, bottom]
+
+
+def level_count(width, height, tile):
+    return max(0, math.ceil(math.log2(max(width, height) / tile))) + 1
+
+
+def cut_pyramid(im, out_dir, tile):
+    """Write every level's tiles (only those whose bytes changed). Returns (levels, written)."""
+    levels = level_count(im.width, im.height, tile)
+    level_im = im
+    written = 0
+    for z in range(levels - 1, -1, -1):
+        for y in range(0, level_im.height, tile):
+            for x in range(0, level_im.width, tile):
+                buf = io.BytesIO()
+                level_im.crop((x, y, min(x + tile, level_im.width), min(y + tile, level_im.height))).save(
+                    buf, format='PNG', optimize=True)
+                path = os.path.join(out_dir, str(z), f'{x // tile}_{y // tile}.png')
+                payload = buf.getvalue()
+                if read_bytes(path) != payload:
+                    write_bytes_atomic(path, payload, fsync=False)
+                    written += 1
+        if z:
+            level_im = level_im.reduce(2)
+    return levels, written
+
+
+def crop_view(box, meta, view):
+    """(level, inclusive tile range) to show box at least `view` pixels wide."""
+    top_level = meta['levels'] - 1
+    width = box[2] - box[0]
+    level = top_level
+    for z in range(top_level + 1):
+        if width / 2 ** (top_level - z) >= view:
+            level = z
+            break
+    scale = 2 ** (top_level - level)
+    tile = meta['tile']
+    return level, [box[0] // scale // tile, box[1] // scale // tile,
+                   max(box[2] // scale - 1, 0) // tile, max(box[3] // scale - 1, 0) // tile]
+
+
+def main():
+    p = argparse.ArgumentParser(description='Tile location maps and compute per-location crop boxes')
+    p.add_argument('--manifest', default=os.path.join(ROOT, 'public', 'data', 'location_to_file_map.json'),
+                   help='Location -> map file JSON to read')
+    p.add_argument('--tiles-manifest', default=os.path.join(ROOT, 'public', 'data', 'location_map_tiles.json'),
+                   help='Where to write the tile and crop metadata')
+    p.add_argument('--map-dir', required=True, help='Directory holding the map images named in the manifest')
+    p.add_argument('--output-dir', required=True, help='Where to write <stem>/<z>/<x>_<y>.png tiles')
+    p.add_argument('--tile', type=int, default=256, help='Tile size in pixels (default 256)')
+    p.add_argument('--view', type=int, default=320, help='Width the client shows a crop at (default 320)')
+    p.add_argument('--margin', type=float, default=0.25, help='Padding around the highlight, as a fraction (default 0.25)')
+    p.add_argument('--min-crop', type=int, default=96, help='Smallest crop side in pixels (default 96)')
+    p.add_argument('--min-red', type=int, default=180)
+    p.add_argument('--red-delta', type=int, default=100)
+    p.add_argument('--force', action='store_true', help='Recut tiles even when the map is unchanged')
+    args = p.parse_args()
+
+    if not os.path.isdir(args.map_dir):
+        print('map-dir not found or not a directory:', args.map_dir)
+        return 2
+    manifest = {}
+    if os.path.exists(args.manifest):
+        with open(args.manifest, 'r', encoding='utf-8') as fh:
+            manifest = json.load(fh)
+    locations = {loc: f for loc, f in manifest.items() if isinstance(f, str)}
+    settings = {'tile': args.tile, 'min_red': args.min_red, 'red_delta': args.red_delta}
+    old = {}
+    if os.path.exists(args.tiles_manifest) and not args.force:
+        with open(args.tiles_manifest, 'r', encoding='utf-8') as fh:
+            old = json.load(fh)
+    old_tiles = (old.get('tiles') or {}) if old.get('settings') == settings else {}
+
+    tiles, boxes, missing = {}, {}, []
+    cut = kept = 0
+    for fname in sorted(set(locations.values())):
+        src = os.path.join(args.map_dir, fname)
+        data = read_bytes(src)
+        if data is None:
+            missing.append(fname)
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        stem = os.path.splitext(fname)[0]
+        prev = old_tiles.get(fname)
+        if prev and prev.get('sha256') == digest and os.path.isdir(os.path.join(args.output_dir, stem)):
+            # Same bytes and settings: the tiles and highlight are still right
+            tiles[fname] = prev
+            kept += 1
+        else:
+            with Image.open(io.BytesIO(data)) as im:
+                im.load()
+                found = highlight_box(im, args.min_red, args.red_delta)
+                levels, _ = cut_pyramid(im.convert('RGBA'), os.path.join(args.output_dir, stem), args.tile)
+                size = im.size
+            cut += 1
+            tiles[fname] = {
+                'width': size[0], 'height': size[1], 'tile': args.tile, 'levels': levels,
+                'path': f'{stem}/{{z}}/{{x}}_{{y}}.png', 'sha256': digest,
+                'highlight': list(found) if found else None,
+            }
+        meta = tiles[fname]
+        size = (meta['width'], meta['height'])
+        found = meta['highlight']
+        boxes[fname] = pad_box(found, size, args.margin, args.min_crop) if found else [0, 0, size[0], size[1]]
+
+    crops = {}
+    for loc, fname in sorted(locations.items()):
+        if fname not in tiles:
+            continue
+        level, tile_range = crop_view(boxes[fname], tiles[fname], args.view)
+        crops[loc] = {'file': fname, 'box': boxes[fname], 'level': level, 'tiles': tile_range}
+
+    write_json(args.tiles_manifest, {'settings': settings, 'tiles': tiles, 'crops': crops})
+
+    no_highlight = sum(1 for t in tiles.values() if not t['highlight'])
+    print(f'{len(tiles)} maps: {cut} tiled, {kept} unchanged; {len(crops)} location crops '
+          f'({no_highlight} maps without a highlight use the whole map)')
+    if missing:
+        print(f'{len(missing)} map files not found in {args.map_dir}, e.g. {", ".join(missing[:5])}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -19,9 +19,14 @@ from __future__ import annotations
 import argparse
 import os
 from pathlib import Path
-from PIL import Image, ImageChops
+from PIL import Image
 import sys
 
+from image_core import channel_bbox, has_alpha, to_rgba
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.image_cache import open_rgba
+
 
 def find_bbox_of_nontransparent(im: Image.Image, threshold: int = 1):
     """Return bbox of non-transparent region.
@@ -29,26 +34,22 @@ def find_bbox_of_nontransparent(im: Image.Image, threshold: int = 1):
     If image has an alpha channel, use it. Otherwise, convert to L and use a
     brightness threshold to determine non-background pixels.
     """
-    if im.mode in ("RGBA", "LA") or ("transparency" in im.info):
-        alpha = im.split()[-1]
-        bbox = alpha.point(lambda p: 255 if p >= threshold else 0).getbbox()
-        return bbox
-    # No alpha: create a mask of "non-background" pixels using luminance
-    gray = im.convert("L")
-    # Treat near-white as background; threshold 250 (adjustable)
-    mask = gray.point(lambda p: 0 if p >= 250 else 255)
-    return mask.getbbox()
+    if has_alpha(im):
+        if im.mode not in ("RGBA", "LA"):
+            im = to_rgba(im)
+        return channel_bbox(im.getchannel("A"), threshold, "ge")
+    # No alpha: "non-background" pixels are those below near-white (250) luminance
+    return channel_bbox(im.convert("L"), 250, "lt")
 
 
-def trim_and_square_image(src_path: Path, dst_path: Path, padding: int = 0):
-    im = Image.open(src_path).convert("RGBA")
+def trim_and_square(im: Image.Image, padding: int = 0) -> Image.Image:
+    """Return an RGBA image trimmed to its content (plus padding) and centered on a square."""
+    im = to_rgba(im)
     bbox = find_bbox_of_nontransparent(im)
     if bbox is None:
         # Image is fully transparent or fully background: create a small transparent square
         size = 1 + 2 * padding
-        out = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-        out.save(dst_path, optimize=True)
-        return True
+        return Image.new("RGBA", (size, size), (0, 0, 0, 0))
 
     left, upper, right, lower = bbox
     left = max(0, left - padding)
@@ -65,6 +66,12 @@ def trim_and_square_image(src_path: Path, dst_path: Path, padding: int = 0):
     paste_x = (side - cw) // 2
     paste_y = (side - ch) // 2
     out.paste(cropped, (paste_x, paste_y), cropped)
+    return out
+
+
+def trim_and_square_image(src_path: Path, dst_path: Path, padding: int = 0):
+    im = open_rgba(src_path)
+    out = trim_and_square(im, padding=padding)
 
     # Ensure parent directory exists
     dst_path.parent.mkdir(parents=True, exist_ok=True)
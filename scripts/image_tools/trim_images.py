@@ -22,41 +22,40 @@ Options:
 This is intentionally lightweight and avoids extra dependencies beyond Pillow.
 """
 
-from PIL import Image, ImageChops
+from PIL import Image
 import argparse
 import os
 import sys
 
+from image_core import foreground_bbox
 
-def find_bbox_for_image(im: Image.Image):
-    """Return bounding box (left, upper, right, lower) of non-background area or None."""
-    # Work on a copy in RGBA to inspect alpha reliably
-    im_rgba = im.convert('RGBA')
-    r, g, b, a = im_rgba.split()
-
-    # If any alpha is not fully opaque, use alpha channel to find bbox
-    try:
-        alpha_bbox = a.getbbox()
-    except Exception:
-        alpha_bbox = None
 
-    if alpha_bbox:
-        return alpha_bbox
+def find_bbox_for_image(im: Image.Image):
+    """Return bounding box (left, upper, right, lower) of non-background area or None.
 
-    # No alpha (or fully opaque). Treat top-left pixel as background color.
-    bg_color = im_rgba.getpixel((0, 0))[:3]
-    img_rgb = im_rgba.convert('RGB')
-    bg = Image.new('RGB', img_rgb.size, bg_color)
-    diff = ImageChops.difference(img_rgb, bg)
-    # Convert to L and getbbox where any channel differs
-    bbox = diff.convert('L').point(lambda p: 255 if p else 0).getbbox()
-    return bbox
+    Uses the alpha channel when any pixel is non-transparent; otherwise treats the
+    top-left pixel colour as background (see image_core.foreground_bbox).
+    """
+    return foreground_bbox(im)
 
 
 def clamp(val, lo, hi):
     return max(lo, min(hi, val))
 
 
+def trim_image(im: Image.Image, padding=0):
+    """Return im cropped to its foreground plus padding, or None if no foreground was found."""
+    bbox = find_bbox_for_image(im)
+    if not bbox:
+        return None
+    left, upper, right, lower = bbox
+    left = clamp(left - padding, 0, im.width)
+    upper = clamp(upper - padding, 0, im.height)
+    right = clamp(right + padding, 0, im.width)
+    lower = clamp(lower + padding, 0, im.height)
+    return im.crop((left, upper, right, lower))
+
+
 def process_file(in_path, out_path, padding=0, overwrite=False):
     if not overwrite and os.path.exists(out_path):
         print(f"Skipping existing: {out_path}")
@@ -64,20 +63,13 @@ def process_file(in_path, out_path, padding=0, overwrite=False):
 
     try:
         with Image.open(in_path) as im:
-            bbox = find_bbox_for_image(im)
-            if not bbox:
+            cropped = trim_image(im, padding=padding)
+            if cropped is None:
                 # No content detected (all background). Save original (or skip)
                 print(f"No foreground detected, copying original: {os.path.basename(in_path)}")
                 im.save(out_path)
                 return 'copied'
 
-            left, upper, right, lower = bbox
-            left = clamp(left - padding, 0, im.width)
-            upper = clamp(upper - padding, 0, im.height)
-            right = clamp(right + padding, 0, im.width)
-            lower = clamp(lower + padding, 0, im.height)
-
-            cropped = im.crop((left, upper, right, lower))
             # Ensure output dir exists
             os.makedirs(os.path.dirname(out_path), exist_ok=True)
             # Preserve format where possible
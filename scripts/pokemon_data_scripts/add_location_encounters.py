@@ -6,18 +6,32 @@ This script:
 1. Renames location_area_encounters to introduced_gen_location_area_encounters
 2. Adds preevolution_location_area_encounters from pre-evolutions
 3. Adds all_location_area_encounters filtered by specific game versions
+
+PokeAPI responses are read through the local mirror (common/pokeapi_store.py),
+so resources already fetched by an earlier run or another script aren't
+requested again; --offline reads only the mirror.
 """
 
 import json
 import argparse
-import requests
-import time
 import re
 from typing import Dict, List, Set, Optional
+import os
 import sys
 
-# Simple in-memory cache of URL -> JSON response to avoid duplicate network calls
-response_cache: Dict[str, Optional[Dict]] = {}
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import write_json
+from common.pokeapi_store import FETCH_ERRORS, PokeAPIStore, add_store_arguments, store_from_args
+
+# Shared PokeAPI mirror; main() configures it from the command line
+store: Optional[PokeAPIStore] = None
+
+
+def fetch_json(url: str) -> Dict:
+    global store
+    if store is None:
+        store = PokeAPIStore.from_env()
+    return store.get(url)
 
 # Valid game versions to filter encounters
 VALID_VERSIONS = {
@@ -40,13 +54,7 @@ def get_evolution_chain(pokemon_id: int) -> Optional[Dict]:
         # Get species data to find evolution chain URL
         species_url = f"https://pokeapi.co/api/v2/pokemon-species/{pokemon_id}"
         print(f"  Fetching species data: {species_url}")
-        if species_url in response_cache:
-            species_data = response_cache[species_url]
-        else:
-            species_response = requests.get(species_url, timeout=10)
-            species_response.raise_for_status()
-            species_data = species_response.json()
-            response_cache[species_url] = species_data
+        species_data = fetch_json(species_url)
         
         # Get evolution chain
         evolution_chain_url = species_data.get('evolution_chain', {}).get('url')
@@ -55,16 +63,9 @@ def get_evolution_chain(pokemon_id: int) -> Optional[Dict]:
             return None
             
         print(f"  Fetching evolution chain: {evolution_chain_url}")
-        time.sleep(0.5)  # Rate limiting
-        if evolution_chain_url in response_cache:
-            return response_cache[evolution_chain_url]
-        chain_response = requests.get(evolution_chain_url, timeout=10)
-        chain_response.raise_for_status()
-        chain_json = chain_response.json()
-        response_cache[evolution_chain_url] = chain_json
-        return chain_json
+        return fetch_json(evolution_chain_url)
         
-    except requests.RequestException as e:
+    except FETCH_ERRORS as e:
         print(f"  Error fetching evolution chain for Pokemon {pokemon_id}: {e}")
         return None
 
@@ -118,13 +119,7 @@ def get_pokemon_encounters(pokemon_id: int) -> List[str]:
     try:
         encounters_url = f"https://pokeapi.co/api/v2/pokemon/{pokemon_id}/encounters"
         print(f"  Fetching encounters: {encounters_url}")
-        if encounters_url in response_cache:
-            encounters_data = response_cache[encounters_url]
-        else:
-            response = requests.get(encounters_url, timeout=10)
-            response.raise_for_status()
-            encounters_data = response.json()
-            response_cache[encounters_url] = encounters_data
+        encounters_data = fetch_json(encounters_url)
 
         # Use dict to aggregate games by location name
         location_map: Dict[str, Dict] = {}
@@ -184,43 +179,25 @@ def get_pokemon_encounters(pokemon_id: int) -> List[str]:
 
             region_name = None
             if location_area_url:
-                # Use shared response cache to avoid duplicate calls
-                if location_area_url in response_cache:
-                    la_data = response_cache[location_area_url]
-                else:
-                    try:
-                        print(f"    Fetching location_area: {location_area_url}")
-                        resp = requests.get(location_area_url, timeout=10)
-                        resp.raise_for_status()
-                        la_data = resp.json()
-                        response_cache[location_area_url] = la_data
-                    except requests.RequestException as e:
-                        print(f"    Error fetching location_area {location_area_url}: {e}")
-                        la_data = None
+                try:
+                    la_data = fetch_json(location_area_url)
+                except FETCH_ERRORS as e:
+                    print(f"    Error fetching location_area {location_area_url}: {e}")
+                    la_data = None
                 if la_data:
                     location_ref = la_data.get('location', {}) or {}
                     location_url = location_ref.get('url')
                     if location_url:
-                        if location_url in response_cache:
-                            loc_data = response_cache[location_url]
-                        else:
-                            try:
-                                time.sleep(0.2)
-                                print(f"    Fetching location: {location_url}")
-                                loc_resp = requests.get(location_url, timeout=10)
-                                loc_resp.raise_for_status()
-                                loc_data = loc_resp.json()
-                                response_cache[location_url] = loc_data
-                            except requests.RequestException as e:
-                                print(f"    Error fetching location {location_url}: {e}")
-                                loc_data = None
+                        try:
+                            loc_data = fetch_json(location_url)
+                        except FETCH_ERRORS as e:
+                            print(f"    Error fetching location {location_url}: {e}")
+                            loc_data = None
                         if loc_data:
                             region_ref = loc_data.get('region', {}) or {}
                             region_name = region_ref.get('name')
                             if region_name:
                                 region_name = region_name.replace('-', ' ').title()
-            # small pause to be polite
-            time.sleep(0.1)
 
             # Normalize and refine name (route trimming, remove 'Area')
             norm = normalize_location_name(location_name)
@@ -326,7 +303,7 @@ def get_pokemon_encounters(pokemon_id: int) -> List[str]:
             out.append(location_entry)
         return out
 
-    except requests.RequestException as e:
+    except FETCH_ERRORS as e:
         print(f"  Error fetching encounters for Pokemon {pokemon_id}: {e}")
         return []
 
@@ -351,7 +328,6 @@ def process_pokemon(pokemon: Dict, all_pokemon: List[Dict]) -> Dict:
     
     # 2. Get evolution chain and find pre-evolutions
     chain_data = get_evolution_chain(pokemon_id)
-    time.sleep(0.5)  # Rate limiting
     
     preevolution_ids = []
     if chain_data:
@@ -380,7 +356,6 @@ def process_pokemon(pokemon: Dict, all_pokemon: List[Dict]) -> Dict:
     
     # 4. Get structured location encounters for this Pokemon
     all_locations = get_pokemon_encounters(pokemon_id)
-    time.sleep(0.5)  # Rate limiting
     # all_locations is a list of {'region': ..., 'name': ...}
     pokemon['location_area_encounters'] = all_locations
     print(f"  Found {len(all_locations)} structured location(s) for Pokemon {pokemon_id}")
@@ -410,8 +385,13 @@ def main():
         '--locations-list',
         help='Path to write a newline-separated list of all location names (trimmed, unique)'
     )
+    add_store_arguments(parser)
     
     args = parser.parse_args()
+
+    global store
+    # Network requests are spaced out by the store; mirrored reads aren't delayed
+    store = store_from_args(args, delay=0.3)
     
     # Load input JSON
     print(f"Loading Pokemon data from: {args.input_json}")
@@ -448,6 +428,7 @@ def main():
         except Exception as e:
             print(f"Error processing Pokemon #{pokemon.get('id', '?')}: {e}")
             print("Continuing with next Pokemon...")
+    store.close()
     
     # Save output JSON
     print("\n" + "="*60)
@@ -469,8 +450,7 @@ def main():
         else:
             out_data = pokemon_data
 
-        with open(args.output_json, 'w', encoding='utf-8') as f:
-            json.dump(out_data, f, indent=2, ensure_ascii=False)
+        write_json(args.output_json, out_data)
         print("Successfully saved output file!")
     except IOError as e:
         print(f"Error writing output file: {e}")
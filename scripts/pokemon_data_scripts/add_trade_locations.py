@@ -11,9 +11,13 @@ This script:
 import json
 import csv
 import argparse
+import os
 import sys
 from collections import defaultdict
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import write_json
+
 def main():
     parser = argparse.ArgumentParser(
         description='Add trade locations to Pokemon data from CSV'
@@ -148,8 +152,7 @@ def main():
     # Save output JSON
     print(f"\nSaving results to: {args.output_json}")
     try:
-        with open(args.output_json, 'w', encoding='utf-8') as f:
-            json.dump(pokemon_data, f, indent=2, ensure_ascii=False)
+        write_json(args.output_json, pokemon_data)
         print("Successfully saved output file!")
     except IOError as e:
         print(f"Error writing output file: {e}")
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Benchmark the level_range / chance parse cache in merge_duplicate_encounters.
+
+Three measurements over a whole pokemon_data.json:
+
+  parse     parse every encounter's level_range and chance literal
+  merge     merge_level_ranges / merge_chances over every (name, region,
+            generation) group (the --ignore-games grouping), so most literals
+            go through the merge path
+  process   the full process() pass, with --ignore-games grouping
+
+Each is timed with the uncached parsers swapped in (the previous behaviour,
+one regex parse per occurrence) and with the LRU-cached parsers, cold (caches
+cleared before every run) and warm. Merged outputs are checked for equality.
+
+Usage:
+  python scripts/pokemon_data_scripts/bench_merge_encounters.py --input-json public/data/pokemon_data.json
+  python scripts/pokemon_data_scripts/bench_merge_encounters.py --input-json public/data/pokemon_data.json --repeat 10
+"""
+
+import argparse
+import copy
+import os
+import sys
+import timeit
+from collections import defaultdict
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.encounter_codec import ENCOUNTER_LISTS, load_pokemon_data
+import merge_duplicate_encounters as mde
+
+
+@contextmanager
+def uncached():
+    """Temporarily route the merge helpers through the uncached parsers."""
+    saved = mde.parse_level_range, mde.parse_chance, mde.parse_pct
+    mde.parse_level_range, mde.parse_chance, mde.parse_pct = (
+        mde._parse_level_range, mde._parse_chance, mde._parse_pct)
+    try:
+        yield
+    finally:
+        mde.parse_level_range, mde.parse_chance, mde.parse_pct = saved
+
+
+def collect(data):
+    level_ranges, chances = [], []
+    groups = defaultdict(list)
+    for p in data:
+        for key in ENCOUNTER_LISTS:
+            for enc in p.get(key) or []:
+                if not isinstance(enc, dict):
+                    continue
+                level_ranges.append(str(enc.get('level_range') or '').strip())
+                chances.append(str(enc.get('chance') or '').strip())
+                groups[(p.get('id'), key, enc.get('name'), enc.get('region'), enc.get('generation'))].append(enc)
+    return level_ranges, chances, list(groups.values())
+
+
+def parse_all(level_ranges, chances):
+    for s in level_ranges:
+        if s:
+            mde.parse_level_range(s)
+    for c in chances:
+        if c:
+            mde.parse_chance(c)
+
+
+def merge_all(groups):
+    return [
+        (mde.merge_level_ranges([e.get('level_range', '') for e in g]),
+         mde.merge_chances([e.get('chance', '') for e in g]))
+        for g in groups
+    ]
+
+
+class ProcessCase:
+    """process() mutates its input, so each run gets a fresh (untimed) copy."""
+
+    def __init__(self, data):
+        self.data = data
+        self.pokemon = None
+
+    def reset(self):
+        self.pokemon = copy.deepcopy(self.data)
+
+    def __call__(self):
+        if self.pokemon is None:
+            self.reset()
+        mde.process(self.pokemon, require_same_games=False)
+        self.pokemon = None
+
+
+def best(fn, repeat, setup=None):
+    """Best single-run time; setup runs before each run and is not timed."""
+    def prepare():
+        if setup:
+            setup()
+        if isinstance(fn, ProcessCase):
+            fn.reset()
+    return min(timeit.repeat(fn, setup=prepare, number=1, repeat=repeat))
+
+
+def main():
+    p = argparse.ArgumentParser(description='Benchmark the merge_duplicate_encounters parse cache')
+    p.add_argument('--input-json', required=True)
+    p.add_argument('--repeat', type=int, default=5, help='Timing repeats; best run is reported')
+    args = p.parse_args()
+
+    data = load_pokemon_data(args.input_json)
+    level_ranges, chances, groups = collect(data)
+    print(f'{len(data)} Pokemon, {len(level_ranges)} encounters, '
+          f'{len(set(level_ranges))} distinct level ranges, {len(set(chances))} distinct chances, '
+          f'{len(groups)} merge groups\n')
+
+    results = []
+    cases = [
+        ('parse', lambda: parse_all(level_ranges, chances)),
+        ('merge', lambda: merge_all(groups)),
+        ('process', ProcessCase(data)),
+    ]
+    for name, fn in cases:
+        with uncached():
+            t_plain = best(fn, args.repeat)
+        t_cold = best(fn, args.repeat, setup=mde.clear_parse_caches)
+        fn()
+        t_warm = best(fn, args.repeat)
+        results.append((name, t_plain, t_cold, t_warm))
+
+    print(f"{'':<10}{'uncached':>12}{'cold cache':>14}{'warm cache':>14}{'speedup':>10}")
+    for name, t_plain, t_cold, t_warm in results:
+        print(f'{name:<10}{t_plain * 1000:>10.2f}ms{t_cold * 1000:>12.2f}ms{t_warm * 1000:>12.2f}ms'
+              f'{t_plain / t_cold:>9.1f}x')
+
+    with uncached():
+        expected = merge_all(groups)
+    mde.clear_parse_caches()
+    same = merge_all(groups) == expected
+    print(f'\nMerged values identical: {same}')
+    for name, info in mde.parse_cache_info().items():
+        print(f'  {name + ":":<13}hits={info.hits} misses={info.misses} size={info.currsize}')
+    return 0 if same else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Benchmark filter_locations_by_generation over a whole pokemon_data.json.
+
+Times the original nested-loop filter (every map key and keyword tried against
+every location of every Pokemon) against `filter_pokemon` with the compiled
+RegionMatcher, and checks both keep the same locations.
+
+If no --location-to-region file is given, a map is derived from the dataset
+itself (each encounter's `name` -> `region`), which gives a realistically sized
+automaton.
+
+Usage:
+  python scripts/pokemon_data_scripts/bench_region_filter.py --input-json public/data/pokemon_data.json
+  python scripts/pokemon_data_scripts/bench_region_filter.py --input-json public/data/pokemon_data.json \\
+      --location-to-region scripts/data/region_map.json --repeat 10
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.encounter_codec import load_pokemon_data
+from common.region_matcher import RegionMatcher
+from filter_locations_by_generation import DEFAULT_GEN_REGIONS, filter_pokemon, location_name
+
+
+def baseline_filter(data, explicit_map):
+    """The pre-matcher filter: linear scans over the map and keywords per location.
+
+    Builds the same output list and report as filter_pokemon so the timings compare
+    like for like. Returns the number of kept locations.
+    """
+    report = {'per_pokemon': {}, 'kept_locations_total': 0, 'removed_locations_total': 0}
+    out_list = []
+    missing_locs = set()
+    for p in data:
+        try:
+            gen = int(p.get('generation'))
+        except (TypeError, ValueError):
+            gen = p.get('generation')
+        kept = []
+        removed = []
+        locs = p.get('location_area_encounters') or []
+        for loc in locs:
+            s = location_name(loc).lower()
+            region = None
+            for sub, reg in explicit_map.items():
+                if sub in s:
+                    region = reg
+                    break
+            if region:
+                matched = region in DEFAULT_GEN_REGIONS.get(gen, [])
+            else:
+                matched = False
+                for kw in DEFAULT_GEN_REGIONS.get(gen, []):
+                    if kw in s:
+                        matched = True
+                        break
+                if not matched:
+                    missing_locs.add(s)
+            (kept if matched else removed).append(loc)
+        report['per_pokemon'][p.get('name')] = {'id': p.get('id'), 'original': len(locs), 'kept': len(kept), 'removed': len(removed)}
+        report['kept_locations_total'] += len(kept)
+        report['removed_locations_total'] += len(removed)
+        new_p = dict(p)
+        new_p['location_area_encounters'] = kept
+        out_list.append(new_p)
+    return report['kept_locations_total']
+
+
+def derive_map(data):
+    mapping = {}
+    for p in data:
+        for key in ('location_area_encounters', 'preevolution_location_area_encounters'):
+            for loc in p.get(key) or []:
+                if isinstance(loc, dict) and loc.get('name') and loc.get('region'):
+                    mapping.setdefault(loc['name'].lower(), loc['region'].lower())
+    return mapping
+
+
+def main():
+    p = argparse.ArgumentParser(description='Benchmark location filtering by generation')
+    p.add_argument('--input-json', required=True)
+    p.add_argument('--location-to-region', action='append', help='Optional JSON mapping substr->region (may be repeated)')
+    p.add_argument('--repeat', type=int, default=5, help='Timing repeats; best run is reported')
+    args = p.parse_args()
+
+    data = load_pokemon_data(args.input_json)
+
+    if args.location_to_region:
+        explicit_map = RegionMatcher.from_json(*args.location_to_region, lowercase_values=True)
+        mapping = dict(zip(explicit_map.keys, explicit_map.values))
+    else:
+        mapping = derive_map(data)
+
+    n_locs = sum(len(p.get('location_area_encounters') or []) for p in data)
+    unique = {location_name(l) for p in data for l in (p.get('location_area_encounters') or [])}
+    print(f'{len(data)} Pokemon, {n_locs} locations ({len(unique)} unique), {len(mapping)} map entries\n')
+
+    t_base = min(timeit.repeat(lambda: baseline_filter(data, mapping), number=1, repeat=args.repeat))
+
+    # Build cost is paid once per run, so include it in the timing
+    def compiled():
+        matcher = RegionMatcher(mapping)
+        return filter_pokemon(data, matcher)
+    t_build = min(timeit.repeat(lambda: RegionMatcher(mapping), number=1, repeat=args.repeat))
+    t_new = min(timeit.repeat(compiled, number=1, repeat=args.repeat))
+
+    base_kept = baseline_filter(data, mapping)
+    _, report, _ = compiled()
+    new_kept = report['kept_locations_total']
+
+    print(f"{'nested loops':<24}{t_base * 1000:>10.2f} ms")
+    print(f"{'compiled matcher':<24}{t_new * 1000:>10.2f} ms  (build {t_build * 1000:.2f} ms)")
+    print(f"{'speedup':<24}{t_base / t_new:>10.1f}x")
+    print(f"\nKept locations: baseline={base_kept} matcher={new_kept}")
+    if base_kept != new_kept:
+        print('NOTE: counts differ where an exact-name key outranks an earlier substring key')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
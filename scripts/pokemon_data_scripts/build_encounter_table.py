@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Build the normalized columnar encounter table from pokemon_data.json.
+
+Flattens every Pokemon's `location_area_encounters` and
+`preevolution_location_area_encounters` into one row per encounter with
+interned location / region / method / game codes (see
+`scripts/common/encounter_table.py`) and saves it as a compressed .npz next to
+the input (or to --output). Analysis scripts can then load the table instead
+of re-flattening the nested JSON.
+
+Usage:
+  python scripts/pokemon_data_scripts/build_encounter_table.py --input-json public/data/pokemon_data.json
+  python scripts/pokemon_data_scripts/build_encounter_table.py --input-json public/data/pokemon_data.json --output scripts/data/encounters.npz
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.encounter_table import EncounterTable
+
+
+def default_output(input_json):
+    base, _ = os.path.splitext(input_json)
+    return base + '_encounters.npz'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the columnar encounter table from pokemon_data.json')
+    parser.add_argument('--input-json', required=True, help='Path to pokemon_data.json')
+    parser.add_argument('--output', help='Output .npz path (default: <input>_encounters.npz)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input_json):
+        print(f'Error: input file not found: {args.input_json}', file=sys.stderr)
+        sys.exit(1)
+
+    table = EncounterTable.from_json(args.input_json)
+    out_path = args.output or default_output(args.input_json)
+    out_dir = os.path.dirname(os.path.abspath(out_path))
+    os.makedirs(out_dir, exist_ok=True)
+    table.save(out_path)
+
+    print(f'Pokemon:    {len(table.pokemon_ids)}')
+    print(f'Encounters: {len(table)}')
+    for name in EncounterTable.TABLES:
+        print(f'  {name + "s:":<16}{len(table.tables[name])}')
+    print(f'Wrote encounter table to: {out_path} ({os.path.getsize(out_path)} bytes)')
+
+
+if __name__ == '__main__':
+    main()
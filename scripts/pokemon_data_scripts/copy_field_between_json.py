@@ -5,9 +5,13 @@ Matches Pokemon by ID to ensure data is copied to the correct entry.
 
 import argparse
 import json
+import os
 import sys
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import write_json
+
 
 def load_json(file_path):
     """Load JSON file and return the data."""
@@ -23,9 +27,8 @@ def load_json(file_path):
 
 
 def save_json(file_path, data, indent=2):
-    """Save data to JSON file."""
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=indent, ensure_ascii=False)
+    """Save data to JSON file (atomically; skipped when the content is unchanged)."""
+    return write_json(file_path, data, indent=indent)
 
 
 def copy_field(from_data, to_data, field_name):
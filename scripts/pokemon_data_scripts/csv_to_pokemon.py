@@ -3,21 +3,31 @@
 Update pokemon_data.json with values from a modified CSV file.
 
 The CSV should have 'id' and 'name' columns plus any other fields to update.
-Matches pokemon by id and updates the specified fields.
+Rows are joined to pokemon by id. Each column is decoded with one dtype, taken
+from the schema sidecar written by pokemon_to_csv.py (output.csv ->
+output.schema.json), or from the field's current values in the JSON when there
+is no sidecar. Only cells that differ from the current (encoded) value are
+applied, so reimporting an unedited export changes nothing. Empty cells keep
+the original value.
 
 Usage:
     python csv_to_pokemon.py -i pokemon_data.json -c pokedataoutput.csv -o pokemon_data_updated.json
     python csv_to_pokemon.py -c pokedataoutput.csv  # Uses defaults
+    python csv_to_pokemon.py -c pokedataoutput.csv --dry-run
 """
 
 import json
 import csv
 import argparse
+import os
 import sys
-from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import write_json
+from common.pokemon_frame import PokemonFrame
 
-def update_pokemon_data(json_file, csv_file, output_file):
+
+def update_pokemon_data(json_file, csv_file, output_file, schema_file=None, dry_run=False):
     """
     Update pokemon_data.json with values from CSV file.
     
@@ -25,6 +35,8 @@ def update_pokemon_data(json_file, csv_file, output_file):
         json_file: Path to pokemon_data.json
         csv_file: Path to modified CSV file
         output_file: Path to output JSON file (can be same as json_file to overwrite)
+        schema_file: Optional dtype schema (defaults to the CSV's sidecar)
+        dry_run: Report changes without writing
     """
     try:
         # Read the JSON file
@@ -35,70 +47,33 @@ def update_pokemon_data(json_file, csv_file, output_file):
             print(f"Error: Expected JSON array but got {type(pokemon_data).__name__}", file=sys.stderr)
             return False
         
-        # Create a map of pokemon by id for fast lookup
-        pokemon_by_id = {}
-        for pokemon in pokemon_data:
-            if isinstance(pokemon, dict) and 'id' in pokemon:
-                pokemon_by_id[pokemon['id']] = pokemon
+        schema = None
+        if schema_file:
+            with open(schema_file, 'r', encoding='utf-8') as f:
+                schema = json.load(f).get('fields', {})
+        
+        # Read the CSV as columns and apply differing cells by id
+        frame = PokemonFrame.read_csv(csv_file, schema=schema)
+        changes, problems = frame.apply(pokemon_data)
+        
+        for problem in problems:
+            print(f"Warning: {problem}", file=sys.stderr)
         
-        # Read the CSV file
-        updated_count = 0
-        with open(csv_file, 'r', newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            
-            if not reader.fieldnames:
-                print("Error: CSV file is empty", file=sys.stderr)
-                return False
-            
-            # Always skip 'id' and 'name' as they're just identifiers
-            fields_to_update = [field for field in reader.fieldnames if field not in ('id', 'name')]
-            
-            for row in reader:
-                # Get the pokemon id
-                try:
-                    pokemon_id = int(row['id'])
-                except (ValueError, KeyError):
-                    print(f"Warning: Skipping row with invalid id: {row}", file=sys.stderr)
-                    continue
-                
-                # Find the pokemon in our data
-                if pokemon_id not in pokemon_by_id:
-                    print(f"Warning: Pokemon with id {pokemon_id} not found in JSON", file=sys.stderr)
-                    continue
-                
-                pokemon = pokemon_by_id[pokemon_id]
-                
-                # Update fields
-                for field in fields_to_update:
-                    value = row[field]
-                    
-                    if value == '':
-                        # Keep original value if CSV is empty
-                        continue
-                    
-                    # Try to parse as JSON (for lists/dicts)
-                    try:
-                        parsed_value = json.loads(value)
-                        pokemon[field] = parsed_value
-                    except json.JSONDecodeError:
-                        # If not valid JSON, try to convert to appropriate type
-                        # Check if it looks like a number
-                        try:
-                            if '.' in value:
-                                pokemon[field] = float(value)
-                            else:
-                                pokemon[field] = int(value)
-                        except ValueError:
-                            # Keep as string
-                            pokemon[field] = value
-                
-                updated_count += 1
+        print(f"  Schema: {', '.join(f'{k}={v}' for k, v in frame.schema.items())}")
+        if changes:
+            for field, n in changes.items():
+                print(f"  {field}: {n} pokemon updated")
+        else:
+            print("  No changes")
+        
+        if dry_run:
+            print("Dry run: nothing written")
+            return True
         
         # Write the updated JSON file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(pokemon_data, f, indent=2, ensure_ascii=False)
+        write_json(output_file, pokemon_data)
         
-        print(f"✓ Successfully updated {updated_count} pokemon")
+        print(f"✓ Successfully updated {sum(changes.values())} field value(s) across {len(frame)} CSV rows")
         print(f"✓ Written to {output_file}")
         return True
     
@@ -138,20 +113,31 @@ def main():
         help='Output JSON file (default: overwrites input file)'
     )
     
+    parser.add_argument(
+        '-s', '--schema',
+        help='Column dtype schema JSON (default: the CSV path with .schema.json for its extension, if present)'
+    )
+    
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Report which fields would change without writing'
+    )
+    
     args = parser.parse_args()
     
     # If no output file specified, use the input file
     output_file = args.output or args.input
     
     # Confirm if overwriting
-    if output_file == args.input:
+    if output_file == args.input and not args.dry_run:
         response = input(f"This will overwrite {args.input}. Continue? (y/n): ").strip().lower()
         if response != 'y':
             print("Cancelled.")
             sys.exit(0)
     
     # Update and export
-    success = update_pokemon_data(args.input, args.csv, output_file)
+    success = update_pokemon_data(args.input, args.csv, output_file, args.schema, args.dry_run)
     sys.exit(0 if success else 1)
 
 
@@ -9,13 +9,17 @@ This will load the input JSON (array of Pokemon objects), and for each Pokemon
 it will deduplicate the `location_area_encounters` and
 `preevolution_location_area_encounters` arrays by `name` (case-insensitive),
 keeping the first occurrence and preserving order. The full JSON is written to
-the output path.
+the output path, streaming one Pokemon at a time.
 """
 import argparse
 import json
+import os
 import sys
 from typing import Dict, List, Any
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.pokemon_json import iter_pokemon, write_pokemon
+
 
 def dedupe_by_name(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Return a new list with duplicates (by name, case-insensitive) removed.
@@ -43,28 +47,11 @@ def dedupe_by_name(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return out
 
 
-def main():
-    parser = argparse.ArgumentParser(description='Dedupe pokemon location entries')
-    parser.add_argument('--input-json', required=True, help='Input JSON file (array of pokemon)')
-    parser.add_argument('--output-json', required=True, help='Output JSON file to write')
-    args = parser.parse_args()
-
-    try:
-        with open(args.input_json, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print(f'Error: input file not found: {args.input_json}', file=sys.stderr)
-        sys.exit(1)
-    except json.JSONDecodeError as e:
-        print(f'Error: invalid JSON in input file: {e}', file=sys.stderr)
-        sys.exit(1)
-
-    if not isinstance(data, list):
-        print('Error: input JSON must be an array of pokemon objects', file=sys.stderr)
-        sys.exit(1)
-
-    for i, p in enumerate(data):
+def dedupe_pokemon(pokemon_iter):
+    """Yield each Pokemon with its encounter lists deduplicated."""
+    for p in pokemon_iter:
         if not isinstance(p, dict):
+            yield p
             continue
         # Deduplicate location_area_encounters
         if 'location_area_encounters' in p:
@@ -79,10 +66,26 @@ def main():
                 p['preevolution_location_area_encounters'] = dedupe_by_name(p.get('preevolution_location_area_encounters') or [])
             except Exception:
                 pass
+        yield p
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dedupe pokemon location entries')
+    parser.add_argument('--input-json', required=True, help='Input JSON file (array of pokemon)')
+    parser.add_argument('--output-json', required=True, help='Output JSON file to write')
+    args = parser.parse_args()
 
     try:
-        with open(args.output_json, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        write_pokemon(args.output_json, dedupe_pokemon(iter_pokemon(args.input_json)))
+    except FileNotFoundError:
+        print(f'Error: input file not found: {args.input_json}', file=sys.stderr)
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f'Error: invalid JSON in input file: {e}', file=sys.stderr)
+        sys.exit(1)
+    except ValueError as e:
+        print(f'Error: {e}', file=sys.stderr)
+        sys.exit(1)
     except IOError as e:
         print(f'Error writing output file: {e}', file=sys.stderr)
         sys.exit(1)
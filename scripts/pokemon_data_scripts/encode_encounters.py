@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Encode pokemon_data.json encounters as interned integer codes (or decode them back).
+
+Moves the repeated location / region / game / method / level range / chance
+strings of every encounter into shared tables (see
+`scripts/common/encounter_codec.py`) and writes the compact document. The
+round trip is checked before writing, and the output size is reported against
+both the input file and the input minified, which is the saving from the
+encoding alone.
+
+Scripts that read pokemon_data through `load_pokemon_data` accept either form.
+
+Usage:
+  python scripts/pokemon_data_scripts/encode_encounters.py --input-json public/data/pokemon_data.json --output-json pokemon_data.encoded.json
+  python scripts/pokemon_data_scripts/encode_encounters.py --decode --input-json pokemon_data.encoded.json --output-json pokemon_data.json
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.encounter_codec import decode_dataset, dump_compact, encode_dataset, is_encoded
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Encode or decode interned encounter tables in pokemon_data.json')
+    parser.add_argument('--input-json', required=True, help='Input pokemon data JSON')
+    parser.add_argument('--output-json', required=True, help='Output JSON path')
+    parser.add_argument('--decode', action='store_true', help='Decode a compact document back to the expanded form')
+    args = parser.parse_args()
+
+    try:
+        with open(args.input_json, 'r', encoding='utf-8') as f:
+            doc = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f'Error reading {args.input_json}: {e}', file=sys.stderr)
+        sys.exit(1)
+
+    if args.decode:
+        if not is_encoded(doc):
+            print('Error: input is not an encoded encounter document', file=sys.stderr)
+            sys.exit(1)
+        data = decode_dataset(doc)
+        with open(args.output_json, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        print(f'Decoded {len(data)} Pokemon to: {args.output_json}')
+        return
+
+    if is_encoded(doc):
+        print('Error: input is already encoded (use --decode)', file=sys.stderr)
+        sys.exit(1)
+
+    encoded = encode_dataset(doc)
+    if decode_dataset(json.loads(json.dumps(encoded))) != doc:
+        print('Error: round trip check failed; not writing output', file=sys.stderr)
+        sys.exit(1)
+
+    buf = io.StringIO()
+    dump_compact(encoded, buf)
+    with open(args.output_json, 'w', encoding='utf-8') as f:
+        f.write(buf.getvalue())
+
+    rows = sum(1 for p in encoded['pokemon'] for k in ('location_area_encounters', 'preevolution_location_area_encounters')
+               for r in (p.get(k) or []) if isinstance(r, list))
+    raw = sum(1 for p in encoded['pokemon'] for k in ('location_area_encounters', 'preevolution_location_area_encounters')
+              for r in (p.get(k) or []) if not isinstance(r, list))
+    in_size = os.path.getsize(args.input_json)
+    # The input as dump_compact would write it, so the ratio is not just the indentation saved
+    plain_size = len(json.dumps(doc, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    out_size = os.path.getsize(args.output_json)
+    print(f'Encoded {rows} encounters ({raw} kept as plain dicts) across {len(doc)} Pokemon')
+    for name, values in encoded['tables'].items():
+        print(f'  {name:<12}{len(values)} entries')
+    print(f'Size: {in_size} -> {out_size} bytes ({100.0 * out_size / in_size:.1f}%); '
+          f'unencoded minified {plain_size} bytes ({100.0 * out_size / plain_size:.1f}%)')
+    print(f'Wrote: {args.output_json}')
+
+
+if __name__ == '__main__':
+    main()
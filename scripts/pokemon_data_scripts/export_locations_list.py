@@ -12,10 +12,13 @@ list of names to the output file, preserving first-seen order.
 """
 
 import argparse
-import json
 import sys
 import os
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.encounter_codec import load_pokemon_data
+from common.encounter_table import EncounterTable
+
 
 def parse_args():
     p = argparse.ArgumentParser(description='Export unique location names from pokemon JSON')
@@ -28,8 +31,7 @@ def parse_args():
 def main():
     args = parse_args()
     try:
-        with open(args.input_json, 'r', encoding='utf-8') as fh:
-            data = json.load(fh)
+        data = load_pokemon_data(args.input_json)
     except Exception as e:
         print(f'Error reading input JSON "{args.input_json}": {e}', file=sys.stderr)
         sys.exit(2)
@@ -41,33 +43,19 @@ def main():
         print('Input JSON does not contain an array of Pokémon objects', file=sys.stderr)
         sys.exit(3)
 
-    for p in data:
-        if not isinstance(p, dict):
+    # Unique names in first-seen order come straight from the encounter table;
+    # only the (much shorter) unique list is walked to fold case and whitespace
+    pokemon = [p for p in data if isinstance(p, dict) and isinstance(p.get('location_area_encounters') or [], list)]
+    table = EncounterTable.from_pokemon_data(pokemon)
+    for name in table.unique_locations(table.select()):
+        name = name.strip()
+        if not name:
             continue
-        locs = p.get('location_area_encounters') or []
-        if not isinstance(locs, list):
+        key = name.lower()
+        if key in seen_lower:
             continue
-        for loc in locs:
-            name = ''
-            if isinstance(loc, dict):
-                # new structured format
-                name = loc.get('name') or ''
-            else:
-                # legacy string format
-                name = loc or ''
-            if not isinstance(name, str):
-                try:
-                    name = str(name)
-                except Exception:
-                    continue
-            name = name.strip()
-            if not name:
-                continue
-            key = name.lower()
-            if key in seen_lower:
-                continue
-            seen_lower.add(key)
-            ordered.append(name)
+        seen_lower.add(key)
+        ordered.append(name)
 
     # If a maps directory is provided, only include locations which are missing a corresponding PNG
     maps_dir = args.maps_dir
@@ -5,8 +5,13 @@ Script to extract all unique location names from Pokemon data JSON.
 
 import json
 import argparse
+import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.encounter_codec import load_pokemon_data
+from common.encounter_table import EncounterTable
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -28,8 +33,7 @@ def main():
     # Load input JSON
     print(f"Loading Pokemon data from: {args.input_json}")
     try:
-        with open(args.input_json, 'r', encoding='utf-8') as f:
-            pokemon_data = json.load(f)
+        pokemon_data = load_pokemon_data(args.input_json)
     except FileNotFoundError:
         print(f"Error: Input file not found: {args.input_json}")
         sys.exit(1)
@@ -43,23 +47,9 @@ def main():
     
     print(f"Loaded {len(pokemon_data)} Pokemon")
     
-    # Collect unique location names
-    location_names = set()
-    
-    for pokemon in pokemon_data:
-        encounters = pokemon.get('location_area_encounters', [])
-        if encounters:
-            for encounter in encounters:
-                if isinstance(encounter, dict):
-                    name = encounter.get('name')
-                else:
-                    name = encounter
-                
-                if name:
-                    location_names.add(name)
-    
-    # Sort alphabetically
-    sorted_locations = sorted(location_names)
+    # Collect unique location names (sorted alphabetically)
+    table = EncounterTable.from_pokemon_data(pokemon_data)
+    sorted_locations = table.unique_locations(table.select(), first_seen=False)
     
     # Write to output file
     print(f"\nWriting {len(sorted_locations)} unique locations to: {args.output_txt}")
@@ -6,7 +6,9 @@ entry inspects the `location_area_encounters` list. Only locations that match
 the Pokemon's `generation` (by simple substring keyword matching) are kept.
 
 This is heuristic-based; provide a `--location-to-region` JSON file to supply
-explicit substring->region mappings for edge cases.
+explicit substring->region mappings for edge cases. The mapping and the region
+keywords are compiled once into a multi-pattern matcher
+(`common/region_matcher.py`) and looked up once per unique location name.
 
 Usage:
   python scripts/filter_locations_by_generation.py --input-json public/data/pokemon_data.json --output-json public/data/pokemon_data_filtered.json --allow-unknown
@@ -14,9 +16,11 @@ Usage:
 Options:
   --input-json         Path to input JSON (required)
   --output-json        Path to write filtered JSON (required)
-  --location-to-region Optional JSON mapping file with keys being substrings
+  --location-to-region Optional JSON mapping file(s) with keys being substrings
                        to match (case-insensitive) and values being region names
-                       e.g. {"lake of rage": "johto"}
+                       e.g. {"lake of rage": "johto"}. May be repeated (e.g.
+                       region_map.json then region_map_overrides.json); later
+                       files take precedence.
   --allow-unknown      If set, locations that don't map to any region are kept
                        (default: dropped)
   --verbose            Print progress and summary
@@ -30,6 +34,10 @@ import os
 import sys
 from collections import defaultdict
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.encounter_codec import load_pokemon_data
+from common.region_matcher import RegionMatcher
+
 
 DEFAULT_GEN_REGIONS = {
     1: ["kanto"],
@@ -44,69 +52,49 @@ DEFAULT_GEN_REGIONS = {
 }
 
 
-def load_location_map(path):
-    if not path:
-        return {}
+def load_location_map(paths):
+    """Build a RegionMatcher from zero or more substring->region JSON files."""
+    if isinstance(paths, str):
+        paths = [paths]
+    paths = [p for p in (paths or []) if p]
     try:
-        with open(path, encoding='utf-8') as f:
-            data = json.load(f)
-            # normalize keys to lowercase
-            return {k.lower(): v.lower() for k, v in data.items()}
+        return RegionMatcher.from_json(*paths, lowercase_values=True)
     except Exception as e:
-        print(f"Failed to load location-to-region map {path}: {e}", file=sys.stderr)
-        return {}
+        print(f"Failed to load location-to-region map {', '.join(paths)}: {e}", file=sys.stderr)
+        return RegionMatcher()
+
+
+def location_name(loc):
+    """Return the location string for an encounter entry (string or {'name': ...} dict)."""
+    if isinstance(loc, dict):
+        return loc.get('name') or ''
+    return loc or ''
 
 
-def detect_region_for_location(loc_str, explicit_map):
-    s = loc_str.lower()
+def detect_region_for_location(loc_str, matcher):
     # explicit map has substrings -> region
-    for sub, region in explicit_map.items():
-        if sub in s:
-            return region
-    # no explicit mapping found
-    return None
+    return matcher.region_for(location_name(loc_str))
 
 
-def location_matches_generation(loc_str, gen, explicit_map):
+def location_matches_generation(loc_str, gen, matcher):
+    """Return (matched, mapped_region) for a location and a Pokemon generation."""
+    name = location_name(loc_str)
+    gen_regions = DEFAULT_GEN_REGIONS.get(gen, [])
     # Check explicit map first
-    region = detect_region_for_location(loc_str, explicit_map)
+    region = matcher.region_for(name)
     if region:
-        return region in DEFAULT_GEN_REGIONS.get(gen, [])
+        return region in gen_regions, region
 
     # Fallback heuristic: check for generation region keywords in the string
-    s = loc_str.lower()
-    gen_keywords = DEFAULT_GEN_REGIONS.get(gen, [])
-    for kw in gen_keywords:
-        if kw in s:
-            return True
-
-    # Not matched
-    return False
-
-
-def parse_args():
-    p = argparse.ArgumentParser(description='Filter pokemon location entries by generation')
-    p.add_argument('--input-json', required=True)
-    p.add_argument('--output-json', required=True)
-    p.add_argument('--location-to-region', help='Optional JSON mapping substr->region')
-    p.add_argument('--missing-map-output', help='Optional path to write missing location->region map (keys -> empty string)')
-    p.add_argument('--allow-unknown', action='store_true', help='Keep locations that do not map to any region')
-    p.add_argument('--verbose', action='store_true')
-    p.add_argument('--report-json', help='Optional path to write a summary report')
-    return p.parse_args()
-
+    found = matcher.keywords_in(name)
+    return any(kw in found for kw in gen_regions), None
 
-def main():
-    args = parse_args()
-    try:
-        with open(args.input_json, encoding='utf-8') as f:
-            data = json.load(f)
-    except Exception as e:
-        print(f"Failed to read input JSON {args.input_json}: {e}", file=sys.stderr)
-        sys.exit(1)
 
-    explicit_map = load_location_map(args.location_to_region)
+def filter_pokemon(data, matcher, allow_unknown=False):
+    """Filter every Pokemon's location_area_encounters.
 
+    Returns (out_list, report, missing_locs).
+    """
     report = {
         'total_pokemon': len(data),
         'filtered': 0,
@@ -117,34 +105,34 @@ def main():
 
     out_list = []
     missing_locs = set()
+    # (location name, generation) -> (matched, mapped_region); names repeat heavily
+    decisions = {}
     for p in data:
         gen = p.get('generation')
+        # generation is stored as a string in pokemon_data.json
+        try:
+            gen = int(gen)
+        except (TypeError, ValueError):
+            pass
         name = p.get('name')
         locs = p.get('location_area_encounters') or []
         kept = []
         removed = []
         for loc in locs:
-            # Check explicit map first so we can record truly-unknown locations
-            mapped_region = detect_region_for_location(loc, explicit_map)
-            matched = False
-            if mapped_region:
-                matched = mapped_region in DEFAULT_GEN_REGIONS.get(gen, [])
-            else:
-                # Fallback heuristic
-                s = loc.lower()
-                for kw in DEFAULT_GEN_REGIONS.get(gen, []):
-                    if kw in s:
-                        matched = True
-                        break
-                if not matched:
-                    # Record this location for potential mapping by the user
-                    missing_locs.add(s)
+            loc_name = location_name(loc)
+            decision = decisions.get((loc_name, gen))
+            if decision is None:
+                decision = decisions[(loc_name, gen)] = location_matches_generation(loc_name, gen, matcher)
+            matched, mapped_region = decision
+            if not matched and not mapped_region:
+                # Record this location for potential mapping by the user
+                missing_locs.add(loc_name.lower())
 
             if matched:
                 kept.append(loc)
             else:
                 # if unknown but allow_unknown True, keep
-                if args.allow_unknown:
+                if allow_unknown:
                     kept.append(loc)
                 else:
                     removed.append(loc)
@@ -158,6 +146,31 @@ def main():
         new_p = dict(p)
         new_p['location_area_encounters'] = kept
         out_list.append(new_p)
+    return out_list, report, missing_locs
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Filter pokemon location entries by generation')
+    p.add_argument('--input-json', required=True)
+    p.add_argument('--output-json', required=True)
+    p.add_argument('--location-to-region', action='append', help='Optional JSON mapping substr->region (may be repeated)')
+    p.add_argument('--missing-map-output', help='Optional path to write missing location->region map (keys -> empty string)')
+    p.add_argument('--allow-unknown', action='store_true', help='Keep locations that do not map to any region')
+    p.add_argument('--verbose', action='store_true')
+    p.add_argument('--report-json', help='Optional path to write a summary report')
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        data = load_pokemon_data(args.input_json)
+    except Exception as e:
+        print(f"Failed to read input JSON {args.input_json}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    matcher = load_location_map(args.location_to_region)
+    out_list, report, missing_locs = filter_pokemon(data, matcher, allow_unknown=args.allow_unknown)
 
     # write output
     try:
@@ -176,8 +189,8 @@ def main():
 
     # Write missing-location map so user can fill in regions for unknown locations
     if args.missing_map_output:
-        # Exclude any locations already present in explicit_map
-        to_write = {loc: "" for loc in sorted(missing_locs) if loc not in explicit_map}
+        # Exclude any locations already present in the explicit map
+        to_write = {loc: "" for loc in sorted(missing_locs) if loc not in matcher.exact}
         try:
             with open(args.missing_map_output, 'w', encoding='utf-8') as f:
                 json.dump(to_write, f, ensure_ascii=False, indent=2)
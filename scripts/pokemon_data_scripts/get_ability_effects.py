@@ -17,6 +17,9 @@ Flags:
   --partial     Process only the first N Pokemon (optional)
   --verbose     Print progress
 
+Responses are read through the local PokeAPI mirror (common/pokeapi_store.py);
+--offline reads only the mirror.
+
 Requires: requests
 """
 
@@ -24,24 +27,20 @@ from __future__ import annotations
 import argparse
 import json
 import os
-import time
+import sys
 from typing import Dict, Any
-import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import write_json
+from common.pokeapi_store import PokeAPIStore, add_store_arguments, store_from_args
 
 
 ALLOWED_GENERATIONS = {"generation-i", "generation-ii", "generation-iii"}
 
 
-def fetch_json(session: requests.Session, url: str, retries: int = 3, timeout: float = 10.0):
-    for attempt in range(1, retries + 1):
-        try:
-            r = session.get(url, timeout=timeout)
-            r.raise_for_status()
-            return r.json()
-        except Exception:
-            if attempt == retries:
-                raise
-            time.sleep(0.5 * attempt)
+def fetch_json(store: PokeAPIStore, url: str):
+    # Read through the local mirror: each resource is requested from PokeAPI once
+    return store.get(url)
 
 
 def get_english_flavor_text(ability_json: Dict[str, Any]) -> str | None:
@@ -59,7 +58,7 @@ def get_english_flavor_text(ability_json: Dict[str, Any]) -> str | None:
     return None
 
 
-def ensure_generation_allowed(pokemon_entry: Dict[str, Any], poke_id: int, session: requests.Session, verbose: bool) -> bool:
+def ensure_generation_allowed(pokemon_entry: Dict[str, Any], poke_id: int, store: PokeAPIStore, verbose: bool) -> bool:
     # First try local data
     gen = pokemon_entry.get('generation')
     if isinstance(gen, dict) and gen.get('name') in ALLOWED_GENERATIONS:
@@ -67,7 +66,7 @@ def ensure_generation_allowed(pokemon_entry: Dict[str, Any], poke_id: int, sessi
     # Fallback: fetch species endpoint to determine generation
     species_url = f"https://pokeapi.co/api/v2/pokemon-species/{poke_id}"
     try:
-        j = fetch_json(session, species_url)
+        j = fetch_json(store, species_url)
         gen2 = j.get('generation') or {}
         name = gen2.get('name')
         if verbose:
@@ -86,12 +85,13 @@ def main(argv=None):
     p.add_argument('--output-json', required=True, help='Path to write augmented JSON (replaces abilities in-place)')
     p.add_argument('--partial', type=int, help='Process only the first N pokemon (others copied unchanged)')
     p.add_argument('--verbose', action='store_true')
+    add_store_arguments(p)
     args = p.parse_args(argv)
 
     with open(args.input_json, encoding='utf-8') as fh:
         data = json.load(fh)
 
-    session = requests.Session()
+    store = store_from_args(args)
     ability_cache: Dict[str, str | None] = {}
 
     total = len(data)
@@ -116,7 +116,7 @@ def main(argv=None):
             print(f"[{idx}/{limit}] Processing id={poke_id} name={poke_name}")
 
         # Ensure generation is within allowed set (local data or species endpoint)
-        allowed = ensure_generation_allowed(entry, poke_id, session, args.verbose)
+        allowed = ensure_generation_allowed(entry, poke_id, store, args.verbose)
         if not allowed:
             if args.verbose:
                 print(f"  Skipping id={poke_id} (generation not in first three)")
@@ -128,7 +128,7 @@ def main(argv=None):
         # Fetch pokemon endpoint to get ability urls
         poke_url = f"https://pokeapi.co/api/v2/pokemon/{poke_id}"
         try:
-            pj = fetch_json(session, poke_url)
+            pj = fetch_json(store, poke_url)
         except Exception as e:
             if args.verbose:
                 print(f"  Error fetching pokemon/{poke_id}: {e}")
@@ -150,14 +150,13 @@ def main(argv=None):
                 try:
                     if args.verbose:
                         print(f"    Fetching ability {abil_name} -> {abil_url}")
-                    aj = fetch_json(session, abil_url)
+                    aj = fetch_json(store, abil_url)
                     effect = get_english_flavor_text(aj)
                 except Exception as e:
                     effect = None
                     if args.verbose:
                         print(f"    Error fetching ability url {abil_url}: {e}")
                 ability_cache[abil_url] = effect
-                time.sleep(0.2)
 
             abilities.append({'name': abil_name, 'effect': effect})
 
@@ -165,13 +164,11 @@ def main(argv=None):
         new_entry['abilities'] = abilities
         new_data.append(new_entry)
 
+    store.close()
+
     # write augmented JSON (same structure as input, but with abilities normalized)
     out_path = args.output_json
-    out_dir = os.path.dirname(out_path)
-    if out_dir:
-        os.makedirs(out_dir, exist_ok=True)
-    with open(out_path, 'w', encoding='utf-8') as cf:
-        json.dump(new_data, cf, indent=2, ensure_ascii=False)
+    write_json(out_path, new_data, verbose=args.verbose)
 
     if args.verbose:
         print(f"Wrote augmented data for {min(limit, total)} entries to {out_path}")
@@ -20,6 +20,9 @@ Flags:
   --partial     Process only the first N pokemon (others ignored)
   --verbose     Print progress
 
+Responses are read through the local PokeAPI mirror (common/pokeapi_store.py);
+--offline reads only the mirror.
+
 Requires: requests
 """
 
@@ -27,22 +30,18 @@ from __future__ import annotations
 import argparse
 import json
 import os
-import time
 from typing import Dict, Any, Set, Tuple
 import re
-import requests
+import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import write_json
+from common.pokeapi_store import PokeAPIStore, add_store_arguments, store_from_args
 
-def fetch_json(session: requests.Session, url: str, retries: int = 3, timeout: float = 10.0):
-    for attempt in range(1, retries + 1):
-        try:
-            r = session.get(url, timeout=timeout)
-            r.raise_for_status()
-            return r.json()
-        except Exception:
-            if attempt == retries:
-                raise
-            time.sleep(0.5 * attempt)
+
+def fetch_json(store: PokeAPIStore, url: str):
+    # Read through the local mirror: each resource is requested from PokeAPI once
+    return store.get(url)
 
 
 def get_english_item_text(item_json: Dict[str, Any]) -> str | None:
@@ -99,12 +98,13 @@ def main(argv=None):
     p.add_argument('--output-json', help='Path to write augmented pokemon JSON (held_items replaced)')
     p.add_argument('--partial', type=int, help='Process only the first N pokemon (others ignored)')
     p.add_argument('--verbose', action='store_true')
+    add_store_arguments(p)
     args = p.parse_args(argv)
 
     with open(args.input_json, encoding='utf-8') as fh:
         data = json.load(fh)
 
-    session = requests.Session()
+    store = store_from_args(args)
     item_cache: Dict[str, Dict[str, Any] | None] = {}
 
     total = len(data)
@@ -124,7 +124,7 @@ def main(argv=None):
             try:
                 if args.verbose:
                     print(f"[{idx}/{min(limit, total)}] Fetching pokemon -> {poke_url}")
-                pj = fetch_json(session, poke_url)
+                pj = fetch_json(store, poke_url)
                 # pj.held_items is usually an array of { item: {name,url}, version_details: [...] }
                 for h in pj.get('held_items', []) or []:
                     if isinstance(h, dict):
@@ -147,9 +147,6 @@ def main(argv=None):
             except Exception as e:
                 if args.verbose:
                     print(f"  Warning: failed to fetch pokemon/{poke_id}: {e}")
-            finally:
-                # polite pause between pokemon requests
-                time.sleep(0.15)
 
         if not fetched:
             # fallback to local data parsing
@@ -180,14 +177,12 @@ def main(argv=None):
                 if args.verbose:
                     print(f"[{idx}/{len(unique_items)}] Fetching item -> {url}")
                 try:
-                    item_json = fetch_json(session, url)
+                    item_json = fetch_json(store, url)
                 except Exception as e:
                     if args.verbose:
                         print(f"  Error fetching {url}: {e}")
                     item_json = None
                 item_cache[url] = item_json
-                # Be polite
-                time.sleep(0.15)
 
             if not item_json:
                 continue
@@ -251,7 +246,7 @@ def main(argv=None):
                 try:
                     if args.verbose:
                         print(f"[{idx}/{min(limit, total)}] Fetching pokemon for output -> {poke_url}")
-                    pj = fetch_json(session, poke_url)
+                    pj = fetch_json(store, poke_url)
                     for h in pj.get('held_items', []) or []:
                         slug = None
                         if isinstance(h, dict):
@@ -273,8 +268,6 @@ def main(argv=None):
                 except Exception as e:
                     if args.verbose:
                         print(f"  Warning: failed to fetch pokemon/{poke_id} for output: {e}")
-                finally:
-                    time.sleep(0.12)
 
             if not fetched:
                 # fallback to local held_items parsing
@@ -285,14 +278,14 @@ def main(argv=None):
                         if id_type == 'url':
                             item_json = item_cache.get(identifier)
                             if not item_json:
-                                item_json = fetch_json(session, identifier)
+                                item_json = fetch_json(store, identifier)
                                 item_cache[identifier] = item_json
                         else:
                             url = f"https://pokeapi.co/api/v2/item/{identifier}"
                             item_json = item_cache.get(url)
                             if not item_json:
                                 try:
-                                    item_json = fetch_json(session, url)
+                                    item_json = fetch_json(store, url)
                                 except Exception:
                                     item_json = None
                                 item_cache[url] = item_json
@@ -312,14 +305,12 @@ def main(argv=None):
 
         # write augmented output JSON
         out_json_path = args.output_json
-        out_json_dir = os.path.dirname(out_json_path)
-        if out_json_dir:
-            os.makedirs(out_json_dir, exist_ok=True)
-        with open(out_json_path, 'w', encoding='utf-8') as outf:
-            json.dump(new_data, outf, indent=2, ensure_ascii=False)
+        write_json(out_json_path, new_data, verbose=args.verbose)
         if args.verbose:
             print(f"Wrote augmented pokemon JSON with replaced held_items to {out_json_path}")
 
+    store.close()
+
 
 if __name__ == '__main__':
     main()
@@ -13,19 +13,24 @@ Output: writes the same array of pokemon objects to `--output-json` but with a
 new `moves` key for each entry, e.g.
   "moves": [ {"name": "Vine Whip", "level_learned_at": 4}, ... ]
 
+Responses are read through the local PokeAPI mirror (common/pokeapi_store.py),
+so Pokemon already fetched by this or another script aren't requested again;
+--offline reads only the mirror.
+
 Requires: `requests` (pip install requests)
 """
 
 from __future__ import annotations
 import argparse
 import json
-import time
-import requests
 import os
 import sys
-import tempfile
 from typing import List, Dict
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import write_json
+from common.pokeapi_store import PokeAPIStore, add_store_arguments, store_from_args
+
 
 ALLOWED_VERSION_GROUPS = {"firered-leafgreen", "emerald", "ruby-sapphire"}
 ALLOWED_LEARN_METHOD = "level-up"
@@ -36,39 +41,17 @@ def prettify_move_name(raw: str) -> str:
     return raw.replace('-', ' ').replace('_', ' ').title()
 
 
-def fetch_pokemon(api_id: int, session: requests.Session, retries: int = 3, timeout: float = 10.0):
-    url = f"https://pokeapi.co/api/v2/pokemon/{api_id}"
-    for attempt in range(1, retries + 1):
-        try:
-            r = session.get(url, timeout=timeout)
-            r.raise_for_status()
-            return r.json()
-        except Exception as e:
-            if attempt == retries:
-                raise
-            time.sleep(1.0 * attempt)
-
-
-def write_output_atomic(data, path: str, verbose: bool = False):
-    # Ensure parent dir exists
-    parent = os.path.dirname(os.path.abspath(path))
-    if parent and not os.path.exists(parent):
-        os.makedirs(parent, exist_ok=True)
-    # Write to a temp file then atomically replace
-    fd, tmp = tempfile.mkstemp(prefix='tmp_moves_', dir=parent)
-    try:
-        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
-            json.dump(data, fh, indent=2, ensure_ascii=False)
-        os.replace(tmp, path)
-        if verbose:
-            print(f"Wrote (atomic) {path}")
-    except Exception:
-        # cleanup temp file if something went wrong
-        try:
-            os.unlink(tmp)
-        except Exception:
-            pass
-        raise
+def fetch_pokemon(api_id: int, store: PokeAPIStore):
+    return store.get(f"https://pokeapi.co/api/v2/pokemon/{api_id}")
+
+
+def write_output_atomic(data, path: str, verbose: bool = False, checkpoint: bool = False):
+    # Temp file + rename; skipped when the serialized output is unchanged.
+    # Checkpoints skip the structural diff (it re-reads the whole file) and stay quiet.
+    if checkpoint:
+        write_json(path, data, diff=False, verbose=False)
+    else:
+        write_json(path, data, verbose=verbose)
 
 
 def extract_level_up_moves(poke_json: Dict) -> List[Dict]:
@@ -103,14 +86,15 @@ def main(argv=None):
     p.add_argument('--start-id', type=int, help='Optional start id to process (inclusive)')
     p.add_argument('--end-id', type=int, help='Optional end id to process (inclusive)')
     p.add_argument('--save-every', type=int, default=0, help='Save intermediate output every N entries (0 disables)')
-    p.add_argument('--delay', type=float, default=0.5, help='Delay between API requests (seconds)')
+    p.add_argument('--delay', type=float, default=0.5, help='Delay between API requests (seconds); mirrored responses are not delayed')
     p.add_argument('--verbose', action='store_true')
+    add_store_arguments(p)
     args = p.parse_args(argv)
 
     with open(args.input_json, encoding='utf-8') as fh:
         data = json.load(fh)
 
-    session = requests.Session()
+    store = store_from_args(args, delay=args.delay)
 
     total = len(data)
     try:
@@ -131,7 +115,7 @@ def main(argv=None):
 
                 if args.verbose:
                     print(f"[{idx}/{total}] Fetching moves for id={poke_id}...")
-                pj = fetch_pokemon(int(poke_id), session)
+                pj = fetch_pokemon(int(poke_id), store)
                 moves = extract_level_up_moves(pj)
                 entry['moves'] = moves
             except Exception as e:
@@ -139,27 +123,27 @@ def main(argv=None):
                 entry['moves'] = []
                 if args.verbose:
                     print(f"  Error fetching id={entry.get('id')}: {e}")
-            finally:
-                # polite delay to avoid hammering the API
-                time.sleep(max(0.0, float(args.delay)))
 
             # optional periodic save
             if args.save_every and (idx % args.save_every == 0):
                 if args.verbose:
                     print(f"Saving intermediate output after {idx} entries...")
-                write_output_atomic(data, args.output_json, verbose=args.verbose)
+                write_output_atomic(data, args.output_json, checkpoint=True)
     except KeyboardInterrupt:
         # Write partial progress on interrupt
         if args.verbose:
             print('\nInterrupted by user; writing partial output...')
         try:
-            write_output_atomic(data, args.output_json, verbose=args.verbose)
+            write_output_atomic(data, args.output_json, checkpoint=True)
             if args.verbose:
                 print(f"Partial output written to {args.output_json}")
         except Exception as e:
             print(f"Failed to write partial output: {e}", file=sys.stderr)
+        store.close()
         sys.exit(1)
 
+    store.close()
+
     # Final write output JSON (atomic)
     write_output_atomic(data, args.output_json, verbose=args.verbose)
     print(f"Wrote augmented data with moves to {args.output_json}")
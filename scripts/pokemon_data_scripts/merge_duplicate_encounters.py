@@ -25,6 +25,12 @@ Grouping key
 
 All other fields are taken from the first entry in each group.
 
+Parsing
+    The same level_range / chance literals recur thousands of times across the
+    dataset, so each distinct string is parsed once into a structured value
+    (`parse_level_range`, `parse_chance`, LRU-cached). Merging works on those
+    structured values and only formats strings for the output entry.
+
 Usage
 -----
     python merge_duplicate_encounters.py --input-json pokemon_data.json
@@ -34,44 +40,60 @@ Usage
 """
 
 import argparse
-import json
+import os
 import re
 import sys
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from functools import lru_cache
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.pokemon_json import iter_pokemon, write_pokemon
 
 
 # ---------------------------------------------------------------------------
 # Level-range helpers
 # ---------------------------------------------------------------------------
 
+_RANGE_RE = re.compile(r'(\d+)\s*-\s*(\d+)')
+_INT_RE = re.compile(r'\d+')
+
+PARSE_CACHE_SIZE = 4096
+
+# Parsed level_range: frozenset of levels (or None) plus ordered special strings
+ParsedLevels = namedtuple('ParsedLevels', 'levels specials')
+
+
 def _parse_level_range(s):
     """
-    Return (numeric_levels: set[int] | None, special_strs: list[str]).
+    Return ParsedLevels(levels: frozenset[int] | None, specials: tuple[str]).
 
-    'special_strs' collects tokens that are not parseable as integers/ranges.
+    'specials' collects tokens that are not parseable as integers/ranges.
     """
     numeric = set()
     specials = []
 
-    for token in re.split(r',', s):
+    for token in s.split(','):
         token = token.strip()
         if not token:
             continue
         # Range like "20-40" or "26-27"
-        range_match = re.fullmatch(r'(\d+)\s*-\s*(\d+)', token)
+        range_match = _RANGE_RE.fullmatch(token)
         if range_match:
             lo, hi = int(range_match.group(1)), int(range_match.group(2))
             numeric.update(range(lo, hi + 1))
             continue
         # Plain integer
-        if re.fullmatch(r'\d+', token):
+        if _INT_RE.fullmatch(token):
             numeric.add(int(token))
             continue
         # Everything else is a special string
         if token not in specials:
             specials.append(token)
 
-    return numeric or None, specials
+    return ParsedLevels(frozenset(numeric) or None, tuple(specials))
+
+
+parse_level_range = lru_cache(maxsize=PARSE_CACHE_SIZE)(_parse_level_range)
 
 
 def _format_levels(levels):
@@ -103,7 +125,7 @@ def merge_level_ranges(level_range_list):
         s = str(lr).strip()
         if not s:
             continue
-        numeric, specials = _parse_level_range(s)
+        numeric, specials = parse_level_range(s)
         if numeric:
             all_numeric |= numeric
         for sp in specials:
@@ -133,6 +155,15 @@ def _fmt_pct(val):
     return f"{v}%"
 
 
+def _parse_pct(s):
+    """Return the float value of a "5%" / "2.5%" string, or None."""
+    m = _PCT_RE.match(s.strip())
+    return float(m.group(1)) if m else None
+
+
+parse_pct = lru_cache(maxsize=PARSE_CACHE_SIZE)(_parse_pct)
+
+
 def _range_pct_strs(values):
     """
     Given a list of percentage strings like ["2%", "5%", "8%"],
@@ -141,13 +172,12 @@ def _range_pct_strs(values):
     """
     nums = []
     for v in values:
-        m = _PCT_RE.match(str(v).strip())
-        if m:
-            nums.append(float(m.group(1)))
-        else:
+        num = parse_pct(str(v))
+        if num is None:
             # Cannot parse — return all unique strings joined
             unique = list(dict.fromkeys(values))
             return ' / '.join(unique)
+        nums.append(num)
     lo, hi = min(nums), max(nums)
     if lo == hi:
         return _fmt_pct(lo)
@@ -156,6 +186,24 @@ def _range_pct_strs(values):
     return f"{lo_s}-{hi_s}%"
 
 
+# Parsed chance: kind is 'tod' (value = (morning, day, night) strings),
+# 'pct' (value = the stripped percentage string) or 'special' (value = string)
+ParsedChance = namedtuple('ParsedChance', 'kind value')
+
+
+def _parse_chance(s):
+    s = s.strip()
+    m_tod = _TOD_RE.match(s)
+    if m_tod:
+        return ParsedChance('tod', (m_tod.group(1).strip(), m_tod.group(2).strip(), m_tod.group(3).strip()))
+    if _PCT_RE.match(s):
+        return ParsedChance('pct', s)
+    return ParsedChance('special', s)
+
+
+parse_chance = lru_cache(maxsize=PARSE_CACHE_SIZE)(_parse_chance)
+
+
 def merge_chances(chance_list):
     """
     Aggregate a list of chance strings into a range representation.
@@ -176,20 +224,16 @@ def merge_chances(chance_list):
     for c in chance_list:
         if not c:
             continue
-        s = str(c).strip()
-        m_tod = _TOD_RE.match(s)
-        if m_tod:
+        kind, value = parse_chance(str(c))
+        if kind == 'tod':
             has_tod = True
-            tod_morning.append(m_tod.group(1).strip())
-            tod_day.append(m_tod.group(2).strip())
-            tod_night.append(m_tod.group(3).strip())
-            continue
-        m_pct = _PCT_RE.match(s)
-        if m_pct:
-            pct_vals.append(s)
-            continue
-        if s not in specials:
-            specials.append(s)
+            tod_morning.append(value[0])
+            tod_day.append(value[1])
+            tod_night.append(value[2])
+        elif kind == 'pct':
+            pct_vals.append(value)
+        elif value not in specials:
+            specials.append(value)
 
     if has_tod:
         return (
@@ -204,6 +248,21 @@ def merge_chances(chance_list):
     return ' / '.join(specials)
 
 
+def parse_cache_info():
+    """Cache statistics for the level_range / chance / percentage parsers."""
+    return {
+        'level_range': parse_level_range.cache_info(),
+        'chance': parse_chance.cache_info(),
+        'pct': parse_pct.cache_info(),
+    }
+
+
+def clear_parse_caches():
+    parse_level_range.cache_clear()
+    parse_chance.cache_clear()
+    parse_pct.cache_clear()
+
+
 # ---------------------------------------------------------------------------
 # Core merge logic
 # ---------------------------------------------------------------------------
@@ -286,32 +345,42 @@ def merge_encounters(encounters, require_same_games=True):
 FIELDS = ('location_area_encounters', 'preevolution_location_area_encounters')
 
 
+def process_pokemon(pokemon, verbose=False, require_same_games=True):
+    """Merge one Pokemon's encounter lists in place; returns the number of entries removed."""
+    removed = 0
+    for field in FIELDS:
+        encounters = pokemon.get(field)
+        if not encounters:
+            continue
+        before = len(encounters)
+        merged = merge_encounters(encounters, require_same_games=require_same_games)
+        after = len(merged)
+        if after < before:
+            pokemon[field] = merged
+            removed += before - after
+            if verbose:
+                print(
+                    f"  [{pokemon.get('id', '?')}] {pokemon.get('name', '?')} "
+                    f"{field}: {before} -> {after} entries"
+                )
+    return removed
+
+
+def iter_processed(pokemon_iter, stats, verbose=False, require_same_games=True):
+    """Yield each Pokemon after merging, accumulating totals into stats."""
+    for pokemon in pokemon_iter:
+        removed = process_pokemon(pokemon, verbose=verbose, require_same_games=require_same_games)
+        if removed:
+            stats['removed'] += removed
+            stats['affected'] += 1
+        yield pokemon
+
+
 def process(pokemon_list, verbose=False, require_same_games=True):
-    total_removed = 0
-    affected_pokemon = 0
-
-    for pokemon in pokemon_list:
-        removed_this = 0
-        for field in FIELDS:
-            encounters = pokemon.get(field)
-            if not encounters:
-                continue
-            before = len(encounters)
-            merged = merge_encounters(encounters, require_same_games=require_same_games)
-            after = len(merged)
-            if after < before:
-                pokemon[field] = merged
-                removed_this += before - after
-                if verbose:
-                    print(
-                        f"  [{pokemon.get('id', '?')}] {pokemon.get('name', '?')} "
-                        f"{field}: {before} -> {after} entries"
-                    )
-        if removed_this:
-            total_removed += removed_this
-            affected_pokemon += 1
-
-    return total_removed, affected_pokemon
+    stats = {'removed': 0, 'affected': 0}
+    for _ in iter_processed(pokemon_list, stats, verbose=verbose, require_same_games=require_same_games):
+        pass
+    return stats['removed'], stats['affected']
 
 
 def main():
@@ -342,25 +411,25 @@ def main():
     args = parser.parse_args()
 
     print(f"Reading {args.input_json} …")
-    with open(args.input_json, 'r', encoding='utf-8') as f:
-        pokemon_list = json.load(f)
-
-    removed, affected = process(
-        pokemon_list,
+    stats = {'removed': 0, 'affected': 0}
+    processed = iter_processed(
+        iter_pokemon(args.input_json),
+        stats,
         verbose=args.verbose or args.dry_run,
         require_same_games=not args.ignore_games,
     )
 
     if args.dry_run:
-        print(f"\nDry run: would merge {removed} duplicate entries across {affected} Pokémon.")
+        for _ in processed:
+            pass
+        print(f"\nDry run: would merge {stats['removed']} duplicate entries across {stats['affected']} Pokémon.")
         sys.exit(0)
 
     output_path = args.output_json or args.input_json
     print(f"Writing {output_path} …")
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(pokemon_list, f, indent=2, ensure_ascii=False)
+    write_pokemon(output_path, processed)
 
-    print(f"Done. Merged {removed} duplicate entries across {affected} Pokémon.")
+    print(f"Done. Merged {stats['removed']} duplicate entries across {stats['affected']} Pokémon.")
     print(f"Output: {output_path}")
 
 
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Manage the local PokeAPI mirror the enrichment scripts read through.
+
+Usage:
+  # Mirror everything the scripts need for Gen 1-3 (pokemon, species, encounters,
+  # evolution chains, abilities, held items, encounter locations)
+  python scripts/pokemon_data_scripts/pokeapi_mirror.py prefetch --start-id 1 --end-id 386
+
+  # Only some groups, more workers
+  python scripts/pokemon_data_scripts/pokeapi_mirror.py prefetch --start-id 1 --end-id 151 --groups pokemon species chains --workers 8
+
+  # Summary of what is mirrored
+  python scripts/pokemon_data_scripts/pokeapi_mirror.py stats
+
+  # Serve the mirror as a local stand-in for https://pokeapi.co/api/v2/
+  python scripts/pokemon_data_scripts/pokeapi_mirror.py serve --port 8765
+
+Once prefetched, run the scripts with --offline (or POKEAPI_OFFLINE=1) to
+guarantee no network calls. The mirror defaults to scripts/data/pokeapi
+(--mirror or POKEAPI_MIRROR to change it); see common/pokeapi_store.py.
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.pokeapi_store import PREFETCH_GROUPS, add_store_arguments, store_from_args
+
+
+def cmd_prefetch(args):
+    if args.end_id < args.start_id:
+        print('Error: --end-id must be >= --start-id', file=sys.stderr)
+        return 2
+    ids = range(args.start_id, args.end_id + 1)
+    with store_from_args(args, delay=args.delay) as store:
+        print(f'Prefetching {", ".join(args.groups)} for ids {args.start_id}-{args.end_id} into {store.root}')
+        outcomes = store.prefetch(ids, groups=args.groups, workers=args.workers)
+        print(f"Done: {outcomes['ok']} available, {outcomes['missing']} missing on PokeAPI, "
+              f"{outcomes['failed']} failed; {store.stats['fetched']} fetched, {store.stats['cached']} already mirrored")
+    return 1 if outcomes['failed'] else 0
+
+
+def cmd_stats(args):
+    store = store_from_args(args)
+    by_resource = Counter()
+    missing = Counter()
+    for key, entry in store.index.items():
+        resource = key.split('/')[0]
+        if key.endswith('/encounters'):
+            resource += '/encounters'
+        (by_resource if entry['status'] == 200 else missing)[resource] += 1
+    print(f'{store.root}: {len(store.index)} resources')
+    for resource in sorted(set(by_resource) | set(missing)):
+        note = f' ({missing[resource]} missing on PokeAPI)' if missing[resource] else ''
+        print(f'  {resource:<24}{by_resource[resource]:>6}{note}')
+    return 0
+
+
+def cmd_serve(args):
+    store = store_from_args(args)
+    store.serve(args.host, args.port)
+    return 0
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description='Prefetch, inspect or serve the local PokeAPI mirror')
+    sub = p.add_subparsers(dest='command', required=True)
+
+    pre = add_store_arguments(sub.add_parser('prefetch', help='Mirror resources for an id range'))
+    pre.add_argument('--start-id', type=int, default=1)
+    pre.add_argument('--end-id', type=int, default=386)
+    pre.add_argument('--groups', nargs='+', choices=PREFETCH_GROUPS, default=list(PREFETCH_GROUPS),
+                     help='Resource groups to mirror (default: all)')
+    pre.add_argument('--workers', type=int, default=4, help='Concurrent requests (default 4)')
+    pre.add_argument('--delay', type=float, default=0.1,
+                     help='Minimum seconds between requests across all workers (default 0.1)')
+    pre.set_defaults(func=cmd_prefetch)
+
+    st = add_store_arguments(sub.add_parser('stats', help='Count mirrored resources'))
+    st.set_defaults(func=cmd_stats)
+
+    sv = add_store_arguments(sub.add_parser('serve', help='Serve the mirror over HTTP'))
+    sv.add_argument('--host', default='127.0.0.1')
+    sv.add_argument('--port', type=int, default=8765)
+    sv.set_defaults(func=cmd_serve)
+
+    args = p.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
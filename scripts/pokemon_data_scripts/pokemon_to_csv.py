@@ -2,16 +2,23 @@
 """
 Extract specified fields from pokemon_data.json and export to CSV.
 
+Fields are exported column by column with one dtype per column (see
+common/pokemon_frame.py): lists and dicts as compact JSON, strings as-is,
+numbers and booleans in their exact text form. A schema sidecar (output.csv ->
+output.schema.json) records the dtypes, so csv_to_pokemon.py can apply edits back losslessly.
+
 Usage:
     python pokemon_to_csv.py -i pokemon_data.json -o output.csv -f generation,habitat,height,weight
     python pokemon_to_csv.py -o output.csv -f types,genus
 """
 
 import json
-import csv
 import argparse
+import os
 import sys
-from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.pokemon_frame import PokemonFrame, schema_path
 
 
 def extract_pokemon_data(input_file, output_file, fields):
@@ -36,41 +43,17 @@ def extract_pokemon_data(input_file, output_file, fields):
             print("Error: JSON array is empty", file=sys.stderr)
             return False
         
-        # Prepare CSV header and rows
-        csv_headers = ['id', 'name'] + fields
-        rows = []
-        
-        for pokemon in pokemon_data:
-            if not isinstance(pokemon, dict):
-                continue
-            
-            # Extract id and name
-            if 'id' not in pokemon or 'name' not in pokemon:
-                print(f"Warning: Skipping pokemon without id or name", file=sys.stderr)
-                continue
-            
-            row = [pokemon['id'], pokemon['name']]
-            
-            # Extract requested fields (use empty string if field doesn't exist)
-            for field in fields:
-                value = pokemon.get(field, '')
-                
-                # Convert lists and dicts to JSON strings for CSV compatibility
-                if isinstance(value, (list, dict)):
-                    value = json.dumps(value)
-                
-                row.append(value)
-            
-            rows.append(row)
+        skipped = sum(1 for p in pokemon_data if isinstance(p, dict) and ('id' not in p or 'name' not in p))
+        if skipped:
+            print(f"Warning: Skipping {skipped} pokemon without id or name", file=sys.stderr)
         
-        # Write to CSV file
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(csv_headers)
-            writer.writerows(rows)
+        # Encode the requested fields column by column and write the CSV + schema
+        frame = PokemonFrame.from_pokemon(pokemon_data, fields)
+        frame.to_csv(output_file)
         
-        print(f"✓ Successfully exported {len(rows)} pokemon to {output_file}")
-        print(f"  Columns: {', '.join(csv_headers)}")
+        print(f"✓ Successfully exported {len(frame)} pokemon to {output_file}")
+        print(f"  Columns: {', '.join(['id', 'name'] + frame.fields)}")
+        print(f"  Schema:  {', '.join(f'{k}={v}' for k, v in frame.schema.items())} ({schema_path(output_file)})")
         return True
     
     except FileNotFoundError:
@@ -109,8 +92,8 @@ def main():
     
     args = parser.parse_args()
     
-    # Parse field names
-    fields = [f.strip() for f in args.fields.split(',')]
+    # Parse field names ('id' and 'name' are always the first two columns)
+    fields = [f.strip() for f in args.fields.split(',') if f.strip() and f.strip() not in ('id', 'name')]
     
     if not fields:
         print("Error: No fields specified", file=sys.stderr)
@@ -1,12 +1,48 @@
 #!/usr/bin/env python3
 """
 Script to remove specified fields from Pokemon data JSON.
+
+Entries are streamed through (see common/pokemon_json.py), so only one Pokemon
+is held in memory at a time.
 """
 
 import json
 import argparse
+import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.pokemon_json import iter_pokemon, write_pokemon
+
+
+def strip_fields(pokemon_iter, fields_to_remove, field_order, stats):
+    """Yield each Pokemon without fields_to_remove and with keys in field_order first."""
+    for pokemon in pokemon_iter:
+        if not isinstance(pokemon, dict):
+            raise ValueError("Input JSON must be an array of Pokemon")
+        stats['pokemon'] += 1
+
+        # Remove fields
+        for field in fields_to_remove:
+            if field in pokemon:
+                del pokemon[field]
+                stats['removed'] += 1
+
+        # Reorder fields
+        ordered_pokemon = {}
+
+        # Add fields in specified order
+        for field in field_order:
+            if field in pokemon:
+                ordered_pokemon[field] = pokemon[field]
+
+        # Add any remaining fields not in the order list
+        for field, value in pokemon.items():
+            if field not in ordered_pokemon:
+                ordered_pokemon[field] = value
+
+        yield ordered_pokemon
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -45,62 +81,31 @@ def main():
         'flavor_text_entries_original'
     ]
     
-    # Load input JSON
-    print(f"Loading Pokemon data from: {args.input_json}")
+    print(f"Streaming Pokemon data from: {args.input_json}")
+    print(f"Saving results to: {args.output_json}")
+    stats = {'pokemon': 0, 'removed': 0}
     try:
-        with open(args.input_json, 'r', encoding='utf-8') as f:
-            pokemon_data = json.load(f)
+        pokemon_iter = iter_pokemon(args.input_json)
+        write_pokemon(args.output_json, strip_fields(pokemon_iter, fields_to_remove, field_order, stats))
     except FileNotFoundError:
         print(f"Error: Input file not found: {args.input_json}")
         sys.exit(1)
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON in input file: {e}")
         sys.exit(1)
-    
-    if not isinstance(pokemon_data, list):
-        print("Error: Input JSON must be an array of Pokemon")
+    except ValueError as e:
+        print(f"Error: {e}")
         sys.exit(1)
-    
-    print(f"Loaded {len(pokemon_data)} Pokemon")
-    
-    # Remove specified fields and reorder remaining fields
-    total_removed = 0
-    for i, pokemon in enumerate(pokemon_data):
-        # Remove fields
-        for field in fields_to_remove:
-            if field in pokemon:
-                del pokemon[field]
-                total_removed += 1
-        
-        # Reorder fields
-        ordered_pokemon = {}
-        
-        # Add fields in specified order
-        for field in field_order:
-            if field in pokemon:
-                ordered_pokemon[field] = pokemon[field]
-        
-        # Add any remaining fields not in the order list
-        for field, value in pokemon.items():
-            if field not in ordered_pokemon:
-                ordered_pokemon[field] = value
-        
-        pokemon_data[i] = ordered_pokemon
-    
-    print(f"Removed {total_removed} field occurrences")
-    print(f"Reordered fields for all Pokemon")
-    
-    # Write output JSON
-    print(f"\nSaving results to: {args.output_json}")
-    try:
-        with open(args.output_json, 'w', encoding='utf-8') as f:
-            json.dump(pokemon_data, f, indent=2, ensure_ascii=False)
-        print("Successfully saved output file!")
     except IOError as e:
         print(f"Error writing output file: {e}")
         sys.exit(1)
-    
-    print(f"\nComplete! Stripped {len(fields_to_remove)} field types from {len(pokemon_data)} Pokemon.")
+
+    print(f"Processed {stats['pokemon']} Pokemon")
+    print(f"Removed {stats['removed']} field occurrences")
+    print(f"Reordered fields for all Pokemon")
+    print("Successfully saved output file!")
+
+    print(f"\nComplete! Stripped {len(fields_to_remove)} field types from {stats['pokemon']} Pokemon.")
 
 
 if __name__ == '__main__':
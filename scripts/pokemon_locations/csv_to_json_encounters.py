@@ -5,21 +5,32 @@ Usage:
   python csv_to_json_encounters.py --input-csv encounters.csv --output-json encounters.json [--pokemon-json pokemon_data.json]
 
 If provided, --pokemon-json will be used to look up canonical Pokemon names by id.
+If provided, --region-map (substring -> region JSON, e.g. scripts/data/region_map.json;
+may be repeated) is consulted through the shared RegionMatcher before falling
+back to the leading region word of the location name.
 """
 
 import argparse
 import csv
 import json
 import os
+import sys
 from collections import defaultdict
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.region_matcher import RegionMatcher
+
 
 KNOWN_REGIONS = {"kanto", "johto", "hoenn", "sinnoh", "unova", "kalos", "alola", "galar"}
 
 
-def infer_region(location_name: str) -> str:
+def infer_region(location_name: str, matcher: RegionMatcher = None) -> str:
     if not location_name:
         return ""
+    if matcher is not None:
+        region = matcher.region_for(location_name)
+        if region:
+            return region.capitalize()
     parts = location_name.split()
     if parts:
         first = parts[0].lower().strip()
@@ -130,8 +141,11 @@ def main():
     p.add_argument("--input-csv", required=True)
     p.add_argument("--output-json", required=True)
     p.add_argument("--pokemon-json", help="Optional pokemon data JSON to get canonical names by id")
+    p.add_argument("--region-map", action="append", help="Optional substring -> region JSON (may be repeated; later files win)")
     args = p.parse_args()
 
+    matcher = RegionMatcher.from_json(*args.region_map) if args.region_map else None
+
     id_to_name = {}
     if args.pokemon_json:
         id_to_name = load_pokemon_json(args.pokemon_json)
@@ -167,7 +181,7 @@ def main():
         for r in rows:
             games = [g.strip() for g in (r.get("games") or "").split("|") if g.strip()]
             loc_name = r.get("location_name", "")
-            region = infer_region_from_games(games) or infer_region(loc_name)
+            region = infer_region_from_games(games) or infer_region(loc_name, matcher)
             generation = infer_generation_from_games(games)
             location_area_encounters.append({
                 "name": loc_name,
@@ -16,34 +16,36 @@ Usage:
 Options:
   --chain-cache  Path to a JSON file to save/load PokeAPI evolution chain results
                  (avoids re-fetching on subsequent runs). Defaults to ./evo_chain_cache.json
+  --mirror / --offline / --refresh
+                 Species and chain responses are read through the local PokeAPI
+                 mirror (common/pokeapi_store.py); --offline reads only the mirror.
 """
 
 import json
 import argparse
-import requests
-import time
+import os
 import sys
 from typing import Dict, List, Optional
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import write_json
+from common.pokeapi_store import FETCH_ERRORS, PokeAPIStore, add_store_arguments, store_from_args
+
 # Only resolve evolution chains for these generations (our encounter data coverage)
 GEN_1_3_MAX_ID = 386
 
-# In-memory cache for PokeAPI responses
-_api_cache: Dict[str, dict] = {}
+# Shared PokeAPI mirror; main() configures it from the command line
+store: Optional[PokeAPIStore] = None
 
 
-def fetch_json(url: str, delay: float = 0.3) -> Optional[dict]:
-    """Fetch a URL, using in-memory cache to avoid duplicate requests."""
-    if url in _api_cache:
-        return _api_cache[url]
+def fetch_json(url: str) -> Optional[dict]:
+    """Fetch a URL through the PokeAPI mirror (each resource is requested once)."""
+    global store
+    if store is None:
+        store = PokeAPIStore.from_env(delay=0.3)
     try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        _api_cache[url] = data
-        time.sleep(delay)
-        return data
-    except requests.RequestException as e:
+        return store.get(url)
+    except FETCH_ERRORS as e:
         print(f"  [WARN] Failed to fetch {url}: {e}", file=sys.stderr)
         return None
 
@@ -130,8 +132,12 @@ def main():
                         help="Path for the output pokemon_data JSON file")
     parser.add_argument("--chain-cache", default="./evo_chain_cache.json",
                         help="Path to cache file for PokeAPI evolution chain results")
+    add_store_arguments(parser)
     args = parser.parse_args()
 
+    global store
+    store = store_from_args(args, delay=0.3)
+
     # --- Load inputs ---
     print(f"Loading pokemon data from {args.pokemon_json}...")
     with open(args.pokemon_json, encoding="utf-8") as f:
@@ -195,6 +201,8 @@ def main():
 
         poke["preevolution_location_area_encounters"] = preevo_encounters
 
+    store.close()
+
     # Save updated chain cache
     save_chain_cache(chain_cache, args.chain_cache)
     print(f"  Saved evolution chain cache ({len(chain_cache)} entries) to {args.chain_cache}")
@@ -202,8 +210,7 @@ def main():
 
     # --- Write output ---
     print(f"Writing output to {args.output}...")
-    with open(args.output, "w", encoding="utf-8") as f:
-        json.dump(pokemon_list, f, ensure_ascii=False, indent=2)
+    write_json(args.output, pokemon_list)
 
     # Summary
     with_encounters = sum(1 for p in pokemon_list if p["location_area_encounters"])
@@ -8,6 +8,12 @@ tables under the "In the games > Pokémon" section and writes rows to CSV.
 Usage:
     python scrape_location_encounters.py --input-urls urls.txt --output-csv encounters.csv
 
+    # Also log every page / section fetch with its timing and bytes as JSON lines
+    python scrape_location_encounters.py --input-urls urls.txt --output-csv encounters.csv --trace scrape_trace.jsonl
+
+A timing summary (per stage: sections, fetch, parse, rate_limit; HTTP calls and
+bytes) prints at the end; see common/instrument.py.
+
 Output CSV columns:
     location_name, pokemon, games, location, levels, rate
 
@@ -16,7 +22,7 @@ Example row:
 """
 
 import csv
-import re
+import os
 import sys
 import time
 import json
@@ -27,6 +33,10 @@ from collections import Counter
 import requests
 from bs4 import BeautifulSoup
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import instrument
+from common.names import normalize_name
+
 API_BASE = "https://bulbapedia.bulbagarden.net/w/api.php"
 HEADERS = {"User-Agent": "pokedle-scraper/1.0 (https://github.com/pokedle)"}
 RATE_LIMIT = 0.8  # seconds between API requests
@@ -47,22 +57,6 @@ GEN_ABBREV_MAP = {
 CSV_FIELDS = ["pokemon_id", "pokemon", "generation", "location_name", "games", "location", "levels", "rate", "rate_morning", "rate_day", "rate_night"]
 
 
-def normalize_name(s: str) -> str:
-    """Normalize Pokemon names for lookup: lower, strip apostrophes, replace hyphens with spaces,
-    remove periods, normalize gender symbols (♀/♂ -> f/m), collapse whitespace."""
-    if not s:
-        return ""
-    s = s.lower()
-    s = s.replace("'", "")
-    s = s.replace("-", " ")
-    s = s.replace(".", "")
-    s = s.replace("♀", "f")
-    s = s.replace("♂", "m")
-    # collapse multiple spaces
-    s = re.sub(r"\s+", " ", s)
-    return s.strip()
-
-
 # ---------------------------------------------------------------------------
 # URL helpers
 # ---------------------------------------------------------------------------
@@ -99,6 +93,8 @@ def get_sections(page_title: str) -> list:
         headers=HEADERS,
         timeout=15,
     )
+    instrument.count("http_calls")
+    instrument.count("http_bytes", len(resp.content))
     resp.raise_for_status()
     return resp.json().get("parse", {}).get("sections", [])
 
@@ -117,6 +113,8 @@ def get_section_html(page_title: str, section_index: str) -> str:
         headers=HEADERS,
         timeout=15,
     )
+    instrument.count("http_calls")
+    instrument.count("http_bytes", len(resp.content))
     resp.raise_for_status()
     return resp.json().get("parse", {}).get("text", {}).get("*", "")
 
@@ -341,6 +339,11 @@ def generation_to_number(generation: str) -> int:
 # Per-page orchestration
 # ---------------------------------------------------------------------------
 
+def rate_limit():
+    with instrument.span("rate_limit"):
+        time.sleep(RATE_LIMIT)
+
+
 def scrape_location_page(url: str) -> list:
     """Scrape encounter rows from a single Bulbapedia location page."""
     location_name = url_to_location_name(url)
@@ -348,11 +351,12 @@ def scrape_location_page(url: str) -> list:
 
     print(f"  [{page_title}] fetching sections...")
     try:
-        sections = get_sections(page_title)
+        with instrument.span("sections"):
+            sections = get_sections(page_title)
     except Exception as exc:
         print(f"  ERROR fetching sections: {exc}")
         return []
-    time.sleep(RATE_LIMIT)
+    rate_limit()
 
     target_sections = find_target_sections(sections)
     if not target_sections:
@@ -366,14 +370,17 @@ def scrape_location_page(url: str) -> list:
     for generation, section_index in target_sections:
         print(f"  Parsing {generation} (section index {section_index})...")
         try:
-            html = get_section_html(page_title, section_index)
+            with instrument.span("fetch", item=generation):
+                html = get_section_html(page_title, section_index)
         except Exception as exc:
             print(f"  ERROR fetching section {section_index}: {exc}")
-            time.sleep(RATE_LIMIT)
+            rate_limit()
             continue
-        time.sleep(RATE_LIMIT)
+        rate_limit()
 
-        rows = parse_encounter_section(html, generation, location_name)
+        with instrument.span("parse", item=generation):
+            rows = parse_encounter_section(html, generation, location_name)
+        instrument.count("rows", len(rows))
         print(f"    -> {len(rows)} encounter rows")
         all_rows.extend(rows)
 
@@ -413,7 +420,9 @@ def main():
         required=True,
         help="Path to write the output CSV",
     )
+    instrument.add_arguments(parser)
     args = parser.parse_args()
+    instrument.setup(args)
 
     # Load pokemon name -> id mapping if provided
     pokemon_id_map = {}
@@ -442,7 +451,8 @@ def main():
     all_rows = []
     for i, url in enumerate(urls, 1):
         print(f"\n[{i}/{len(urls)}] {url}")
-        rows = scrape_location_page(url)
+        with instrument.span("page", item=url_to_page_title(url)):
+            rows = scrape_location_page(url)
         all_rows.extend(rows)
         print(f"  Subtotal: {len(all_rows)} rows")
 
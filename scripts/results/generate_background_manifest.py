@@ -20,38 +20,31 @@ Output format:
 }
 
 Keys are folder paths relative to the input directory ("." will be replaced with the input
-directory basename). Filenames are basenames only.
+directory basename). Filenames are basenames only. Keys and filenames are in natural order
+("2.png" before "10.png"), and unchanged files are not re-read between runs (see
+scripts/common/asset_manifests.py).
 """
 
 import argparse
-import json
 import os
+import sys
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.asset_manifests import AssetScan, backgrounds_folders, build_backgrounds_manifest
+from common.atomic_output import write_json
 
 
 DEFAULT_EXTS = {'.png', '.jpg', '.jpeg', '.webp'}
 
 
-def collect_images(input_dir: Path, exts: List[str]) -> Dict[str, List[str]]:
-    mapping = {}
-    input_dir = input_dir.resolve()
-    for dirpath, dirnames, filenames in os.walk(input_dir):
-        rel = os.path.relpath(dirpath, input_dir)
-        # Normalize to forward slashes for manifest keys
-        key = rel.replace('\\', '/')
-        if key == '.':
-            key = input_dir.name
-        files = []
-        for fn in sorted(filenames):
-            lower = fn.lower()
-            if any(lower.endswith(ext) for ext in exts):
-                files.append(fn)
-        if files:
-            mapping[key] = files
-    # Sort keys for deterministic output
-    ordered = {k: mapping[k] for k in sorted(mapping.keys())}
-    return ordered
+def collect_images(input_dir: Path, exts: List[str], state_path: Optional[str] = None) -> Dict[str, List[str]]:
+    scan = AssetScan(input_dir, state_path=state_path)
+    scan.scan(backgrounds_folders(''))
+    print(scan.summary())
+    scan.save()
+    return build_backgrounds_manifest(scan, '', exts)
 
 
 def main():
@@ -59,6 +52,7 @@ def main():
     p.add_argument('--input-dir', '-i', required=True, help='Input directory to scan (recursively)')
     p.add_argument('--output', '-o', default='backgrounds_manifest.json', help='Output JSON file path')
     p.add_argument('--exts', help='Comma-separated list of extensions to include (defaults: png,jpg,jpeg,webp)')
+    p.add_argument('--state', help='Scan state file (default scripts/data/manifest_state/)')
     args = p.parse_args()
 
     input_dir = Path(args.input_dir)
@@ -71,17 +65,15 @@ def main():
     else:
         exts = sorted(DEFAULT_EXTS)
 
-    manifest = collect_images(input_dir, exts)
+    manifest = collect_images(input_dir, exts, args.state)
 
     out_path = Path(args.output)
-    try:
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-    except Exception:
-        pass
-    with out_path.open('w', encoding='utf-8') as fh:
-        json.dump(manifest, fh, ensure_ascii=False, indent=4)
-
-    print(f'Wrote manifest to: {out_path} ({len(manifest)} folders)')
+    result = write_json(out_path, manifest, indent=4, verbose=False)
+
+    if result.changed:
+        print(f'Wrote manifest to: {out_path} ({len(manifest)} folders)')
+    else:
+        print(f'Manifest unchanged: {out_path} ({len(manifest)} folders)')
 
 
 if __name__ == '__main__':
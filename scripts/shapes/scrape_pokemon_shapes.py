@@ -5,11 +5,16 @@ Extracts shape descriptions and matches Pokemon to their shapes.
 
 import argparse
 import json
+import os
 import re
+import sys
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import write_json
+
 
 def load_pokemon_data(json_path):
     """Load pokemon data from JSON file."""
@@ -19,9 +24,8 @@ def load_pokemon_data(json_path):
 
 
 def save_pokemon_data(json_path, pokemon_data, indent=2):
-    """Save pokemon data to JSON file."""
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(pokemon_data, f, indent=indent, ensure_ascii=False)
+    """Save pokemon data to JSON file (atomically; skipped when the content is unchanged)."""
+    return write_json(json_path, pokemon_data, indent=indent)
 
 
 def normalize_pokemon_name(name):
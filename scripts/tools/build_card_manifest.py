@@ -5,11 +5,32 @@ Usage:
   python scripts/tools/build_card_manifest.py --images-dir ./images --csv summary.csv --output manifest.json
 
 This is a lightweight helper used by the project to summarize card metadata.
+Rows are keyed by filename in natural order ('1-2.jpg' before '1-11.jpg');
+rows whose image is not in --images-dir are kept but reported. Only the
+file names under --images-dir are listed; the images are never opened.
 """
 import argparse
 import csv
-import json
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import instrument
+from common.asset_manifests import natural_key
+from common.atomic_output import write_json
+
+
+def list_files(root):
+    """Paths of the non-hidden files under root, relative and '/'-separated."""
+    paths = set()
+    for folder, dirs, files in os.walk(root):
+        # Skip hidden files and folders, as AssetScan does
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        rel = os.path.relpath(folder, root).replace(os.sep, '/')
+        for f in files:
+            if not f.startswith('.'):
+                paths.add(f if rel == '.' else f'{rel}/{f}')
+    return paths
 
 
 def main():
@@ -17,26 +38,36 @@ def main():
     p.add_argument('--images-dir', required=True)
     p.add_argument('--csv', required=True)
     p.add_argument('--output', required=True)
+    instrument.add_arguments(p)
     args = p.parse_args()
+    instrument.setup(args)
 
     rows = []
-    with open(args.csv, encoding='utf-8') as fh:
+    with instrument.span('read_csv'), open(args.csv, encoding='utf-8') as fh:
         reader = csv.DictReader(fh)
         for r in reader:
             rows.append(r)
+    instrument.count('csv_rows', len(rows))
+
+    with instrument.span('scan'):
+        images = list_files(args.images_dir)
+    instrument.count('files_scanned', len(images))
 
     manifest = {}
+    missing = []
     for r in rows:
         fname = r.get('filename') or r.get('file')
         if not fname:
             continue
-        path = os.path.join(args.images_dir, fname)
+        if fname.replace('\\', '/') not in images:
+            missing.append(fname)
         manifest[fname] = r
+    manifest = dict(sorted(manifest.items(), key=lambda kv: natural_key(kv[0])))
+    if missing:
+        print(f'Warning: {len(missing)} rows have no image in {args.images_dir}: {", ".join(missing[:10])}')
 
-    with open(args.output, 'w', encoding='utf-8') as fh:
-        json.dump(manifest, fh, indent=2, ensure_ascii=False)
-
-    print(f'Wrote manifest to {args.output}')
+    with instrument.span('write'):
+        write_json(args.output, manifest)
 
 
 if __name__ == '__main__':
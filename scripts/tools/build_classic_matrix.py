@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Precompute the Classic-mode feedback matrix and solver statistics.
+
+Usage:
+  python scripts/tools/build_classic_matrix.py
+
+  # Also check every cell against a direct port of getComparison
+  python scripts/tools/build_classic_matrix.py --verify
+
+  # Rate the scheduled Classic answers (see build_daily_schedule.py)
+  python scripts/tools/build_classic_matrix.py --schedule scripts/data/daily_schedule.json
+
+The output holds the Pokemon ids in pokemon_data.json order and, for each
+attribute, the N x N feedback codes bit-packed (1 or 2 bits per cell, row =
+guess, column = answer, base64). Cell (g, a) is at bit offset (g * N + a) * bits;
+see common/classic_feedback.py for the state names and lookup(). Stats give
+the best opening guesses by expected remaining candidates and, per answer,
+the mean / best candidates left after one guess.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import write_json
+from common.classic_feedback import (decode_packed, encode_packed, feedback_codes, feedback_matrices,
+                                     solver_stats, verify_matrices)
+from common.pokemon_json import iter_pokemon
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    p = argparse.ArgumentParser(description='Build the Classic feedback matrix and solver stats')
+    p.add_argument('--pokemon-json', default=os.path.join(ROOT, 'public', 'data', 'pokemon_data.json'))
+    p.add_argument('--output', default=os.path.join(ROOT, 'scripts', 'data', 'classic_matrix.json'))
+    p.add_argument('--verify', action='store_true', help='Check every cell against getComparison')
+    p.add_argument('--full-feedback', action='store_true',
+                   help='Score guesses on the full getComparison result (evolution up/down too)')
+    p.add_argument('--top', type=int, default=10, help='Opening guesses to list (default 10)')
+    p.add_argument('--schedule', help='daily_schedule.json to rate the scheduled Classic answers')
+    args = p.parse_args()
+
+    fields = ('id', 'name', 'types', 'habitat', 'height', 'weight', 'generation', 'evolution_stage')
+    pokemon = [{k: e.get(k) for k in fields} for e in iter_pokemon(args.pokemon_json)]
+    n = len(pokemon)
+
+    t0 = time.perf_counter()
+    matrices = feedback_matrices(pokemon)
+    packed = encode_packed(matrices)
+    codes = feedback_codes(matrices, visible=not args.full_feedback)
+    stats = solver_stats(pokemon, codes, top=args.top)
+    print(f'{n} x {n} matrix and stats in {time.perf_counter() - t0:.2f}s')
+
+    if args.verify:
+        bad = verify_matrices(pokemon, matrices)
+        bad += verify_matrices(pokemon, decode_packed(packed, n))
+        for i, j, attr in bad[:20]:
+            print(f"  mismatch: {attr} for guess {pokemon[i]['name']} / answer {pokemon[j]['name']}")
+        print(f'Verify: {len(bad)} mismatches in {n * n} pairs')
+        if bad:
+            return 1
+
+    write_json(args.output, {
+        'version': 1,
+        'ids': [e['id'] for e in pokemon],
+        'attributes': packed,
+        'stats': stats,
+    }, indent=None, separators=(',', ':'))
+
+    print('Best opening guesses (expected candidates left, worst case):')
+    for row in stats['best_openers']:
+        print(f"  {row['name']:<14} {row['expected_remaining']:>7.2f} {row['worst_case']:>5}")
+
+    if args.schedule:
+        with open(args.schedule, 'r', encoding='utf-8') as fh:
+            schedule = json.load(fh)
+        answers = stats['answers']
+        rated = [(answers[str(pid)]['mean_remaining'], pid)
+                 for pid in schedule['modes']['classic'] if pid is not None and str(pid) in answers]
+        if rated:
+            rated.sort()
+            names = {e['id']: e['name'] for e in pokemon}
+            print(f"Scheduled Classic answers from {schedule['start']}: "
+                  f"{sum(r for r, _ in rated) / len(rated):.2f} candidates left after a random first guess on average")
+            print(f'  hardest: {names[rated[-1][1]]} ({rated[-1][0]:.2f}), easiest: {names[rated[0][1]]} ({rated[0][0]:.2f})')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Precompute the daily answers for every mode over a date range.
+
+Usage:
+  # Two years from today, with repeat / collision statistics
+  python scripts/tools/build_daily_schedule.py --days 730
+
+  # A fixed range, written somewhere else
+  python scripts/tools/build_daily_schedule.py --start 2026-01-01 --end 2027-12-31 --output schedule.json
+
+  # Just print the answers for a few days
+  python scripts/tools/build_daily_schedule.py --start 2026-12-24 --days 3 --show
+
+Dates are game days: the day that starts at RESET_HOUR_UTC on the previous UTC
+day, which is what getSeedFromDate in src/App.jsx encodes. The selection is a
+port of App.jsx's (see common/daily_schedule.py), so the output matches what
+players see as long as pokemon_data.json, card_manifest.json and
+dailyOverrides.js are unchanged.
+
+The schedule file is columnar: modes -> list of ids (one per day from start),
+card_type / card_file lists, details_mode as one letter per day (s/z/f), and
+day indexes of overrides, theme days and anti-repeat fallbacks, plus stats.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import write_json
+from common.daily_schedule import (MODES, ScheduleBuilder, answers_for, difficulty_balance, load_daily_overrides,
+                                   schedule_stats)
+from common.pokemon_json import iter_pokemon
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESET_HOUR_UTC = 18  # src/config/resetConfig.js
+
+
+def current_game_day():
+    now = datetime.now(timezone.utc)
+    day = now.date()
+    return day + timedelta(days=1) if now.hour >= RESET_HOUR_UTC else day
+
+
+def main():
+    p = argparse.ArgumentParser(description='Precompute daily answers for all modes')
+    p.add_argument('--start', type=date.fromisoformat, help='First game day, YYYY-MM-DD (default: today)')
+    span = p.add_mutually_exclusive_group()
+    span.add_argument('--days', type=int, default=365, help='Number of days (default 365)')
+    span.add_argument('--end', type=date.fromisoformat, help='Last game day, inclusive')
+    p.add_argument('--pokemon-json', default=os.path.join(ROOT, 'public', 'data', 'pokemon_data.json'))
+    p.add_argument('--card-manifest', default=os.path.join(ROOT, 'public', 'data', 'card_manifest.json'))
+    p.add_argument('--overrides', default=os.path.join(ROOT, 'src', 'config', 'dailyOverrides.js'))
+    p.add_argument('--output', default=os.path.join(ROOT, 'scripts', 'data', 'daily_schedule.json'))
+    p.add_argument('--show', action='store_true', help='Print each day instead of writing the schedule')
+    p.add_argument('--difficulty', help='classic_difficulty.json (solve_classic.py) to report hard/easy Classic days')
+    args = p.parse_args()
+
+    start = args.start or current_game_day()
+    days = (args.end - start).days + 1 if args.end else args.days
+    if days <= 0:
+        print('Error: the range is empty', file=sys.stderr)
+        return 2
+
+    ids = [entry['id'] for entry in iter_pokemon(args.pokemon_json)]
+    overrides = load_daily_overrides(args.overrides) if os.path.exists(args.overrides) else {}
+    card_manifest = None
+    if os.path.exists(args.card_manifest):
+        with open(args.card_manifest, 'r', encoding='utf-8') as fh:
+            card_manifest = json.load(fh)
+    else:
+        print(f'Warning: {args.card_manifest} not found; Card days will have no answer')
+
+    schedule = ScheduleBuilder(ids, overrides, card_manifest).build(start, days)
+
+    if args.show:
+        for i in range(days):
+            day = start + timedelta(days=i)
+            answers = answers_for(schedule, day)
+            modes = ' '.join(f'{m}={answers[m]}' for m in MODES)
+            print(f"{day} {schedule['details_mode'][i]} {modes} card={answers.get('card_type')}/{answers.get('card_file')}")
+        return 0
+
+    stats = schedule_stats(schedule)
+    if args.difficulty:
+        with open(args.difficulty, 'r', encoding='utf-8') as fh:
+            scores = {int(k): v['difficulty'] for k, v in json.load(fh)['pokemon'].items()}
+        stats['classic_difficulty'] = difficulty_balance(schedule, scores)
+    schedule['version'] = 1
+    schedule['source'] = {
+        'pokemon': len(ids),
+        'ids_sha1': hashlib.sha1(','.join(map(str, ids)).encode('ascii')).hexdigest()[:12],
+    }
+    schedule['stats'] = stats
+    write_json(args.output, schedule, indent=None, separators=(',', ':'))
+
+    print(f'{days} days from {start}:')
+    for mode, s in stats['modes'].items():
+        gap = s['min_repeat_gap'] if s['min_repeat_gap'] is not None else '-'
+        print(f"  {mode:<8} {s['distinct']:>4} distinct, {s['repeats']:>4} repeats "
+              f"(min gap {gap}, {s['repeats_within_lookback']} within 28 days), "
+              f"{s['overrides']} overrides, {s['fallbacks']} fallbacks")
+    print(f"  {len(stats['collisions'])} cases of one Pokemon answering several modes on the same day")
+    balance = stats.get('classic_difficulty')
+    if balance:
+        weekdays = ', '.join(f'{d} {v:.0f}' for d, v in balance['by_weekday'].items())
+        print(f"Classic difficulty (0-100): mean {balance['mean']:.1f}; by weekday {weekdays}")
+        print(f"  hardest week from {balance['hardest_week']['from']} ({balance['hardest_week']['mean']:.1f}), "
+              f"longest hard run {balance['longest_hard_run']['days']} days "
+              f"(ending {balance['longest_hard_run']['ending']})")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
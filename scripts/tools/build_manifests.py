@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Rebuild every asset manifest in public/data from one scan of the assets checkout.
+
+Usage:
+  python scripts/tools/build_manifests.py --assets-dir D:\\Github\\pokedle_assets
+  python scripts/tools/build_manifests.py --assets-dir ../pokedle_assets --only cards,eyes
+  python scripts/tools/build_manifests.py --assets-dir ../pokedle_assets --eyes-dir eyes/trimmed_v2
+
+The folders are listed once with os.scandir (see common/asset_manifests.py);
+files whose size and mtime match the previous run's scan state are not
+re-read. Manifests are only rewritten when their contents change.
+
+    cards        <assets>/cards                -> card_manifest.json
+    eyes         <assets>/eyes/trimmed         -> eyes_manifest.json
+    body_parts   <assets>/body_parts/trimmed   -> body_parts_manifest.json
+    backgrounds  <assets>/results/backgrounds  -> backgrounds_manifest.json
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import instrument
+from common.asset_manifests import MANIFESTS, AssetScan
+from common.atomic_output import write_json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    p = argparse.ArgumentParser(description='Rebuild the card, eyes, body part and background manifests')
+    p.add_argument('--assets-dir', required=True, help='Root of the pokedle_assets checkout')
+    p.add_argument('--output-dir', default=os.path.join(ROOT, 'public', 'data'),
+                   help='Where the manifests are written (default public/data)')
+    p.add_argument('--only', help=f'Comma-separated manifests to build (default all: {",".join(MANIFESTS)})')
+    p.add_argument('--state', help='Scan state file (default scripts/data/manifest_state/<assets>-<hash>.json)')
+    for name, spec in MANIFESTS.items():
+        p.add_argument(f'--{name.replace("_", "-")}-dir', dest=f'{name}_dir', default=spec.folder,
+                       help=f'{name} folder relative to --assets-dir (default {spec.folder})')
+    instrument.add_arguments(p)
+    args = p.parse_args()
+    instrument.setup(args)
+
+    if not os.path.isdir(args.assets_dir):
+        print(f"Error: Assets directory '{args.assets_dir}' does not exist")
+        return 1
+    names = [n.strip() for n in args.only.split(',') if n.strip()] if args.only else list(MANIFESTS)
+    unknown = [n for n in names if n not in MANIFESTS]
+    if unknown:
+        p.error(f'unknown manifest(s): {", ".join(unknown)}')
+
+    scan = AssetScan(args.assets_dir, state_path=args.state)
+    with instrument.span('scan'):
+        scan.scan([f for n in names for f in MANIFESTS[n].folders(getattr(args, f'{n}_dir'))])
+    print(f'Scanned {args.assets_dir}: {scan.summary()}')
+
+    for name in names:
+        spec = MANIFESTS[name]
+        with instrument.span('build', item=name):
+            manifest = spec.build(scan, getattr(args, f'{name}_dir'))
+        out = os.path.join(args.output_dir, spec.output)
+        with instrument.span('write', item=name):
+            result = write_json(out, manifest, indent=spec.indent, verbose=False)
+        print(f"  {name}: {len(manifest)} entries, {'written to' if result.changed else 'unchanged'} {out}")
+
+    # Saved last, so a failed run rescans the same files next time
+    scan.save()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
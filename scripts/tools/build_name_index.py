@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Build the guess-autocomplete name index (see common/name_index.py).
+
+Usage:
+  python scripts/tools/build_name_index.py
+  python scripts/tools/build_name_index.py --max-bytes 8000 --output /tmp/name_index.json
+
+  # Compare against the pages' linear startsWith filter on every typed prefix
+  python scripts/tools/build_name_index.py --benchmark
+
+Names are matched the way common/names.py normalises them (case, accents,
+apostrophes, periods, hyphens, ♀/♂), so every name the pages' startsWith filter
+finds is found too, plus spellings like "mr mime" or "nidoranf". The index is
+written compact and shrunk to --max-bytes if needed.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import write_json
+from common.name_index import NameIndex, build_index, index_size
+from common.pokemon_json import iter_pokemon
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def linear_prefix(lowered, query, limit=50):
+    """The pages' filter: name.toLowerCase().startsWith(guess.toLowerCase())."""
+    q = query.lower()
+    return [n for n, name in enumerate(lowered) if name.startswith(q)][:limit]
+
+
+def benchmark(pokemon, index, repeat):
+    lowered = [p['name'].lower() for p in pokemon]
+    queries = sorted({name[:i] for name in lowered for i in range(1, len(name) + 1)})
+
+    missing = [q for q in queries if not set(linear_prefix(lowered, q)) <= set(index.prefix(q))]
+    for q in missing[:10]:
+        print(f'  index misses a linear match for {q!r}')
+
+    timings = {}
+    for label, fn in (('linear scan', lambda q: linear_prefix(lowered, q)), ('index', index.prefix)):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for q in queries:
+                fn(q)
+        timings[label] = (time.perf_counter() - t0) / (repeat * len(queries)) * 1e6
+    print(f'{len(queries)} typed prefixes x {repeat}: ' +
+          ', '.join(f'{label} {us:.1f} us/query' for label, us in timings.items()))
+
+    substr = [q for q in ('chu', 'saur', 'mime', 'doran', 'zzz') if index.substring(q)]
+    print(f'Substring fallback finds: {", ".join(substr) or "nothing (no trigrams)"}')
+    return 1 if missing else 0
+
+
+def main():
+    p = argparse.ArgumentParser(description='Build the autocomplete name index')
+    p.add_argument('--pokemon-json', default=os.path.join(ROOT, 'public', 'data', 'pokemon_data.json'))
+    p.add_argument('--output', default=os.path.join(ROOT, 'public', 'data', 'name_index.json'))
+    p.add_argument('--max-bytes', type=int, default=32768, help='Size budget for the index (default 32768)')
+    p.add_argument('--block', type=int, default=16, help='Keys per front-coding block (default 16)')
+    p.add_argument('--benchmark', action='store_true', help='Check and time lookups instead of writing')
+    p.add_argument('--repeat', type=int, default=5)
+    args = p.parse_args()
+
+    pokemon = [{'id': e['id'], 'name': e['name']} for e in iter_pokemon(args.pokemon_json)]
+    try:
+        doc, dropped = build_index(pokemon, max_bytes=args.max_bytes, block=args.block)
+    except ValueError as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+    note = f" (dropped {', '.join(dropped)} to fit)" if dropped else ''
+    print(f"{len(pokemon)} names, {len(doc['postings'])} keys, {len(doc.get('trigrams') or {})} trigrams: "
+          f"{index_size(doc)} bytes{note}")
+
+    if args.benchmark:
+        return benchmark(pokemon, NameIndex(doc), args.repeat)
+    write_json(args.output, doc, indent=None, separators=(',', ':'), ensure_ascii=False)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
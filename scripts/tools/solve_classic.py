@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Solve Classic mode and score how hard each Pokemon is as an answer.
+
+Usage:
+  python scripts/tools/solve_classic.py
+
+  # Include the full guess tree in the output
+  python scripts/tools/solve_classic.py --tree
+
+  # Scale check on a synthetic roster (attributes resampled from the real data)
+  python scripts/tools/solve_classic.py --synthetic 1200 --openers 100 --output /tmp/classic_1200.json
+
+Builds the feedback patterns (common/classic_feedback.py) and an
+entropy-greedy guess tree (common/classic_solver.py). Per Pokemon it records:
+
+  guesses     guesses the tree needs when it is the answer
+  expected    mean guesses over every first guess, playing the tree after it
+  difficulty  percentile of `expected` across the roster (0 easiest, 100 hardest)
+
+build_daily_schedule.py --difficulty reads this file to report how hard and
+easy Classic days are spread across the schedule.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.atomic_output import write_json
+from common.classic_feedback import feedback_codes, feedback_matrices
+from common.classic_solver import ClassicSolver, tree_to_ids
+from common.pokemon_json import iter_pokemon
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+FIELDS = ('id', 'name', 'types', 'habitat', 'height', 'weight', 'generation', 'evolution_stage')
+
+
+def synthetic_roster(pokemon, size, seed=0):
+    """`size` made-up Pokemon whose attributes are drawn from the real columns."""
+    rng = random.Random(seed)
+    columns = {f: [p[f] for p in pokemon] for f in FIELDS[2:]}
+    return [dict({'id': i + 1, 'name': f'Synthetic {i + 1}'},
+                 **{f: rng.choice(values) for f, values in columns.items()})
+            for i in range(size)]
+
+
+def percentiles(values):
+    """Rank of each value as 0-100 (ties share the lower rank)."""
+    ordered = sorted(values)
+    n = len(values)
+    first = {}
+    for i, v in enumerate(ordered):
+        first.setdefault(v, i)
+    return [round(100 * first[v] / max(n - 1, 1), 1) for v in values]
+
+
+def main():
+    p = argparse.ArgumentParser(description='Classic-mode guess tree and per-Pokemon difficulty')
+    p.add_argument('--pokemon-json', default=os.path.join(ROOT, 'public', 'data', 'pokemon_data.json'))
+    p.add_argument('--output', default=os.path.join(ROOT, 'scripts', 'data', 'classic_difficulty.json'))
+    p.add_argument('--full-feedback', action='store_true',
+                   help='Solve on the full getComparison result (evolution up/down too)')
+    p.add_argument('--openers', type=int, help='Average difficulty over this many first guesses (default all)')
+    p.add_argument('--tree', action='store_true', help='Write the guess tree too')
+    p.add_argument('--synthetic', type=int, metavar='N', help='Solve a synthetic roster of N Pokemon instead')
+    args = p.parse_args()
+
+    pokemon = [{k: e.get(k) for k in FIELDS} for e in iter_pokemon(args.pokemon_json)]
+    if args.synthetic:
+        pokemon = synthetic_roster(pokemon, args.synthetic)
+    ids = [e['id'] for e in pokemon]
+
+    t0 = time.perf_counter()
+    solver = ClassicSolver(feedback_codes(feedback_matrices(pokemon), visible=not args.full_feedback))
+    tree = solver.solve()
+    guesses = solver.guess_counts(tree)
+    t1 = time.perf_counter()
+    expected = solver.difficulty(args.openers).tolist()
+    t2 = time.perf_counter()
+    print(f'{len(pokemon)} Pokemon: tree in {t1 - t0:.2f}s, difficulty in {t2 - t1:.2f}s')
+
+    ranks = percentiles(expected)
+    counts = [guesses[i] for i in range(len(pokemon))]
+    out = {
+        'version': 1,
+        'opener': {'id': ids[tree['guess']], 'name': pokemon[tree['guess']]['name']},
+        'mean_guesses': round(sum(counts) / len(counts), 4),
+        'max_guesses': max(counts),
+        'pokemon': {
+            str(ids[i]): {'guesses': counts[i], 'expected': round(expected[i], 4), 'difficulty': ranks[i]}
+            for i in range(len(pokemon))
+        },
+    }
+    if args.tree:
+        out['tree'] = tree_to_ids(tree, ids)
+    write_json(args.output, out, indent=None, separators=(',', ':'))
+
+    print(f"Best opener: {out['opener']['name']}; tree averages {out['mean_guesses']:.3f} guesses, "
+          f"at most {out['max_guesses']}")
+    order = sorted(range(len(pokemon)), key=lambda i: expected[i])
+    print('Easiest: ' + ', '.join(f"{pokemon[i]['name']} ({expected[i]:.2f})" for i in order[:5]))
+    print('Hardest: ' + ', '.join(f"{pokemon[i]['name']} ({expected[i]:.2f})" for i in order[-5:]))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -25,8 +25,13 @@ import argparse
 import json
 import os
 import random
+import sys
 from PIL import Image, ImageDraw
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import instrument
+from common.image_cache import open_rgba
+
 
 def has_full_alpha(img, x, y, alpha_area=3):
     """Return True if the square neighborhood centered at (x,y) is fully opaque.
@@ -132,17 +137,14 @@ def choose_points_for_image(img_path, points=10, max_attempts=20000, sample_area
     Raises RuntimeError if not enough valid points found within max_attempts.
     """
     try:
-        im = Image.open(img_path)
+        rgba = open_rgba(img_path)
     except Exception as e:
         raise RuntimeError(f"Failed to open image {img_path}: {e}")
 
-    w, h = im.size
+    w, h = rgba.size
     if w < 3 or h < 3:
         raise RuntimeError(f"Image too small for 3x3 checks: {img_path} ({w}x{h})")
 
-    # Convert to RGBA to inspect alpha.
-    # If the image has no alpha, converting to RGBA will set alpha=255 everywhere.
-    rgba = im.convert('RGBA')
 
     chosen = []
     attempts = 0
@@ -199,6 +201,7 @@ def choose_points_for_image(img_path, points=10, max_attempts=20000, sample_area
         if len(tried) >= len(candidates) and len(chosen) < points:
             break
 
+    instrument.count('point_attempts', attempts)
     if len(chosen) < points:
         raise RuntimeError(f"Could not find {points} valid points in {img_path} after {attempts} attempts (found {len(chosen)})")
 
@@ -223,7 +226,9 @@ def main():
     p.add_argument('--threshold', type=int, default=10, help='Color distance threshold for uniformity (default 10)')
     p.add_argument('--alpha-area', type=int, default=3, help='Side-length in pixels of alpha-check area (default 3 => 3x3)')
     p.add_argument('--verbose', action='store_true', help='Enable verbose logging of selection decisions')
+    instrument.add_arguments(p)
     args = p.parse_args()
+    instrument.setup(args)
 
     if args.seed is not None:
         random.seed(args.seed)
@@ -250,21 +255,22 @@ def main():
         path = os.path.join(images_dir, fname)
         key = os.path.splitext(fname)[0]
         try:
-            pts = choose_points_for_image(
-                path,
-                points=args.points,
-                max_attempts=args.max_attempts,
-                sample_area=args.area,
-                color_threshold=args.threshold,
-                verbose=args.verbose,
-                alpha_area=args.alpha_area,
-            )
+            with instrument.span('points', item=fname):
+                pts = choose_points_for_image(
+                    path,
+                    points=args.points,
+                    max_attempts=args.max_attempts,
+                    sample_area=args.area,
+                    color_threshold=args.threshold,
+                    verbose=args.verbose,
+                    alpha_area=args.alpha_area,
+                )
             results[key] = pts
             print(f"OK: {fname} -> {len(pts)} points")
             # Write annotated image if requested
             if annotate_dir:
                 try:
-                    with Image.open(path) as orig_im:
+                    with instrument.span('annotate', item=fname), Image.open(path) as orig_im:
                         draw = ImageDraw.Draw(orig_im)
                         for (x, y) in pts:
                             # draw a larger red rectangle around the marker center
@@ -289,6 +295,7 @@ def main():
                 except Exception as e:
                     print(f"ERROR annotating {fname}: {e}")
         except Exception as e:
+            instrument.count('errors')
             print(f"ERROR processing {fname}: {e}")
 
     # Write JSON